@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Log hattının Slack handler gecikmesine etkisinin benchmark'ı.
+
+Tipik bir handler'ı (küçük bir iş + birkaç INFO log satırı) farklı log kurulumlarıyla
+çalıştırır ve çağrı başına gecikmeyi (p50/p99/max) raporlar:
+    off        -> log kapalı (sadece WARNING ve üstü)
+    sync       -> eski kurulum: handler'lar log çağıran thread'de yazar
+    queue      -> QueueHandler/QueueListener (I/O arka plan thread'inde)
+    queue+json -> kuyruk + JSON-lines dosya formatı
+    queue+sample -> kuyruk + modül başına dakikada 20 INFO örneklemesi
+
+Konsol çıktısı /dev/null'a yönlendirilir, dosya logları geçici dizine yazılır.
+
+Kullanım:
+    python scripts/benchmark_logging.py
+    python scripts/benchmark_logging.py --calls 5000 --lines 8
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import tempfile
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.logger import setup_logger, stop_logging
+
+MODES = {
+    "off": dict(use_queue=False, json_format=False, sample_limit=0),
+    "sync": dict(use_queue=False, json_format=False, sample_limit=0),
+    "queue": dict(use_queue=True, json_format=False, sample_limit=0),
+    "queue+json": dict(use_queue=True, json_format=True, sample_limit=0),
+    "queue+sample": dict(use_queue=True, json_format=False, sample_limit=20),
+}
+
+
+def fake_handler(logger: logging.Logger, user_id: str, lines: int):
+    """Oy verme gibi sık çağrılan bir handler: biraz iş + her adımda INFO log."""
+    total = 0
+    for step in range(lines):
+        total += sum(range(200))
+        logger.info(f"[+] Adım {step} tamamlandı | Kullanıcı: {user_id}", extra={"user": user_id, "cmd": "/oylama"})
+    return total
+
+
+def run_mode(mode: str, calls: int, lines: int, log_dir: str):
+    logger = setup_logger(f"bench-{mode}", os.path.join(log_dir, f"{mode}.log"), **MODES[mode])
+    if mode == "off":
+        logger.setLevel(logging.WARNING)
+
+    latencies = []
+    for i in range(calls):
+        started = time.perf_counter()
+        fake_handler(logger, f"U{i % 50}", lines)
+        latencies.append((time.perf_counter() - started) * 1e6)
+
+    drain_started = time.perf_counter()
+    stop_logging(f"bench-{mode}")
+    drain_ms = (time.perf_counter() - drain_started) * 1000
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "max": latencies[-1],
+        "drain_ms": drain_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log hattı gecikme benchmark'ı")
+    parser.add_argument("--calls", type=int, default=2000, help="Handler çağrı sayısı")
+    parser.add_argument("--lines", type=int, default=5, help="Çağrı başına log satırı")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    real_stdout = sys.stdout
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        # Konsol handler'ı kurulum anındaki sys.stdout'u kullanır
+        sys.stdout = devnull
+        try:
+            for mode in args.modes:
+                results[mode] = run_mode(mode, args.calls, args.lines, log_dir)
+        finally:
+            sys.stdout = real_stdout
+
+    print(f"\n{args.calls} çağrı x {args.lines} log satırı (mikrosaniye / çağrı)\n")
+    print(f"{'Mod':<14} {'p50':>10} {'p99':>10} {'max':>10} {'kuyruk boşaltma':>18}")
+    print("-" * 66)
+    for mode, r in results.items():
+        print(f"{mode:<14} {r['p50']:>10.1f} {r['p99']:>10.1f} {r['max']:>10.1f} {r['drain_ms']:>15.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
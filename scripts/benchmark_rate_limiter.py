@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Rate limiter benchmark'ı: eski liste tabanlı limiter ile kayan pencere sayacı karşılaştırması.
+
+Eski limiter her kullanıcı için `datetime` listesi tutar ve her kontrolde listeyi yeniden kurar
+(O(max_requests)); hiç temizlenmediği için görülen her kullanıcı bellekte kalır. Yeni limiter
+kullanıcı başına iki sayaç tutar (O(1)) ve boşta kalan kullanıcıları kendisi siler.
+
+Senaryo: `--users` farklı kullanıcı, her biri sırayla istek atar. Kontrol başına süre (ns)
+ve çalışma sonunda bellekte tutulan kullanıcı sayısı raporlanır.
+
+Kullanım:
+    python scripts/benchmark_rate_limiter.py
+    python scripts/benchmark_rate_limiter.py --checks 200000 --users 5000 --max-requests 50
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.rate_limiter import RateLimiter
+
+
+class LegacyRateLimiter:
+    """Önceki implementasyon (karşılaştırma için birebir)."""
+
+    def __init__(self, max_requests: int = 10, window_seconds: int = 60):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.requests = defaultdict(list)
+
+    def is_allowed(self, user_id: str):
+        now = datetime.now()
+        user_requests = self.requests[user_id]
+        cutoff_time = now - timedelta(seconds=self.window_seconds)
+        user_requests[:] = [req_time for req_time in user_requests if req_time > cutoff_time]
+        if len(user_requests) >= self.max_requests:
+            oldest_request = min(user_requests) if user_requests else now
+            wait_seconds = int((oldest_request + timedelta(seconds=self.window_seconds) - now).total_seconds())
+            return False, f"⏳ Çok fazla istek! Lütfen {wait_seconds} saniye sonra tekrar deneyin."
+        user_requests.append(now)
+        return True, None
+
+
+def run(limiter, checks: int, users: int) -> dict:
+    user_ids = [f"U{i:06d}" for i in range(users)]
+    allowed = 0
+    started = time.perf_counter()
+    for i in range(checks):
+        if limiter.is_allowed(user_ids[i % users])[0]:
+            allowed += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "ns_per_check": elapsed / checks * 1e9,
+        "allowed": allowed,
+        "tracked_users": len(limiter.requests),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate limiter benchmark'ı")
+    parser.add_argument("--checks", type=int, default=100000, help="Toplam kontrol sayısı")
+    parser.add_argument("--users", type=int, default=1000, help="Farklı kullanıcı sayısı")
+    parser.add_argument("--max-requests", type=int, default=10, help="Pencere başına limit")
+    parser.add_argument("--window", type=int, default=60, help="Pencere (saniye)")
+    args = parser.parse_args()
+
+    limiters = {
+        "eski (liste)": LegacyRateLimiter(args.max_requests, args.window),
+        "kayan sayaç": RateLimiter(args.max_requests, args.window),
+    }
+
+    print(f"\n{args.checks} kontrol, {args.users} kullanıcı, limit {args.max_requests}/{args.window}s\n")
+    print(f"{'Limiter':<14} {'ns/kontrol':>12} {'izin':>10} {'tutulan kullanıcı':>20}")
+    print("-" * 60)
+    for name, limiter in limiters.items():
+        r = run(limiter, args.checks, args.users)
+        print(f"{name:<14} {r['ns_per_check']:>12.0f} {r['allowed']:>10} {r['tracked_users']:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Admin istatistik sorgularının benchmark'ı.
+
+Sentetik SQLite veritabanları (varsayılan 10k / 100k / 1M satır) oluşturur ve eski
+yöntemi (tüm satırları list() ile çekip Python'da saymak) SQL tarafı toplu sayım ve
+stats_counters anlık görüntüsüyle (StatisticsRepository) karşılaştırır.
+Süre ve tepe bellek kullanımı raporlanır.
+
+Kullanım:
+    python scripts/benchmark_statistics.py
+    python scripts/benchmark_statistics.py --sizes 10000 50000 --no-legacy
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.clients.database_client import DatabaseClient
+from src.repositories.statistics_repository import StatisticsRepository
+from src.services.statistics_service import BotStatistics
+
+SCHEMA = [
+    "CREATE TABLE users (id TEXT PRIMARY KEY, slack_id TEXT UNIQUE, full_name TEXT, cohort TEXT)",
+    "CREATE TABLE matches (id TEXT PRIMARY KEY, user1_id TEXT, user2_id TEXT, status TEXT, summary TEXT, created_at TIMESTAMP)",
+    "CREATE TABLE help_requests (id TEXT PRIMARY KEY, requester_id TEXT, topic TEXT, description TEXT, status TEXT)",
+    "CREATE TABLE feedbacks (id TEXT PRIMARY KEY, content TEXT, category TEXT)",
+    "CREATE TABLE polls (id TEXT PRIMARY KEY, topic TEXT, options TEXT, is_closed INTEGER)",
+    "CREATE TABLE votes (id TEXT PRIMARY KEY, poll_id TEXT, user_id TEXT, option_index INTEGER)",
+    "CREATE INDEX idx_users_cohort ON users(cohort)",
+    "CREATE INDEX idx_matches_status ON matches(status)",
+    "CREATE INDEX idx_help_requests_status ON help_requests(status)",
+    "CREATE INDEX idx_feedbacks_category ON feedbacks(category)",
+    "CREATE INDEX idx_polls_is_closed ON polls(is_closed)",
+    "CREATE INDEX idx_votes_poll ON votes(poll_id)",
+]
+
+
+class FileDatabase:
+    """DatabaseClient ile aynı bağlantı arayüzü (singleton olmadan, benchmark için)."""
+
+    def __init__(self, path: str):
+        self.db_path = path
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+def build_database(path: str, rows: int):
+    """Her tabloya `rows` kadar (polls için rows/10) sentetik kayıt ekler."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+    cohorts = ["Yapay Zeka", "Veri Bilimi", "Backend", "Frontend", None]
+    text = "x" * 120
+
+    def batch(sql, generator):
+        conn.executemany(sql, generator)
+
+    batch("INSERT INTO users VALUES (?, ?, ?, ?)",
+          ((f"u{i}", f"U{i}", f"Kullanıcı {i}", rng.choice(cohorts)) for i in range(rows)))
+    batch("INSERT INTO matches VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)",
+          ((f"m{i}", f"U{i}", f"U{i + 1}", rng.choice(["active", "closed"]), text) for i in range(rows)))
+    batch("INSERT INTO help_requests VALUES (?, ?, ?, ?, ?)",
+          ((f"h{i}", f"U{i}", "Konu", text, rng.choice(["open", "in_progress", "resolved", "closed"])) for i in range(rows)))
+    batch("INSERT INTO feedbacks VALUES (?, ?, ?)",
+          ((f"f{i}", text, rng.choice(["general", "bug", "suggestion"])) for i in range(rows)))
+    poll_count = max(1, rows // 10)
+    batch("INSERT INTO polls VALUES (?, ?, ?, ?)",
+          ((f"p{i}", "Konu", '["A", "B", "C"]', rng.randint(0, 1)) for i in range(poll_count)))
+    batch("INSERT INTO votes VALUES (?, ?, ?, ?)",
+          ((f"v{i}", f"p{rng.randrange(poll_count)}", f"U{i}", rng.randint(0, 2)) for i in range(rows)))
+    conn.commit()
+
+    # Sayaç tablosu ve trigger'lar (SingletonMeta'yı atlayarak), ardından ilk uzlaştırma
+    DatabaseClient.__new__(DatabaseClient)._create_stats_counters(conn.cursor())
+    conn.commit()
+    conn.close()
+    StatisticsRepository(FileDatabase(path)).reconcile_counters()
+
+
+def legacy_statistics(db: FileDatabase) -> dict:
+    """Eski yöntem: her tabloyu list() ile çekip Python'da sayar."""
+    def fetch_all(table):
+        with db.get_connection() as conn:
+            return [dict(row) for row in conn.execute(f"SELECT * FROM {table}").fetchall()]
+
+    users = fetch_all("users")
+    cohorts = {}
+    for user in users:
+        cohorts[user.get("cohort")] = cohorts.get(user.get("cohort"), 0) + 1
+    matches = fetch_all("matches")
+    help_requests = fetch_all("help_requests")
+    feedbacks = fetch_all("feedbacks")
+    polls = fetch_all("polls")
+    votes = fetch_all("votes")
+    return {
+        "users": len(users),
+        "matches_active": len([m for m in matches if m.get("status") == "active"]),
+        "help_open": len([h for h in help_requests if h.get("status") == "open"]),
+        "feedbacks": len(feedbacks),
+        "polls_open": len([p for p in polls if p.get("is_closed", 0) == 0]),
+        "votes": len(votes),
+    }
+
+
+def sql_statistics(db: FileDatabase) -> BotStatistics:
+    """Yeni yöntem: tek GROUP BY sorgusu + tipli sonuç nesnesi."""
+    return BotStatistics.from_grouped_counts(StatisticsRepository(db).fetch_grouped_counts())
+
+
+def snapshot_statistics(db: FileDatabase) -> BotStatistics:
+    """Sayaç tablosundan okuma (trigger'larla güncel tutulan stats_counters)."""
+    return BotStatistics.from_grouped_counts(StatisticsRepository(db).fetch_counter_snapshot())
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İstatistik sorguları benchmark'ı")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Tablo başına satır sayıları")
+    parser.add_argument("--no-legacy", action="store_true", help="Eski yöntemi ölçme (büyük boyutlarda yavaş)")
+    args = parser.parse_args()
+
+    print(f"{'satır':>10} | {'yöntem':<8} | {'süre (ms)':>10} | {'tepe bellek (MB)':>16}")
+    print("-" * 55)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            path = os.path.join(tmp, f"stats_{rows}.db")
+            build_database(path, rows)
+            db = FileDatabase(path)
+
+            snapshot, elapsed, peak = measure(snapshot_statistics, db)
+            print(f"{rows:>10} | {'snapshot':<8} | {elapsed * 1000:>10.1f} | {peak / 1e6:>16.2f}")
+
+            stats, elapsed, peak = measure(sql_statistics, db)
+            print(f"{rows:>10} | {'sql':<8} | {elapsed * 1000:>10.1f} | {peak / 1e6:>16.2f}")
+            assert snapshot == stats
+
+            if not args.no_legacy:
+                legacy, elapsed, peak = measure(legacy_statistics, db)
+                print(f"{rows:>10} | {'legacy':<8} | {elapsed * 1000:>10.1f} | {peak / 1e6:>16.2f}")
+                assert legacy["users"] == stats.users.total
+                assert legacy["matches_active"] == stats.matches.active
+                assert legacy["votes"] == stats.polls.total_votes
+
+
+if __name__ == "__main__":
+    main()
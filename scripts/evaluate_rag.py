@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+/sor (RAG) için çevrimdışı değerlendirme.
+
+Sabit bir soru kümesinde vektör araması ile cross-encoder yeniden sıralamasını karşılaştırır:
+bağlam hazırlama süresi (p50/p95), beklenen kaynağın bağlama girme oranı (hit), ilk doğru
+parçanın sırası (MRR), beklenen anahtar kelimelerin bağlamda geçme oranı ve bağlam boyutu.
+`--with-llm` verilirse Groq ile uçtan uca yanıt süresi ve yanıttaki anahtar kelime oranı da
+ölçülür (GROQ_API_KEY gerekir).
+
+Soru kümesi (JSON):
+    [{"question": "...", "expected_sources": ["kurallar.pdf"], "expected_keywords": ["..."]}]
+
+Kullanım:
+    python scripts/evaluate_rag.py
+    python scripts/evaluate_rag.py --questions sorular.json --candidates 30 --top-n 3 --budget-ms 200
+    python scripts/evaluate_rag.py --with-llm --json sonuc.json
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Dict, List, Optional
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.settings import get_settings
+from src.clients.vector_client import VectorClient
+from src.clients.reranker_client import RerankerClient
+from src.services.knowledge_service import KnowledgeService
+
+DEFAULT_QUESTIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rag_eval_questions.json")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def keyword_recall(text: str, keywords: List[str]) -> Optional[float]:
+    if not keywords:
+        return None
+    text = text.lower()
+    return sum(1 for keyword in keywords if keyword.lower() in text) / len(keywords)
+
+
+def reciprocal_rank(docs: List[Dict], expected_sources: List[str]) -> Optional[float]:
+    if not expected_sources:
+        return None
+    for rank, doc in enumerate(docs, 1):
+        if doc["metadata"].get("source") in expected_sources:
+            return 1 / rank
+    return 0.0
+
+
+def mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return statistics.mean(values) if values else None
+
+
+def evaluate(service: KnowledgeService, questions: List[Dict], repeat: int, with_llm: bool) -> Dict:
+    rows = []
+    for item in questions:
+        question = item["question"]
+        expected_sources = item.get("expected_sources", [])
+        keywords = item.get("expected_keywords", [])
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            docs = service.retrieve_context(question, collections=service.qa_collections)
+            timings.append((time.perf_counter() - started) * 1000)
+        context = "\n".join(doc["text"] for doc in docs)
+        rr = reciprocal_rank(docs, expected_sources)
+        row = {
+            "question": question,
+            "retrieval_ms": statistics.median(timings),
+            "chunks": len(docs),
+            "context_chars": len(context),
+            "hit": None if rr is None else rr > 0,
+            "mrr": rr,
+            "context_keywords": keyword_recall(context, keywords),
+        }
+
+        if with_llm:
+            started = time.perf_counter()
+            answer = asyncio.run(service.ask_question(question, user_id="evaluate_rag"))
+            row["answer_ms"] = (time.perf_counter() - started) * 1000
+            row["answer_keywords"] = keyword_recall(answer, keywords)
+            row["answer"] = answer
+        rows.append(row)
+
+    retrieval = [row["retrieval_ms"] for row in rows]
+    summary = {
+        "retrieval_p50_ms": percentile(retrieval, 50),
+        "retrieval_p95_ms": percentile(retrieval, 95),
+        "hit_rate": mean([None if row["hit"] is None else float(row["hit"]) for row in rows]),
+        "mrr": mean([row["mrr"] for row in rows]),
+        "context_keywords": mean([row["context_keywords"] for row in rows]),
+        "avg_chunks": mean([row["chunks"] for row in rows]),
+        "avg_context_chars": mean([row["context_chars"] for row in rows]),
+    }
+    if with_llm:
+        answers = [row["answer_ms"] for row in rows]
+        summary["answer_p50_ms"] = percentile(answers, 50)
+        summary["answer_p95_ms"] = percentile(answers, 95)
+        summary["answer_keywords"] = mean([row["answer_keywords"] for row in rows])
+    return {"summary": summary, "questions": rows}
+
+
+def print_summary(results: Dict[str, Dict]):
+    metrics = list(next(iter(results.values()))["summary"])
+    print(f"\n{'metrik':<20}" + "".join(f"{mode:>20}" for mode in results))
+    print("-" * (20 + 20 * len(results)))
+    for metric in metrics:
+        cells = []
+        for result in results.values():
+            value = result["summary"].get(metric)
+            cells.append(f"{'-' if value is None else f'{value:.3f}':>20}")
+        print(f"{metric:<20}" + "".join(cells))
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="/sor vektör araması ve yeniden sıralama değerlendirmesi")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS, help="Soru kümesi (JSON)")
+    parser.add_argument("--store", default=settings.vector_store_dir, help="Vektör deposu dizini")
+    parser.add_argument("--candidates", type=int, default=settings.rerank_candidates)
+    parser.add_argument("--top-n", type=int, default=settings.rerank_top_n)
+    parser.add_argument("--batch-size", type=int, default=settings.rerank_batch_size)
+    parser.add_argument("--budget-ms", type=float, default=settings.rerank_budget_ms)
+    parser.add_argument("--model", default=settings.rerank_model, help="Cross-encoder modeli")
+    parser.add_argument("--repeat", type=int, default=3, help="Her soru için bağlam hazırlama tekrarı")
+    parser.add_argument("--with-llm", action="store_true", help="Groq ile uçtan uca yanıtla")
+    parser.add_argument("--json", dest="json_path", help="Sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    with open(args.questions, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    vector_client = VectorClient(index_path=args.store, keep_versions=settings.vector_store_keep_versions)
+    if not vector_client.has_index():
+        print(f"[X] {args.store} içinde indeks yok. Önce `python -m src.indexer` çalıştırın.")
+        return 1
+    groq_client = None
+    if args.with_llm:
+        from src.clients.groq_client import GroqClient
+        groq_client = GroqClient()
+
+    reranker = RerankerClient(model_name=args.model, batch_size=args.batch_size, budget_ms=args.budget_ms)
+    # Model yükleme ve ilk sorgu süresi ölçüme karışmasın
+    vector_client.warm_up()
+    reranker.warm_up()
+
+    modes = {
+        "vektör": KnowledgeService(vector_client, groq_client, qa_collections=settings.qa_collections()),
+        "yeniden sıralama": KnowledgeService(
+            vector_client, groq_client,
+            qa_collections=settings.qa_collections(),
+            reranker=reranker,
+            rerank_candidates=args.candidates,
+            rerank_top_n=args.top_n
+        ),
+    }
+    print(f"[i] {len(questions)} soru, indeks sürümü: {vector_client.version}, aday: {args.candidates}, "
+          f"top-n: {args.top_n}, bütçe: {args.budget_ms:.0f}ms")
+
+    results = {}
+    for mode, service in modes.items():
+        service.retrieve_context(questions[0]["question"])
+        results[mode] = evaluate(service, questions, args.repeat, args.with_llm)
+    print_summary(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n[+] Sonuçlar yazıldı: {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
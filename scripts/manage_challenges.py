@@ -30,26 +30,37 @@ except ImportError:
     print("❌ Error: 'slack_sdk' library is missing. Please install it: pip install slack_sdk")
     sys.exit(1)
 
-from src.core.settings import get_settings
+from src.container import build_container
+from src.commands.pagination import iter_cursor_pages
 
 console = Console()
 
 class ChallengeManager:
-    def __init__(self):
-        self.settings = get_settings()
+    def __init__(self, container=None):
+        # Konteyner servisleri ilk kullanımda oluşturur: Slack client'ı sadece kanal
+        # analizi yapan komutlarda kurulur, Groq/embedding modeli hiç yüklenmez.
+        self.container = container or build_container()
+        self.settings = self.container.settings
         self.db_path = self.settings.database_path
         
         if not os.path.exists(self.db_path):
             console.print(f"[bold red]❌ Database not found at:[/bold red] {self.db_path}")
             sys.exit(1)
             
-        # Slack Client (for channel analysis)
-        self.slack_client = WebClient(token=self.settings.slack_bot_token)
-        self.user_client = WebClient(token=self.settings.slack_user_token) if self.settings.slack_user_token else None
-
         # Şema uyum kontrolü (kritik kolonlar eksikse otomatik ekle)
         self._ensure_schema()
 
+    @property
+    def slack_client(self) -> WebClient:
+        """Slack Client (for channel analysis)"""
+        return self.container.slack_web_client
+
+    @property
+    def user_client(self) -> Optional[WebClient]:
+        if not self.settings.slack_user_token:
+            return None
+        return WebClient(token=self.settings.slack_user_token)
+
     def get_connection(self):
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
@@ -536,8 +547,9 @@ class ChallengeManager:
             created_at = datetime.fromtimestamp(created_ts).isoformat()
             
             # 2. Fetch Members
-            members_resp = self.slack_client.conversations_members(channel=channel_id)
-            members = members_resp.get("members", [])
+            members = list(iter_cursor_pages(
+                self.slack_client.conversations_members, "members", channel=channel_id
+            ))
             bot_id = self.slack_client.auth_test()["user_id"]
             human_members = [m for m in members if m != bot_id]
             
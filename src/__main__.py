@@ -3,15 +3,30 @@ import os
 import time
 import signal
 import atexit
-
-# Kullanıcıya anında geri bildirim ver
-print("\n[INIT] Cemil Bot başlatılıyor...")
-print("[INIT] Gerekli yapay zeka kütüphaneleri (Torch, SciPy, Transformers) yükleniyor. Bu işlem ilk seferde biraz zaman alabilir, lütfen bekleyin...\n")
+import threading
 
 # Proje kök dizinini sys.path'e ekle
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.bot import app, db_client, cron_client, knowledge_service, chat_manager, user_repo, vector_client
+from src.core.startup_profiler import PROFILE_FLAG, is_profile_child, mark_phase, write_profile_output
+
+# Profil modu: bot -X importtime ile bir alt süreçte açılır, bu süreç sadece raporu basar
+if PROFILE_FLAG in sys.argv and not is_profile_child():
+    from src.core.startup_profiler import run_startup_profile
+    sys.exit(run_startup_profile(sys.argv[1:]))
+
+# Kullanıcıya anında geri bildirim ver
+print("\n[INIT] Cemil Bot başlatılıyor...\n")
+
+# Profil alt süreci veritabanlarının geçici kopyalarıyla açılır (şema göçü/temizlik gerçek veriye dokunmaz)
+if is_profile_child():
+    from src.core.settings import get_settings as _get_settings
+    from src.core.startup_profiler import use_database_copies
+    _profile_settings = _get_settings()
+    use_database_copies({"DB_PATH": _profile_settings.database_path, "STATE_DB_PATH": _profile_settings.state_db_path})
+    _get_settings(reload=True)
+
+from src.bot import app, db_client, cron_client, knowledge_service, chat_manager, user_repo, vector_client, voting_service, coffee_service, statistics_service, challenge_evaluation_service, challenge_hub_service, email_outbox_service, leader_elector, state_backend
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 import asyncio
 from src.core.logger import logger
@@ -130,6 +145,66 @@ def ensure_database_schema():
     except Exception as e:
         logger.error(f"[X] Şema kontrolü sırasında hata: {e}", exc_info=True)
 
+def prepare_local_state(settings):
+    """
+    Slack'e bağlanmadan önceki yerel açılış adımları: şema, bellek içi sayaç/havuz/indeksler.
+    (Tablolar DatabaseClient oluşturulurken init_db ile zaten hazırlanır.)
+    """
+    logger.info("[>] Veritabanı kontrol ediliyor...")
+    # Şema güncellemelerini uygula (yeni kolonlar varsa ekle)
+    ensure_database_schema()
+    mark_phase("şema kontrolü")
+    
+    # Açık oylamaların oy sayaçlarını veritabanından yeniden kur
+    voting_service.restore_open_polls()
+    mark_phase("oylama sayaçları")
+    
+    # Kahve bekleme havuzunu geri yükle
+    coffee_service.restore_pool()
+    mark_phase("kahve havuzu")
+    
+    # İstatistik sayaçlarını doğrula (trigger'lar öncesi veriler veya şema göçleri için)
+    statistics_service.reconcile_counters()
+    mark_phase("istatistik sayaçları")
+    
+    # Challenge tablolarını temizle (startup'ta) - Settings'e bağlı
+    if settings.db_clean_on_startup:
+        logger.info("[>] Challenge tabloları TEMİZLENİYOR (Settings gereği)...")
+        deleted_counts = db_client.clean_challenge_tables()
+        if deleted_counts:
+            total = sum(deleted_counts.values())
+            print(f"[+] Challenge tabloları temizlendi: {total} kayıt silindi")
+        else:
+            print("[i] Challenge tabloları zaten temizdi.")
+    else:
+        logger.info("[i] Challenge tabloları temizlenmedi (Settings: False).")
+    
+    # Challenge kanalı yetkili üye indeksini kur (katılma olayları bellekten yanıtlanır)
+    challenge_hub_service.load_channel_index()
+    mark_phase("challenge kanal indeksi")
+
+
+def profile_startup():
+    """Profil alt süreci: yerel açılış adımlarını çalıştırır, süreleri yazar ve çıkar."""
+    from src.core.lazy import lazy_load_times
+    load_dotenv()
+    settings = get_settings(reload=True)
+    prepare_local_state(settings)
+    write_profile_output({"lazy": lazy_load_times()})
+
+
+def start_background_reindex(settings):
+    """Bilgi küpünü ayrı bir indeksleyici sürecinde yeniden oluşturur (açılışı bekletmez)."""
+    def reindex():
+        result = knowledge_service.reindex_in_worker(timeout=settings.indexer_timeout)
+        if result["success"]:
+            logger.info(f"[+] Vektör veritabanı güncellendi (sürüm: {result['version']}).")
+        else:
+            logger.warning(f"[!] Vektör veritabanı güncellenemedi: {result['message']}")
+
+    threading.Thread(target=reindex, name="kb-reindex", daemon=True).start()
+
+
 # Non-interactive mod (CI / prod deploy) için flag
 NON_INTERACTIVE = os.environ.get("CEMIL_NON_INTERACTIVE") == "1"
 
@@ -179,7 +254,34 @@ def graceful_shutdown(signum=None, frame=None):
         except Exception as e:
             logger.warning(f"[!] Zamanlayıcılar durdurulurken hata: {e}")
         
-        # 3. Veritabanı bağlantılarını kapat (SQLite otomatik kapanır ama yine de kontrol edelim)
+        # 3. Liderliği bırak (diğer süreç kira dolmadan devralır) ve durum deposunu kapat
+        try:
+            leader_elector.stop()
+            state_backend.close()
+        except Exception as e:
+            logger.warning(f"[!] Durum deposu kapatılırken hata: {e}")
+        
+        # 4. Bekleyen oyları veritabanına yaz
+        try:
+            voting_service.shutdown()
+            logger.info("[+] Bekleyen oylar kaydedildi.")
+        except Exception as e:
+            logger.warning(f"[!] Bekleyen oylar kaydedilirken hata: {e}")
+        
+        # 5. Bekleyen challenge canvas güncellemesini yayınla
+        try:
+            challenge_evaluation_service.shutdown()
+        except Exception as e:
+            logger.warning(f"[!] Canvas güncellemesi yayınlanırken hata: {e}")
+        
+        # 6. Zamanı gelmiş e-postaları gönder ve SMTP oturumunu kapat
+        try:
+            email_outbox_service.shutdown()
+            logger.info("[+] E-posta kuyruğu durduruldu.")
+        except Exception as e:
+            logger.warning(f"[!] E-posta kuyruğu durdurulurken hata: {e}")
+        
+        # 7. Veritabanı bağlantılarını kapat (SQLite otomatik kapanır ama yine de kontrol edelim)
         logger.info("[>] Veritabanı bağlantıları kapatılıyor...")
         # SQLite connection'lar context manager ile otomatik kapanır
         logger.info("[+] Veritabanı bağlantıları temizlendi.")
@@ -220,24 +322,16 @@ def main():
     print("           CEMIL BOT - HIZLI BAŞLATMA (PROD)")
     print("="*60 + "\n")
 
-    # 1. Veritabanı
-    logger.info("[>] Veritabanı kontrol ediliyor...")
-    db_client.init_db()
+    # 1. Veritabanı ve süreç içi durum
+    prepare_local_state(settings)
     
-    # Şema güncellemelerini uygula (yeni kolonlar varsa ekle)
-    ensure_database_schema()
+    # Yarıda kalan challenge başlatmalarını kaldıkları adımdan sürdür
+    pending_starts = challenge_hub_service.resume_pending_starts()
+    if pending_starts:
+        logger.info(f"[i] {pending_starts} yarıda kalan challenge başlatması devam ettirilecek.")
     
-    # Challenge tablolarını temizle (startup'ta) - Settings'e bağlı
-    if settings.db_clean_on_startup:
-        logger.info("[>] Challenge tabloları TEMİZLENİYOR (Settings gereği)...")
-        deleted_counts = db_client.clean_challenge_tables()
-        if deleted_counts:
-            total = sum(deleted_counts.values())
-            print(f"[+] Challenge tabloları temizlendi: {total} kayıt silindi")
-        else:
-            print("[i] Challenge tabloları zaten temizdi.")
-    else:
-        logger.info("[i] Challenge tabloları temizlenmedi (Settings: False).")
+    # E-posta kuyruğu worker'ı (önceki çalışmadan kalan e-postalar da gönderilir)
+    email_outbox_service.start()
     
     # --- CSV Veri İçe Aktarma Kontrolü ---
     # Klasörlerin varlığını kontrol et
@@ -270,31 +364,30 @@ def main():
             print("Hata oluştu, logları kontrol edin.")
     # -------------------------------------
 
-    # 2. Cron
+    # 2. Cron (periyodik görevler sadece lider süreçte çalışır)
     logger.info("[>] Zamanlayıcılar başlatılıyor...")
+    leader_elector.start()
     cron_client.start()
 
     # 3. Vektör Veritabanı Kontrolü
-    vector_index_exists = os.path.exists(settings.vector_store_path) and os.path.exists(settings.vector_store_pkl_path)
-    
-    if vector_index_exists:
+    # İndeksleme ayrı süreçte (python -m src.indexer) arka planda yapılır; bot beklemeden açılır
+    # ve indeksleyici bitince yeni sürüme geçer.
+    if vector_client.has_index():
         # Mevcut veriler var
-        print(f"\n[?] Vektör veritabanı bulundu (mevcut veriler: {len(vector_client.documents) if vector_client.documents else 0} parça).")
+        print(f"\n[?] Vektör veritabanı bulundu (mevcut veriler: {len(vector_client.documents)} parça).")
         
         if settings.kb_rebuild_index:
-            print("[i] Vektör veritabanı yeniden oluşturuluyor (Settings gereği)...")
+            print("[i] Vektör veritabanı arka planda yeniden oluşturuluyor (Settings gereği)...")
             logger.info("[>] Bilgi Küpü indeksleniyor...")
-            asyncio.run(knowledge_service.process_knowledge_base())
-            print("[+] Vektör veritabanı başarıyla güncellendi.")
+            start_background_reindex(settings)
         else:
             print("[i] Mevcut vektör veritabanı kullanılıyor.")
             logger.info("[i] Mevcut vektör veritabanı yüklendi.")
     else:
         # Vektör veritabanı yok, oluştur
-        print(f"\n[i] Vektör veritabanı bulunamadı. Oluşturuluyor...")
+        print(f"\n[i] Vektör veritabanı bulunamadı. Arka planda oluşturuluyor...")
         logger.info("[>] Bilgi Küpü indeksleniyor...")
-        asyncio.run(knowledge_service.process_knowledge_base())
-        print("[+] Vektör veritabanı başarıyla oluşturuldu.")
+        start_background_reindex(settings)
 
     # 4. Slack
     if not settings.slack_app_token:
@@ -544,6 +637,11 @@ def main():
     logger.info("[>] Slack Socket Mode handler başlatılıyor...")
     print("[i] Slack bağlantısı kuruluyor...")
     
+    # Embedding modelini arka planda yükle (açılışı bekletmez, ilk /sor hazır bulur)
+    threading.Thread(target=vector_client.warm_up, name="vector-warm-up", daemon=True).start()
+    if knowledge_service.reranker is not None:
+        threading.Thread(target=knowledge_service.reranker.warm_up, name="reranker-warm-up", daemon=True).start()
+    
     handler = SocketModeHandler(app, settings.slack_app_token)
     
     try:
@@ -562,4 +660,7 @@ def main():
         graceful_shutdown()
 
 if __name__ == "__main__":
-    main()
+    if is_profile_child():
+        profile_startup()
+    else:
+        main()
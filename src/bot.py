@@ -7,59 +7,13 @@ Ana bot dosyası: Tüm servislerin entegrasyonu ve slash komutları
 import os
 import asyncio
 from dotenv import load_dotenv
-from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
-from slack_sdk import WebClient
 
-# --- Core & Clients ---
+# --- Core ---
 from src.core.logger import logger
 from src.core.settings import get_settings
-from src.clients import (
-    DatabaseClient,
-    GroqClient,
-    CronClient,
-    VectorClient,
-    SMTPClient
-)
-
-# --- Commands (Slack API Wrappers) ---
-from src.commands import (
-    ChatManager,
-    ConversationManager,
-    UserManager,
-    CanvasManager
-)
-
-# --- Repositories ---
-from src.repositories import (
-    UserRepository,
-    MatchRepository,
-    PollRepository,
-    VoteRepository,
-    FeedbackRepository,
-    HelpRepository,
-    ChallengeHubRepository,
-    ChallengeParticipantRepository,
-    ChallengeProjectRepository,
-    ChallengeSubmissionRepository,
-    ChallengeThemeRepository,
-    UserChallengeStatsRepository,
-    ChallengeEvaluationRepository,
-    ChallengeEvaluatorRepository
-)
-
-# --- Services ---
-from src.services import (
-    CoffeeMatchService,
-    VotingService,
-    FeedbackService,
-    KnowledgeService,
-    HelpService,
-    StatisticsService,
-    ChallengeEnhancementService,
-    ChallengeHubService,
-    ChallengeEvaluationService
-)
+from src.core.startup_profiler import mark_phase
+from src.container import build_container
 
 # --- Handlers ---
 from src.handlers import (
@@ -78,6 +32,7 @@ from src.handlers import (
 
 # Non-interactive mod (CI / prod deploy) için flag
 NON_INTERACTIVE = os.environ.get("CEMIL_NON_INTERACTIVE") == "1"
+mark_phase("import'lar")
 
 # ============================================================================
 # KONFIGÜRASYON
@@ -90,104 +45,91 @@ settings = get_settings()
 if not settings.slack_bot_token:
     raise ValueError("SLACK_BOT_TOKEN environment variable is required!")
 
-app = App(token=settings.slack_bot_token)
+# Bağımlılık grafiği (src/container.py). Bot tüm grafiği kullanır; CLI ve worker'lar
+# build_container() ile sadece ihtiyaç duydukları servisleri oluşturur.
+container = build_container(settings)
+app = container.app
+mark_phase("ayarlar + slack app")
 
 # ============================================================================
 # CLIENT İLKLENDİRME (Singleton Pattern)
 # ============================================================================
 
 logger.info("[i] Client'lar ilklendiriliyor...")
-db_client = DatabaseClient(db_path=settings.database_path)
-groq_client = GroqClient()
-cron_client = CronClient()
-vector_client = VectorClient()
-smtp_client = SMTPClient()
-logger.info("[+] Client'lar hazır.")
+db_client = container.db_client
+groq_client = container.groq_client
+cron_client = container.cron_client
+vector_client = container.vector_client
+smtp_client = container.smtp_client
+state_backend = container.state_backend
+leader_elector = container.leader_elector
+logger.info(f"[+] Client'lar hazır. (Durum deposu: {settings.state_backend})")
+mark_phase("client'lar")
 
 # ============================================================================
 # COMMAND MANAGER İLKLENDİRME
 # ============================================================================
 
 logger.info("[i] Command Manager'lar ilklendiriliyor...")
-
-# User token varsa kanal oluşturma ve erişim için kullan
-user_client = None
-if settings.slack_user_token:
-    user_client = WebClient(token=settings.slack_user_token)
+slack_rate_limiter = container.slack_rate_limiter
+bot_client = container.bot_client
+user_client = container.user_client
+if user_client is not None:
     logger.info("[i] User token bulundu - kanal oluşturma ve erişim işlemleri için kullanılacak")
 else:
     logger.warning("[!] User token bulunamadı - workspace kısıtlamaları kanal oluşturmayı engelleyebilir")
 
-chat_manager = ChatManager(app.client, user_client=user_client)
-conv_manager = ConversationManager(app.client, user_client=user_client)
-user_manager = UserManager(app.client)
-canvas_manager = CanvasManager(app.client)
+chat_manager = container.chat_manager
+conv_manager = container.conv_manager
+user_manager = container.user_manager
+canvas_manager = container.canvas_manager
+dm_manager = container.dm_manager
 logger.info("[+] Command Manager'lar hazır.")
+mark_phase("command manager'lar")
 
 # ============================================================================
 # REPOSITORY İLKLENDİRME
 # ============================================================================
 
 logger.info("[i] Repository'ler ilklendiriliyor...")
-user_repo = UserRepository(db_client)
-match_repo = MatchRepository(db_client)
-poll_repo = PollRepository(db_client)
-vote_repo = VoteRepository(db_client)
-feedback_repo = FeedbackRepository(db_client)
-help_repo = HelpRepository(db_client)
-challenge_hub_repo = ChallengeHubRepository(db_client)
-challenge_participant_repo = ChallengeParticipantRepository(db_client)
-challenge_project_repo = ChallengeProjectRepository(db_client)
-challenge_submission_repo = ChallengeSubmissionRepository(db_client)
-challenge_theme_repo = ChallengeThemeRepository(db_client)
-user_challenge_stats_repo = UserChallengeStatsRepository(db_client)
-challenge_evaluation_repo = ChallengeEvaluationRepository(db_client)
-challenge_evaluator_repo = ChallengeEvaluatorRepository(db_client)
+user_repo = container.user_repo
+match_repo = container.match_repo
+coffee_pool_repo = container.coffee_pool_repo
+poll_repo = container.poll_repo
+vote_repo = container.vote_repo
+feedback_repo = container.feedback_repo
+email_outbox_repo = container.email_outbox_repo
+help_repo = container.help_repo
+challenge_hub_repo = container.challenge_hub_repo
+challenge_start_repo = container.challenge_start_repo
+challenge_participant_repo = container.challenge_participant_repo
+challenge_project_repo = container.challenge_project_repo
+challenge_submission_repo = container.challenge_submission_repo
+challenge_theme_repo = container.challenge_theme_repo
+user_challenge_stats_repo = container.user_challenge_stats_repo
+challenge_evaluation_repo = container.challenge_evaluation_repo
+challenge_evaluator_repo = container.challenge_evaluator_repo
+stats_repo = container.stats_repo
 logger.info("[+] Repository'ler hazır.")
+mark_phase("repository'ler")
 
 # ============================================================================
 # SERVİS İLKLENDİRME
 # ============================================================================
 
 logger.info("[i] Servisler ilklendiriliyor...")
-coffee_service = CoffeeMatchService(
-    chat_manager, conv_manager, groq_client, cron_client, match_repo
-)
-voting_service = VotingService(
-    chat_manager, poll_repo, vote_repo, cron_client
-)
-feedback_service = FeedbackService(
-    chat_manager, smtp_client, feedback_repo
-)
-knowledge_service = KnowledgeService(
-    vector_client, groq_client
-)
-help_service = HelpService(
-    chat_manager, conv_manager, user_manager, help_repo, user_repo, groq_client, cron_client
-)
-statistics_service = StatisticsService(
-    user_repo, match_repo, help_repo, feedback_repo, poll_repo, vote_repo
-)
-challenge_enhancement_service = ChallengeEnhancementService(
-    groq_client, knowledge_service
-)
-challenge_evaluation_service = ChallengeEvaluationService(
-    chat_manager, conv_manager,
-    challenge_evaluation_repo, challenge_evaluator_repo,
-    challenge_hub_repo, challenge_participant_repo,
-    user_challenge_stats_repo, cron_client,
-    canvas_manager, user_manager
-)
-challenge_hub_service = ChallengeHubService(
-    chat_manager, conv_manager, user_manager,
-    challenge_hub_repo, challenge_participant_repo,
-    challenge_project_repo, challenge_submission_repo,
-    challenge_theme_repo, user_challenge_stats_repo,
-    challenge_enhancement_service, groq_client, cron_client,
-    db_client=db_client,
-    evaluation_service=challenge_evaluation_service
-)
+coffee_service = container.coffee_service
+voting_service = container.voting_service
+email_outbox_service = container.email_outbox_service
+feedback_service = container.feedback_service
+knowledge_service = container.knowledge_service
+help_service = container.help_service
+statistics_service = container.statistics_service
+challenge_enhancement_service = container.challenge_enhancement_service
+challenge_evaluation_service = container.challenge_evaluation_service
+challenge_hub_service = container.challenge_hub_service
 logger.info("[+] Servisler hazır.")
+mark_phase("servisler")
 
 # ============================================================================
 # HANDLER KAYITLARI
@@ -200,27 +142,42 @@ setup_poll_handlers(app, voting_service, chat_manager, user_repo)
 setup_feedback_handlers(app, feedback_service, chat_manager, user_repo)
 setup_knowledge_handlers(app, knowledge_service, chat_manager, user_repo)
 setup_profile_handlers(app, chat_manager, user_repo)
-setup_health_handlers(app, chat_manager, db_client, groq_client, vector_client)
+setup_health_handlers(app, chat_manager, db_client, groq_client, vector_client, slack_rate_limiter)
 setup_help_handlers(app, help_service, chat_manager, user_repo)
-setup_statistics_handlers(app, statistics_service, chat_manager, user_repo)
+setup_statistics_handlers(app, statistics_service, chat_manager, user_repo, challenge_evaluation_repo)
 setup_challenge_handlers(app, challenge_hub_service, challenge_evaluation_service, chat_manager, user_repo)
 setup_challenge_evaluation_handlers(app, challenge_evaluation_service, challenge_hub_service, chat_manager, user_repo)
 logger.info("[+] Handler'lar kaydedildi.")
+mark_phase("handler'lar")
 
 # ============================================================================
 # PERİYODİK GÖREVLER (Challenge Kanalı Yetkisiz Kullanıcı Kontrolü)
 # ============================================================================
 
-# Challenge kanallarını periyodik olarak kontrol et (her 1 dakikada bir)
+# Challenge kanallarını uzlaştır (her 30 dakikada bir). Yetkisiz katılımlar anında
+# member_joined_channel olayıyla yakalanır; bu görev sadece kaçırılan olaylar içindir.
+try:
+    cron_client.add_cron_job(
+        func=challenge_hub_service.reconcile_challenge_channels,
+        cron_expression={"minute": "*/30"},
+        job_id="reconcile_challenge_channels"
+    )
+    logger.info("[+] Challenge kanalları uzlaştırması başlatıldı (her 30 dakikada bir)")
+except Exception as e:
+    logger.warning(f"[!] Challenge kanalları uzlaştırması başlatılamadı: {e}")
+
+# Kanal indeksi süreç içidir: her replika kendi indeksini yeniler (her dakika), böylece
+# member_joined_channel hangi replikaya gelirse gelsin yeni kanal ve üyeleri bilinir.
 try:
     cron_client.add_cron_job(
-        func=challenge_hub_service.monitor_challenge_channels,
-        cron_expression={"minute": "*/1"},  # Her 1 dakikada bir
-        job_id="monitor_challenge_channels"
+        func=challenge_hub_service.refresh_channel_index,
+        cron_expression={"minute": "*"},
+        job_id="refresh_channel_index",
+        leader_only=False
     )
-    logger.info("[+] Challenge kanalları periyodik kontrolü başlatıldı (her 1 dakikada bir)")
+    logger.info("[+] Challenge kanal indeksi yenilemesi başlatıldı (her dakika)")
 except Exception as e:
-    logger.warning(f"[!] Challenge kanalları periyodik kontrolü başlatılamadı: {e}")
+    logger.warning(f"[!] Challenge kanal indeksi yenilemesi başlatılamadı: {e}")
 
 # Değerlendirmeleri periyodik olarak kontrol et (her 1 saatte bir)
 def check_pending_evaluations():
@@ -254,6 +211,41 @@ try:
 except Exception as e:
     logger.warning(f"[!] Challenge recruitment zaman aşımı kontrolü başlatılamadı: {e}")
 
+# İstatistik sayaçlarını gerçek sayımlarla uzlaştır (her gün 04:00'te)
+try:
+    cron_client.add_cron_job(
+        func=statistics_service.reconcile_counters,
+        cron_expression={"hour": "4", "minute": "0"},
+        job_id="reconcile_stats_counters"
+    )
+    logger.info("[+] İstatistik sayaç uzlaştırması başlatıldı (her gün 04:00)")
+except Exception as e:
+    logger.warning(f"[!] İstatistik sayaç uzlaştırması başlatılamadı: {e}")
+
+# Kahve havuzu zaman aşımı taraması (kullanıcı başına görev yerine tek görev, her 15 saniyede bir)
+try:
+    cron_client.add_cron_job(
+        func=coffee_service.sweep_pool,
+        cron_expression={"second": "*/15"},
+        job_id="coffee_pool_sweep"
+    )
+    logger.info("[+] Kahve havuzu zaman aşımı taraması başlatıldı (her 15 saniyede bir)")
+except Exception as e:
+    logger.warning(f"[!] Kahve havuzu taraması başlatılamadı: {e}")
+
+# Ayrı süreçteki indeksleyicinin yayınladığı yeni vektör indeksi sürümüne geç. Her süreç kendi
+# kopyasını yüklediği için lider dışındaki süreçlerde de çalışır.
+try:
+    cron_client.add_cron_job(
+        func=vector_client.reload_if_changed,
+        cron_expression={"second": f"*/{settings.vector_reload_interval}"},
+        job_id="vector_index_reload",
+        leader_only=False
+    )
+    logger.info(f"[+] Vektör indeksi sürüm kontrolü başlatıldı (her {settings.vector_reload_interval} saniyede bir)")
+except Exception as e:
+    logger.warning(f"[!] Vektör indeksi sürüm kontrolü başlatılamadı: {e}")
+
 # ============================================================================
 # EVENT HANDLERS (Challenge Kanalı Yetkisiz Kullanıcı Kontrolü)
 # ============================================================================
@@ -281,8 +273,8 @@ def handle_member_joined_channel(event, client):
             action = result.get('action')
             logger.info(f"[!] Yetkisiz kullanıcı tespit edildi: {user_id} | Kanal: {channel_id} | Aksiyon: {action}")
             
-            if action == "removed":
-                logger.info(f"[+] Yetkisiz kullanıcı başarıyla çıkarıldı: {user_id}")
+            if action == "queued":
+                logger.info(f"[i] Yetkisiz kullanıcı çıkarma kuyruğuna eklendi: {user_id}")
             elif action == "failed_to_remove":
                 logger.error(f"[X] Yetkisiz kullanıcı çıkarılamadı: {user_id} | Kanal: {channel_id}")
             elif action == "error":
@@ -323,5 +315,7 @@ def global_error_handler(error, body, logger):
 # BOT BAŞLATMA
 # ============================================================================
 
+mark_phase("cron görevleri + event'ler")
+
 # src/bot.py dosyasındaki ana bot nesnesi ve handlerlar hazır.
 # Başlatma işlemi src/__main__.py üzerinden gerçekleştirilir.
@@ -1,13 +1,23 @@
-from .database_client import DatabaseClient
-from .groq_client import GroqClient
-from .cron_client import CronClient
-from .smpt_client import SMTPClient
-from .vector_client import VectorClient
+# Client'lar ilk erişimde import edilir: sadece veritabanı kullanan bir CLI/worker
+# Groq, faiss veya sentence_transformers modüllerini yüklemez (bkz. src.core.lazy.lazy_exports).
+from src.core.lazy import lazy_exports
 
-__all__ = [
-    "DatabaseClient",
-    "GroqClient",
-    "CronClient",
-    "SMTPClient",
-    "VectorClient",
-]
+_EXPORTS = {
+    "DatabaseClient": ".database_client",
+    "GroqClient": ".groq_client",
+    "CronClient": ".cron_client",
+    "SMTPClient": ".smpt_client",
+    "VectorClient": ".vector_client",
+    "RerankerClient": ".reranker_client",
+    "StateBackend": ".state_backend",
+    "MemoryStateBackend": ".state_backend",
+    "SQLiteStateBackend": ".state_backend",
+    "RedisStateBackend": ".state_backend",
+    "LeaderElector": ".state_backend",
+    "create_state_backend": ".state_backend",
+    "configure_state_backend": ".state_backend",
+    "get_state_backend": ".state_backend",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
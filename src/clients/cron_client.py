@@ -1,12 +1,20 @@
 import logging
 import asyncio
+import functools
 from datetime import datetime, timedelta
-from typing import Callable, List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, TYPE_CHECKING
 from apscheduler.schedulers.background import BackgroundScheduler
 from src.core.logger import logger
 from src.core.exceptions import CemilBotError
 from src.core.singleton import SingletonMeta
 
+if TYPE_CHECKING:
+    from src.clients.state_backend import LeaderElector, StateBackend
+
+# Tek seferlik görevin birden fazla süreçte çalışmasını önleyen işaretin ömrü (saniye)
+ONCE_JOB_CLAIM_TTL = 600
+
+
 class CronClient(metaclass=SingletonMeta):
     """
     Cemil Bot için merkezi zamanlanmış görev (Cron) yönetim sınıfı.
@@ -17,6 +25,48 @@ class CronClient(metaclass=SingletonMeta):
     def __init__(self):
         self.scheduler = BackgroundScheduler()
         self._is_running = False
+        # Birden fazla süreç çalışırken koordinasyon (enable_coordination ile ayarlanır)
+        self.leader: Optional["LeaderElector"] = None
+        self.state_backend: Optional["StateBackend"] = None
+
+    def enable_coordination(self, state_backend: "StateBackend", leader: "LeaderElector"):
+        """
+        Çoklu süreç modunu açar: periyodik görevler sadece lider süreçte çalışır,
+        tek seferlik görevler aynı job_id için yalnızca bir süreçte çalışır.
+        """
+        self.state_backend = state_backend
+        self.leader = leader
+
+    def _leader_only(self, func: Callable, job_id: Optional[str]) -> Callable:
+        """Görevi çalışma anında lider kontrolüyle sarmalar."""
+        @functools.wraps(func)
+        def wrapper(*a, **k):
+            if self.leader is not None and not self.leader.is_leader:
+                logger.debug(f"[i] Cron görevi atlandı (lider değil): {job_id}")
+                return None
+            return func(*a, **k)
+        return wrapper
+
+    def _run_once_cluster_wide(self, func: Callable, job_id: Optional[str], run_date: datetime) -> Callable:
+        """
+        Aynı tek seferlik görevi (aynı job_id ve çalışma zamanı) planlamış süreçlerden yalnızca
+        ilki çalıştırır. Aynı job_id'nin başka bir zamana yeniden planlanması (örn. tekrar deneme)
+        ayrı bir çalıştırmadır.
+        """
+        claim_key = f"once-job:{job_id}:{run_date.isoformat()}"
+
+        @functools.wraps(func)
+        def wrapper(*a, **k):
+            backend = self.state_backend
+            if job_id and backend is not None and backend.is_shared:
+                try:
+                    if backend.incr(claim_key, ttl=ONCE_JOB_CLAIM_TTL) != 1:
+                        logger.info(f"[i] Görev başka bir süreçte çalıştırıldı, atlanıyor: {job_id}")
+                        return None
+                except Exception as e:
+                    logger.warning(f"[!] Görev sahipliği alınamadı, yine de çalıştırılıyor: {job_id} | {e}")
+            return func(*a, **k)
+        return wrapper
 
     def start(self):
         """Zamanlayıcıyı başlatır."""
@@ -43,12 +93,15 @@ class CronClient(metaclass=SingletonMeta):
             return wrapper, args
         return func, args
 
-    def add_cron_job(self, func: Callable, cron_expression: Dict[str, Any], job_id: Optional[str] = None, args: Optional[List] = None) -> str:
+    def add_cron_job(self, func: Callable, cron_expression: Dict[str, Any], job_id: Optional[str] = None, args: Optional[List] = None, leader_only: bool = True) -> str:
         """
         Düzenli bir cron görevi ekler.
+        `leader_only` ise (varsayılan) çoklu süreç modunda görev sadece lider süreçte çalışır.
         """
         try:
             wrapped_func, wrapped_args = self._wrap_async(func, args or [])
+            if leader_only:
+                wrapped_func = self._leader_only(wrapped_func, job_id)
             
             job = self.scheduler.add_job(
                 wrapped_func,
@@ -75,6 +128,7 @@ class CronClient(metaclass=SingletonMeta):
 
         try:
             wrapped_func, wrapped_args = self._wrap_async(func, args or [])
+            wrapped_func = self._run_once_cluster_wide(wrapped_func, job_id, run_date)
 
             job = self.scheduler.add_job(
                 wrapped_func,
@@ -6,6 +6,18 @@ from src.core.logger import logger
 from src.core.exceptions import DatabaseError
 from src.core.singleton import SingletonMeta
 
+# Trigger'larla güncel tutulan istatistik sayaçları: (kapsam, tablo, gruplama kolonu)
+# Kolon None ise tablonun toplam kayıt sayısı tutulur.
+STATS_COUNTER_SPECS = [
+    ("users", "users", "cohort"),
+    ("matches", "matches", "status"),
+    ("help_requests", "help_requests", "status"),
+    ("feedbacks", "feedbacks", "category"),
+    ("polls", "polls", "is_closed"),
+    ("votes", "votes", None),
+    ("poll_votes", "votes", "poll_id"),
+]
+
 class DatabaseClient(metaclass=SingletonMeta):
     """
     Cemil Bot için merkezi veritabanı yönetim sınıfı.
@@ -169,11 +181,14 @@ class DatabaseClient(metaclass=SingletonMeta):
                     logger.warning(f"[!] Akademi admin kullanıcısı seed edilirken hata: {admin_seed_error}")
 
                 # Eşleşme Takip Tablosu (Matches)
-                # Mevcut şemada foreign key'ler users(id)'ye bağlıydı, ancak uygulama Slack ID kullanıyor.
-                # Foreign key hatalarını önlemek için tabloyu yeniden oluşturup users(slack_id)'ye bağlarız.
-                cursor.execute("DROP TABLE IF EXISTS matches")
+                # Eski şemada foreign key'ler users(id)'ye bağlıydı, ancak uygulama Slack ID kullanıyor.
+                # Sadece eski şema tespit edilirse tablo yeniden oluşturulur; eşleşme geçmişi
+                # (tekrar eden eşleşmeleri önlemek için) yeniden başlatmada korunur.
+                if self._has_legacy_user_fk(cursor, "matches"):
+                    logger.info("[i] matches tablosu users(slack_id) foreign key'lerine taşınıyor...")
+                    cursor.execute("DROP TABLE IF EXISTS matches")
                 cursor.execute("""
-                    CREATE TABLE matches (
+                    CREATE TABLE IF NOT EXISTS matches (
                         id TEXT PRIMARY KEY,
                         channel_id TEXT,
                         coffee_channel_id TEXT,
@@ -188,6 +203,17 @@ class DatabaseClient(metaclass=SingletonMeta):
                     )
                 """)
 
+                # Kahve Bekleme Havuzu (Coffee Pool) - yeniden başlatmada havuz kaybolmasın
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS coffee_pool (
+                        user_id TEXT PRIMARY KEY,
+                        channel_id TEXT,
+                        user_name TEXT,
+                        expires_at REAL NOT NULL, -- Unix zaman damgası
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
                 # Oylama Başlıkları Tablosu (Polls)
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS polls (
@@ -216,11 +242,14 @@ class DatabaseClient(metaclass=SingletonMeta):
                     logger.info("[i] polls tablosuna message_channel kolonu eklendi.")
 
                 # Oylar Tablosu (Votes) - User & Poll Ara Tablo
-                # Mevcut şemada foreign key users(id)'ye bağlıydı, ancak uygulama Slack ID kullanıyor.
-                # Foreign key hatalarını önlemek için tabloyu yeniden oluşturup users(slack_id)'ye bağlarız.
-                cursor.execute("DROP TABLE IF EXISTS votes")
+                # Eski şemada foreign key users(id)'ye bağlıydı, ancak uygulama Slack ID kullanıyor.
+                # Sadece eski şema tespit edilirse tablo yeniden oluşturulur; açık oylamaların
+                # oyları yeniden başlatmada korunur (oy sayacı açılışta bu tablodan yüklenir).
+                if self._has_legacy_user_fk(cursor, "votes"):
+                    logger.info("[i] votes tablosu users(slack_id) foreign key'ine taşınıyor...")
+                    cursor.execute("DROP TABLE IF EXISTS votes")
                 cursor.execute("""
-                    CREATE TABLE votes (
+                    CREATE TABLE IF NOT EXISTS votes (
                         id TEXT PRIMARY KEY,
                         poll_id TEXT,
                         user_id TEXT,
@@ -242,6 +271,23 @@ class DatabaseClient(metaclass=SingletonMeta):
                     )
                 """)
                 
+                # E-posta Giden Kutusu (arka plan worker'ı tarafından gönderilir)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS email_outbox (
+                        id TEXT PRIMARY KEY,
+                        recipients TEXT NOT NULL, -- JSON: alıcı adresleri
+                        subject TEXT NOT NULL,
+                        body TEXT NOT NULL,
+                        is_html INTEGER DEFAULT 0,
+                        status TEXT DEFAULT 'pending', -- pending, sent, failed
+                        attempts INTEGER DEFAULT 0,
+                        next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_error TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        sent_at TIMESTAMP
+                    )
+                """)
+                
                 # Yardım İstekleri Tablosu (Help Requests)
                 # Mevcut şemada foreign key'ler users(id)'ye bağlıydı, ancak uygulama Slack ID kullanıyor.
                 # Foreign key hatalarını önlemek için tabloyu yeniden oluşturup users(slack_id)'ye bağlarız.
@@ -444,6 +490,20 @@ class DatabaseClient(metaclass=SingletonMeta):
                     )
                 """)
                 
+                # Challenge Başlatma Adımları (yarıda kalan başlatmalar yeniden açılışta devam eder)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS challenge_start_runs (
+                        challenge_hub_id TEXT PRIMARY KEY,
+                        step TEXT NOT NULL, -- sıradaki adım
+                        state TEXT, -- JSON: tamamlanan adımların çıktıları (kanal ID, proje vb.)
+                        attempts INTEGER DEFAULT 0,
+                        last_error TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (challenge_hub_id) REFERENCES challenge_hubs(id) ON DELETE CASCADE
+                    )
+                """)
+                
                 # User Challenge Stats (Kullanıcı İstatistikleri)
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS user_challenge_stats (
@@ -467,6 +527,10 @@ class DatabaseClient(metaclass=SingletonMeta):
                 self._create_indexes(cursor)
                 conn.commit()
                 
+                # İstatistik sayaçları (tablolara yazıldıkça trigger'larla güncellenir)
+                self._create_stats_counters(cursor)
+                conn.commit()
+                
                 # Seed data: Temalar ve Projeler
                 self._seed_challenge_data(cursor)
                 conn.commit()
@@ -1360,6 +1424,59 @@ class DatabaseClient(metaclass=SingletonMeta):
         except Exception as e:
             logger.warning(f"[!] Challenge seed data eklenirken hata: {e}")
     
+    def _has_legacy_user_fk(self, cursor, table_name: str) -> bool:
+        """Tablonun users(id)'ye bağlı eski bir foreign key'i olup olmadığını kontrol eder."""
+        cursor.execute(f"PRAGMA foreign_key_list({table_name})")
+        for fk in cursor.fetchall():
+            if fk["table"] == "users" and fk["to"] == "id":
+                return True
+        return False
+
+    def _create_stats_counters(self, cursor):
+        """
+        stats_counters tablosunu ve onu güncel tutan trigger'ları oluşturur.
+        Her INSERT/DELETE (ve gruplama kolonu değişen UPDATE) ilgili sayacı artırır/azaltır;
+        böylece admin istatistikleri tablolar taranmadan okunabilir.
+        """
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS stats_counters (
+                    scope TEXT NOT NULL,
+                    bucket TEXT NOT NULL, -- NULL gruplar '' olarak tutulur
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (scope, bucket)
+                )
+            """)
+
+            def bucket(row: str, column: Optional[str]) -> str:
+                return f"COALESCE(CAST({row}.{column} AS TEXT), '')" if column else "''"
+
+            def change(scope: str, bucket_expr: str, delta: str) -> str:
+                return (
+                    f"INSERT INTO stats_counters (scope, bucket, count) VALUES ('{scope}', {bucket_expr}, {delta}) "
+                    f"ON CONFLICT(scope, bucket) DO UPDATE SET count = count + ({delta});"
+                )
+
+            for scope, table, column in STATS_COUNTER_SPECS:
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS stats_{scope}_insert AFTER INSERT ON {table} "
+                    f"BEGIN {change(scope, bucket('NEW', column), '1')} END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS stats_{scope}_delete AFTER DELETE ON {table} "
+                    f"BEGIN {change(scope, bucket('OLD', column), '-1')} END"
+                )
+                if column:
+                    cursor.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS stats_{scope}_update AFTER UPDATE OF {column} ON {table} "
+                        f"WHEN OLD.{column} IS NOT NEW.{column} "
+                        f"BEGIN {change(scope, bucket('OLD', column), '-1')} "
+                        f"{change(scope, bucket('NEW', column), '1')} END"
+                    )
+            logger.debug("[i] İstatistik sayaçları ve trigger'ları kontrol edildi.")
+        except sqlite3.Error as e:
+            logger.warning(f"[!] İstatistik sayaçları oluşturulamadı: {e}")
+
     def _create_indexes(self, cursor):
         """Performans için index'leri oluşturur."""
         try:
@@ -1372,6 +1489,7 @@ class DatabaseClient(metaclass=SingletonMeta):
                 ("idx_challenge_submissions_hub", "challenge_submissions", "challenge_hub_id"),
                 ("idx_challenge_evaluations_hub", "challenge_evaluations", "challenge_hub_id"),
                 ("idx_challenge_evaluations_status", "challenge_evaluations", "status"),
+                ("idx_challenge_evaluations_result", "challenge_evaluations", "final_result"),
                 ("idx_challenge_evaluators_evaluation", "challenge_evaluators", "evaluation_id"),
                 ("idx_challenge_evaluators_user", "challenge_evaluators", "user_id"),
                 
@@ -1384,6 +1502,7 @@ class DatabaseClient(metaclass=SingletonMeta):
                 ("idx_matches_status", "matches", "status"),
                 ("idx_matches_user1", "matches", "user1_id"),
                 ("idx_matches_user2", "matches", "user2_id"),
+                ("idx_matches_created", "matches", "created_at"),
                 
                 # Poll indexes
                 ("idx_polls_is_closed", "polls", "is_closed"),
@@ -1393,6 +1512,13 @@ class DatabaseClient(metaclass=SingletonMeta):
                 
                 # User indexes
                 ("idx_users_slack_id", "users", "slack_id"),
+                ("idx_users_cohort", "users", "cohort"),
+                
+                # Feedback indexes
+                ("idx_feedbacks_category", "feedbacks", "category"),
+                
+                # E-posta kuyruğu (worker bekleyen ve zamanı gelenleri tarar)
+                ("idx_email_outbox_due", "email_outbox", "status, next_attempt_at"),
             ]
             
             for index_name, table_name, column_name in indexes:
@@ -1421,6 +1547,7 @@ class DatabaseClient(metaclass=SingletonMeta):
                     "challenge_evaluations",
                     "challenge_submissions",
                     "challenge_participants",
+                    "challenge_start_runs",
                     "challenge_hubs",
                     "user_challenge_stats"
                 ]
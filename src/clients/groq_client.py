@@ -39,11 +39,13 @@ class GroqClient(metaclass=SingletonMeta):
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
-        stream: bool = False
+        stream: bool = False,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Groq üzerinden ASENKRON bir sohbet yanıtı döndürür.
         Rate limit durumunda otomatik olarak hiyerarşideki bir sonraki modele geçer.
+        response_format={"type": "json_object"} verilirse model geçerli bir JSON nesnesi döndürmeye zorlanır.
         """
         # Kullanıcının istediği modelden başla, yoksa varsayılandan başla
         start_model = model or self.default_model
@@ -62,12 +64,16 @@ class GroqClient(metaclass=SingletonMeta):
             try:
                 logger.info(f"[>] Groq sorgusu gönderiliyor ({target_model})...")
                 
+                request = {}
+                if response_format:
+                    request["response_format"] = response_format
                 completion = await self.client.chat.completions.create(
                     model=target_model,
                     messages=messages,
                     temperature=temperature,
                     max_tokens=max_tokens,
-                    stream=stream
+                    stream=stream,
+                    **request
                 )
                 
                 response_text = completion.choices[0].message.content
@@ -107,6 +113,29 @@ class GroqClient(metaclass=SingletonMeta):
         ]
         return await self.chat_completion(messages, model=model)
 
+    async def ask_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 1024
+    ) -> str:
+        """
+        JSON modunda (response_format=json_object) tek soru-cevap.
+        Ham yanıt metnini döndürür; doğrulama çağıranın şemasına göre yapılır.
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        return await self.chat_completion(
+            messages,
+            model=model,
+            temperature=0.3,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+
     async def close(self):
         """İstemciyi kapatır."""
         await self.client.close()
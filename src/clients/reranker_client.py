@@ -0,0 +1,95 @@
+import threading
+import time
+from typing import Dict, List, Optional
+from src.core.lazy import lazy_import
+from src.core.logger import logger
+from src.core.singleton import SingletonMeta
+
+# Cross-encoder (torch) sadece yeniden sıralama açıksa ve ilk kullanımda yüklenir
+sentence_transformers = lazy_import("sentence_transformers")
+
+
+class RerankerClient(metaclass=SingletonMeta):
+    """
+    Vektör aramasının aday parçalarını CPU üzerinde küçük bir cross-encoder ile yeniden sıralar.
+
+    Adaylar vektör sırasına göre partiler halinde puanlanır. Süre bütçesi dolunca veya yeterli
+    sayıda parça `early_exit_score` eşiğini geçince puanlama durur; puanlanamayan adaylar
+    vektör sırasıyla puanlananların arkasına eklenir. Böylece yeniden sıralama yanıt süresini
+    hiçbir zaman bütçeden (bir parti süresinden) fazla uzatmaz.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        batch_size: int = 8,
+        budget_ms: float = 300.0,
+        early_exit_score: Optional[float] = None
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.budget_ms = budget_ms
+        self.early_exit_score = early_exit_score
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self):
+        """Cross-encoder modeli; ilk kullanımda yüklenir."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    logger.info(f"[>] Yeniden sıralama modeli yükleniyor: {self.model_name}")
+                    self._model = sentence_transformers.CrossEncoder(self.model_name, device="cpu")
+        return self._model
+
+    def warm_up(self):
+        """Modeli önceden yükler (ilk /sor beklemesin)."""
+        try:
+            self.model
+        except Exception as e:
+            logger.warning(f"[!] Yeniden sıralama modeli önceden yüklenemedi: {e}")
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[Dict],
+        top_n: int = 4,
+        budget_ms: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Adayları soruyla ilgisine göre sıralar ve en iyi `top_n` tanesini döndürür.
+
+        Args:
+            candidates: `VectorClient.search` sonuçları (vektör sırasıyla)
+            budget_ms: Bu çağrı için süre bütçesi (varsayılan: istemcinin bütçesi)
+
+        Returns:
+            Kopyalanmış sonuçlar; puanlananlara `rerank_score` eklenir
+        """
+        if not candidates:
+            return []
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000
+        started = time.perf_counter()
+        scored = []
+        confident = 0
+        position = 0
+
+        while position < len(candidates):
+            batch = candidates[position:position + self.batch_size]
+            scores = self.model.predict([(query, doc["text"]) for doc in batch], batch_size=self.batch_size)
+            for doc, score in zip(batch, scores):
+                scored.append(dict(doc, rerank_score=float(score)))
+                if self.early_exit_score is not None and score >= self.early_exit_score:
+                    confident += 1
+            position += len(batch)
+            if confident >= top_n or time.perf_counter() - started >= budget:
+                break
+
+        scored.sort(key=lambda doc: doc["rerank_score"], reverse=True)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if position < len(candidates):
+            logger.debug(
+                f"[i] Yeniden sıralama erken bitti: {position}/{len(candidates)} aday, {elapsed_ms:.0f}ms"
+            )
+        return (scored + [dict(doc) for doc in candidates[position:]])[:top_n]
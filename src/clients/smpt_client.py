@@ -1,8 +1,9 @@
 import os
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 from src.core.logger import logger
 from src.core.exceptions import SMTPClientError
 from src.core.singleton import SingletonMeta
@@ -11,11 +12,17 @@ class SMTPClient(metaclass=SingletonMeta):
     """
     Google/Gmail üzerinden e-posta göndermek için merkezi istemci sınıfı.
     .env dosyasındaki kimlik bilgilerini kullanır.
+
+    Kimliği doğrulanmış tek bir SMTP oturumu açık tutulur ve gönderimler arasında
+    yeniden kullanılır; oturum düşmüşse bir sonraki gönderimde yeniden bağlanılır.
+    Sunucu ayarları (SMTP_HOST / SMTP_PORT / SMTP_USE_TLS) konteynerde Settings'ten verilir
+    (örn: yerel test sunucusu).
     """
 
-    def __init__(self):
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+    def __init__(self, smtp_host: str = "smtp.gmail.com", smtp_port: int = 587, use_tls: bool = True):
+        self.smtp_server = smtp_host
+        self.smtp_port = smtp_port
+        self.use_tls = use_tls
         self.sender_email = os.environ.get("SMTP_EMAIL")
         self.sender_password = os.environ.get("SMTP_PASSWORD") # App Password kullanılmalıdır
 
@@ -23,39 +30,125 @@ class SMTPClient(metaclass=SingletonMeta):
             logger.error("[X] SMTP_EMAIL veya SMTP_PASSWORD bulunamadı!")
             raise SMTPClientError("SMTP yapılandırması eksik (.env kontrol edin).")
 
+        self._server: Optional[smtplib.SMTP] = None
+        self._lock = threading.RLock()
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        """Yeni bir SMTP oturumu açar (TLS + giriş)."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30)
+        try:
+            server.ehlo()
+            if self.use_tls:
+                server.starttls()
+                server.ehlo()
+            # Sunucu AUTH sunmuyorsa (örn: yerel test sunucusu) giriş atlanır
+            if server.has_extn("auth"):
+                server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+        self.connections_opened += 1
+        logger.debug(f"[+] SMTP oturumu açıldı: {self.smtp_server}:{self.smtp_port}")
+        return server
+
+    def _session(self) -> smtplib.SMTP:
+        """Açık oturumu döndürür; yoksa veya düşmüşse yeniden bağlanır."""
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self._discard_session()
+        self._server = self._connect()
+        return self._server
+
+    def _discard_session(self):
+        if self._server is not None:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+            self._server = None
+
+    def close(self):
+        """Açık SMTP oturumunu kapatır."""
+        with self._lock:
+            if self._server is None:
+                return
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+            logger.debug("[i] SMTP oturumu kapatıldı.")
+
+    def _build_message(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        is_html: bool,
+        hide_recipients: bool = False
+    ) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = self.sender_email
+        # Gizli gönderimde adresler sadece zarfta kalır (Bcc gibi), alıcılar birbirini görmez
+        msg['To'] = "undisclosed-recipients:;" if hide_recipients else ", ".join(to_emails)
+        msg['Subject'] = subject
+
+        # İçeriği ekle (HTML veya Düz Metin)
+        msg.attach(MIMEText(body, 'html' if is_html else 'plain'))
+        return msg
+
+    def send_message(self,
+                     to_emails: List[str],
+                     subject: str,
+                     body: str,
+                     is_html: bool = False,
+                     hide_recipients: bool = False) -> Dict[str, tuple]:
+        """
+        Tek mesajı tüm alıcılara açık oturum üzerinden gönderir.
+        Oturum gönderim sırasında düşerse bir kez yeniden bağlanılıp tekrar denenir.
+        `hide_recipients` ile alıcılar To başlığına yazılmaz (birleştirilmiş gönderimler için).
+
+        Returns:
+            Reddedilen alıcılar ({adres: (kod, mesaj)}); hepsi kabul edildiyse boş sözlük
+        """
+        msg = self._build_message(to_emails, subject, body, is_html, hide_recipients)
+        with self._lock:
+            try:
+                return self._session().send_message(msg, to_addrs=to_emails)
+            except smtplib.SMTPServerDisconnected:
+                logger.warning("[!] SMTP oturumu düştü, yeniden bağlanılıyor...")
+                self._discard_session()
+                return self._session().send_message(msg, to_addrs=to_emails)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused):
+                # Oturum sağlam, sadece bu mesaj reddedildi
+                raise
+            except Exception:
+                self._discard_session()
+                raise
+
     def send_email(self, 
                    to_emails: Union[str, List[str]], 
                    subject: str, 
                    body: str, 
                    is_html: bool = False) -> bool:
         """
-        E-posta gönderir.
+        E-postayı hemen (çağıran thread'de) gönderir.
         to_emails: Tek bir string veya liste olarak alıcı adresleri.
+        Slack handler'larından kuyruğa eklemek için EmailOutboxService kullanılmalıdır.
         """
         if isinstance(to_emails, str):
             to_emails = [to_emails]
 
-        # Mesajı hazırla
-        msg = MIMEMultipart()
-        msg['From'] = self.sender_email
-        msg['To'] = ", ".join(to_emails)
-        msg['Subject'] = subject
-
-        # İçeriği ekle (HTML veya Düz Metin)
-        msg.attach(MIMEText(body, 'html' if is_html else 'plain'))
-
         try:
-            logger.info(f"[>] E-posta gönderiliyor: {subject} -> {msg['To']}")
-            
-            # Bağlantıyı kur ve TLS başlat
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            
-            # Giriş yap ve gönder
-            server.login(self.sender_email, self.sender_password)
-            server.send_message(msg)
-            server.quit()
-            
+            logger.info(f"[>] E-posta gönderiliyor: {subject} -> {', '.join(to_emails)}")
+            self.send_message(to_emails, subject, body, is_html)
             logger.info(f"[+] E-posta başarıyla gönderildi: {subject}")
             return True
 
@@ -67,21 +160,29 @@ class SMTPClient(metaclass=SingletonMeta):
             logger.error(f"[X] E-posta gönderme hatası: {e}")
             raise SMTPClientError(f"E-posta gönderilemedi: {e}")
 
-    def send_request_notification(self, requester_slack_id: str, request_content: str):
-        """
-        Kullanıcının Slack üzerinden yaptığı talebi yöneticilere e-posta ile bildirir.
-        """
+    def admin_recipients(self) -> List[str]:
+        """ADMIN_EMAIL (virgülle ayrılmış) adresleri; tanımlı değilse botun kendi adresi."""
         admin_emails_str = os.environ.get("ADMIN_EMAIL", "")
-        # Virgülle ayrılmış birden fazla emaili listeye çevir
         admin_emails = [email.strip() for email in admin_emails_str.split(",") if email.strip()]
         
         if not admin_emails:
             # Eğer admin emaili yoksa, gönderen (bot) emaili varsayılan alıcı yap
             admin_emails = [self.sender_email]
             logger.warning("[!] ADMIN_EMAIL tanımlanmamış, bildirim botun kendi adresine gönderiliyor.")
+        return admin_emails
+
+    def send_request_notification(self, requester_slack_id: str, request_content: str):
+        """
+        Kullanıcının Slack üzerinden yaptığı talebi yöneticilere e-posta ile bildirir.
+        """
+        subject, body = request_notification_message(requester_slack_id, request_content)
+        return self.send_email(self.admin_recipients(), subject, body, is_html=True)
+
 
-        subject = "Cemil Bot - Yeni Kullanıcı Talebi"
-        body = f"""
+def request_notification_message(requester_slack_id: str, request_content: str):
+    """Kullanıcı talebi bildirimi için (konu, HTML gövde)."""
+    subject = "Cemil Bot - Yeni Kullanıcı Talebi"
+    body = f"""
         <h3>Yeni Slack Talebi</h3>
         <p><b>Talep Eden Slack ID:</b> {requester_slack_id}</p>
         <p><b>Talep İçeriği:</b></p>
@@ -90,4 +191,4 @@ class SMTPClient(metaclass=SingletonMeta):
         </blockquote>
         <p><i>Bu e-posta Cemil Bot tarafından otomatik oluşturulmuştur.</i></p>
         """
-        return self.send_email(admin_emails, subject, body, is_html=True)
+    return subject, body
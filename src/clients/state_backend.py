@@ -0,0 +1,517 @@
+"""
+Birden fazla bot sürecinin paylaştığı durum deposu: dağıtık kilitler, lider seçimi ve sayaçlar.
+
+Varsayılan `MemoryStateBackend` tek süreç içindir (mevcut davranış). Aynı makinede birden fazla
+Socket Mode süreci çalıştırılacaksa `SQLiteStateBackend` (WAL modunda ayrı bir SQLite dosyası)
+veya `RedisStateBackend` kullanılır; seçim `STATE_BACKEND` ayarıyla yapılır.
+
+Kilit ve sayaç süreleri süreçler arasında karşılaştırılabilmesi için duvar saati (`time.time()`)
+ile tutulur.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from src.core.logger import logger
+from src.core.exceptions import StateBackendError
+
+# Süresi dolan sayaç/kilit kayıtları her bu kadar yazmada bir temizlenir (SQLite)
+PURGE_EVERY_WRITES = 500
+
+
+class StateBackend(ABC):
+    """Paylaşılan durum deposu arayüzü."""
+
+    # Başka süreçlerle paylaşılıyor mu? (False ise koordinasyona gerek yoktur)
+    is_shared = True
+
+    @abstractmethod
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """Kilidi `ttl` saniyeliğine almaya çalışır; sahibi zaten `owner` ise süresini uzatır."""
+
+    @abstractmethod
+    def release_lock(self, name: str, owner: str) -> bool:
+        """Kilidi bırakır (sadece sahibi bırakabilir)."""
+
+    @abstractmethod
+    def extend_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """Sahip olunan ve süresi dolmamış kilidin süresini yeniler."""
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """
+        Sayacı atomik olarak artırır ve yeni değeri döndürür.
+        `ttl` verilirse sayaç ilk oluşturulduğunda bu kadar saniye sonra silinir.
+        """
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """Sayacın değeri (yoksa 0)."""
+
+    def get_counters(self, keys: Sequence[str]) -> List[int]:
+        """Birden fazla sayacı okur."""
+        return [self.get_counter(key) for key in keys]
+
+    def close(self):
+        """Bağlantıları kapatır."""
+
+    @contextmanager
+    def lock(self, name: str, ttl: float = 30.0, timeout: float = 10.0) -> Iterator[str]:
+        """
+        Dağıtık kilit context manager'ı. Kilit alınamazsa `timeout` süresince tekrar dener.
+
+        Raises:
+            StateBackendError: Kilit süresinde alınamazsa
+        """
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while not self.acquire_lock(name, owner, ttl):
+            if time.monotonic() >= deadline:
+                raise StateBackendError(f"Kilit alınamadı: {name} ({timeout:.0f}s)")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+        try:
+            yield owner
+        finally:
+            try:
+                self.release_lock(name, owner)
+            except Exception as e:
+                logger.warning(f"[!] Kilit bırakılamadı: {name} | {e}")
+
+
+class MemoryStateBackend(StateBackend):
+    """Süreç içi depo (tek süreçli çalışma için varsayılan)."""
+
+    is_shared = False
+
+    def __init__(self):
+        self._locks: Dict[str, Tuple[str, float]] = {}
+        self._counters: Dict[str, Tuple[int, Optional[float]]] = {}
+        self._mutex = threading.Lock()
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._mutex:
+            current = self._locks.get(name)
+            if current is not None and current[1] > now and current[0] != owner:
+                return False
+            self._locks[name] = (owner, now + ttl)
+            return True
+
+    def release_lock(self, name: str, owner: str) -> bool:
+        with self._mutex:
+            current = self._locks.get(name)
+            if current is None or current[0] != owner:
+                return False
+            del self._locks[name]
+            return True
+
+    def extend_lock(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._mutex:
+            current = self._locks.get(name)
+            if current is None or current[0] != owner or current[1] <= now:
+                return False
+            self._locks[name] = (owner, now + ttl)
+            return True
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.time()
+        with self._mutex:
+            entry = self._counters.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= now):
+                entry = (0, now + ttl if ttl else None)
+            value = entry[0] + amount
+            self._counters[key] = (value, entry[1])
+            return value
+
+    def get_counter(self, key: str) -> int:
+        with self._mutex:
+            value, expires_at = self._counters.get(key, (0, None))
+            if expires_at is not None and expires_at <= time.time():
+                return 0
+            return value
+
+
+class SQLiteStateBackend(StateBackend):
+    """
+    Aynı makinedeki süreçler arası paylaşılan depo (SQLite, WAL modu).
+    Yazmalar `BEGIN IMMEDIATE` ile tek işlemde yapılır; her thread kendi bağlantısını kullanır.
+    """
+
+    def __init__(self, db_path: str = "data/cemil_state.db", busy_timeout: float = 5.0):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._writes = 0
+
+        dir_name = os.path.dirname(db_path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+
+        with self._write() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS state_locks (
+                    name TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS state_counters (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL,
+                    expires_at REAL
+                )
+            """)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            try:
+                # isolation_level=None: işlemler BEGIN IMMEDIATE ile elle yönetilir
+                conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.Error as e:
+                raise StateBackendError(f"Durum deposuna bağlanılamadı: {e}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            raise StateBackendError(f"Durum deposu yazma hatası: {e}")
+
+        self._writes += 1
+        if self._writes % PURGE_EVERY_WRITES == 0:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Süresi dolan kilit ve sayaçları siler."""
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            removed = conn.execute("DELETE FROM state_locks WHERE expires_at <= ?", (now,)).rowcount
+            removed += conn.execute(
+                "DELETE FROM state_counters WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            ).rowcount
+            conn.execute("COMMIT")
+            return removed
+        except sqlite3.Error as e:
+            logger.warning(f"[!] Durum deposu temizlenemedi: {e}")
+            return 0
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "DELETE FROM state_locks WHERE name = ? AND expires_at <= ?", (name, now)
+            )
+            conn.execute(
+                "INSERT INTO state_locks (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET expires_at = excluded.expires_at "
+                "WHERE state_locks.owner = excluded.owner",
+                (name, owner, now + ttl)
+            )
+            row = conn.execute("SELECT owner FROM state_locks WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == owner
+
+    def release_lock(self, name: str, owner: str) -> bool:
+        with self._write() as conn:
+            cursor = conn.execute("DELETE FROM state_locks WHERE name = ? AND owner = ?", (name, owner))
+        return cursor.rowcount > 0
+
+    def extend_lock(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._write() as conn:
+            cursor = conn.execute(
+                "UPDATE state_locks SET expires_at = ? WHERE name = ? AND owner = ? AND expires_at > ?",
+                (now + ttl, name, owner, now)
+            )
+        return cursor.rowcount > 0
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "DELETE FROM state_counters WHERE key = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                (key, now)
+            )
+            conn.execute(
+                "INSERT INTO state_counters (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                (key, amount, now + ttl if ttl else None)
+            )
+            row = conn.execute("SELECT value FROM state_counters WHERE key = ?", (key,)).fetchone()
+        return row[0]
+
+    def get_counter(self, key: str) -> int:
+        return self.get_counters([key])[0]
+
+    def get_counters(self, keys: Sequence[str]) -> List[int]:
+        keys = list(keys)
+        if not keys:
+            return []
+        placeholders = ", ".join("?" for _ in keys)
+        try:
+            rows = self._connection().execute(
+                f"SELECT key, value FROM state_counters WHERE key IN ({placeholders}) "
+                f"AND (expires_at IS NULL OR expires_at > ?)",
+                (*keys, time.time())
+            ).fetchall()
+        except sqlite3.Error as e:
+            raise StateBackendError(f"Durum deposu okuma hatası: {e}")
+        values = dict(rows)
+        return [values.get(key, 0) for key in keys]
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+
+# Redis tarafında atomik çalışan Lua betikleri
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+INCR_SCRIPT = """
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if tonumber(ARGV[2]) > 0 and redis.call('PTTL', KEYS[1]) < 0 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return value
+"""
+
+
+class RedisStateBackend(StateBackend):
+    """
+    Redis (veya Redis protokolü uyumlu bir sunucu) üzerinde paylaşılan depo.
+    Kilitler `SET NX PX`, sahiplik kontrolü gerektiren işlemler Lua betikleriyle atomik yapılır.
+    """
+
+    def __init__(self, client: Any, prefix: str = "cemil:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "cemil:") -> "RedisStateBackend":
+        try:
+            import redis
+        except ImportError:
+            raise StateBackendError("STATE_BACKEND=redis için 'redis' paketi kurulu olmalı (pip install redis)")
+        return cls(redis.Redis.from_url(url, decode_responses=True), prefix=prefix)
+
+    def _key(self, kind: str, name: str) -> str:
+        return f"{self.prefix}{kind}:{name}"
+
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        return value.decode() if isinstance(value, bytes) else value
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        key = self._key("lock", name)
+        try:
+            if self.client.set(key, owner, nx=True, px=max(1, int(ttl * 1000))):
+                return True
+            if self._text(self.client.get(key)) == owner:
+                return self.extend_lock(name, owner, ttl)
+            return False
+        except Exception as e:
+            raise StateBackendError(f"Redis kilit hatası: {e}")
+
+    def release_lock(self, name: str, owner: str) -> bool:
+        try:
+            return bool(self.client.eval(RELEASE_SCRIPT, 1, self._key("lock", name), owner))
+        except Exception as e:
+            raise StateBackendError(f"Redis kilit hatası: {e}")
+
+    def extend_lock(self, name: str, owner: str, ttl: float) -> bool:
+        try:
+            return bool(self.client.eval(
+                EXTEND_SCRIPT, 1, self._key("lock", name), owner, max(1, int(ttl * 1000))
+            ))
+        except Exception as e:
+            raise StateBackendError(f"Redis kilit hatası: {e}")
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        try:
+            ttl_ms = int(ttl * 1000) if ttl else 0
+            return int(self.client.eval(INCR_SCRIPT, 1, self._key("counter", key), amount, ttl_ms))
+        except Exception as e:
+            raise StateBackendError(f"Redis sayaç hatası: {e}")
+
+    def get_counter(self, key: str) -> int:
+        return self.get_counters([key])[0]
+
+    def get_counters(self, keys: Sequence[str]) -> List[int]:
+        keys = list(keys)
+        if not keys:
+            return []
+        try:
+            values = self.client.mget([self._key("counter", key) for key in keys])
+        except Exception as e:
+            raise StateBackendError(f"Redis sayaç hatası: {e}")
+        return [int(self._text(v)) if v is not None else 0 for v in values]
+
+    def close(self):
+        close = getattr(self.client, "close", None)
+        if close:
+            close()
+
+
+class LeaderElector:
+    """
+    Kilit tabanlı lider seçimi. Lider kilidi `ttl` saniyelik kiralanır ve arka plan thread'inde
+    `ttl / 3` aralıklarla yenilenir; lider süreç düşerse kira dolunca başka bir süreç devralır.
+    """
+
+    def __init__(
+        self,
+        backend: StateBackend,
+        name: str = "cron-leader",
+        instance_id: Optional[str] = None,
+        ttl: float = 30.0
+    ):
+        self.backend = backend
+        self.name = name
+        self.instance_id = instance_id or default_instance_id()
+        self.ttl = ttl
+        self._leader = False
+        # Kira yenilenemese bile bu ana kadar lider sayılırız (kira süresinden önce biter)
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader and time.monotonic() < self._valid_until
+
+    def try_acquire(self) -> bool:
+        """Liderliği almayı veya yenilemeyi dener; sonucu döndürür."""
+        started = time.monotonic()
+        try:
+            if self._leader:
+                acquired = self.backend.extend_lock(self.name, self.instance_id, self.ttl)
+            else:
+                acquired = self.backend.acquire_lock(self.name, self.instance_id, self.ttl)
+        except Exception as e:
+            logger.warning(f"[!] Lider kirası yenilenemedi ({self.name}): {e}")
+            return self.is_leader
+
+        if acquired and not self._leader:
+            logger.info(f"[+] Lider seçildi ({self.name}): {self.instance_id}")
+        elif not acquired and self._leader:
+            logger.warning(f"[!] Liderlik kaybedildi ({self.name}): {self.instance_id}")
+        self._leader = acquired
+        self._valid_until = started + self.ttl * 0.8 if acquired else 0.0
+        return acquired
+
+    def _run(self):
+        interval = self.ttl / 3
+        while not self._stop.is_set():
+            self.try_acquire()
+            self._stop.wait(interval)
+
+    def start(self):
+        """Kira yenileme thread'ini başlatır."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.try_acquire()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Yenilemeyi durdurur ve liderliği bırakır (diğer süreç beklemeden devralır)."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._leader:
+            try:
+                self.backend.release_lock(self.name, self.instance_id)
+            except Exception as e:
+                logger.warning(f"[!] Liderlik bırakılamadı ({self.name}): {e}")
+            self._leader = False
+            self._valid_until = 0.0
+
+
+def default_instance_id() -> str:
+    """Süreç kimliği: host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def create_state_backend(
+    kind: str = "memory",
+    sqlite_path: str = "data/cemil_state.db",
+    redis_url: Optional[str] = None
+) -> StateBackend:
+    """
+    Ayardaki türe göre depo oluşturur.
+
+    Args:
+        kind: "memory" | "sqlite" | "redis"
+    """
+    kind = (kind or "memory").lower()
+    if kind == "memory":
+        return MemoryStateBackend()
+    if kind == "sqlite":
+        return SQLiteStateBackend(sqlite_path)
+    if kind == "redis":
+        if not redis_url:
+            raise StateBackendError("STATE_BACKEND=redis için REDIS_URL tanımlı olmalı")
+        return RedisStateBackend.from_url(redis_url)
+    raise StateBackendError(f"Bilinmeyen durum deposu türü: {kind}")
+
+
+# Süreç genelinde kullanılan depo (bot.py ayarlar)
+_state_backend: Optional[StateBackend] = None
+
+
+def configure_state_backend(backend: Optional[StateBackend]):
+    """Süreç genelinde kullanılacak depoyu ayarlar."""
+    global _state_backend
+    _state_backend = backend
+
+
+def get_state_backend() -> Optional[StateBackend]:
+    """Ayarlanmış depo (yoksa None: tek süreçli çalışma)."""
+    return _state_backend
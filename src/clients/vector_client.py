@@ -1,136 +1,387 @@
 import os
-import faiss
-import numpy as np
 import pickle
-from typing import List, Dict, Any, Tuple
-from sentence_transformers import SentenceTransformer
+import threading
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from src.clients import vector_store
+from src.clients.vector_store import DEFAULT_COLLECTION
+from src.core.exceptions import VectorStoreError
+from src.core.lazy import lazy_import
 from src.core.logger import logger
+from src.core.rwlock import ReadWriteLock
 from src.core.singleton import SingletonMeta
 
+# Ağır kütüphaneler ilk kullanımda yüklenir (sentence_transformers torch'u da yükler)
+faiss = lazy_import("faiss")
+np = lazy_import("numpy")
+sentence_transformers = lazy_import("sentence_transformers")
+
+
+class _Collection:
+    """Bir koleksiyonun indeksi, parçaları ve kaynak -> indeks konumları (ön filtre için)."""
+    __slots__ = ("index", "documents", "source_ids")
+
+    def __init__(self, index, documents: List[Dict]):
+        self.index = index
+        self.documents = documents
+        positions: Dict[str, List[int]] = {}
+        for position, doc in enumerate(documents):
+            positions.setdefault(doc["metadata"].get("source"), []).append(position)
+        self.source_ids = {source: np.array(ids, dtype="int64") for source, ids in positions.items()}
+
+    def selector_ids(self, sources: Iterable[str]):
+        """Verilen kaynaklara ait konumlar (hiçbiri yoksa None)."""
+        ids = [self.source_ids[source] for source in sources if source in self.source_ids]
+        if not ids:
+            return None
+        return np.concatenate(ids)
+
+
+class _IndexSnapshot:
+    """Aynı anda değiştirilen koleksiyonlar + sürüm + manifest (aramalar tek referans okur)."""
+    __slots__ = ("collections", "documents", "version", "manifest")
+
+    def __init__(
+        self,
+        collections: Optional[Dict[str, _Collection]] = None,
+        version: Optional[str] = None,
+        manifest: Optional[Dict[str, Any]] = None
+    ):
+        self.collections = collections or {}
+        self.documents = [doc for collection in self.collections.values() for doc in collection.documents]
+        self.version = version
+        self.manifest = manifest or {}
+
+
 class VectorClient(metaclass=SingletonMeta):
     """
-    Yerel FAISS indeksi ve SentenceTransformers kullanarak 
+    Yerel FAISS indeksi ve SentenceTransformers kullanarak
     ücretsiz ve limitsiz vektör arama işlemlerini yönetir.
+
+    Parçalar koleksiyonlara (metadata["collection"], örn. `genel`, `challenge`) bölünür ve her
+    koleksiyonun kendi indeksi vardır; arama sadece istenen koleksiyonları tarar, kaynak filtresi
+    (metadata["source"]) arama sırasında ID seçiciyle uygulanır.
+
+    İndeks sürümlü olarak saklanır (bkz. `vector_store`). Yeni sürüm yüklenince indeks ve
+    dökümanlar tek seferde takas edilir. Diske yazma hiçbir kilidi tutmaz; aramalar sadece
+    takasın kendisi (okuma-yazma kilidinin yazma tarafı) sırasında kısa bir an bekler.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2", index_path: str = "data/vector_store"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        index_path: str = "data/vector_store",
+        keep_versions: int = 3,
+        autoload: bool = True
+    ):
+        self.model_name = model_name
+        self._model = None
+        self._model_lock = threading.Lock()
+        # Sürümlü deponun kök dizini (eski düzende `<index_path>.index` / `.pkl` dosyaları)
         self.index_path = index_path
-        self.index = None
-        self.documents = []  # Chunks/Texts
-        self.dimension = self.model.get_sentence_embedding_dimension()
-        
+        self.keep_versions = keep_versions
+        self._snapshot = _IndexSnapshot()
+        # Aramalar okuma, takas yazma tarafını alır
+        self._rw_lock = ReadWriteLock()
+        # Yeni sürüm üreten işlemler (diske yazma dahil) birbirini bekler
+        self._swap_lock = threading.Lock()
+        # Doğrulamadan geçemeyen sürümler (her kontrolde yeniden denenmez)
+        self._rejected_versions = set()
+
         # Dizini oluştur
-        os.makedirs(os.path.dirname(index_path) if os.path.dirname(index_path) else "data", exist_ok=True)
-        
+        os.makedirs(index_path, exist_ok=True)
+
         # Mevcut indeksi yükle
-        self.load_index()
+        if autoload:
+            self.load_index()
+
+    @property
+    def documents(self) -> List[Dict]:
+        """Tüm koleksiyonlardaki parçalar."""
+        return self._snapshot.documents
+
+    @property
+    def version(self) -> Optional[str]:
+        """Yüklü indeks sürümü (eski düz dosyalardan yüklendiyse veya indeks yoksa None)."""
+        return self._snapshot.version
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """Yüklü sürümün manifesti (vektör/parça sayısı, model, boyut, koleksiyonlar)."""
+        return self._snapshot.manifest
+
+    def collection_sizes(self) -> Dict[str, int]:
+        """Koleksiyon adı -> parça sayısı."""
+        return {name: len(c.documents) for name, c in self._snapshot.collections.items()}
+
+    def has_index(self) -> bool:
+        return bool(self._snapshot.collections)
+
+    @property
+    def model(self):
+        """Embedding modeli; ilk kullanımda yüklenir (torch + model dosyaları birkaç saniye sürer)."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    logger.info(f"[>] Embedding modeli yükleniyor: {self.model_name}")
+                    self._model = sentence_transformers.SentenceTransformer(self.model_name)
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        for collection in self._snapshot.collections.values():
+            return collection.index.d
+        return self.model.get_sentence_embedding_dimension()
+
+    def warm_up(self):
+        """Modeli önceden yükler (açılıştan sonra arka planda çağrılır, ilk /sor beklemesin)."""
+        try:
+            self.model
+        except Exception as e:
+            logger.warning(f"[!] Embedding modeli önceden yüklenemedi: {e}")
+
+    def _encode(self, texts: List[str]):
+        return np.array(self.model.encode(texts)).astype('float32')
+
+    def _embed_by_collection(
+        self, texts: List[str], metadata: Optional[List[Dict]]
+    ) -> Dict[str, Tuple[Any, List[Dict]]]:
+        """Metinleri vektörleştirir ve koleksiyonlarına göre gruplar: ad -> (vektörler, parçalar)."""
+        embeddings = self._encode(texts)
+        positions: Dict[str, List[int]] = {}
+        documents: Dict[str, List[Dict]] = {}
+        for i, text in enumerate(texts):
+            meta = dict(metadata[i]) if metadata else {}
+            name = vector_store.normalize_collection(meta.get("collection"))
+            meta["collection"] = name
+            positions.setdefault(name, []).append(i)
+            documents.setdefault(name, []).append({"text": text, "metadata": meta})
+        return {name: (embeddings[ids], documents[name]) for name, ids in positions.items()}
 
     def add_texts(self, texts: List[str], metadata: List[Dict] = None):
-        """Metinleri vektörleştirir ve indekse ekler."""
+        """Metinleri vektörleştirir, ilgili koleksiyonların bir kopyasına ekler ve yeni sürüm olarak yayınlar."""
         if not texts:
             return
 
-        embeddings = self.model.encode(texts)
-        embeddings = np.array(embeddings).astype('float32')
-
-        if self.index is None:
-            self.index = faiss.IndexFlatL2(self.dimension)
-        
-        self.index.add(embeddings)
-        
-        for i, text in enumerate(texts):
-            meta = metadata[i] if metadata else {}
-            self.documents.append({"text": text, "metadata": meta})
-        
-        self.save_index()
+        grouped = self._embed_by_collection(texts, metadata)
+        with self._swap_lock:
+            collections = {
+                name: (c.index, c.documents) for name, c in self._snapshot.collections.items()
+            }
+            for name, (embeddings, new_documents) in grouped.items():
+                # Sunulan indeks yerinde değiştirilmez (kopyala-yaz): aramalar tutarlı kalır
+                if name in collections:
+                    index = faiss.clone_index(collections[name][0])
+                    documents = collections[name][1] + new_documents
+                else:
+                    index = faiss.IndexFlatL2(embeddings.shape[1])
+                    documents = new_documents
+                index.add(embeddings)
+                collections[name] = (index, documents)
+            self._publish(collections)
         logger.info(f"[+] {len(texts)} yeni parça vektör indeksine eklendi.")
 
-    def search(self, query: str, top_k: int = 5, threshold: float = 0.8) -> List[Dict]:
+    def rebuild(self, texts: List[str], metadata: List[Dict] = None) -> Optional[str]:
+        """
+        İndeksi verilen metinlerle sıfırdan oluşturur ve yeni sürüm olarak yayınlar.
+        Her parça metadata["collection"] koleksiyonuna (yoksa varsayılana) eklenir.
+
+        Returns:
+            Yayınlanan sürüm adı (metin yoksa None)
+        """
+        if not texts:
+            return None
+
+        collections = {}
+        for name, (embeddings, documents) in self._embed_by_collection(texts, metadata).items():
+            index = faiss.IndexFlatL2(embeddings.shape[1])
+            index.add(embeddings)
+            collections[name] = (index, documents)
+        with self._swap_lock:
+            return self._publish(collections)
+
+    def _publish(self, collections: vector_store.Collections) -> str:
+        version = vector_store.publish_version(
+            self.index_path, collections, keep=self.keep_versions, model_name=self.model_name
+        )
+        self._swap(self._make_snapshot(
+            collections, version, vector_store.read_manifest(self.index_path, version)
+        ))
+        return version
+
+    @staticmethod
+    def _make_snapshot(collections: vector_store.Collections, version=None, manifest=None) -> _IndexSnapshot:
+        return _IndexSnapshot(
+            {name: _Collection(index, documents) for name, (index, documents) in collections.items()},
+            version,
+            manifest
+        )
+
+    def _swap(self, snapshot: _IndexSnapshot) -> Optional[str]:
+        """Yeni görüntüye geçer; dönen değer önceki sürümdür."""
+        with self._rw_lock.write_locked():
+            previous = self._snapshot.version
+            self._snapshot = snapshot
+        return previous
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        threshold: float = 0.8,
+        collections: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None
+    ) -> List[Dict]:
         """
         Soruya en yakın metin parçalarını döner.
-        
+
         Args:
             query: Arama sorgusu
             top_k: Dönecek maksimum sonuç sayısı (varsayılan: 5)
             threshold: L2 mesafesi için maksimum eşik (varsayılan: 0.8)
                       Küçük değer = sıkı eşleşme, büyük değer = gevşek eşleşme
-        
+            collections: Sadece bu koleksiyonlarda ara (None: hepsi)
+            sources: Sadece bu kaynak dosyalardan parçalar (arama öncesi ID seçiciyle filtrelenir)
+
         Returns:
             Eşleşen dökümanlar listesi (score ile sıralı)
         """
-        if self.index is None or not self.documents:
-            logger.warning(f"[!] Vector search: İndeks veya döküman yok | Toplam döküman: {len(self.documents) if self.documents else 0}")
+        if not self.has_index():
+            logger.warning(f"[!] Vector search: İndeks veya döküman yok | Toplam döküman: {len(self.documents)}")
             return []
 
-        query_embedding = self.model.encode([query])
-        query_embedding = np.array(query_embedding).astype('float32')
-
+        query_embedding = self._encode([query])
         # Daha fazla sonuç al, sonra filtrele (top_k * 5 ile daha geniş arama)
-        search_k = min(top_k * 5, len(self.documents)) if self.documents else top_k
-        distances, indices = self.index.search(query_embedding, search_k)
-        
+        search_k = top_k * 5
+        all_candidates = []
+
+        # Tek görüntü: arama sırasında yeni sürüme geçilse bile indeks ve dökümanlar eşleşir
+        with self._rw_lock.read_locked():
+            snapshot = self._snapshot
+            names = snapshot.collections if collections is None else [
+                vector_store.normalize_collection(name) for name in collections
+            ]
+            for name in names:
+                collection = snapshot.collections.get(name)
+                if collection is None:
+                    continue
+                params, candidate_count = None, collection.index.ntotal
+                if sources is not None:
+                    ids = collection.selector_ids(sources)
+                    if ids is None:
+                        continue
+                    params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(ids))
+                    candidate_count = len(ids)
+                k = min(search_k, candidate_count)
+                if k == 0:
+                    continue
+                distances, indices = collection.index.search(query_embedding, k, params=params)
+                for distance, idx in zip(distances[0], indices[0]):
+                    if idx != -1:
+                        all_candidates.append({'doc': collection.documents[idx], 'distance': float(distance)})
+
+        # Koleksiyonlar arası birleştir (düz L2 indekslerde kesin sonuç)
+        all_candidates = sorted(all_candidates, key=lambda x: x['distance'])[:search_k]
+        scope = f"koleksiyonlar: {','.join(collections)}" if collections is not None else "tüm koleksiyonlar"
+
         results = []
         filtered_count = 0
-        all_candidates = []
-        
-        # Önce tüm adayları topla
-        for i, idx in enumerate(indices[0]):
-            if idx != -1 and idx < len(self.documents):
-                distance = float(distances[0][i])
-                all_candidates.append({
-                    'idx': idx,
-                    'distance': distance
-                })
-        
+
         # Threshold filtrelemesi (ama çok gevşek)
         for candidate in all_candidates:
             distance = candidate['distance']
-            idx = candidate['idx']
-            
+
             if distance <= threshold:
-                doc = self.documents[idx].copy()
+                doc = candidate['doc'].copy()
                 doc["score"] = distance
                 results.append(doc)
             else:
                 filtered_count += 1
                 # Eğer çok az sonuç varsa, threshold'u görmezden gel
                 if len(results) < 3 and distance < threshold * 2:  # Çok kötü değilse ekle
-                    doc = self.documents[idx].copy()
+                    doc = candidate['doc'].copy()
                     doc["score"] = distance
                     results.append(doc)
                     logger.debug(f"[i] Düşük skor ama eklendi: score={distance:.3f} > threshold={threshold} (az sonuç olduğu için)")
-        
+
         # En iyi sonuçları döndür (score'a göre sırala)
         results = sorted(results, key=lambda x: x.get('score', float('inf')))[:top_k]
-        
+
         if results:
-            logger.debug(f"[i] Vector search: {len(results)}/{search_k} sonuç döndürüldü (threshold: {threshold}, {filtered_count} filtrelendi)")
+            logger.debug(f"[i] Vector search: {len(results)}/{len(all_candidates)} sonuç döndürüldü (threshold: {threshold}, {filtered_count} filtrelendi, {scope})")
         else:
-            logger.warning(f"[!] Vector search: Hiç uygun sonuç yok (threshold: {threshold}, toplam: {search_k}, filtrelenen: {filtered_count})")
+            logger.warning(f"[!] Vector search: Hiç uygun sonuç yok (threshold: {threshold}, toplam: {len(all_candidates)}, filtrelenen: {filtered_count}, {scope})")
             # Son çare: En iyi 3 sonucu threshold olmadan döndür
             if all_candidates:
                 logger.warning(f"[!] Son çare: En iyi 3 sonuç threshold olmadan döndürülüyor")
-                for candidate in sorted(all_candidates, key=lambda x: x['distance'])[:3]:
-                    idx = candidate['idx']
-                    doc = self.documents[idx].copy()
+                for candidate in all_candidates[:3]:
+                    doc = candidate['doc'].copy()
                     doc["score"] = candidate['distance']
                     results.append(doc)
-        
+
         return results
 
     def save_index(self):
-        """İndeksi ve dökümanları diske kaydeder."""
-        if self.index is not None:
-            faiss.write_index(self.index, f"{self.index_path}.index")
-            with open(f"{self.index_path}.pkl", "wb") as f:
-                pickle.dump(self.documents, f)
-            logger.debug("[i] Vektör indeksi diske kaydedildi.")
+        """Yüklü indeksi ve dökümanları yeni bir sürüm olarak diske kaydeder."""
+        with self._swap_lock:
+            current = self._snapshot
+            if current.collections:
+                self._publish({name: (c.index, c.documents) for name, c in current.collections.items()})
+                logger.debug("[i] Vektör indeksi diske kaydedildi.")
 
     def load_index(self):
-        """İndeksi ve dökümanları diskten yükler."""
-        if os.path.exists(f"{self.index_path}.index"):
-            self.index = faiss.read_index(f"{self.index_path}.index")
+        """
+        Aktif sürümü diskten yükler. Aktif sürüm eksik/bozuksa (manifestle uyuşmuyorsa) en yeni
+        sağlam sürüme düşer; sürümlü depo yoksa eski düz dosyaları dener.
+        """
+        if vector_store.list_versions(self.index_path):
+            loaded = vector_store.load_latest_valid(
+                self.index_path, model_name=self.model_name, skip=self._rejected_versions
+            )
+            if loaded is None:
+                logger.error("[X] Vektör deposunda sağlam sürüm bulunamadı, indeks boş başlatılıyor.")
+                return
+            version, collections, manifest = loaded
+            snapshot = self._make_snapshot(collections, version, manifest)
+            self._swap(snapshot)
+            logger.info(
+                f"[i] Vektör indeksi yüklendi: {len(snapshot.documents)} parça, "
+                f"{len(collections)} koleksiyon (sürüm: {version})."
+            )
+        elif os.path.exists(f"{self.index_path}.index"):
+            index = faiss.read_index(f"{self.index_path}.index")
             with open(f"{self.index_path}.pkl", "rb") as f:
-                self.documents = pickle.load(f)
-            logger.info(f"[i] Vektör indeksi yüklendi: {len(self.documents)} parça.")
+                documents = pickle.load(f)
+            # Eski düzende iki dosya ayrı yazıldığı için yarım kalmış olabilir
+            if index.ntotal != len(documents):
+                logger.error(
+                    f"[X] Eski vektör indeksi tutarsız ({index.ntotal} vektör, {len(documents)} parça), "
+                    "yüklenmedi. Yeniden indeksleyin."
+                )
+                return
+            self._swap(self._make_snapshot({DEFAULT_COLLECTION: (index, documents)}))
+            logger.info(f"[i] Vektör indeksi yüklendi: {len(documents)} parça.")
+
+    def reload_if_changed(self) -> bool:
+        """
+        İşaretçi başka bir sürümü gösteriyorsa (örn. `python -m src.indexer` yeni sürüm yayınladı)
+        onu doğrulayıp yükler ve takas eder. Yükleme sırasında aramalar eski sürümle devam eder;
+        doğrulamadan geçemeyen sürüm atlanır ve mevcut sürüm kullanılmaya devam edilir.
+
+        Returns:
+            Yeni sürüme geçildiyse True
+        """
+        version = vector_store.read_pointer(self.index_path)
+        if not version or version == self._snapshot.version or version in self._rejected_versions:
+            return False
+        try:
+            collections, manifest = vector_store.load_version(
+                self.index_path, version, model_name=self.model_name
+            )
+        except VectorStoreError as e:
+            self._rejected_versions.add(version)
+            logger.error(f"[X] Yeni vektör indeksi sürümü reddedildi, mevcut sürüm kullanılıyor: {e.message}")
+            return False
+        snapshot = self._make_snapshot(collections, version, manifest)
+        previous = self._swap(snapshot)
+        logger.info(f"[+] Vektör indeksi yeni sürüme geçti: {previous} -> {version} ({len(snapshot.documents)} parça)")
+        return True
@@ -0,0 +1,364 @@
+"""
+Sürümlü vektör deposu düzeni.
+
+Her yeniden indeksleme yeni bir sürüm dizini üretir; aktif sürüm `CURRENT` işaretçi dosyasında
+tutulur. Sürüm önce `.staging-*` dizinine yazılır, tamamlanınca yeniden adlandırılır ve işaretçi
+`os.replace` ile atomik olarak değiştirilir. Böylece indeksleyici ayrı bir süreçte çalışırken
+bot yarım yazılmış bir indeks görmez; işaretçi değişince yeni sürümü yükleyip takas eder.
+
+Çökmeye dayanıklılık: her dosya geçici adla yazılır, fsync edilir ve yerine taşınır; dizinler de
+fsync edilir. `manifest.json` en son yazılır ve vektör/parça sayısını, modeli, boyutu ve dosya
+özetlerini (sha256) içerir. Manifesti olmayan veya manifestle uyuşmayan sürüm yüklenmez; yükleme
+bir önceki sağlam sürüme düşer.
+
+Koleksiyonlar: dökümanlar alana göre (örn. `genel`, `challenge`, `akademi`) ayrı FAISS
+indekslerine bölünür; bir arama sadece istenen koleksiyonların indekslerini tarar.
+
+    data/vector_store/
+        CURRENT                      # aktif sürüm adı
+        versions/
+            20261019T120301123456-3f2a9c/
+                collections/
+                    genel.faiss
+                    challenge.faiss
+                documents.pkl        # koleksiyon -> parça listesi (indeks sırasıyla)
+                manifest.json
+            .staging-20261019T130000654321-8b1d2e/   # yazılmakta (yarım kalırsa temizlenir)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.exceptions import VectorStoreError
+from src.core.lazy import lazy_import
+from src.core.logger import logger
+
+faiss = lazy_import("faiss")
+
+# Koleksiyon adı -> (FAISS indeksi, indeks sırasıyla parçalar)
+Collections = Dict[str, Tuple[Any, List[Dict[str, Any]]]]
+
+POINTER_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+STAGING_PREFIX = ".staging-"
+COLLECTIONS_DIR = "collections"
+DOCUMENTS_FILE = "documents.pkl"
+# Tek indeksli eski sürüm biçimi (manifestte "collections" yok)
+INDEX_FILE = "index.faiss"
+# Koleksiyonu belirtilmemiş parçalar
+DEFAULT_COLLECTION = "genel"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FORMAT = 2
+# Bu süreden eski staging dizinleri çökmüş bir indeksleyiciden kalmıştır
+STALE_STAGING_SECONDS = 3600
+
+
+def new_version_id() -> str:
+    """Sıralanabilir, çakışmayan sürüm adı (zaman damgası + rastgele ek)."""
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:6]}"
+
+
+def versions_path(root: str) -> str:
+    return os.path.join(root, VERSIONS_DIR)
+
+
+def version_path(root: str, version: str) -> str:
+    return os.path.join(root, VERSIONS_DIR, version)
+
+
+# ----------------------------------------------------------------------
+# Atomik dosya yazımı
+# ----------------------------------------------------------------------
+
+def _fsync_dir(path: str):
+    """Dizin girdilerini (yeniden adlandırma, yeni dosya) diske yazar (POSIX)."""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(path: str, write: Callable[[str], None]):
+    """`write(tmp_path)` ile geçici dosyaya yazar, fsync eder ve `path` üzerine taşır."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp)
+        with open(tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# İşaretçi
+# ----------------------------------------------------------------------
+
+def read_pointer(root: str) -> Optional[str]:
+    """Aktif sürüm adını döndürür (işaretçi yoksa None)."""
+    try:
+        with open(os.path.join(root, POINTER_FILE), encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def write_pointer(root: str, version: str):
+    """İşaretçiyi atomik olarak günceller (geçici dosya + fsync + os.replace)."""
+    def write(tmp: str):
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(version + "\n")
+
+    _write_atomic(os.path.join(root, POINTER_FILE), write)
+
+
+def list_versions(root: str) -> List[str]:
+    """Tamamlanmış sürümler (eskiden yeniye)."""
+    try:
+        names = os.listdir(versions_path(root))
+    except FileNotFoundError:
+        return []
+    return sorted(name for name in names if not name.startswith("."))
+
+
+# ----------------------------------------------------------------------
+# Sürüm yazma / yükleme
+# ----------------------------------------------------------------------
+
+def collection_file(name: str) -> str:
+    return f"{COLLECTIONS_DIR}/{name}.faiss"
+
+
+def stage_version(root: str, collections: Collections, model_name: Optional[str] = None) -> str:
+    """Yeni sürümü staging dizinine yazar ve tamamlanınca yerine taşır (işaretçiye dokunmaz)."""
+    dimensions = set()
+    for name, (index, documents) in collections.items():
+        if index.ntotal != len(documents):
+            raise VectorStoreError(
+                f"İndeks ve dökümanlar uyuşmuyor ({name}): {index.ntotal} vektör, {len(documents)} parça"
+            )
+        dimensions.add(int(index.d))
+    if len(dimensions) > 1:
+        raise VectorStoreError(f"Koleksiyon boyutları farklı: {sorted(dimensions)}")
+
+    version = new_version_id()
+    staging = os.path.join(versions_path(root), STAGING_PREFIX + version)
+    os.makedirs(os.path.join(staging, COLLECTIONS_DIR))
+    try:
+        written = []
+        for name, (index, _) in collections.items():
+            relative = collection_file(name)
+            _write_atomic(os.path.join(staging, relative), lambda tmp, index=index: faiss.write_index(index, tmp))
+            written.append(relative)
+
+        def write_documents(tmp: str):
+            with open(tmp, "wb") as f:
+                pickle.dump({name: documents for name, (_, documents) in collections.items()}, f)
+
+        _write_atomic(os.path.join(staging, DOCUMENTS_FILE), write_documents)
+        written.append(DOCUMENTS_FILE)
+
+        # Manifest en son yazılır: varlığı sürümün eksiksiz olduğunu gösterir
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "version": version,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "vector_count": sum(int(index.ntotal) for index, _ in collections.values()),
+            "chunk_count": sum(len(documents) for _, documents in collections.values()),
+            "model_name": model_name,
+            "dimension": dimensions.pop() if dimensions else None,
+            "collections": {
+                name: {"vector_count": int(index.ntotal), "chunk_count": len(documents)}
+                for name, (index, documents) in collections.items()
+            },
+            "files": {
+                relative: {
+                    "size": os.path.getsize(os.path.join(staging, relative)),
+                    "sha256": _sha256(os.path.join(staging, relative)),
+                }
+                for relative in written
+            },
+        }
+
+        def write_manifest(tmp: str):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        _write_atomic(os.path.join(staging, MANIFEST_FILE), write_manifest)
+
+        os.rename(staging, version_path(root, version))
+        _fsync_dir(versions_path(root))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return version
+
+
+def publish_version(
+    root: str,
+    collections: Collections,
+    keep: int = 3,
+    model_name: Optional[str] = None
+) -> str:
+    """Sürümü yazar, işaretçiyi ona çevirir ve eski sürümleri temizler."""
+    version = stage_version(root, collections, model_name=model_name)
+    write_pointer(root, version)
+    prune_versions(root, keep)
+    chunk_count = sum(len(documents) for _, documents in collections.values())
+    logger.info(
+        f"[+] Vektör indeksi yayınlandı: {version} ({chunk_count} parça, "
+        f"koleksiyonlar: {', '.join(sorted(collections)) or '-'})"
+    )
+    return version
+
+
+def read_manifest(root: str, version: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(version_path(root, version), MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise VectorStoreError(f"Manifest yok (yarım kalmış sürüm): {version}")
+    except ValueError as e:
+        raise VectorStoreError(f"Manifest okunamadı ({version}): {e}")
+
+
+def _read_collections(path: str, manifest: Dict[str, Any]) -> Collections:
+    with open(os.path.join(path, DOCUMENTS_FILE), "rb") as f:
+        documents = pickle.load(f)
+    if "collections" not in manifest:
+        # Tek indeksli eski sürüm (format 1): hepsi varsayılan koleksiyonda
+        return {DEFAULT_COLLECTION: (faiss.read_index(os.path.join(path, INDEX_FILE)), documents)}
+    return {
+        name: (faiss.read_index(os.path.join(path, collection_file(name))), documents[name])
+        for name in manifest["collections"]
+    }
+
+
+def load_version(
+    root: str,
+    version: str,
+    model_name: Optional[str] = None
+) -> Tuple[Collections, Dict[str, Any]]:
+    """
+    Bir sürümün koleksiyonlarını yükler ve manifestle doğrular.
+
+    Args:
+        model_name: Verilirse sürümün aynı embedding modeliyle oluşturulduğu da kontrol edilir
+
+    Raises:
+        VectorStoreError: Sürüm eksik, bozuk veya tutarsızsa
+    """
+    path = version_path(root, version)
+    manifest = read_manifest(root, version)
+
+    for name, expected in manifest.get("files", {}).items():
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path):
+            raise VectorStoreError(f"Dosya eksik ({version}): {name}")
+        if os.path.getsize(file_path) != expected["size"] or _sha256(file_path) != expected["sha256"]:
+            raise VectorStoreError(f"Dosya manifestle uyuşmuyor ({version}): {name}")
+
+    try:
+        collections = _read_collections(path, manifest)
+    except Exception as e:
+        raise VectorStoreError(f"Sürüm okunamadı ({version}): {e}")
+
+    problems = []
+    vector_count = sum(index.ntotal for index, _ in collections.values())
+    chunk_count = sum(len(documents) for _, documents in collections.values())
+    if vector_count != manifest["vector_count"]:
+        problems.append(f"vektör sayısı {vector_count} != {manifest['vector_count']}")
+    if chunk_count != manifest["chunk_count"]:
+        problems.append(f"parça sayısı {chunk_count} != {manifest['chunk_count']}")
+    for name, (index, documents) in collections.items():
+        if index.ntotal != len(documents):
+            problems.append(f"{name}: {index.ntotal} vektör != {len(documents)} parça")
+        if index.d != manifest["dimension"]:
+            problems.append(f"{name}: boyut {index.d} != {manifest['dimension']}")
+    if model_name and manifest.get("model_name") and manifest["model_name"] != model_name:
+        problems.append(f"model {manifest['model_name']} != {model_name}")
+    if problems:
+        raise VectorStoreError(f"Sürüm tutarsız ({version}): {', '.join(problems)}")
+    return collections, manifest
+
+
+def load_latest_valid(
+    root: str,
+    model_name: Optional[str] = None,
+    skip: Optional[set] = None
+) -> Optional[Tuple[str, Collections, Dict[str, Any]]]:
+    """
+    İşaretçinin gösterdiği sürümü, o geçersizse en yeni sağlam sürümü yükler.
+
+    Args:
+        skip: Daha önce geçersiz bulunmuş sürümler (yeniden denenmez)
+
+    Returns:
+        (sürüm, koleksiyonlar, manifest) veya hiç sağlam sürüm yoksa None
+    """
+    skip = skip if skip is not None else set()
+    current = read_pointer(root)
+    candidates = [current] if current else []
+    candidates += [v for v in reversed(list_versions(root)) if v != current]
+
+    for version in candidates:
+        if version in skip:
+            continue
+        try:
+            collections, manifest = load_version(root, version, model_name=model_name)
+        except VectorStoreError as e:
+            logger.error(f"[X] {e.message}")
+            skip.add(version)
+            continue
+        if version != current:
+            logger.warning(f"[!] Aktif sürüm ({current}) yüklenemedi, son sağlam sürüme dönüldü: {version}")
+        return version, collections, manifest
+    return None
+
+
+def prune_versions(root: str, keep: int = 3):
+    """Aktif sürüm ve en yeni `keep` sürüm dışındakileri ve bayat staging dizinlerini siler."""
+    current = read_pointer(root)
+    versions = list_versions(root)
+    for version in versions[:-keep] if keep > 0 else versions:
+        if version != current:
+            shutil.rmtree(version_path(root, version), ignore_errors=True)
+
+    now = time.time()
+    try:
+        names = os.listdir(versions_path(root))
+    except FileNotFoundError:
+        return
+    for name in names:
+        path = os.path.join(versions_path(root), name)
+        if name.startswith(STAGING_PREFIX) and now - os.path.getmtime(path) > STALE_STAGING_SECONDS:
+            logger.warning(f"[!] Yarım kalmış indeks sürümü temizleniyor: {name}")
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def normalize_collection(name: Optional[str]) -> str:
+    """Koleksiyon adını dosya adı olarak güvenli hale getirir (boşsa varsayılan koleksiyon)."""
+    cleaned = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in (name or "").strip().lower())
+    return cleaned or DEFAULT_COLLECTION
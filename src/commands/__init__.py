@@ -5,6 +5,8 @@ from .canvas_commands import CanvasManager
 from .pin_commands import PinManager
 from .search_commands import SearchManager
 from .file_commands import FileManager
+from .rate_limit import SlackRateLimiter, RateLimitedClient
+from .fanout import DirectMessageManager, DMChannelCache, FanOutResult, fan_out
 
 __all__ = [
     "ChatManager",
@@ -14,4 +16,10 @@ __all__ = [
     "PinManager",
     "SearchManager",
     "FileManager",
+    "SlackRateLimiter",
+    "RateLimitedClient",
+    "DirectMessageManager",
+    "DMChannelCache",
+    "FanOutResult",
+    "fan_out",
 ]
@@ -1,6 +1,7 @@
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Iterator, Iterable, Set
 from src.core.logger import logger
 from src.core.exceptions import SlackClientError
+from src.commands.pagination import iter_cursor_pages, DEFAULT_PAGE_SIZE
 
 class ConversationManager:
     """
@@ -42,15 +43,29 @@ class ConversationManager:
             logger.error(f"[X] conversations.info hatası: {e}")
             raise SlackClientError(str(e))
 
-    def list_channels(self, types: str = "public_channel,private_channel", limit: int = 100, **kwargs) -> List[Dict[str, Any]]:
-        """Workspace'teki kanalları listeler (conversations.list)."""
+    def iter_channels(
+        self,
+        types: str = "public_channel,private_channel",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_items: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """Workspace'teki kanalları sayfa sayfa dolaşır (conversations.list, cursor ile)."""
+        return iter_cursor_pages(
+            self.client.conversations_list,
+            "channels",
+            page_size=page_size,
+            max_items=max_items,
+            types=types,
+            **kwargs
+        )
+
+    def list_channels(self, types: str = "public_channel,private_channel", limit: int = DEFAULT_PAGE_SIZE, **kwargs) -> List[Dict[str, Any]]:
+        """Workspace'teki tüm kanalları listeler (conversations.list). `limit` sayfa büyüklüğüdür."""
         try:
-            response = self.client.conversations_list(types=types, limit=limit, **kwargs)
-            if response["ok"]:
-                channels = response.get("channels", [])
-                logger.info(f"[i] Kanallar listelendi: {len(channels)} adet")
-                return channels
-            raise SlackClientError(response['error'])
+            channels = list(self.iter_channels(types=types, page_size=limit, **kwargs))
+            logger.info(f"[i] Kanallar listelendi: {len(channels)} adet")
+            return channels
         except Exception as e:
             logger.error(f"[X] conversations.list hatası: {e}")
             raise SlackClientError(str(e))
@@ -79,14 +94,22 @@ class ConversationManager:
         # User token varsa onu kullan (workspace owner olarak işlem yapar)
         client_to_use = self.user_client if self.user_client else self.client
         
-        # Kanalın mevcut üyelerini al (zaten kanalda olanları davet etmemek için)
-        existing_members = set()
-        try:
-            members = self.get_members(channel_id)  # get_members artık user token kullanıyor
-            existing_members = set(members)
-            logger.debug(f"[i] Kanal mevcut üyeleri: {len(existing_members)} kişi")
-        except Exception as e:
-            logger.warning(f"[!] Kanal üyeleri alınamadı, devam ediliyor: {e}")
+        # Bot'un user ID'sini al (bot token ile mesaj gönderebilmek için davet edilecek)
+        bot_user_id = None
+        if include_bot:
+            try:
+                bot_info = self.client.auth_test()
+                if bot_info["ok"]:
+                    bot_user_id = bot_info["user_id"]
+            except Exception as e:
+                logger.warning(f"[!] Bot user ID alınamadı: {e}")
+        
+        # Kanalın mevcut üyelerini tara (zaten kanalda olanları davet etmemek için).
+        # Sadece davet edilecek kişiler aranır; hepsi bulunursa kalan sayfalar istenmez.
+        wanted = set(user_ids)
+        if bot_user_id:
+            wanted.add(bot_user_id)
+        existing_members = self.find_members(channel_id, wanted)
         
         # User token sahibini davet listesinden çıkar (zaten kanalda - user token ile oluşturulan kanallarda otomatik eklenir)
         user_token_owner_id = None
@@ -103,22 +126,13 @@ class ConversationManager:
         # Zaten kanalda olanları davet listesinden çıkar
         final_user_ids = [uid for uid in user_ids if uid not in existing_members]
         
-        # Bot'u mutlaka davet listesine ekle (bot token ile mesaj gönderebilmek için)
-        bot_user_id = None
-        if include_bot:
-            try:
-                # Bot'un user ID'sini al
-                bot_info = self.client.auth_test()
-                if bot_info["ok"]:
-                    bot_user_id = bot_info["user_id"]
-                    # Bot zaten kanalda değilse ekle
-                    if bot_user_id not in existing_members:
-                        final_user_ids.append(bot_user_id)
-                        logger.debug(f"[i] Bot user ID eklendi: {bot_user_id}")
-                    else:
-                        logger.debug(f"[i] Bot zaten kanalda: {bot_user_id}")
-            except Exception as e:
-                logger.warning(f"[!] Bot user ID alınamadı: {e}")
+        # Bot'u mutlaka davet listesine ekle (zaten kanalda değilse)
+        if bot_user_id:
+            if bot_user_id not in existing_members:
+                final_user_ids.append(bot_user_id)
+                logger.debug(f"[i] Bot user ID eklendi: {bot_user_id}")
+            else:
+                logger.debug(f"[i] Bot zaten kanalda: {bot_user_id}")
         
         # Eğer davet edilecek kimse yoksa, başarılı dön (zaten hepsi kanalda)
         if not final_user_ids:
@@ -208,71 +222,43 @@ class ConversationManager:
             logger.error(f"[X] conversations.invite hatası: {e}")
             raise SlackClientError(str(e))
 
-    def kick_user(self, channel_id: str, user_id: str, max_retries: int = 3) -> bool:
+    def kick_user(self, channel_id: str, user_id: str) -> bool:
         """
         Kullanıcıyı kanaldan çıkarır (conversations.kick). 
         User token varsa onu kullanır (workspace owner olarak işlem yapar).
-        Rate limit hatalarında otomatik retry yapar.
+        Rate limit (429) beklemeleri ve tekrar denemeler istemciyi saran SlackRateLimiter tarafından yapılır.
         """
-        import time
-        
         # User token varsa onu kullan (workspace owner olarak işlem yapar)
         client_to_use = self.user_client if self.user_client else self.client
         token_type = "user token" if self.user_client else "bot token"
         
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"[>] conversations.kick çağrılıyor (deneme {attempt + 1}/{max_retries}) | Kullanıcı: {user_id} | Kanal: {channel_id} | Token: {token_type}")
-                response = client_to_use.conversations_kick(channel=channel_id, user=user_id)
-                
-                if response["ok"]:
-                    logger.info(f"[+] Kullanıcı çıkarıldı: {user_id} (Kanal: {channel_id}) - {token_type} kullanıldı")
-                    return True
-                
-                # Hata durumunda detaylı log
-                error = response.get('error', 'unknown_error')
-                error_detail = response.get('response_metadata', {}).get('messages', [])
-                
-                logger.error(f"[X] conversations.kick hatası: {error} | Kullanıcı: {user_id} | Kanal: {channel_id} | Token: {token_type}")
-                if error_detail:
-                    logger.error(f"[X] Hata detayları: {error_detail}")
-                
-                # Bazı hatalar non-critical olabilir
-                if error in ["user_not_found", "channel_not_found", "not_in_channel"]:
-                    logger.warning(f"[!] conversations.kick non-critical hata: {error}")
-                    return False
-                
-                raise SlackClientError(f"conversations.kick failed: {error}")
-            except SlackClientError:
-                raise
-            except Exception as e:
-                error_str = str(e).lower()
-                
-                # Rate limit hatası kontrolü
-                if "rate_limited" in error_str or "ratelimited" in error_str or "429" in error_str:
-                    # Slack'in önerdiği bekleme süresini al
-                    retry_after = 60  # Varsayılan: 60 saniye
-                    
-                    # Response'dan Retry-After header'ını almaya çalış
-                    try:
-                        if hasattr(e, 'response') and e.response:
-                            retry_after = int(e.response.get('headers', {}).get('Retry-After', 60))
-                    except:
-                        pass
-                    
-                    if attempt < max_retries - 1:
-                        logger.warning(f"[!] Rate limit hatası! {retry_after} saniye bekleniyor... (deneme {attempt + 1}/{max_retries}) | Kullanıcı: {user_id}")
-                        time.sleep(retry_after)
-                        continue  # Tekrar dene
-                    else:
-                        logger.error(f"[X] Rate limit hatası! Max retry sayısına ulaşıldı | Kullanıcı: {user_id}")
-                        raise SlackClientError(f"Rate limit exceeded after {max_retries} retries")
-                
-                logger.error(f"[X] conversations.kick exception: {e} | Kullanıcı: {user_id} | Kanal: {channel_id}", exc_info=True)
-                raise SlackClientError(str(e))
-        
-        # Buraya gelmemeli ama yine de
-        return False
+        try:
+            logger.info(f"[>] conversations.kick çağrılıyor | Kullanıcı: {user_id} | Kanal: {channel_id} | Token: {token_type}")
+            response = client_to_use.conversations_kick(channel=channel_id, user=user_id)
+            
+            if response["ok"]:
+                logger.info(f"[+] Kullanıcı çıkarıldı: {user_id} (Kanal: {channel_id}) - {token_type} kullanıldı")
+                return True
+            
+            # Hata durumunda detaylı log
+            error = response.get('error', 'unknown_error')
+            error_detail = response.get('response_metadata', {}).get('messages', [])
+            
+            logger.error(f"[X] conversations.kick hatası: {error} | Kullanıcı: {user_id} | Kanal: {channel_id} | Token: {token_type}")
+            if error_detail:
+                logger.error(f"[X] Hata detayları: {error_detail}")
+            
+            # Bazı hatalar non-critical olabilir
+            if error in ["user_not_found", "channel_not_found", "not_in_channel"]:
+                logger.warning(f"[!] conversations.kick non-critical hata: {error}")
+                return False
+            
+            raise SlackClientError(f"conversations.kick failed: {error}")
+        except SlackClientError:
+            raise
+        except Exception as e:
+            logger.error(f"[X] conversations.kick exception: {e} | Kullanıcı: {user_id} | Kanal: {channel_id}", exc_info=True)
+            raise SlackClientError(str(e))
 
     def leave_channel(self, channel_id: str) -> bool:
         """Kanaldan veya grup DM'den ayrılır (conversations.leave)."""
@@ -390,6 +376,26 @@ class ConversationManager:
             logger.error(f"[X] conversations.history hatası: {e}")
             raise SlackClientError(str(e))
 
+    def iter_history(
+        self,
+        channel_id: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_items: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Kanal geçmişini sayfa sayfa dolaşır (conversations.history, cursor ile).
+        Mesajlar Slack'in döndürdüğü sırayla, en yeniden en eskiye gelir.
+        """
+        return iter_cursor_pages(
+            self.client.conversations_history,
+            "messages",
+            page_size=page_size,
+            max_items=max_items,
+            channel=channel_id,
+            **kwargs
+        )
+
     def get_replies(self, channel_id: str, ts: str, **kwargs) -> List[Dict[str, Any]]:
         """Bir mesaj dizisindeki (thread) cevapları getirir (conversations.replies)."""
         try:
@@ -401,19 +407,59 @@ class ConversationManager:
             logger.error(f"[X] conversations.replies hatası: {e}")
             raise SlackClientError(str(e))
 
-    def get_members(self, channel_id: str, limit: int = 100, **kwargs) -> List[str]:
-        """Kanal üyelerinin ID listesini getirir (conversations.members). User token varsa onu kullanır."""
+    def iter_members(
+        self,
+        channel_id: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_items: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Kanal üyelerini sayfa sayfa dolaşır (conversations.members, cursor ile).
+        User token varsa onu kullanır. Döngü erken kırılırsa kalan sayfalar istenmez.
+        """
         # User token varsa onu kullan (user token ile oluşturulan kanalları görebilmek için)
         client_to_use = self.user_client if self.user_client else self.client
+        return iter_cursor_pages(
+            client_to_use.conversations_members,
+            "members",
+            page_size=page_size,
+            max_items=max_items,
+            channel=channel_id,
+            **kwargs
+        )
+
+    def get_members(self, channel_id: str, limit: int = DEFAULT_PAGE_SIZE, **kwargs) -> List[str]:
+        """Kanalın tüm üyelerinin ID listesini getirir (conversations.members). `limit` sayfa büyüklüğüdür."""
         try:
-            response = client_to_use.conversations_members(channel=channel_id, limit=limit, **kwargs)
-            if response["ok"]:
-                return response.get("members", [])
-            raise SlackClientError(response['error'])
+            return list(self.iter_members(channel_id, page_size=limit, **kwargs))
         except Exception as e:
             logger.error(f"[X] conversations.members hatası: {e}")
             raise SlackClientError(str(e))
 
+    def find_members(self, channel_id: str, user_ids: Iterable[str], **kwargs) -> Set[str]:
+        """
+        Verilen kullanıcılardan kanalda olanları döndürür.
+        Aranan herkes bulunduğunda sayfalama durur; hata durumunda boş küme döner.
+        """
+        wanted = set(user_ids)
+        found = set()
+        if not wanted:
+            return found
+        try:
+            for member_id in self.iter_members(channel_id, **kwargs):
+                if member_id in wanted:
+                    found.add(member_id)
+                    if len(found) == len(wanted):
+                        break
+        except Exception as e:
+            logger.warning(f"[!] Kanal üyeleri alınamadı, devam ediliyor: {e}")
+        return found
+
+    def is_member(self, channel_id: str, user_id: str) -> bool:
+        """Kullanıcının kanalda olup olmadığını kontrol eder (bulunduğu sayfada durur)."""
+        return user_id in self.find_members(channel_id, [user_id])
+
     def open_conversation(self, users: List[str], **kwargs) -> Dict[str, Any]:
         """DM veya grup DM başlatır (conversations.open)."""
         try:
@@ -0,0 +1,212 @@
+"""
+Çok sayıda kullanıcıya/kanala aynı anda Slack çağrısı yapmak için sınırlı eşzamanlı fan-out.
+
+Çağrılar yine ChatManager/ConversationManager üzerinden (dolayısıyla RateLimitedClient ve
+SlackRateLimiter tier limitleriyle) yapılır; burada sadece sırayla beklemek yerine en fazla
+`max_concurrency` çağrı aynı anda uçuşta tutulur. chat.postMessage limiti kanal başına
+uygulandığından farklı DM kanallarına giden mesajlar birbirini beklemez.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+from src.core.logger import logger
+from src.core.exceptions import SlackClientError
+from src.commands.chat_commands import ChatManager
+from src.commands.conversation_commands import ConversationManager
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Bu hatalarda önbellekteki DM kanalı geçersiz sayılır ve bir kez yeniden açılır
+STALE_CHANNEL_ERRORS = ("channel_not_found", "is_archived", "not_in_channel")
+
+
+class FanOutResult:
+    """Fan-out sonucu: anahtar bazında başarılı sonuçlar ve hatalar."""
+
+    def __init__(self):
+        self.succeeded: Dict[Hashable, Any] = {}
+        self.failed: Dict[Hashable, Exception] = {}
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    def summary(self) -> str:
+        return f"{len(self.succeeded)}/{self.total} başarılı ({self.elapsed:.2f}s)"
+
+
+def fan_out(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    key: Callable[[Any], Hashable] = lambda item: item,
+    name: str = "fan-out"
+) -> FanOutResult:
+    """
+    `func(item)` çağrılarını en fazla `max_concurrency` eşzamanlı olarak çalıştırır ve hepsini bekler.
+    Bir çağrının hatası diğerlerini durdurmaz; hatalar sonuçta raporlanır.
+
+    Args:
+        func: Her öğe için çağrılacak fonksiyon
+        items: Öğeler (tekrarlar bir kez işlenir)
+        max_concurrency: Aynı anda çalışacak en fazla çağrı
+        key: Sonuç sözlüklerinde kullanılacak anahtar
+        name: Log'larda görünen iş adı
+    """
+    unique: "OrderedDict[Hashable, Any]" = OrderedDict()
+    for item in items:
+        unique.setdefault(key(item), item)
+
+    result = FanOutResult()
+    if not unique:
+        return result
+
+    started = time.perf_counter()
+    workers = max(1, min(max_concurrency, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name) as executor:
+        futures = {k: executor.submit(func, item) for k, item in unique.items()}
+    for k, future in futures.items():
+        error = future.exception()
+        if error is None:
+            result.succeeded[k] = future.result()
+        else:
+            result.failed[k] = error
+    result.elapsed = time.perf_counter() - started
+
+    if result.failed:
+        logger.warning(
+            f"[!] {name}: {result.summary()} | Hatalı: "
+            + ", ".join(f"{k} ({e})" for k, e in result.failed.items())
+        )
+    else:
+        logger.debug(f"[+] {name}: {result.summary()}")
+    return result
+
+
+class DMChannelCache:
+    """Kullanıcı -> DM kanal ID önbelleği (LRU). conversations.open her kullanıcı için bir kez çağrılır."""
+
+    def __init__(self, conv_manager: ConversationManager, max_size: int = 2048):
+        self.conv = conv_manager
+        self.max_size = max_size
+        self._channels: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> str:
+        """Kullanıcının DM kanal ID'si (gerekirse açılır)."""
+        with self._lock:
+            channel_id = self._channels.get(user_id)
+            if channel_id is not None:
+                self._channels.move_to_end(user_id)
+                self.hits += 1
+                return channel_id
+            self.misses += 1
+
+        channel_id = self.conv.open_conversation(users=[user_id])["id"]
+        with self._lock:
+            self._channels[user_id] = channel_id
+            self._channels.move_to_end(user_id)
+            while len(self._channels) > self.max_size:
+                self._channels.popitem(last=False)
+        return channel_id
+
+    def forget(self, user_id: str):
+        with self._lock:
+            self._channels.pop(user_id, None)
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+
+MessageContent = Union[Tuple[str, Optional[List[Dict[str, Any]]]], str]
+
+
+class DirectMessageManager:
+    """
+    Kullanıcılara DM gönderimi (tekli ve toplu).
+    DM kanal ID'leri önbelleğe alınır; toplu gönderimler `fan_out` ile eşzamanlı yapılır.
+    """
+
+    def __init__(
+        self,
+        chat_manager: ChatManager,
+        conv_manager: ConversationManager,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
+        self.chat = chat_manager
+        self.channels = DMChannelCache(conv_manager)
+        self.max_concurrency = max_concurrency
+
+    def send_dm(self, user_id: str, text: str, blocks: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Kullanıcıya DM gönderir; önbellekteki kanal geçersizse bir kez yeniden açar."""
+        channel_id = self.channels.get(user_id)
+        try:
+            return self.chat.post_message(channel=channel_id, text=text, blocks=blocks)
+        except SlackClientError as e:
+            if not any(code in str(e) for code in STALE_CHANNEL_ERRORS):
+                raise
+            self.channels.forget(user_id)
+            return self.chat.post_message(channel=self.channels.get(user_id), text=text, blocks=blocks)
+
+    def queue_dm(self, user_id: str, text: str, blocks: Optional[List[Dict[str, Any]]] = None) -> Future:
+        """Acil olmayan DM'i Slack rate limit kuyruğuna verir; çağıran (handler) thread beklemez."""
+        return self._submit(self.send_dm, user_id, text, blocks)
+
+    def queue_dms(
+        self,
+        user_ids: Iterable[str],
+        text: Union[str, Callable[[str], MessageContent]],
+        blocks: Optional[List[Dict[str, Any]]] = None,
+        name: str = "dm-fan-out"
+    ) -> Future:
+        """`send_dms`'in arka plan kuyruğunda çalışan hali; sonuç (FanOutResult) Future ile döner."""
+        return self._submit(self.send_dms, list(user_ids), text, blocks, name)
+
+    def _submit(self, func: Callable[..., Any], *args) -> Future:
+        limiter = getattr(getattr(self.chat, "client", None), "limiter", None)
+        if limiter is not None:
+            return limiter.submit(func, *args)
+        # Rate limit kuyruğu olmayan istemci (örn. testler): hemen gönder
+        future: Future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            logger.error(f"[X] DM gönderilemedi: {e}")
+            future.set_exception(e)
+        return future
+
+    def send_dms(
+        self,
+        user_ids: Iterable[str],
+        text: Union[str, Callable[[str], MessageContent]],
+        blocks: Optional[List[Dict[str, Any]]] = None,
+        name: str = "dm-fan-out"
+    ) -> FanOutResult:
+        """
+        Aynı mesajı (veya kullanıcıya özel mesajı) tüm kullanıcılara eşzamanlı gönderir.
+
+        Args:
+            user_ids: Alıcı kullanıcılar
+            text: Mesaj metni ya da user_id -> metin / (metin, blocks) döndüren fonksiyon
+            blocks: Sabit mesaj için Block Kit blokları
+            name: Log'larda görünen iş adı
+        """
+        def send(user_id: str):
+            if callable(text):
+                content = text(user_id)
+                msg_text, msg_blocks = content if isinstance(content, tuple) else (content, None)
+            else:
+                msg_text, msg_blocks = text, blocks
+            return self.send_dm(user_id, msg_text, msg_blocks)
+
+        return fan_out(send, user_ids, max_concurrency=self.max_concurrency, name=name)
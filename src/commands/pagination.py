@@ -0,0 +1,73 @@
+"""
+Slack cursor tabanlı liste endpoint'leri için sayfalama yardımcıları.
+Dökümantasyon: https://api.slack.com/apis/pagination
+"""
+
+import time
+from typing import Any, Callable, Iterator, Optional
+from src.core.logger import logger
+from src.core.exceptions import SlackClientError
+
+# Slack çoğu liste metodunda 200'ün üzerindeki limitleri önermiyor
+DEFAULT_PAGE_SIZE = 200
+
+
+def iter_cursor_pages(
+    method: Callable[..., Any],
+    items_key: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_items: Optional[int] = None,
+    page_delay: float = 0.0,
+    **kwargs
+) -> Iterator[Any]:
+    """
+    Cursor tabanlı bir Slack liste metodunu sayfa sayfa, tembel (lazy) olarak dolaşır.
+
+    Bir sonraki sayfa ancak mevcut sayfanın tüm elemanları tüketildiğinde istenir;
+    böylece çağıran taraf aradığını bulduğunda döngüyü kırarak ek API çağrısı yapılmasını engeller.
+
+    Args:
+        method: WebClient metodu (örn: client.conversations_members)
+        items_key: Yanıttaki liste alanı (örn: "members", "channels")
+        page_size: Sayfa başına istenecek eleman sayısı (Slack `limit` parametresi)
+        max_items: Döndürülecek maksimum eleman sayısı (None ise sınırsız)
+        page_delay: Sayfalar arasında beklenecek süre (saniye, Tier 2 metodlar için)
+        **kwargs: Metoda aynen iletilecek ek parametreler
+    """
+    method_name = getattr(method, "__name__", "slack_method")
+    cursor: Optional[str] = None
+    yielded = 0
+    page = 0
+
+    while True:
+        if max_items is not None:
+            limit = min(page_size, max_items - yielded)
+        else:
+            limit = page_size
+
+        # 429 beklemeleri ve tekrar denemeler istemciyi saran SlackRateLimiter'da yapılır
+        try:
+            response = method(limit=limit, cursor=cursor, **kwargs)
+        except Exception as e:
+            logger.error(f"[X] {method_name} sayfalama hatası (sayfa {page + 1}): {e}")
+            raise SlackClientError(str(e))
+
+        if not response["ok"]:
+            raise SlackClientError(response.get("error", "unknown_error"))
+
+        page += 1
+        items = response.get(items_key, [])
+        logger.debug(f"[i] {method_name} sayfa {page}: {len(items)} kayıt")
+
+        for item in items:
+            yield item
+            yielded += 1
+            if max_items is not None and yielded >= max_items:
+                return
+
+        cursor = (response.get("response_metadata") or {}).get("next_cursor")
+        if not cursor:
+            return
+
+        if page_delay > 0:
+            time.sleep(page_delay)
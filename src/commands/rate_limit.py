@@ -0,0 +1,306 @@
+"""
+Slack Web API için istemci tarafı rate limit zamanlayıcısı.
+Dökümantasyon: https://api.slack.com/apis/rate-limits
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from src.core.logger import logger
+from src.core.exceptions import SlackClientError
+from src.core.singleton import SingletonMeta
+
+# Slack tier limitleri: (dakikada istek, anlık patlama kapasitesi)
+TIER_LIMITS: Dict[Any, Tuple[int, int]] = {
+    1: (1, 1),
+    2: (20, 3),
+    3: (50, 5),
+    4: (100, 10),
+    # chat.postMessage: kanal başına saniyede ~1 mesaj
+    "special": (60, 3),
+}
+
+DEFAULT_TIER = 3
+
+# WebClient metod adı -> Slack tier
+METHOD_TIERS: Dict[str, Any] = {
+    "auth_test": 4,
+    "chat_postMessage": "special",
+    "chat_postEphemeral": 4,
+    "chat_update": 3,
+    "chat_delete": 3,
+    "chat_getPermalink": 4,
+    "chat_scheduleMessage": 3,
+    "conversations_create": 2,
+    "conversations_archive": 2,
+    "conversations_unarchive": 2,
+    "conversations_rename": 2,
+    "conversations_setTopic": 2,
+    "conversations_setPurpose": 2,
+    "conversations_list": 2,
+    "conversations_info": 3,
+    "conversations_invite": 3,
+    "conversations_kick": 3,
+    "conversations_join": 3,
+    "conversations_open": 3,
+    "conversations_history": 3,
+    "conversations_replies": 3,
+    "conversations_members": 4,
+    "conversations_canvases_create": 2,
+    "canvases_create": 2,
+    "canvases_edit": 3,
+    "canvases_delete": 2,
+    "users_list": 2,
+    "users_info": 4,
+    "users_lookupByEmail": 3,
+    "users_conversations": 3,
+    "users_profile_get": 4,
+    "files_upload_v2": 2,
+    "pins_add": 2,
+    "pins_remove": 2,
+    "search_messages": 2,
+}
+
+# Bu metodlar için limit kanal başına uygulanır
+PER_CHANNEL_METHODS = {"chat_postMessage"}
+
+
+def retry_after_seconds(error: Exception) -> Optional[int]:
+    """Hata 429 (rate limit) ise Slack'in önerdiği bekleme süresini döndürür."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    status_code = getattr(response, "status_code", None)
+    headers = getattr(response, "headers", None) or {}
+    error_code = response.get("error") if hasattr(response, "get") else None
+
+    if status_code != 429 and error_code != "ratelimited":
+        return None
+
+    try:
+        return int(headers.get("Retry-After", headers.get("retry-after", 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+class TokenBucket:
+    """
+    Rezervasyon tabanlı token bucket.
+    Her çağrı bir token rezerve eder ve ne kadar beklemesi gerektiğini öğrenir;
+    böylece bekleyen çağrılar geliş sırasına göre (FIFO) kuyruklanır.
+    """
+
+    def __init__(self, per_minute: int, burst: int):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Bir token rezerve eder, çağrının beklemesi gereken süreyi (saniye) döndürür."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            wait = 0.0
+            if self.tokens < 0:
+                wait = -self.tokens / self.rate
+            return max(wait, self.blocked_until - now)
+
+    def refund(self):
+        """Kullanılmayan bir rezervasyonu geri verir."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def block(self, seconds: float):
+        """Slack'in Retry-After süresi boyunca yeni çağrıları bekletir."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = min(self.tokens, 0.0)
+
+
+class SlackRateLimiter(metaclass=SingletonMeta):
+    """
+    Slack Web API çağrıları için merkezi zamanlayıcı.
+    Her metod için tier'ına uygun bir token bucket tutar, 429 yanıtlarında
+    Retry-After süresine uyar ve metod bazlı istatistik toplar.
+
+    Slack handler thread'lerinde (`handler_executor` ile çalışan listener'lar) bir çağrı en fazla
+    `handler_max_wait` saniye bekler; daha uzun bekleme gerekiyorsa hemen hata verir. Acil olmayan
+    işler (DM, toplu bildirim) `submit` ile arka plan kuyruğuna verilir; arka plan thread'leri
+    (cron, kuyruk worker'ları) `max_queue_wait` saniyeye kadar bekleyebilir.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        max_queue_wait: float = 120.0,
+        handler_max_wait: float = 3.0,
+        workers: int = 4
+    ):
+        self.max_retries = max_retries
+        self.max_queue_wait = max_queue_wait
+        self.handler_max_wait = handler_max_wait
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="slack-rl")
+
+    def _bucket_for(self, method_name: str, kwargs: Dict[str, Any]) -> TokenBucket:
+        key = method_name
+        if method_name in PER_CHANNEL_METHODS and kwargs.get("channel"):
+            key = f"{method_name}:{kwargs['channel']}"
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    tier = METHOD_TIERS.get(method_name, DEFAULT_TIER)
+                    per_minute, burst = TIER_LIMITS[tier]
+                    bucket = TokenBucket(per_minute, burst)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def _record(self, method_name: str, field: str, amount: float = 1):
+        with self._lock:
+            stats = self._stats.setdefault(method_name, {
+                "calls": 0,
+                "queued": 0,
+                "rate_limited": 0,
+                "errors": 0,
+                "wait_seconds": 0.0,
+            })
+            stats[field] += amount
+
+    @contextmanager
+    def handler_context(self) -> Iterator[None]:
+        """Bu blok içindeki çağrılar handler thread'i gibi kısa bekleme sınırıyla yapılır."""
+        previous = getattr(self._local, "in_handler", False)
+        self._local.in_handler = True
+        try:
+            yield
+        finally:
+            self._local.in_handler = previous
+
+    def _run_in_handler(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self.handler_context():
+            return func(*args, **kwargs)
+
+    def handler_executor(self, max_workers: int = 5) -> "HandlerExecutor":
+        """Slack listener'ları için executor (Bolt `listener_executor`): her listener handler kipinde çalışır."""
+        return HandlerExecutor(self, max_workers=max_workers)
+
+    def _max_wait(self) -> float:
+        return self.handler_max_wait if getattr(self._local, "in_handler", False) else self.max_queue_wait
+
+    def call(self, method_name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Slack metodunu limitlere uyarak çağırır.
+        Token yoksa sırası gelene kadar bekler; 429 alınırsa Retry-After kadar
+        bu metodu bloklayıp yeniden dener. Handler thread'inde bekleme `handler_max_wait`
+        ile sınırlıdır; aşılırsa uyumadan hata verilir.
+        """
+        bucket = self._bucket_for(method_name, kwargs)
+        max_wait = self._max_wait()
+
+        for attempt in range(self.max_retries):
+            wait = bucket.reserve()
+            if wait > max_wait:
+                bucket.refund()
+                self._record(method_name, "errors")
+                raise SlackClientError(f"{method_name} rate limit kuyruğu dolu ({wait:.0f}s bekleme)")
+            if wait > 0:
+                self._record(method_name, "queued")
+                self._record(method_name, "wait_seconds", wait)
+                logger.debug(f"[i] Slack rate limit kuyruğu | {method_name} | {wait:.2f}s")
+                time.sleep(wait)
+
+            self._record(method_name, "calls")
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                retry_after = retry_after_seconds(e)
+                if retry_after is None:
+                    self._record(method_name, "errors")
+                    raise
+                self._record(method_name, "rate_limited")
+                bucket.block(retry_after)
+                if attempt >= self.max_retries - 1:
+                    logger.error(f"[X] {method_name} rate limit | Max retry sayısına ulaşıldı")
+                    raise
+                if retry_after > max_wait:
+                    logger.warning(f"[!] {method_name} rate limit (429) | {retry_after}s beklenmeden hata veriliyor")
+                    raise
+                logger.warning(
+                    f"[!] {method_name} rate limit (429) | {retry_after}s sonra tekrar denenecek "
+                    f"(deneme {attempt + 1}/{self.max_retries})"
+                )
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Acil olmayan bir işi (örn. DM gönderimi) arka plan kuyruğunda çalıştırır; çağıran thread
+        beklemez. İş içindeki Slack çağrıları `max_queue_wait` saniyeye kadar sırasını bekleyebilir.
+        """
+        name = getattr(func, "__name__", "slack-job")
+
+        def log_failure(future: Future):
+            error = future.exception()
+            if error is not None:
+                logger.error(f"[X] Arka plan Slack işi başarısız: {name} | {error}")
+
+        future = self._executor.submit(func, *args, **kwargs)
+        future.add_done_callback(log_failure)
+        return future
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Metod bazlı çağrı/kuyruk/429 istatistiklerini döndürür."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+class HandlerExecutor(ThreadPoolExecutor):
+    """Slack listener'larını `SlackRateLimiter.handler_context` içinde çalıştıran executor."""
+
+    def __init__(self, limiter: SlackRateLimiter, max_workers: int = 5):
+        super().__init__(max_workers=max_workers, thread_name_prefix="slack-handler")
+        self.limiter = limiter
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return super().submit(self.limiter._run_in_handler, fn, *args, **kwargs)
+
+
+class RateLimitedClient:
+    """
+    WebClient'ı saran vekil (proxy) sınıf.
+    Tüm Slack metod çağrıları SlackRateLimiter üzerinden geçer; diğer öznitelikler
+    (token, base_url vb.) olduğu gibi iletilir.
+    """
+
+    def __init__(self, client, limiter: Optional[SlackRateLimiter] = None):
+        self._client = client
+        self.limiter = limiter or SlackRateLimiter()
+
+    @property
+    def raw(self):
+        """Sarılmamış WebClient."""
+        return self._client
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def rate_limited_call(*args, **kwargs):
+            return self.limiter.call(name, attr, *args, **kwargs)
+
+        rate_limited_call.__name__ = name
+        return rate_limited_call
@@ -1,6 +1,7 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from src.core.logger import logger
 from src.core.exceptions import SlackClientError
+from src.commands.pagination import iter_cursor_pages, DEFAULT_PAGE_SIZE
 
 class UserManager:
     """
@@ -27,9 +28,22 @@ class UserManager:
             logger.error(f"[X] users.info hatası: {e}", exc_info=True)
             raise SlackClientError(str(e))
 
+    def iter_users(self, page_size: int = DEFAULT_PAGE_SIZE, max_items: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Workspace kullanıcılarını sayfa sayfa dolaşır (users.list, cursor ile).
+        Döngü erken kırılırsa kalan sayfalar istenmez.
+        """
+        return iter_cursor_pages(
+            self.client.users_list,
+            "members",
+            page_size=page_size,
+            max_items=max_items
+        )
+
     def list_users(self, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
         """
-        Workspace'teki tüm kullanıcıları listeler (users.list).
+        Workspace kullanıcılarının tek bir sayfasını listeler (users.list).
+        Tüm kullanıcılar için `iter_users` kullanın.
         """
         try:
             response = self.client.users_list(limit=limit, cursor=cursor)
@@ -0,0 +1,319 @@
+"""
+Cemil Bot bağımlılık grafiği.
+
+Tüm client, command manager, repository ve servisler burada `Container`'a kaydedilir ve ilk
+kullanımda oluşturulur. Bot (`src/bot.py`) grafiğin tamamını kullanır; CLI'lar ve worker'lar
+sadece ihtiyaç duydukları servisi ister:
+
+    from src.container import build_container
+
+    container = build_container()
+    hubs = container.challenge_hub_repo.list(limit=5)   # sadece settings + db_client oluşturulur
+
+Fabrikalar modülleri fonksiyon içinde import eder; kullanılmayan servisin modülü yüklenmez.
+"""
+
+from typing import Optional
+
+from src.core.container import Container
+from src.core.settings import BotSettings, get_settings
+
+# (servis adı, sınıf adı) — hepsi sadece db_client alır
+REPOSITORIES = (
+    ("user_repo", "UserRepository"),
+    ("match_repo", "MatchRepository"),
+    ("coffee_pool_repo", "CoffeePoolRepository"),
+    ("poll_repo", "PollRepository"),
+    ("vote_repo", "VoteRepository"),
+    ("feedback_repo", "FeedbackRepository"),
+    ("email_outbox_repo", "EmailOutboxRepository"),
+    ("help_repo", "HelpRepository"),
+    ("challenge_hub_repo", "ChallengeHubRepository"),
+    ("challenge_start_repo", "ChallengeStartRepository"),
+    ("challenge_participant_repo", "ChallengeParticipantRepository"),
+    ("challenge_project_repo", "ChallengeProjectRepository"),
+    ("challenge_submission_repo", "ChallengeSubmissionRepository"),
+    ("challenge_theme_repo", "ChallengeThemeRepository"),
+    ("user_challenge_stats_repo", "UserChallengeStatsRepository"),
+    ("challenge_evaluation_repo", "ChallengeEvaluationRepository"),
+    ("challenge_evaluator_repo", "ChallengeEvaluatorRepository"),
+    ("stats_repo", "StatisticsRepository"),
+)
+
+
+def build_container(settings: Optional[BotSettings] = None) -> Container:
+    """
+    Uygulamanın bağımlılık konteynerini oluşturur (hiçbir servis henüz oluşturulmaz).
+
+    Args:
+        settings: Ayarlar (verilmezse `get_settings()` ilk kullanımda çağrılır)
+    """
+    container = Container()
+    if settings is not None:
+        container.register_instance("settings", settings)
+    else:
+        container.register("settings", lambda c: get_settings())
+
+    _register_clients(container)
+    _register_slack(container)
+    _register_repositories(container)
+    _register_services(container)
+    return container
+
+
+# ----------------------------------------------------------------------
+# Client'lar
+# ----------------------------------------------------------------------
+
+def _register_clients(container: Container):
+    def db_client(c):
+        from src.clients.database_client import DatabaseClient
+        return DatabaseClient(db_path=c.settings.database_path)
+
+    def groq_client(c):
+        from src.clients.groq_client import GroqClient
+        return GroqClient()
+
+    def vector_client(c):
+        from src.clients.vector_client import VectorClient
+        return VectorClient(index_path=c.settings.vector_store_dir, keep_versions=c.settings.vector_store_keep_versions)
+
+    def reranker_client(c):
+        from src.clients.reranker_client import RerankerClient
+        settings = c.settings
+        return RerankerClient(
+            model_name=settings.rerank_model,
+            batch_size=settings.rerank_batch_size,
+            budget_ms=settings.rerank_budget_ms,
+            early_exit_score=settings.rerank_early_exit_score
+        )
+
+    def smtp_client(c):
+        from src.clients.smpt_client import SMTPClient
+        settings = c.settings
+        return SMTPClient(
+            smtp_host=settings.smtp_host,
+            smtp_port=settings.smtp_port,
+            use_tls=settings.smtp_use_tls
+        )
+
+    def state_backend(c):
+        # Kilit, lider seçimi ve paylaşılan sayaçlar (birden fazla süreç için STATE_BACKEND=sqlite/redis)
+        from src.clients.state_backend import configure_state_backend, create_state_backend
+        settings = c.settings
+        backend = create_state_backend(settings.state_backend, settings.state_db_path, settings.redis_url)
+        configure_state_backend(backend)
+        return backend
+
+    def leader_elector(c):
+        from src.clients.state_backend import LeaderElector
+        return LeaderElector(
+            c.state_backend, instance_id=c.settings.instance_id, ttl=c.settings.leader_lease_seconds
+        )
+
+    def cron_client(c):
+        from src.clients.cron_client import CronClient
+        client = CronClient()
+        client.enable_coordination(c.state_backend, c.leader_elector)
+        return client
+
+    container.register("db_client", db_client)
+    container.register("groq_client", groq_client)
+    container.register("vector_client", vector_client)
+    container.register("reranker_client", reranker_client)
+    container.register("smtp_client", smtp_client)
+    container.register("state_backend", state_backend, close=lambda backend: backend.close())
+    container.register("leader_elector", leader_elector, close=lambda elector: elector.stop())
+    container.register("cron_client", cron_client, close=lambda client: client.shutdown(wait=False))
+
+
+# ----------------------------------------------------------------------
+# Slack (App + command manager'lar)
+# ----------------------------------------------------------------------
+
+def _register_slack(container: Container):
+    def slack_web_client(c):
+        from slack_sdk import WebClient
+        if not c.settings.slack_bot_token:
+            raise ValueError("SLACK_BOT_TOKEN environment variable is required!")
+        return WebClient(token=c.settings.slack_bot_token)
+
+    def app(c):
+        from slack_bolt import App
+        from src.core.startup_profiler import is_profile_child
+        # Profil modunda (CI) auth.test ağ çağrısı yapılmaz; ölçülen şey botun kendi açılış maliyetidir
+        # Listener'lar handler kipinde çalışır: Slack rate limit beklemesi kısa tutulur, uzun kuyrukta hata verilir
+        return App(
+            client=c.slack_web_client,
+            token_verification_enabled=not is_profile_child(),
+            listener_executor=c.slack_rate_limiter.handler_executor()
+        )
+
+    def slack_rate_limiter(c):
+        from src.commands.rate_limit import SlackRateLimiter
+        return SlackRateLimiter()
+
+    def bot_client(c):
+        # Tüm Slack Web API çağrıları tier bazlı merkezi rate limit zamanlayıcısından geçer
+        from src.commands.rate_limit import RateLimitedClient
+        return RateLimitedClient(c.slack_web_client, c.slack_rate_limiter)
+
+    def user_client(c):
+        # User token varsa kanal oluşturma ve erişim için kullanılır
+        if not c.settings.slack_user_token:
+            return None
+        from slack_sdk import WebClient
+        from src.commands.rate_limit import RateLimitedClient
+        return RateLimitedClient(WebClient(token=c.settings.slack_user_token), c.slack_rate_limiter)
+
+    def chat_manager(c):
+        from src.commands.chat_commands import ChatManager
+        return ChatManager(c.bot_client, user_client=c.user_client)
+
+    def conv_manager(c):
+        from src.commands.conversation_commands import ConversationManager
+        return ConversationManager(c.bot_client, user_client=c.user_client)
+
+    def user_manager(c):
+        from src.commands.user_commands import UserManager
+        return UserManager(c.bot_client)
+
+    def canvas_manager(c):
+        from src.commands.canvas_commands import CanvasManager
+        return CanvasManager(c.bot_client)
+
+    def dm_manager(c):
+        # DM kanal ID'leri servisler arasında paylaşılan önbellekte tutulur
+        from src.commands.fanout import DirectMessageManager
+        return DirectMessageManager(c.chat_manager, c.conv_manager)
+
+    container.register("slack_web_client", slack_web_client)
+    container.register("app", app)
+    container.register("slack_rate_limiter", slack_rate_limiter)
+    container.register("bot_client", bot_client)
+    container.register("user_client", user_client)
+    container.register("chat_manager", chat_manager)
+    container.register("conv_manager", conv_manager)
+    container.register("user_manager", user_manager)
+    container.register("canvas_manager", canvas_manager)
+    container.register("dm_manager", dm_manager)
+
+
+# ----------------------------------------------------------------------
+# Repository'ler
+# ----------------------------------------------------------------------
+
+def _repository_factory(class_name: str):
+    def factory(c):
+        import src.repositories as repositories
+        return getattr(repositories, class_name)(c.db_client)
+    return factory
+
+
+def _register_repositories(container: Container):
+    for name, class_name in REPOSITORIES:
+        container.register(name, _repository_factory(class_name))
+
+
+# ----------------------------------------------------------------------
+# Servisler
+# ----------------------------------------------------------------------
+
+def _register_services(container: Container):
+    def coffee_service(c):
+        from src.services.match_service import CoffeeMatchService
+        return CoffeeMatchService(
+            c.chat_manager, c.conv_manager, c.groq_client, c.cron_client, c.match_repo, c.coffee_pool_repo,
+            state_backend=c.state_backend
+        )
+
+    def voting_service(c):
+        from src.services.voting_service import VotingService
+        return VotingService(
+            c.chat_manager, c.poll_repo, c.vote_repo, c.cron_client,
+            live_update_interval=c.settings.poll_live_update_interval,
+            state_backend=c.state_backend
+        )
+
+    def email_outbox_service(c):
+        from src.services.email_outbox_service import EmailOutboxService
+        return EmailOutboxService(
+            c.smtp_client, c.email_outbox_repo,
+            poll_interval=c.settings.email_outbox_poll_interval,
+            max_attempts=c.settings.email_outbox_max_attempts
+        )
+
+    def feedback_service(c):
+        from src.services.feedback_service import FeedbackService
+        return FeedbackService(c.chat_manager, c.email_outbox_service, c.feedback_repo)
+
+    def knowledge_service(c):
+        from src.services.knowledge_service import KnowledgeService
+        return KnowledgeService(
+            c.vector_client, c.groq_client,
+            knowledge_base_path=c.settings.knowledge_base_path,
+            collection_patterns=c.settings.collection_patterns(),
+            qa_collections=c.settings.qa_collections(),
+            # Kapalıyken cross-encoder hiç oluşturulmaz/yüklenmez
+            reranker=c.reranker_client if c.settings.rerank_enabled else None,
+            rerank_candidates=c.settings.rerank_candidates,
+            rerank_top_n=c.settings.rerank_top_n
+        )
+
+    def help_service(c):
+        from src.services.help_service import HelpService
+        return HelpService(
+            c.chat_manager, c.conv_manager, c.user_manager, c.help_repo, c.user_repo, c.groq_client,
+            c.cron_client, dm_manager=c.dm_manager
+        )
+
+    def statistics_service(c):
+        from src.services.statistics_service import StatisticsService
+        return StatisticsService(
+            c.user_repo, c.match_repo, c.help_repo, c.feedback_repo, c.poll_repo, c.vote_repo, c.stats_repo
+        )
+
+    def challenge_enhancement_service(c):
+        from src.services.challenge_enhancement_service import ChallengeEnhancementService
+        return ChallengeEnhancementService(
+            c.groq_client, c.knowledge_service,
+            knowledge_collection=c.settings.challenge_knowledge_collection
+        )
+
+    def challenge_evaluation_service(c):
+        from src.services.challenge_evaluation_service import ChallengeEvaluationService
+        return ChallengeEvaluationService(
+            c.chat_manager, c.conv_manager,
+            c.challenge_evaluation_repo, c.challenge_evaluator_repo,
+            c.challenge_hub_repo, c.challenge_participant_repo,
+            c.user_challenge_stats_repo, c.cron_client,
+            c.canvas_manager, c.user_manager,
+            canvas_update_interval=c.settings.challenge_canvas_update_interval,
+            dm_manager=c.dm_manager
+        )
+
+    def challenge_hub_service(c):
+        from src.services.challenge_hub_service import ChallengeHubService
+        return ChallengeHubService(
+            c.chat_manager, c.conv_manager, c.user_manager,
+            c.challenge_hub_repo, c.challenge_participant_repo,
+            c.challenge_project_repo, c.challenge_submission_repo,
+            c.challenge_theme_repo, c.user_challenge_stats_repo,
+            c.challenge_enhancement_service, c.groq_client, c.cron_client,
+            db_client=c.db_client,
+            evaluation_service=c.challenge_evaluation_service,
+            start_repo=c.challenge_start_repo
+        )
+
+    container.register("coffee_service", coffee_service)
+    container.register("voting_service", voting_service, close=lambda service: service.shutdown())
+    container.register("email_outbox_service", email_outbox_service, close=lambda service: service.shutdown())
+    container.register("feedback_service", feedback_service)
+    container.register("knowledge_service", knowledge_service)
+    container.register("help_service", help_service)
+    container.register("statistics_service", statistics_service)
+    container.register("challenge_enhancement_service", challenge_enhancement_service)
+    container.register(
+        "challenge_evaluation_service", challenge_evaluation_service, close=lambda service: service.shutdown()
+    )
+    container.register("challenge_hub_service", challenge_hub_service)
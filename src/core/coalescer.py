@@ -0,0 +1,133 @@
+"""
+Anahtar bazlı güncelleme birleştirici (debounce/coalesce).
+Sık tetiklenen ve her seferinde son durumu yeniden çizen işler (Slack mesaj/canvas
+güncellemeleri gibi) için kullanılır.
+"""
+
+import heapq
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from src.core.logger import logger
+
+
+class UpdateCoalescer:
+    """
+    Her anahtar için işi en fazla `interval` saniyede bir çalıştırır.
+
+    `mark_dirty` çağrıları bekleyen bir iş varsa onun yerine geçer (coalesce);
+    iş çalıştığında her zaman en son verilen callback kullanılır. Boştaki bir anahtar
+    için ilk işaret hemen çalışır, sonraki işaretler pencere sonuna ertelenir.
+    İşler tek bir arka plan thread'inde sırayla çalıştırılır.
+    """
+
+    def __init__(self, interval: float = 2.0, name: str = "coalescer"):
+        self.interval = interval
+        self.name = name
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, str]] = []
+        self._pending: Dict[str, Callable[[], Any]] = {}
+        self._last_run: Dict[str, float] = {}
+        self._running_key = None
+        self._thread = None
+        self._stats = {"marked": 0, "coalesced": 0, "flushed": 0, "cancelled": 0, "errors": 0}
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-worker", daemon=True)
+            self._thread.start()
+
+    def mark_dirty(self, key: str, callback: Callable[[], Any]):
+        """Anahtarı kirli olarak işaretler; callback pencere sonunda bir kez çalışır."""
+        with self._cond:
+            self._stats["marked"] += 1
+            if key in self._pending:
+                self._pending[key] = callback
+                self._stats["coalesced"] += 1
+                return
+
+            now = time.monotonic()
+            due = max(now, self._last_run.get(key, 0.0) + self.interval)
+            self._pending[key] = callback
+            heapq.heappush(self._heap, (due, key))
+            self._ensure_worker()
+            self._cond.notify()
+
+    def cancel(self, key: str):
+        """
+        Bekleyen işi iptal eder ve o anahtar için çalışan bir iş varsa bitmesini bekler.
+        Son durum yazılmadan önce (örn: oylama kapanışı) eski bir güncellemenin
+        üzerine yazmasını engellemek için kullanılır.
+        """
+        with self._cond:
+            if self._pending.pop(key, None) is not None:
+                self._stats["cancelled"] += 1
+            self._last_run.pop(key, None)
+            while self._running_key == key:
+                self._cond.wait()
+
+    def flush(self, key: str):
+        """Bekleyen işi beklemeden hemen (çağıran thread'de) çalıştırır."""
+        with self._cond:
+            callback = self._pending.pop(key, None)
+            while self._running_key == key:
+                self._cond.wait()
+            if callback is None:
+                return
+            self._running_key = key
+        self._execute(key, callback)
+
+    def get_stats(self) -> Dict[str, int]:
+        """İşaretlenen, birleştirilen, çalıştırılan ve iptal edilen iş sayıları."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+            return stats
+
+    def _execute(self, key: str, callback: Callable[[], Any]):
+        try:
+            callback()
+            with self._cond:
+                self._stats["flushed"] += 1
+        except Exception as e:
+            with self._cond:
+                self._stats["errors"] += 1
+            logger.error(f"[X] {self.name} güncellemesi başarısız | Anahtar: {key} | {e}")
+        finally:
+            with self._cond:
+                self._last_run[key] = time.monotonic()
+                self._running_key = None
+                self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    # İptal edilmiş/önceden çalıştırılmış kayıtları at
+                    while self._heap and self._heap[0][1] not in self._pending:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    due, key = self._heap[0]
+                    wait = due - time.monotonic()
+                    if wait > 0:
+                        self._cond.wait(timeout=wait)
+                        continue
+                    if self._running_key == key:
+                        self._cond.wait()
+                        continue
+                    heapq.heappop(self._heap)
+                    callback = self._pending.pop(key)
+                    self._running_key = key
+                    break
+                self._prune_last_run()
+            self._execute(key, callback)
+
+    def _prune_last_run(self):
+        """Uzun süredir işaretlenmeyen anahtarları unut (bellek sınırlı kalır)."""
+        if len(self._last_run) < 256:
+            return
+        cutoff = time.monotonic() - self.interval * 10
+        for key in [k for k, t in self._last_run.items() if t < cutoff and k not in self._pending]:
+            del self._last_run[key]
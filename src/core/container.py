@@ -0,0 +1,226 @@
+"""
+Hafif bağımlılık konteyneri (DI).
+
+Servisler ada göre bir fabrika fonksiyonuyla kaydedilir ve ilk kullanımda oluşturulur; böylece
+sadece veritabanına ihtiyaç duyan bir CLI veya worker Groq client'ını, embedding modelini ya da
+Slack App'i hiç oluşturmaz (ve ilgili modülleri import etmez).
+
+    container = Container()
+    container.register("db_client", lambda c: DatabaseClient(db_path=c.settings.database_path))
+    container.register("user_repo", lambda c: UserRepository(c.db_client))
+
+    repo = container.user_repo            # db_client da bu anda oluşturulur
+
+    with container.override("groq_client", FakeGroq()):
+        ...                               # testler / benchmark'lar için geçici yerine koyma
+
+    with container.scope() as request_scope:
+        request_scope.get("unit_of_work") # SCOPED servisler kapsam başına bir kez oluşturulur
+
+Yaşam süreleri:
+    SINGLETON: kök konteynerde bir kez oluşturulur, tüm kapsamlar paylaşır (varsayılan)
+    SCOPED:    her kapsam (scope) kendi örneğini oluşturur
+    TRANSIENT: her `get` çağrısında yeni örnek
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.exceptions import ContainerError
+
+SINGLETON = "singleton"
+SCOPED = "scoped"
+TRANSIENT = "transient"
+LIFETIMES = (SINGLETON, SCOPED, TRANSIENT)
+
+
+class _Provider:
+    __slots__ = ("factory", "lifetime", "close")
+
+    def __init__(self, factory: Callable[["Container"], Any], lifetime: str, close: Optional[Callable[[Any], None]]):
+        self.factory = factory
+        self.lifetime = lifetime
+        self.close = close
+
+
+class _Override:
+    """`override` dönüşü: hemen uygulanır; `with` ile kullanılırsa çıkışta geri alınır."""
+
+    def __init__(self, container: "Container", name: str, previous: Any, had_previous: bool):
+        self._container = container
+        self._name = name
+        self._previous = previous
+        self._had_previous = had_previous
+
+    def __enter__(self):
+        return self._container._overrides[self._name]
+
+    def __exit__(self, *exc):
+        overrides = self._container._overrides
+        if self._had_previous:
+            overrides[self._name] = self._previous
+        else:
+            overrides.pop(self._name, None)
+        return False
+
+
+class Container:
+    """Ada göre kayıtlı servisleri tembel (lazy) oluşturan konteyner."""
+
+    def __init__(self, parent: Optional["Container"] = None):
+        self._parent = parent
+        # Kayıtlar kök ile tüm kapsamlar arasında paylaşılır
+        self._providers: Dict[str, _Provider] = parent._providers if parent else {}
+        self._instances: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        # Oluşturulma sırası (kapanışta ters sırayla kapatılır) ve süreleri
+        self._build_order: List[str] = []
+        self._build_times: Dict[str, float] = {}
+        self._lock = parent._lock if parent else threading.RLock()
+        self._resolving = parent._resolving if parent else threading.local()
+
+    # ------------------------------------------------------------------
+    # Kayıt
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[["Container"], Any],
+        lifetime: str = SINGLETON,
+        close: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        Servis kaydeder.
+
+        Args:
+            name: Servis adı (`container.get(name)` veya `container.<name>`)
+            factory: Konteyneri alıp servisi döndüren fonksiyon
+            lifetime: SINGLETON, SCOPED veya TRANSIENT
+            close: `close()` çağrısında oluşturulmuş örneği kapatan fonksiyon
+        """
+        if lifetime not in LIFETIMES:
+            raise ContainerError(f"Geçersiz yaşam süresi: {lifetime}")
+        if name.startswith("_") or hasattr(type(self), name):
+            raise ContainerError(f"Servis adı kullanılamaz: {name}")
+        self._providers[name] = _Provider(factory, lifetime, close)
+
+    def register_instance(self, name: str, instance: Any):
+        """Hazır bir nesneyi singleton olarak kaydeder."""
+        self.register(name, lambda c: instance)
+        self._root()._instances[name] = instance
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._providers
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self._providers)
+
+    # ------------------------------------------------------------------
+    # Çözümleme
+    # ------------------------------------------------------------------
+
+    def get(self, name: str) -> Any:
+        """Servisi döndürür; gerekirse (bağımlılıklarıyla birlikte) oluşturur."""
+        container = self
+        while container is not None:
+            if name in container._overrides:
+                return container._overrides[name]
+            container = container._parent
+
+        provider = self._providers.get(name)
+        if provider is None:
+            raise ContainerError(f"Kayıtlı olmayan servis: {name}")
+
+        if provider.lifetime == TRANSIENT:
+            return self._build(name, provider)
+        owner = self._root() if provider.lifetime == SINGLETON else self
+        if name in owner._instances:
+            return owner._instances[name]
+        with self._lock:
+            if name not in owner._instances:
+                instance = self._build(name, provider)
+                owner._instances[name] = instance
+                owner._build_order.append(name)
+            return owner._instances[name]
+
+    def __getattr__(self, name: str) -> Any:
+        # Sadece normal öznitelik bulunamazsa çağrılır
+        if name.startswith("_") or name not in self._providers:
+            raise AttributeError(f"'{type(self).__name__}' nesnesinde '{name}' servisi yok")
+        return self.get(name)
+
+    def _build(self, name: str, provider: _Provider) -> Any:
+        stack = self._resolving.__dict__.setdefault("stack", [])
+        if name in stack:
+            chain = " -> ".join(stack[stack.index(name):] + [name])
+            raise ContainerError(f"Döngüsel bağımlılık: {chain}")
+        stack.append(name)
+        started = time.perf_counter()
+        try:
+            return provider.factory(self)
+        finally:
+            stack.pop()
+            self._root()._build_times[name] = time.perf_counter() - started
+
+    def _root(self) -> "Container":
+        container = self
+        while container._parent is not None:
+            container = container._parent
+        return container
+
+    # ------------------------------------------------------------------
+    # Test / benchmark yardımcıları
+    # ------------------------------------------------------------------
+
+    def override(self, name: str, instance: Any) -> _Override:
+        """
+        Servisi bu konteynerde (ve kapsamlarında) verilen nesneyle değiştirir.
+        Hemen uygulanır; `with container.override(...)` bloğu bitince eski hali geri gelir.
+        """
+        if name not in self._providers:
+            raise ContainerError(f"Kayıtlı olmayan servis: {name}")
+        had_previous = name in self._overrides
+        previous = self._overrides.get(name)
+        self._overrides[name] = instance
+        return _Override(self, name, previous, had_previous)
+
+    def scope(self) -> "Container":
+        """Alt kapsam: SCOPED servisler ve override'lar bu kapsama özeldir."""
+        return Container(parent=self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def is_built(self, name: str) -> bool:
+        """Servis bu konteynerde (SINGLETON ise kökte) oluşturuldu mu?"""
+        provider = self._providers.get(name)
+        owner = self._root() if provider and provider.lifetime == SINGLETON else self
+        return name in owner._instances
+
+    def build_times(self) -> Dict[str, float]:
+        """Oluşturulan servisler ve oluşturulma süreleri (saniye, bağımlılıklar dahil)."""
+        return dict(self._root()._build_times)
+
+    def close(self):
+        """Bu konteynerde oluşturulan örnekleri ters sırayla kapatır ve unutur."""
+        with self._lock:
+            names, self._build_order = self._build_order, []
+            for name in reversed(names):
+                instance = self._instances.pop(name, None)
+                provider = self._providers.get(name)
+                if provider is None or provider.close is None or instance is None:
+                    continue
+                try:
+                    provider.close(instance)
+                except Exception as e:
+                    # logger'ı burada import etmek döngüsel import'u önler
+                    from src.core.logger import logger
+                    logger.warning(f"[!] Servis kapatılamadı ({name}): {e}")
+            self._instances.clear()
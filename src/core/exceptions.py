@@ -37,3 +37,15 @@ class PermissionDeniedError(CemilBotError):
     """Yetkisiz erişim denemelerinde fırlatılan hata."""
     def __init__(self, message="Bu işlem için yetkiniz bulunmuyor.", extra=None):
         super().__init__(message, extra)
+
+class StateBackendError(CemilBotError):
+    """Paylaşılan durum deposu (kilit, lider seçimi, sayaç) işlemlerinde oluşan hatalar."""
+    pass
+
+class ContainerError(CemilBotError):
+    """Bağımlılık konteynerinde (kayıtsız servis, döngüsel bağımlılık) oluşan hatalar."""
+    pass
+
+class VectorStoreError(CemilBotError):
+    """Vektör indeksi sürümü okunamadığında veya tutarsız olduğunda fırlatılan hata."""
+    pass
@@ -0,0 +1,90 @@
+"""
+Ağır kütüphaneler için gecikmeli (lazy) import.
+
+`faiss`, `pandas`, `pypdf`, `docx`, `sentence_transformers` (torch) gibi kütüphaneler modül
+seviyesinde import edildiğinde bot açılışını saniyelerce uzatır. `lazy_import` bir vekil modül
+döndürür; gerçek import ilk öznitelik erişiminde (örn. `faiss.IndexFlatL2`) yapılır.
+
+    faiss = lazy_import("faiss")
+"""
+
+import importlib
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any, Dict
+
+
+class LazyModule(ModuleType):
+    """İlk öznitelik erişiminde gerçek modülü import eden vekil."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    _load_times[self.__name__] = time.perf_counter() - started
+                    self.__dict__["_lazy_module"] = module
+                    # logger'ı burada import etmek döngüsel import'u önler
+                    from src.core.logger import logger
+                    logger.debug(f"[i] Gecikmeli import: {self.__name__} ({_load_times[self.__name__]:.2f}s)")
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "yüklendi" if self.is_loaded else "yüklenmedi"
+        return f"<LazyModule '{self.__name__}' ({state})>"
+
+
+# Modül adı -> gerçek import süresi (saniye)
+_load_times: Dict[str, float] = {}
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Modülü ilk kullanımda import edecek vekil döndürür."""
+    return LazyModule(name)
+
+
+def lazy_load_times() -> Dict[str, float]:
+    """Şimdiye kadar yüklenen gecikmeli modüller ve import süreleri."""
+    return dict(_load_times)
+
+
+def lazy_exports(package: str, exports: Dict[str, str]):
+    """
+    Paket `__init__` dosyaları için PEP 562 `__getattr__` üretir: `from src.clients import
+    DatabaseClient` sadece `database_client` modülünü yükler, Groq/faiss gibi kardeş modüller
+    ihtiyaç duyulana kadar import edilmez.
+
+        _EXPORTS = {"DatabaseClient": ".database_client", ...}
+        __all__ = list(_EXPORTS)
+        __getattr__ = lazy_exports(__name__, _EXPORTS)
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Sonraki erişimler __getattr__'a uğramaz
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -1,8 +1,14 @@
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
+from typing import Dict, Optional, Tuple
 
 # Slack botuna özel ASCII ikonlar ve renkler
 LOG_ICONS = {
@@ -96,18 +102,127 @@ class CemilLogger(logging.Logger):
     """
     Slack Botuna özel metodları olan genişletilmiş Logger sınıfı.
     """
-    def slack_command(self, user_id, command, message, level=logging.INFO):
-        self.log(level, message, extra={"user": user_id, "cmd": f"/{command} | "})
+    def slack_command(self, user_id, command, message, level=logging.INFO, latency_ms=None):
+        extra = {"user": user_id, "cmd": f"/{command} | "}
+        if latency_ms is not None:
+            extra["latency_ms"] = round(latency_ms, 2)
+        self.log(level, message, extra=extra)
 
     def slack_match(self, user1, user2, status="SUCCESS"):
         icon = LOG_ICONS["MATCH"]
         msg = f"{icon} Eşleşme: {user1} & {user2}"
         self.info(msg, extra={"user": "MATCH_ENGINE"})
 
-def setup_logger(name="CemilBot", log_file="logs/cemil_detailed.log"):
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Her kaydı tek satırlık JSON olarak yazar (log toplama araçları için).
+    `extra` ile verilen user/cmd/latency_ms alanları ayrı anahtarlar olarak eklenir.
+    """
+
+    EXTRA_FIELDS = ("user", "cmd", "latency_ms", "channel")
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for field in self.EXTRA_FIELDS:
+            value = record.__dict__.get(field)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class LogSampler(logging.Filter):
+    """
+    Modül bazlı log oranı sınırlayıcı.
+    INFO ve altındaki kayıtlar her modül için `window` saniyede en fazla `limit` kez geçer;
+    fazlası atılır ve bir sonraki pencerenin ilk kaydına atlanan sayı eklenir.
+    WARNING ve üstü her zaman geçer.
+    """
+
+    def __init__(self, limit: int, window: float = 60.0, module_limits: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.module_limits = module_limits or {}
+        self._windows: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        limit = self.module_limits.get(record.module, self.limit)
+        if limit <= 0:
+            return True
+
+        key = (record.module, record.levelno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} (son {self.window:.0f}s içinde {suppressed} benzer kayıt atlandı)"
+                    record.args = None
+                return True
+            if state[1] < limit:
+                state[1] += 1
+                return True
+            state[2] += 1
+            self.dropped += 1
+            return False
+
+class _AsyncQueueHandler(QueueHandler):
+    """
+    Kaydı kuyruğa koyan handler (disk/stdout I/O'su dinleyici thread'inde yapılır).
+    Aynı süreç içinde kalındığı için kayıt kopyalanmaz; sadece mesaj bir kez çözülür,
+    exc_info korunur (formatlama dinleyici thread'inde yapılır).
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Logger adı -> arka planda handler'ları çalıştıran dinleyici
+_listeners: Dict[str, QueueListener] = {}
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def setup_logger(
+    name="CemilBot",
+    log_file="logs/cemil_detailed.log",
+    json_format: Optional[bool] = None,
+    use_queue: Optional[bool] = None,
+    sample_limit: Optional[int] = None
+):
     """
     Merkezi logger kurulumu.
+
+    Konsol ve dosya handler'ları bir QueueListener thread'inde çalışır; logger'a sadece
+    QueueHandler eklenir, böylece log çağıran thread'ler disk/stdout I/O'sunu beklemez.
+    Ayarlar ortam değişkenlerinden okunur (logger, settings'ten önce yüklenir):
+        LOG_JSON=true          -> dosyaya JSON-lines yazılır
+        LOG_QUEUE=false        -> handler'lar doğrudan (senkron) çalışır
+        LOG_SAMPLE_PER_MINUTE  -> modül başına dakikada en fazla bu kadar INFO kaydı (0: sınırsız)
     """
+    if json_format is None:
+        json_format = _env_flag("LOG_JSON")
+    if use_queue is None:
+        use_queue = _env_flag("LOG_QUEUE", default=True)
+    if sample_limit is None:
+        sample_limit = int(os.environ.get("LOG_SAMPLE_PER_MINUTE", "0") or 0)
+
     # Klasör kontrolü
     log_dir = os.path.dirname(log_file)
     if log_dir and not os.path.exists(log_dir):
@@ -119,13 +234,14 @@ def setup_logger(name="CemilBot", log_file="logs/cemil_detailed.log"):
     logger.setLevel(logging.INFO)
 
     # Temizleme (Handlerların mükerrer eklenmesini önler)
+    stop_logging(name)
     if logger.hasHandlers():
         logger.handlers.clear()
+    logger.filters.clear()
 
     # 1. Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(SlackBotFormatter())
-    logger.addHandler(console_handler)
 
     # 2. Rotating File Handler (JSON veya Yapısal format için uygun)
     file_formatter = FileFormatter(
@@ -133,6 +249,8 @@ def setup_logger(name="CemilBot", log_file="logs/cemil_detailed.log"):
         datefmt='%Y-%m-%d %H:%M:%S',
         defaults={"user": "SYSTEM", "cmd": "N/A"}
     )
+    if json_format:
+        file_formatter = JsonLinesFormatter()
     file_handler = RotatingFileHandler(
         log_file, 
         maxBytes=10*1024*1024, # 10MB
@@ -141,9 +259,35 @@ def setup_logger(name="CemilBot", log_file="logs/cemil_detailed.log"):
     )
     file_handler.setFormatter(file_formatter)
     file_handler.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
+
+    # 3. Geveze INFO kayıtları için modül bazlı örnekleme (kuyruğa girmeden elenir)
+    if sample_limit > 0:
+        logger.addFilter(LogSampler(limit=sample_limit, window=60.0))
+
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(_AsyncQueueHandler(log_queue))
+        listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+    else:
+        logger.addHandler(console_handler)
+        logger.addHandler(file_handler)
 
     return logger
 
+def stop_logging(name: Optional[str] = None):
+    """
+    Kuyruktaki kayıtları yazar ve dinleyici thread'ini durdurur (kapanışta çağrılır).
+    İsim verilmezse tüm logger'ların dinleyicileri durdurulur.
+    """
+    names = [name] if name is not None else list(_listeners)
+    for logger_name in names:
+        listener = _listeners.pop(logger_name, None)
+        if listener is not None:
+            listener.stop()
+
+atexit.register(stop_logging)
+
 # Singleton instance
 logger = setup_logger()
@@ -1,83 +1,226 @@
 """
 Rate limiting için middleware ve utility sınıfları.
+
+Kullanıcı bazlı limit kayan pencere sayacı (sliding window counter) ile uygulanır: her anahtar
+için sadece mevcut ve önceki pencerenin istek sayısı tutulur, önceki pencere geçen süre oranında
+ağırlıklandırılır. Kontrol O(1)'dir ve `time.monotonic()` kullanır (saat değişikliklerinden
+etkilenmez). Uzun süre istek yapmayan anahtarlar kontrol sırasında otomatik silinir.
+
+Paylaşılan bir durum deposu (`src.clients.state_backend`) ayarlanmışsa aynı pencere sayaçları
+depoda tutulur; böylece birden fazla bot süreci aynı limiti uygular.
 """
 
-from typing import Dict, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, TYPE_CHECKING
 from src.core.logger import logger
 
+if TYPE_CHECKING:
+    from src.clients.state_backend import StateBackend
+
+# Bu kadar pencere boyunca istek yapmayan anahtarın sayacı sıfırdır, kaydı silinebilir
+IDLE_WINDOWS = 2
+
+
+class _WindowCounter:
+    """Bir anahtarın mevcut/önceki pencere sayaçları."""
+
+    __slots__ = ("window_start", "previous", "current", "last_seen")
+
+    def __init__(self, window_start: float):
+        self.window_start = window_start
+        self.previous = 0
+        self.current = 0
+        self.last_seen = window_start
+
 
 class RateLimiter:
     """
     Kullanıcı bazlı rate limiting yönetimi.
     """
-    
-    def __init__(self, max_requests: int = 10, window_seconds: int = 60):
+
+    def __init__(
+        self,
+        max_requests: int = 10,
+        window_seconds: int = 60,
+        name: str = "default",
+        backend: Optional["StateBackend"] = None
+    ):
         """
         Args:
             max_requests: Zaman penceresi içinde izin verilen maksimum istek sayısı
             window_seconds: Zaman penceresi (saniye)
+            name: Log'larda görünen limiter adı (komut grubu)
+            backend: Süreçler arası paylaşılan sayaç deposu (None: süreç içi sayaçlar)
         """
+        self.name = name
+        self.backend = backend
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, list] = defaultdict(list)
-    
+        # En son görülen anahtar sonda; boşta kalanlar baştan silinir
+        self.requests: "OrderedDict[str, _WindowCounter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _roll(self, counter: _WindowCounter, now: float):
+        """Pencere sınırı geçildiyse sayaçları kaydırır."""
+        elapsed_windows = int((now - counter.window_start) // self.window_seconds)
+        if elapsed_windows <= 0:
+            return
+        counter.previous = counter.current if elapsed_windows == 1 else 0
+        counter.current = 0
+        counter.window_start += elapsed_windows * self.window_seconds
+
+    def _estimate(self, counter: _WindowCounter, now: float) -> float:
+        """Son `window_seconds` içindeki tahmini istek sayısı."""
+        weight = 1 - (now - counter.window_start) / self.window_seconds
+        return counter.previous * weight + counter.current
+
+    def _wait_seconds(self, window_start: float, previous: int, current: int, now: float) -> float:
+        """Bir sonraki isteğe izin verilene kadar geçmesi gereken süre."""
+        window = self.window_seconds
+        allowed = self.max_requests - 1
+        if current > allowed:
+            # Mevcut pencere tek başına dolu: sonraki pencerede ağırlığının yeterince düşmesi beklenir
+            next_start = window_start + window
+            return next_start - now + window * max(0.0, 1 - allowed / current)
+        if previous == 0:
+            return 0.0
+        # Önceki pencerenin ağırlığı (allowed - current) / previous oranına düşmeli
+        weight = (allowed - current) / previous
+        return window_start + window * (1 - weight) - now
+
+    def _deny_message(self, wait: float) -> str:
+        wait_seconds = max(1, math.ceil(wait))
+        return f"⏳ Çok fazla istek! Lütfen {wait_seconds} saniye sonra tekrar deneyin."
+
+    def _evict_idle(self, now: float) -> int:
+        """Uzun süredir istek yapmayan anahtarları siler (en eski görülenden başlayarak)."""
+        cutoff = now - self.window_seconds * IDLE_WINDOWS
+        removed = 0
+        while self.requests:
+            oldest = next(iter(self.requests.values()))
+            if oldest.last_seen >= cutoff:
+                break
+            self.requests.popitem(last=False)
+            removed += 1
+        return removed
+
     def is_allowed(self, user_id: str) -> tuple[bool, Optional[str]]:
         """
         Kullanıcının isteği yapıp yapamayacağını kontrol eder.
-        
+
         Returns:
             (izin_var_mı, hata_mesajı veya None)
         """
-        now = datetime.now()
-        user_requests = self.requests[user_id]
-        
-        # Eski istekleri temizle (zaman penceresi dışındakiler)
-        cutoff_time = now - timedelta(seconds=self.window_seconds)
-        user_requests[:] = [req_time for req_time in user_requests 
-                           if req_time > cutoff_time]
-        
-        # Rate limit kontrolü
-        if len(user_requests) >= self.max_requests:
-            oldest_request = min(user_requests) if user_requests else now
-            wait_seconds = int((oldest_request + timedelta(seconds=self.window_seconds) - now).total_seconds())
-            return False, f"⏳ Çok fazla istek! Lütfen {wait_seconds} saniye sonra tekrar deneyin."
-        
-        # İsteği kaydet
-        user_requests.append(now)
-        return True, None
-    
+        if self.backend is not None:
+            return self._is_allowed_shared(user_id)
+
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+
+            counter = self.requests.get(user_id)
+            if counter is None:
+                counter = _WindowCounter(now)
+                self.requests[user_id] = counter
+            else:
+                self.requests.move_to_end(user_id)
+                self._roll(counter, now)
+            counter.last_seen = now
+
+            # Rate limit kontrolü
+            if self._estimate(counter, now) + 1 > self.max_requests:
+                wait = self._wait_seconds(counter.window_start, counter.previous, counter.current, now)
+                return False, self._deny_message(wait)
+
+            # İsteği kaydet
+            counter.current += 1
+            return True, None
+
+    def _is_allowed_shared(self, user_id: str) -> tuple[bool, Optional[str]]:
+        """
+        Paylaşılan depodaki pencere sayaçlarıyla kontrol. Pencereler duvar saatine hizalıdır;
+        sayaçlar iki pencere sonra depodan kendiliğinden silinir.
+        """
+        now = time.time()
+        index = int(now // self.window_seconds)
+        window_start = index * self.window_seconds
+        weight = 1 - (now - window_start) / self.window_seconds
+        prefix = f"rl:{self.name}:{user_id}"
+        current_key = f"{prefix}:{index}"
+
+        previous, current = self.backend.get_counters([f"{prefix}:{index - 1}", current_key])
+        if previous * weight + current + 1 <= self.max_requests:
+            # İsteği kaydet; arada başka süreç de saydıysa geri al
+            current = self.backend.incr(current_key, ttl=self.window_seconds * IDLE_WINDOWS)
+            if previous * weight + current <= self.max_requests:
+                return True, None
+            self.backend.incr(current_key, -1)
+            current -= 1
+
+        return False, self._deny_message(self._wait_seconds(window_start, previous, current, now))
+
     def reset(self, user_id: str):
         """Kullanıcının rate limit kayıtlarını sıfırla."""
-        if user_id in self.requests:
-            del self.requests[user_id]
-    
+        with self._lock:
+            self.requests.pop(user_id, None)
+        if self.backend is not None:
+            index = int(time.time() // self.window_seconds)
+            for key in (f"rl:{self.name}:{user_id}:{index - 1}", f"rl:{self.name}:{user_id}:{index}"):
+                value = self.backend.get_counter(key)
+                if value:
+                    self.backend.incr(key, -value)
+
+    def reconfigure(self, max_requests: int, window_seconds: int):
+        """Limitleri değiştirir; pencere süresi değişirse mevcut sayaçlar sıfırlanır."""
+        with self._lock:
+            if window_seconds != self.window_seconds:
+                self.requests.clear()
+            self.max_requests = max_requests
+            self.window_seconds = window_seconds
+
     def cleanup_old_entries(self):
-        """Eski kayıtları temizle (memory leak önleme)."""
-        now = datetime.now()
-        cutoff_time = now - timedelta(seconds=self.window_seconds * 2)
-        
-        users_to_remove = []
-        for user_id, requests in self.requests.items():
-            # Eğer tüm istekler çok eskiyse, kullanıcıyı listeden çıkar
-            if requests and max(requests) < cutoff_time:
-                users_to_remove.append(user_id)
-        
-        for user_id in users_to_remove:
-            del self.requests[user_id]
-        
-        if users_to_remove:
-            logger.debug(f"[i] Rate limiter temizlendi: {len(users_to_remove)} kullanıcı kaldırıldı")
-
-
-# Global rate limiter instance
-_global_rate_limiter: Optional[RateLimiter] = None
-
-
-def get_rate_limiter(max_requests: int = 10, window_seconds: int = 60) -> RateLimiter:
-    """Rate limiter singleton instance döndürür."""
-    global _global_rate_limiter
-    if _global_rate_limiter is None:
-        _global_rate_limiter = RateLimiter(max_requests, window_seconds)
-    return _global_rate_limiter
+        """Eski kayıtları temizle (is_allowed bunu zaten her çağrıda yapar)."""
+        with self._lock:
+            removed = self._evict_idle(time.monotonic())
+
+        if removed:
+            logger.debug(f"[i] Rate limiter temizlendi ({self.name}): {removed} kullanıcı kaldırıldı")
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+
+# Komut grubu adı -> limiter
+_rate_limiters: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    name: str = "default",
+    max_requests: int = 10,
+    window_seconds: int = 60
+) -> RateLimiter:
+    """
+    İsimli rate limiter döndürür (her komut grubunun kendi limiti ve sayaçları olur).
+    Aynı isim farklı limitlerle istenirse mevcut limiter yeniden yapılandırılır.
+    Paylaşılan bir durum deposu ayarlıysa sayaçlar orada tutulur.
+    """
+    from src.clients.state_backend import get_state_backend
+
+    with _registry_lock:
+        limiter = _rate_limiters.get(name)
+        if limiter is None:
+            backend = get_state_backend()
+            shared = backend if backend is not None and backend.is_shared else None
+            limiter = RateLimiter(max_requests, window_seconds, name=name, backend=shared)
+            _rate_limiters[name] = limiter
+        elif (limiter.max_requests, limiter.window_seconds) != (max_requests, window_seconds):
+            logger.info(
+                f"[i] Rate limiter güncellendi ({name}): "
+                f"{limiter.max_requests}/{limiter.window_seconds}s -> {max_requests}/{window_seconds}s"
+            )
+            limiter.reconfigure(max_requests, window_seconds)
+        return limiter
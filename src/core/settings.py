@@ -3,7 +3,7 @@ Cemil Bot için merkezi konfigürasyon yönetimi.
 Pydantic Settings kullanarak environment variable'ları yönetir.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator, ConfigDict
 
@@ -22,6 +22,14 @@ class BotSettings(BaseSettings):
     # SMTP Ayarları (Opsiyonel)
     smtp_email: Optional[str] = Field(None, description="SMTP Email adresi")
     smtp_password: Optional[str] = Field(None, description="SMTP Password")
+    smtp_host: str = Field("smtp.gmail.com", description="SMTP sunucusu")
+    smtp_port: int = Field(587, description="SMTP portu")
+    smtp_use_tls: bool = Field(True, description="SMTP bağlantısında STARTTLS kullanılsın mı")
+    email_outbox_poll_interval: float = Field(
+        5.0,
+        description="E-posta kuyruğunun kontrol edilme aralığı (saniye)"
+    )
+    email_outbox_max_attempts: int = Field(5, description="Bir e-posta için maksimum gönderim denemesi")
     
     # Slack Kanal Ayarları
     admin_channel_id: Optional[str] = Field(None, description="Admin kanalı ID")
@@ -44,12 +52,56 @@ class BotSettings(BaseSettings):
     # Logging Ayarları
     log_level: str = Field("INFO", description="Log seviyesi (DEBUG, INFO, WARNING, ERROR)")
     log_file: str = Field("logs/cemil_detailed.log", description="Log dosyası yolu")
+    # Aşağıdakiler logger ilk import edildiğinde ortam değişkenlerinden okunur (src/core/logger.py)
+    log_json: bool = Field(False, description="Dosya logları JSON-lines formatında yazılsın")
+    log_queue: bool = Field(True, description="Log handler'ları arka plan thread'inde (QueueListener) çalışsın")
+    log_sample_per_minute: int = Field(
+        0,
+        description="Modül başına dakikada en fazla INFO kaydı (0: sınırsız)"
+    )
     
     # Rate Limiting Ayarları
     rate_limit_requests: int = Field(10, description="Rate limit - dakikada maksimum istek")
     rate_limit_window: int = Field(60, description="Rate limit - zaman penceresi (saniye)")
+    rate_limit_overrides: str = Field(
+        "",
+        description="Komut grubu bazlı limitler, örn. 'knowledge=5/60,help=3/120' (istek/saniye)"
+    )
     
+    # Çoklu Süreç (Paylaşılan Durum) Ayarları
+    state_backend: str = Field(
+        "memory",
+        description="Kilit/lider seçimi/sayaç deposu: memory (tek süreç), sqlite veya redis"
+    )
+    state_db_path: str = Field("data/cemil_state.db", description="STATE_BACKEND=sqlite için SQLite (WAL) dosyası")
+    redis_url: Optional[str] = Field(None, description="STATE_BACKEND=redis için bağlantı adresi")
+    instance_id: Optional[str] = Field(None, description="Süreç kimliği (boşsa host:pid)")
+    leader_lease_seconds: float = Field(30.0, description="Cron lider kirası süresi (saniye)")
+
+    # Oylama Ayarları
+    poll_live_update_interval: float = Field(
+        2.0,
+        description="Canlı oylama mesajının en sık güncellenme aralığı (saniye)"
+    )
+
+    # Challenge Ayarları
+    challenge_canvas_update_interval: float = Field(
+        3.0,
+        description="Challenge özet canvas'ının en sık güncellenme aralığı (saniye)"
+    )
+
     # Vector Store Ayarları
+    vector_store_dir: str = Field(
+        "data/vector_store",
+        description="Sürümlü vektör deposu dizini (CURRENT işaretçisi + versions/)"
+    )
+    vector_store_keep_versions: int = Field(3, ge=1, description="Saklanacak indeks sürümü sayısı")
+    vector_reload_interval: int = Field(
+        10, ge=1, le=59,
+        description="İndeksleyicinin yayınladığı yeni sürümün kontrol aralığı (saniye)"
+    )
+    indexer_timeout: float = Field(1800.0, description="Ayrı süreçteki indeksleyici için zaman aşımı (saniye)")
+    # Eski düz dosya düzeni (sürümlü depo yoksa bunlardan yüklenir)
     vector_store_path: str = Field("data/vector_store.index", description="Vector store dosya yolu")
     vector_store_pkl_path: str = Field("data/vector_store.pkl", description="Vector store pickle dosya yolu")
     
@@ -62,6 +114,31 @@ class BotSettings(BaseSettings):
     
     # Knowledge Base Ayarları
     knowledge_base_path: str = Field("knowledge_base", description="Bilgi küpü klasör yolu")
+    kb_collection_patterns: str = Field(
+        "",
+        description=(
+            "Kök klasördeki dosyalar için koleksiyon kuralları, örn. "
+            "'challenge=*challenge*|*proje*,akademi=*kural*' (alt klasörler kendi adıyla koleksiyondur)"
+        )
+    )
+    knowledge_qa_collections: str = Field(
+        "",
+        description="/sor'un aradığı koleksiyonlar, virgülle ayrılmış (boş: hepsi)"
+    )
+    challenge_knowledge_collection: str = Field(
+        "challenge",
+        description="Challenge proje zenginleştirmesinin aradığı koleksiyon"
+    )
+    # /sor yeniden sıralama (cross-encoder) ayarları
+    rerank_enabled: bool = Field(False, description="/sor bağlamını cross-encoder ile yeniden sırala")
+    rerank_model: str = Field("cross-encoder/ms-marco-MiniLM-L-6-v2", description="Yeniden sıralama modeli")
+    rerank_candidates: int = Field(20, ge=1, description="Yeniden sıralanacak vektör adayı sayısı")
+    rerank_top_n: int = Field(4, ge=1, description="Prompt'a giren parça sayısı")
+    rerank_batch_size: int = Field(8, ge=1, description="Cross-encoder parti boyutu")
+    rerank_budget_ms: float = Field(300.0, gt=0, description="Yeniden sıralama süre bütçesi (ms)")
+    rerank_early_exit_score: Optional[float] = Field(
+        None, description="Bu skoru geçen top_n parça bulununca puanlamayı bitir (boş: kapalı)"
+    )
     
     # Başlangıç Senaryo Ayarları (Soruları Otomatize Etmek İçin)
     db_clean_on_startup: bool = Field(False, description="Başlangıçta challenge tablolarını temizle")
@@ -86,6 +163,46 @@ class BotSettings(BaseSettings):
             raise ValueError("Değer pozitif olmalı")
         return v
     
+    def rate_limit_for(self, name: str) -> Tuple[int, int]:
+        """Komut grubunun (max_requests, window_seconds) limiti; override yoksa genel limit."""
+        for entry in self.rate_limit_overrides.split(","):
+            key, _, value = entry.partition("=")
+            if key.strip() != name:
+                continue
+            try:
+                max_requests, _, window = value.partition("/")
+                max_requests = int(max_requests)
+                window = int(window) if window.strip() else self.rate_limit_window
+            except ValueError:
+                break
+            if max_requests > 0 and window > 0:
+                return max_requests, window
+            break
+        return self.rate_limit_requests, self.rate_limit_window
+
+    def collection_patterns(self) -> Dict[str, List[str]]:
+        """KB_COLLECTION_PATTERNS: koleksiyon -> dosya adı kalıpları (fnmatch)."""
+        patterns: Dict[str, List[str]] = {}
+        for entry in self.kb_collection_patterns.split(","):
+            name, _, globs = entry.partition("=")
+            globs = [g.strip() for g in globs.split("|") if g.strip()]
+            if name.strip() and globs:
+                patterns.setdefault(name.strip(), []).extend(globs)
+        return patterns
+
+    def qa_collections(self) -> Optional[List[str]]:
+        """/sor koleksiyonları (None: hepsi)."""
+        names = [name.strip() for name in self.knowledge_qa_collections.split(",") if name.strip()]
+        return names or None
+
+    @field_validator('state_backend')
+    @classmethod
+    def validate_state_backend(cls, v: str) -> str:
+        """Durum deposu türünü doğrula."""
+        if v.lower() not in ('memory', 'sqlite', 'redis'):
+            raise ValueError("STATE_BACKEND memory, sqlite veya redis olmalı")
+        return v.lower()
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,280 @@
+"""
+Açılış (cold start) profilleyicisi: `python -m src --profile-startup`
+
+Bot `-X importtime` ile bir alt süreçte başlatılır; Slack'e bağlanmadan ve arka plan işlerini
+(cron, e-posta kuyruğu, challenge devamı) başlatmadan önceki tüm adımlar çalıştırılır. Alt süreç
+`mark_phase` ile işaretlenen açılış aşamalarının sürelerini bir JSON dosyasına yazar; üst süreç
+bunları import süreleriyle birleştirip rapor basar ve bütçe aşılırsa sıfırdan farklı kodla çıkar
+(CI kontrolü için). Profil modunda Slack App token doğrulaması (auth.test) atlanır; böylece
+ölçüm ağ erişimi olmadan da alınabilir.
+
+    python -m src --profile-startup
+    python -m src --profile-startup --budget 5 --phase-budget "client'lar=1.5" --import-budget src.bot=3
+    python -m src --profile-startup --json startup.json --top 25
+
+Alt süreç veritabanlarının geçici kopyalarıyla çalışır (`use_database_copies`): şema göçleri,
+sayaç düzeltmeleri ve DB_CLEAN_ON_STARTUP temizliği gerçek veriye dokunmaz.
+
+Bu modül sadece standart kütüphaneyi kullanır; üst süreç botun hiçbir parçasını import etmez.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+PROFILE_FLAG = "--profile-startup"
+# Alt süreç aşama sürelerini bu dosyaya yazar
+PROFILE_OUTPUT_ENV = "CEMIL_PROFILE_OUTPUT"
+# Varsayılan toplam açılış bütçesi (saniye, komut satırında --budget ile ezilir)
+BUDGET_ENV = "STARTUP_BUDGET_SECONDS"
+
+# Aşamalar: (ad, süre). Süre bir önceki işaretten bu yana geçen zamandır.
+_phases: List[Tuple[str, float]] = []
+_last_mark = time.perf_counter()
+
+
+def mark_phase(name: str):
+    """Bir açılış aşamasının bittiğini işaretler (profil modu dışında da ucuzdur)."""
+    global _last_mark
+    now = time.perf_counter()
+    _phases.append((name, now - _last_mark))
+    _last_mark = now
+
+
+def recorded_phases() -> List[Tuple[str, float]]:
+    return list(_phases)
+
+
+def is_profile_child() -> bool:
+    """Bu süreç profil alt süreci mi?"""
+    return bool(os.environ.get(PROFILE_OUTPUT_ENV))
+
+
+def write_profile_output(extra: Optional[Dict[str, Any]] = None):
+    """Alt süreçte: kaydedilen aşamaları üst sürecin okuyacağı dosyaya yazar."""
+    path = os.environ.get(PROFILE_OUTPUT_ENV)
+    if not path:
+        return
+    data = {"phases": _phases, **(extra or {})}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def use_database_copies(paths: Dict[str, str]) -> str:
+    """
+    Alt süreçte: SQLite dosyalarını geçici bir dizine kopyalar ve ortam değişkenlerini kopyalara
+    yönlendirir (ayarlar bundan sonra yeniden yüklenmelidir). Dizin süreç çıkarken silinir.
+
+    Args:
+        paths: ortam değişkeni adı -> veritabanı yolu (örn. {"DB_PATH": "data/cemil_bot.db"})
+    """
+    workdir = tempfile.mkdtemp(prefix="cemil-startup-db-")
+    atexit.register(shutil.rmtree, workdir, True)
+    for env_name, path in paths.items():
+        copy = os.path.join(workdir, f"{env_name.lower()}-{os.path.basename(path)}")
+        # WAL dosyası da kopyalanmazsa henüz checkpoint edilmemiş veriler eksik kalır
+        for suffix in ("", "-wal"):
+            if os.path.exists(path + suffix):
+                shutil.copy2(path + suffix, copy + suffix)
+        os.environ[env_name] = copy
+    return workdir
+
+
+# ----------------------------------------------------------------------
+# Import süreleri (-X importtime çıktısı)
+# ----------------------------------------------------------------------
+
+def parse_importtime(lines: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    `-X importtime` satırlarını ayrıştırır.
+
+    Returns:
+        modül -> {"self": sn, "cumulative": sn, "depth": girinti seviyesi}
+    """
+    imports: Dict[str, Dict[str, Any]] = {}
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # başlık satırı ("self [us] | cumulative | imported package")
+        # Modül adı bir boşluk + her seviye için iki boşlukla girintilenir
+        name = parts[2]
+        depth = max(0, len(name) - len(name.lstrip(" ")) - 1) // 2
+        imports[name.strip()] = {
+            "self": self_us / 1e6,
+            "cumulative": cumulative_us / 1e6,
+            "depth": depth,
+        }
+    return imports
+
+
+# ----------------------------------------------------------------------
+# Bütçe kontrolü ve rapor
+# ----------------------------------------------------------------------
+
+def _parse_budgets(entries: List[str]) -> Dict[str, float]:
+    budgets = {}
+    for entry in entries:
+        name, sep, seconds = entry.rpartition("=")
+        if not sep or not name:
+            raise argparse.ArgumentTypeError(f"Bütçe 'ad=saniye' biçiminde olmalı: {entry}")
+        budgets[name] = float(seconds)
+    return budgets
+
+
+def check_budgets(
+    report: Dict[str, Any],
+    total_budget: Optional[float] = None,
+    phase_budgets: Optional[Dict[str, float]] = None,
+    import_budgets: Optional[Dict[str, float]] = None
+) -> List[str]:
+    """Bütçe aşımlarını döndürür (boş liste: bütçe içinde)."""
+    violations = []
+    if total_budget is not None and report["total"] > total_budget:
+        violations.append(f"Toplam açılış {report['total']:.2f}s > {total_budget:.2f}s")
+
+    phases = dict(report["phases"])
+    for name, budget in (phase_budgets or {}).items():
+        if name not in phases:
+            violations.append(f"Aşama bulunamadı: {name}")
+        elif phases[name] > budget:
+            violations.append(f"Aşama '{name}' {phases[name]:.2f}s > {budget:.2f}s")
+
+    for module, budget in (import_budgets or {}).items():
+        timing = report["imports"].get(module)
+        if timing is None:
+            continue  # import edilmemiş modül bütçeyi aşamaz
+        if timing["cumulative"] > budget:
+            violations.append(f"Import '{module}' {timing['cumulative']:.2f}s > {budget:.2f}s")
+    return violations
+
+
+def format_report(report: Dict[str, Any], top: int = 15) -> str:
+    lines = ["", "=" * 60, "           CEMIL BOT - AÇILIŞ PROFİLİ", "=" * 60, ""]
+    lines.append(f"{'Aşama':<32} {'Süre (s)':>10} {'Pay':>8}")
+    lines.append("-" * 52)
+    phase_total = sum(seconds for _, seconds in report["phases"]) or 1.0
+    for name, seconds in report["phases"]:
+        lines.append(f"{name:<32} {seconds:>10.3f} {seconds / phase_total:>7.0%}")
+    lines.append("-" * 52)
+    lines.append(f"{'Aşamalar toplamı':<32} {phase_total:>10.3f}")
+    lines.append(f"{'Süreç toplamı (yorumlayıcı dahil)':<32} {report['total']:>10.3f}")
+
+    # En pahalı üst seviye import'lar (kümülatif) ve en pahalı tekil modüller (self)
+    imports = report["imports"]
+    top_level = sorted(
+        ((name, t) for name, t in imports.items() if t["depth"] <= 1),
+        key=lambda item: item[1]["cumulative"], reverse=True
+    )[:top]
+    if top_level:
+        lines += ["", f"{'Üst seviye import':<40} {'Kümülatif (s)':>14}", "-" * 56]
+        lines += [f"{name:<40} {t['cumulative']:>14.3f}" for name, t in top_level]
+
+    heaviest = sorted(imports.items(), key=lambda item: item[1]["self"], reverse=True)[:top]
+    if heaviest:
+        lines += ["", f"{'En yavaş modül (self)':<40} {'Süre (s)':>14}", "-" * 56]
+        lines += [f"{name:<40} {t['self']:>14.3f}" for name, t in heaviest]
+
+    if report.get("lazy"):
+        lines += ["", "Açılışta yüklenen gecikmeli modüller: " + ", ".join(sorted(report["lazy"]))]
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src", description="Açılış profilleyicisi")
+    parser.add_argument(PROFILE_FLAG, action="store_true", help="Açılışı profille ve çık")
+    parser.add_argument(
+        "--budget", type=float, default=None,
+        help=f"Toplam açılış bütçesi (saniye, varsayılan: ${BUDGET_ENV})"
+    )
+    parser.add_argument(
+        "--phase-budget", action="append", default=[], metavar="AŞAMA=SN",
+        help="Aşama bütçesi (tekrarlanabilir)"
+    )
+    parser.add_argument(
+        "--import-budget", action="append", default=[], metavar="MODÜL=SN",
+        help="Modül import bütçesi, kümülatif (tekrarlanabilir)"
+    )
+    parser.add_argument("--top", type=int, default=15, help="Raporda gösterilecek import sayısı")
+    parser.add_argument("--json", dest="json_path", default=None, help="Raporu JSON olarak da yaz")
+    return parser
+
+
+def run_startup_profile(argv: List[str]) -> int:
+    """
+    Üst süreç: botu `-X importtime` ile alt süreçte açar, raporu basar ve bütçeyi kontrol eder.
+
+    Returns:
+        0: bütçe içinde, 1: bütçe aşıldı, 2: açılış başarısız
+    """
+    args = build_parser().parse_args(argv)
+    total_budget = args.budget
+    if total_budget is None and os.environ.get(BUDGET_ENV):
+        total_budget = float(os.environ[BUDGET_ENV])
+    try:
+        phase_budgets = _parse_budgets(args.phase_budget)
+        import_budgets = _parse_budgets(args.import_budget)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        print(f"[X] {e}", file=sys.stderr)
+        return 2
+
+    fd, output_path = tempfile.mkstemp(prefix="cemil-startup-", suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, **{PROFILE_OUTPUT_ENV: output_path, "CEMIL_NON_INTERACTIVE": "1"})
+    cmd = [sys.executable, "-X", "importtime", "-m", "src", PROFILE_FLAG]
+
+    started = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, env=env, stderr=subprocess.PIPE, text=True)
+        total = time.perf_counter() - started
+
+        stderr_lines = proc.stderr.splitlines()
+        passthrough = [line for line in stderr_lines if not line.startswith("import time:")]
+        if passthrough:
+            print("\n".join(passthrough), file=sys.stderr)
+
+        try:
+            with open(output_path, encoding="utf-8") as f:
+                child = json.load(f)
+        except (OSError, ValueError):
+            child = None
+    finally:
+        os.unlink(output_path)
+
+    if proc.returncode != 0 or not child:
+        print(f"[X] Açılış profili alınamadı (çıkış kodu: {proc.returncode})", file=sys.stderr)
+        return 2
+
+    report = {
+        "total": total,
+        "phases": [tuple(phase) for phase in child["phases"]],
+        "imports": parse_importtime(stderr_lines),
+        "lazy": child.get("lazy", {}),
+    }
+    print(format_report(report, top=args.top))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    violations = check_budgets(report, total_budget, phase_budgets, import_budgets)
+    if violations:
+        print("\n[X] Açılış bütçesi aşıldı:")
+        for violation in violations:
+            print(f"    - {violation}")
+        return 1
+    if total_budget is not None or phase_budgets or import_budgets:
+        print("\n[+] Açılış bütçe içinde.")
+    return 0
@@ -25,10 +25,7 @@ def setup_challenge_handlers(
 ):
     """Challenge handler'larını kaydeder."""
     settings = get_settings()
-    rate_limiter = get_rate_limiter(
-        max_requests=settings.rate_limit_requests,
-        window_seconds=settings.rate_limit_window
-    )
+    rate_limiter = get_rate_limiter("challenge", *settings.rate_limit_for("challenge"))
 
     # İzin verilen komut kanalları (opsiyonel)
     allowed_channels_raw = settings.allowed_command_channels or ""
@@ -930,16 +927,11 @@ def setup_challenge_handlers(
                     ]
                 )
                 
-                # İsteyen kullanıcıya bilgi ver (DM)
-                try:
-                    dm = chat_manager.client.conversations_open(users=requester_id)
-                    dm_channel = dm["channel"]["id"]
-                    chat_manager.post_message(
-                        channel=dm_channel,
-                        text=f"✅ Challenge (`{challenge_id[:8]}`) bitirme isteğiniz ONAYLANDI ve challenge sonlandırıldı."
-                    )
-                except Exception as e:
-                    logger.warning(f"Kullanıcıya DM atılamadı: {e}")
+                # İsteyen kullanıcıya bilgi ver (DM, arka planda)
+                evaluation_service.dm.queue_dm(
+                    requester_id,
+                    f"✅ Challenge (`{challenge_id[:8]}`) bitirme isteğiniz ONAYLANDI ve challenge sonlandırıldı."
+                )
                     
             except Exception as e:
                 logger.error(f"Approval process error: {e}")
@@ -982,16 +974,11 @@ def setup_challenge_handlers(
                 ]
             )
             
-            # İsteyen kullanıcıya bilgi ver (DM)
-            try:
-                dm = chat_manager.client.conversations_open(users=requester_id)
-                dm_channel = dm["channel"]["id"]
-                chat_manager.post_message(
-                    channel=dm_channel,
-                    text=f"❌ Challenge (`{challenge_id[:8]}`) bitirme isteğiniz REDDEDİLDİ."
-                )
-            except Exception as e:
-                logger.warning(f"Kullanıcıya DM atılamadı: {e}")
+            # İsteyen kullanıcıya bilgi ver (DM, arka planda)
+            evaluation_service.dm.queue_dm(
+                requester_id,
+                f"❌ Challenge (`{challenge_id[:8]}`) bitirme isteğiniz REDDEDİLDİ."
+            )
                 
         except Exception as e:
             logger.error(f"Rejection process error: {e}")
@@ -20,10 +20,7 @@ def setup_coffee_handlers(
 ):
     """Kahve handler'larını kaydeder."""
     settings = get_settings()
-    rate_limiter = get_rate_limiter(
-        max_requests=settings.rate_limit_requests,
-        window_seconds=settings.rate_limit_window
-    )
+    rate_limiter = get_rate_limiter("coffee", *settings.rate_limit_for("coffee"))
     
     @app.command("/kahve")
     def handle_coffee_command(ack, body):
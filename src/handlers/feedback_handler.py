@@ -21,10 +21,7 @@ def setup_feedback_handlers(
 ):
     """Geri bildirim handler'larını kaydeder."""
     settings = get_settings()
-    rate_limiter = get_rate_limiter(
-        max_requests=settings.rate_limit_requests,
-        window_seconds=settings.rate_limit_window
-    )
+    rate_limiter = get_rate_limiter("feedback", *settings.rate_limit_for("feedback"))
     
     @app.command("/geri-bildirim")
     def handle_feedback_command(ack, body):
@@ -4,7 +4,8 @@ Health check komut handler'ları.
 
 from slack_bolt import App
 from src.core.logger import logger
-from src.commands import ChatManager
+from typing import Optional
+from src.commands import ChatManager, SlackRateLimiter
 from src.clients import DatabaseClient, GroqClient, VectorClient
 
 
@@ -36,19 +37,48 @@ def check_vector_store(vector_client: VectorClient) -> tuple[bool, str]:
     try:
         if hasattr(vector_client, 'documents') and vector_client.documents:
             doc_count = len(vector_client.documents)
-            return True, f"✅ Vector store aktif ({doc_count} doküman)"
+            version = getattr(vector_client, "version", None)
+            version_text = f", sürüm {version}" if version else ""
+            return True, f"✅ Vector store aktif ({doc_count} doküman{version_text})"
         return True, "✅ Vector store hazır (boş)"
     except Exception as e:
         logger.error(f"[X] Vector store health check hatası: {e}")
         return False, f"❌ Vector store hatası: {str(e)[:50]}"
 
 
+def check_slack_rate_limits(slack_rate_limiter: Optional[SlackRateLimiter]) -> tuple[bool, str]:
+    """Slack API rate limit istatistiklerini özetler."""
+    if not slack_rate_limiter:
+        return True, "ℹ️ Slack rate limit zamanlayıcısı devre dışı"
+    try:
+        stats = slack_rate_limiter.get_stats()
+        total_calls = sum(s["calls"] for s in stats.values())
+        total_queued = sum(s["queued"] for s in stats.values())
+        total_429 = sum(s["rate_limited"] for s in stats.values())
+
+        msg = f"{'✅' if total_429 == 0 else '⚠️'} Slack API: {total_calls} çağrı | {total_queued} kuyrukta bekledi | {total_429} adet 429"
+
+        # En çok beklenen metodlar
+        busiest = sorted(stats.items(), key=lambda item: item[1]["wait_seconds"], reverse=True)[:3]
+        for method_name, method_stats in busiest:
+            if method_stats["queued"] or method_stats["rate_limited"]:
+                msg += (
+                    f"\n    • `{method_name}`: {method_stats['calls']} çağrı, "
+                    f"{method_stats['wait_seconds']:.1f}s bekleme, {method_stats['rate_limited']}x 429"
+                )
+        return True, msg
+    except Exception as e:
+        logger.error(f"[X] Slack rate limit health check hatası: {e}")
+        return False, f"❌ Slack rate limit hatası: {str(e)[:50]}"
+
+
 def setup_health_handlers(
     app: App,
     chat_manager: ChatManager,
     db_client: DatabaseClient,
     groq_client: GroqClient,
-    vector_client: VectorClient
+    vector_client: VectorClient,
+    slack_rate_limiter: Optional[SlackRateLimiter] = None
 ):
     """Health check handler'larını kaydeder."""
     
@@ -66,16 +96,18 @@ def setup_health_handlers(
             db_status, db_msg = check_database(db_client)
             groq_status, groq_msg = check_groq_api(groq_client)
             vector_status, vector_msg = check_vector_store(vector_client)
+            slack_status, slack_msg = check_slack_rate_limits(slack_rate_limiter)
             
             # Genel durum
-            all_healthy = db_status and groq_status and vector_status
+            all_healthy = db_status and groq_status and vector_status and slack_status
             status_icon = "✅" if all_healthy else "⚠️"
             
             health_report = (
                 f"{status_icon} *CEMIL BOT SAĞLIK RAPORU*\n\n"
                 f"{db_msg}\n"
                 f"{groq_msg}\n"
-                f"{vector_msg}\n\n"
+                f"{vector_msg}\n"
+                f"{slack_msg}\n\n"
             )
             
             if all_healthy:
@@ -21,10 +21,7 @@ def setup_help_handlers(
 ):
     """Yardımlaşma handler'larını kaydeder."""
     settings = get_settings()
-    rate_limiter = get_rate_limiter(
-        max_requests=settings.rate_limit_requests,
-        window_seconds=settings.rate_limit_window
-    )
+    rate_limiter = get_rate_limiter("help", *settings.rate_limit_for("help"))
     
     @app.command("/yardim-iste")
     def handle_help_request(ack, body):
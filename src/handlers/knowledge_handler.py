@@ -3,6 +3,7 @@ Bilgi küpü (RAG) komut handler'ları.
 """
 
 import asyncio
+import threading
 from slack_bolt import App
 from src.core.logger import logger
 from src.core.settings import get_settings
@@ -33,10 +34,7 @@ def setup_knowledge_handlers(
 ):
     """Bilgi küpü handler'larını kaydeder."""
     settings = get_settings()
-    rate_limiter = get_rate_limiter(
-        max_requests=settings.rate_limit_requests,
-        window_seconds=settings.rate_limit_window
-    )
+    rate_limiter = get_rate_limiter("knowledge", *settings.rate_limit_for("knowledge"))
     
     @app.command("/sor")
     def handle_ask_command(ack, body):
@@ -144,21 +142,21 @@ def setup_knowledge_handlers(
             text="⚙️ Bilgi küpü yeniden taranıyor..."
         )
         
-        # Async işlemi sync wrapper ile çalıştır
-        async def process_reindex():
-            try:
-                await knowledge_service.process_knowledge_base()
-                logger.info(f"[+] BİLGİ KÜPÜ YENİDEN İNDEKLENDİ | Kullanıcı: {user_name} ({user_id})")
+        # İndeksleme ayrı süreçte yapılır; Bolt iş parçacığı beklemeden serbest kalır
+        def process_reindex():
+            result = knowledge_service.reindex_in_worker(timeout=settings.indexer_timeout)
+            if result["success"]:
+                logger.info(f"[+] BİLGİ KÜPÜ YENİDEN İNDEKLENDİ | Kullanıcı: {user_name} ({user_id}) | Sürüm: {result['version']}")
                 chat_manager.post_message(
                     channel=channel_id,
                     text=f"✅ <@{user_id}> Bilgi küpü güncellendi! Cemil artık en güncel dökümanları biliyor."
                 )
-            except Exception as e:
-                logger.error(f"[X] İndeksleme hatası: {e}", exc_info=True)
+            else:
+                logger.error(f"[X] İndeksleme hatası: {result['message']}")
                 chat_manager.post_ephemeral(
                     channel=channel_id,
                     user=user_id,
-                    text="İndeksleme sırasında bir hata oluştu. Lütfen logları kontrol edin."
+                    text=f"İndeksleme tamamlanamadı: {result['message']} Lütfen logları kontrol edin."
                 )
         
-        asyncio.run(process_reindex())
+        threading.Thread(target=process_reindex, name="kb-reindex", daemon=True).start()
@@ -33,10 +33,7 @@ def setup_poll_handlers(
 ):
     """Oylama handler'larını kaydeder."""
     settings = get_settings()
-    rate_limiter = get_rate_limiter(
-        max_requests=settings.rate_limit_requests,
-        window_seconds=settings.rate_limit_window
-    )
+    rate_limiter = get_rate_limiter("poll", *settings.rate_limit_for("poll"))
     
     @app.command("/oylama")
     def handle_poll_command(ack, body):
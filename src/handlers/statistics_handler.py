@@ -2,18 +2,16 @@
 Admin istatistik komut handler'ları.
 """
 
+from datetime import datetime
 from slack_bolt import App
 from src.core.logger import logger
 from src.commands import ChatManager
 from src.services import StatisticsService
-from src.repositories import (
-    UserRepository,
-    ChallengeHubRepository,
-    ChallengeParticipantRepository,
-    ChallengeEvaluationRepository
-)
-from src.clients import DatabaseClient
-from src.core.settings import get_settings
+from src.repositories import UserRepository, ChallengeEvaluationRepository
+
+# Başarılı projeler raporu: mesaj başına proje (2 blok/proje, Slack limiti 50 blok) ve en fazla sayfa
+SUCCESSFUL_PROJECTS_PAGE_SIZE = 20
+SUCCESSFUL_PROJECTS_MAX_PAGES = 5
 
 
 def is_admin(app: App, user_id: str) -> bool:
@@ -28,11 +26,51 @@ def is_admin(app: App, user_id: str) -> bool:
     return False
 
 
+def _build_successful_project_block(project: dict) -> dict:
+    """Tek bir başarılı proje için kompakt section bloğu oluşturur."""
+    # Takım üyeleri (challenge sahibi önce, tekrarlar olmadan)
+    member_ids = []
+    for member_id in [project.get("creator_id")] + project.get("member_ids", []):
+        if member_id and member_id not in member_ids:
+            member_ids.append(member_id)
+    team_members = [f"<@{member_id}>" for member_id in member_ids]
+    
+    # GitHub linki
+    github_url = project.get("github_repo_url")
+    github_text = f"🔗 <{github_url}|GitHub>" if github_url else "❌ Link yok"
+    
+    # Tarih bilgisi
+    completed_at = project.get("completed_at")
+    date_text = "Bilinmiyor"
+    if completed_at:
+        try:
+            dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
+            date_text = dt.strftime("%d.%m.%Y")
+        except (TypeError, ValueError):
+            pass
+    
+    theme = project.get("theme") or "N/A"
+    project_name = project.get("project_name") or "N/A"
+    
+    return {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": (
+                f"*{theme}* | {project_name}\n"
+                f"👥 {', '.join(team_members)}\n"
+                f"{github_text} | 📅 {date_text}"
+            )
+        }
+    }
+
+
 def setup_statistics_handlers(
     app: App,
     statistics_service: StatisticsService,
     chat_manager: ChatManager,
-    user_repo: UserRepository
+    user_repo: UserRepository,
+    eval_repo: ChallengeEvaluationRepository
 ):
     """Admin istatistik handler'larını kaydeder."""
     
@@ -113,17 +151,8 @@ def setup_statistics_handlers(
             return
         
         try:
-            # Başarılı projeleri getir
-            settings = get_settings()
-            db_client = DatabaseClient(db_path=settings.database_path)
-            eval_repo = ChallengeEvaluationRepository(db_client)
-            hub_repo = ChallengeHubRepository(db_client)
-            participant_repo = ChallengeParticipantRepository(db_client)
-            
-            # Başarılı değerlendirmeleri bul
-            successful_evaluations = eval_repo.list(filters={"final_result": "success"})
-            
-            if not successful_evaluations:
+            total = eval_repo.count_successful()
+            if not total:
                 chat_manager.post_ephemeral(
                     channel=channel_id,
                     user=user_id,
@@ -131,89 +160,46 @@ def setup_statistics_handlers(
                 )
                 return
             
-            # Her proje için detayları topla
-            blocks = [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": f"🎉 Başarılı Projeler ({len(successful_evaluations)})",
-                        "emoji": True
-                    }
-                },
-                {"type": "divider"}
-            ]
-            
-            for eval_data in successful_evaluations:
-                challenge_id = eval_data["challenge_hub_id"]
-                challenge = hub_repo.get(challenge_id)
-                
-                if not challenge:
-                    continue
-                
-                # Takım üyelerini al
-                participants = participant_repo.get_team_members(challenge_id)
-                creator_id = challenge.get("creator_id")
+            # Projeler tek join sorgusuyla sayfa sayfa gelir; her sayfa ayrı mesaj olarak gönderilir
+            # (Slack mesaj başına en fazla 50 blok kabul eder)
+            shown = 0
+            pages = eval_repo.iter_successful_project_pages(page_size=SUCCESSFUL_PROJECTS_PAGE_SIZE)
+            for page_number, projects in enumerate(pages, start=1):
+                blocks = [
+                    {
+                        "type": "header",
+                        "text": {
+                            "type": "plain_text",
+                            "text": f"🎉 Başarılı Projeler ({total})" if page_number == 1
+                                    else f"🎉 Başarılı Projeler ({page_number}. sayfa)",
+                            "emoji": True
+                        }
+                    },
+                    {"type": "divider"}
+                ]
+                for project in projects:
+                    blocks.append(_build_successful_project_block(project))
+                    blocks.append({"type": "divider"})
+                shown += len(projects)
                 
-                team_members = []
-                if creator_id:
-                    team_members.append(f"<@{creator_id}>")
+                remaining = total - shown
+                last_page = page_number >= SUCCESSFUL_PROJECTS_MAX_PAGES
+                if last_page and remaining > 0:
+                    blocks.append({
+                        "type": "context",
+                        "elements": [{"type": "mrkdwn", "text": f"... ve {remaining} proje daha"}]
+                    })
                 
-                for participant in participants:
-                    user_id_p = participant.get("user_id")
-                    team_members.append(f"<@{user_id_p}>")
-                
-                # GitHub linki
-                github_url = eval_data.get("github_repo_url")
-                github_text = f"🔗 <{github_url}|GitHub>" if github_url else "❌ Link yok"
-                
-                # Tarih bilgisi
-                completed_at = eval_data.get("completed_at")
-                date_text = "Bilinmiyor"
-                if completed_at:
-                    from datetime import datetime
-                    try:
-                        dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
-                        date_text = dt.strftime("%d.%m.%Y")
-                    except:
-                        pass
-                
-                # Proje bilgileri
-                theme = challenge.get("theme", "N/A")
-                project_id = challenge.get("selected_project_id")
-                project_name = "N/A"
-                if project_id:
-                    from src.repositories import ChallengeProjectRepository
-                    project_repo = ChallengeProjectRepository(db_client)
-                    project = project_repo.get(project_id)
-                    if project:
-                        project_name = project.get("name", "N/A")
-                
-                # Block oluştur - daha kompakt
-                project_text = (
-                    f"*{theme}* | {project_name}\n"
-                    f"👥 {', '.join(team_members)}\n"
-                    f"{github_text} | 📅 {date_text}"
+                chat_manager.post_ephemeral(
+                    channel=channel_id,
+                    user=user_id,
+                    text=f"🎉 Başarılı Projeler ({total})",
+                    blocks=blocks
                 )
-                
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": project_text
-                    }
-                })
-                blocks.append({"type": "divider"})
-            
-            # Mesajı gönder
-            chat_manager.post_ephemeral(
-                channel=channel_id,
-                user=user_id,
-                text=f"🎉 Başarılı Projeler ({len(successful_evaluations)})",
-                blocks=blocks
-            )
+                if last_page:
+                    break
             
-            logger.info(f"[+] Başarılı projeler gösterildi | Kullanıcı: {user_name} ({user_id}) | Toplam: {len(successful_evaluations)}")
+            logger.info(f"[+] Başarılı projeler gösterildi | Kullanıcı: {user_name} ({user_id}) | Toplam: {total} | Gösterilen: {shown}")
             
         except Exception as e:
             logger.error(f"[X] Başarılı projeler hatası: {e}", exc_info=True)
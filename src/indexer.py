@@ -0,0 +1,96 @@
+"""
+Bilgi küpü indeksleyicisi (bottan bağımsız süreç).
+
+    python -m src.indexer
+    python -m src.indexer --source knowledge_base --store data/vector_store --keep 3
+
+Dökümanlar okunur, embedding'ler hesaplanır ve yeni bir indeks sürümü staging dizininde
+oluşturulur; tamamlanınca `CURRENT` işaretçisi atomik olarak yeni sürüme çevrilir. Çalışan
+bot(lar) işaretçideki değişikliği görüp yeni sürüme geçer (`VectorClient.reload_if_changed`);
+indeksleme botun CPU'sunu ve belleğini kullanmaz, sorgular hiç beklemez.
+
+Çıkış kodları: 0 yeni sürüm yayınlandı, 1 indekslenecek döküman yok, 2 hata.
+Son satırda yayınlanan sürüm `VERSION=<ad>` olarak basılır.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+VERSION_PREFIX = "VERSION="
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.indexer", description="Bilgi küpü indeksleyicisi")
+    parser.add_argument("--source", default=None, help="Döküman klasörü (varsayılan: KNOWLEDGE_BASE_PATH)")
+    parser.add_argument("--store", default=None, help="Vektör deposu dizini (varsayılan: VECTOR_STORE_DIR)")
+    parser.add_argument("--keep", type=int, default=None, help="Saklanacak eski sürüm sayısı")
+    return parser
+
+
+def run(source: str, store: str, keep: int, collection_patterns: Optional[Dict[str, List[str]]] = None) -> int:
+    """Dökümanları indeksler ve yeni sürümü yayınlar."""
+    from src.clients.vector_client import VectorClient
+    from src.core.logger import logger
+    from src.services.document_loader import load_knowledge_base
+
+    if not os.path.isdir(source):
+        logger.warning(f"[!] {source} bulunamadı, indekslenecek döküman yok.")
+        return 1
+
+    started = time.perf_counter()
+    texts, metadata = load_knowledge_base(source, collection_patterns=collection_patterns)
+    if not texts:
+        logger.warning(f"[!] {source} içinde indekslenecek metin bulunamadı.")
+        return 1
+
+    # Mevcut indeks bu süreçte gerekmez; sadece yeni sürüm oluşturulur
+    vector_client = VectorClient(index_path=store, keep_versions=keep, autoload=False)
+    version = vector_client.rebuild(texts, metadata)
+    logger.info(f"[+] İndeksleme tamamlandı: {len(texts)} parça, {time.perf_counter() - started:.1f}s")
+    print(f"{VERSION_PREFIX}{version}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    from src.core.settings import get_settings
+    settings = get_settings()
+    source = args.source or settings.knowledge_base_path
+    store = args.store or settings.vector_store_dir
+    keep = args.keep if args.keep is not None else settings.vector_store_keep_versions
+    try:
+        return run(source, store, keep, settings.collection_patterns())
+    except Exception as e:
+        from src.core.logger import logger
+        logger.error(f"[X] İndeksleme hatası: {e}", exc_info=True)
+        return 2
+
+
+def run_indexer_process(
+    source: Optional[str] = None,
+    store: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> subprocess.CompletedProcess:
+    """İndeksleyiciyi ayrı bir süreçte çalıştırır ve bitmesini bekler (bot içinden kullanılır)."""
+    cmd = [sys.executable, "-m", "src.indexer"]
+    if source:
+        cmd += ["--source", source]
+    if store:
+        cmd += ["--store", store]
+    return subprocess.run(cmd, stdout=subprocess.PIPE, text=True, timeout=timeout)
+
+
+def parse_version(stdout: str) -> Optional[str]:
+    """İndeksleyici çıktısından yayınlanan sürümü okur."""
+    for line in reversed(stdout.splitlines()):
+        if line.startswith(VERSION_PREFIX):
+            return line[len(VERSION_PREFIX):].strip()
+    return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
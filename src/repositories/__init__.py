@@ -1,10 +1,13 @@
 from .user_repository import UserRepository
 from .match_repository import MatchRepository
+from .coffee_pool_repository import CoffeePoolRepository
 from .poll_repository import PollRepository
 from .vote_repository import VoteRepository
 from .feedback_repository import FeedbackRepository
+from .email_outbox_repository import EmailOutboxRepository
 from .help_repository import HelpRepository
 from .challenge_hub_repository import ChallengeHubRepository
+from .challenge_start_repository import ChallengeStartRepository
 from .challenge_participant_repository import ChallengeParticipantRepository
 from .challenge_project_repository import ChallengeProjectRepository
 from .challenge_submission_repository import ChallengeSubmissionRepository
@@ -12,15 +15,19 @@ from .challenge_theme_repository import ChallengeThemeRepository
 from .user_challenge_stats_repository import UserChallengeStatsRepository
 from .challenge_evaluation_repository import ChallengeEvaluationRepository
 from .challenge_evaluator_repository import ChallengeEvaluatorRepository
+from .statistics_repository import StatisticsRepository
 
 __all__ = [
     "UserRepository",
     "MatchRepository",
+    "CoffeePoolRepository",
     "PollRepository",
     "VoteRepository",
     "FeedbackRepository",
+    "EmailOutboxRepository",
     "HelpRepository",
     "ChallengeHubRepository",
+    "ChallengeStartRepository",
     "ChallengeParticipantRepository",
     "ChallengeProjectRepository",
     "ChallengeSubmissionRepository",
@@ -28,4 +35,5 @@ __all__ = [
     "UserChallengeStatsRepository",
     "ChallengeEvaluationRepository",
     "ChallengeEvaluatorRepository",
+    "StatisticsRepository",
 ]
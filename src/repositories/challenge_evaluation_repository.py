@@ -1,7 +1,8 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 from src.repositories.base_repository import BaseRepository
 from src.clients.database_client import DatabaseClient
 from src.core.logger import logger
+from src.core.exceptions import DatabaseError
 
 
 class ChallengeEvaluationRepository(BaseRepository):
@@ -15,6 +16,38 @@ class ChallengeEvaluationRepository(BaseRepository):
         evaluations = self.list(filters={"challenge_hub_id": challenge_hub_id})
         return evaluations[0] if evaluations else None
 
+    def get_by_challenges(self, challenge_hub_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Birden fazla challenge'ın değerlendirmelerini jüri oy sayılarıyla birlikte tek sorguda getirir.
+        Dönüş: challenge_hub_id -> değerlendirme (`vote_true` / `vote_false` alanları eklenmiş).
+        Değerlendirmesi olmayan challenge'lar sonuçta yer almaz.
+        """
+        if not challenge_hub_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in challenge_hub_ids)
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT
+                        e.*,
+                        COALESCE(SUM(ev.vote = 'true'), 0) AS vote_true,
+                        COALESCE(SUM(ev.vote = 'false'), 0) AS vote_false
+                    FROM challenge_evaluations e
+                    LEFT JOIN challenge_evaluators ev ON ev.evaluation_id = e.id
+                    WHERE e.challenge_hub_id IN ({placeholders})
+                    GROUP BY e.id
+                    ORDER BY e.rowid
+                """, list(challenge_hub_ids))
+                evaluations: Dict[str, Dict[str, Any]] = {}
+                for row in cursor.fetchall():
+                    # get_by_challenge ile aynı davranış: challenge başına ilk kayıt
+                    evaluations.setdefault(row["challenge_hub_id"], dict(row))
+                return evaluations
+        except Exception as e:
+            logger.error(f"[X] get_by_challenges hatası: {e}")
+            raise DatabaseError(str(e))
+
     def get_by_channel_id(self, channel_id: str) -> Optional[Dict[str, Any]]:
         """Kanal ID'sine göre değerlendirme getirir."""
         try:
@@ -67,3 +100,78 @@ class ChallengeEvaluationRepository(BaseRepository):
             "true_votes": true_votes,
             "false_votes": false_votes
         })
+
+    def count_successful(self) -> int:
+        """Başarılı sonuçlanan değerlendirme sayısını döndürür."""
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT COUNT(*) as count
+                    FROM challenge_evaluations e
+                    INNER JOIN challenge_hubs h ON h.id = e.challenge_hub_id
+                    WHERE e.final_result = 'success'
+                """)
+                return cursor.fetchone()["count"]
+        except Exception as e:
+            logger.error(f"[X] count_successful hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def list_successful_projects(self, limit: int = 20, before_rowid: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Başarılı projeleri challenge, proje ve takım bilgisiyle birlikte tek sorguda getirir
+        (en yeni önce). Sayfalama keyset ile yapılır: bir sonraki sayfa için son kaydın
+        `cursor` değeri `before_rowid` olarak verilir.
+
+        Her kayıtta: evaluation_id, challenge_hub_id, github_repo_url, completed_at,
+        theme, creator_id, project_name, member_ids (liste), cursor
+        """
+        sql = """
+            SELECT
+                e.rowid AS cursor,
+                e.id AS evaluation_id,
+                e.challenge_hub_id,
+                e.github_repo_url,
+                e.completed_at,
+                h.theme,
+                h.creator_id,
+                p.name AS project_name,
+                GROUP_CONCAT(cp.user_id) AS member_ids
+            FROM challenge_evaluations e
+            INNER JOIN challenge_hubs h ON h.id = e.challenge_hub_id
+            LEFT JOIN challenge_projects p ON p.id = h.selected_project_id
+            LEFT JOIN challenge_participants cp ON cp.challenge_hub_id = h.id
+            WHERE e.final_result = 'success'
+        """
+        params: List[Any] = []
+        if before_rowid is not None:
+            sql += " AND e.rowid < ?"
+            params.append(before_rowid)
+        sql += " GROUP BY e.rowid ORDER BY e.rowid DESC LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, params)
+                projects = []
+                for row in cursor.fetchall():
+                    project = dict(row)
+                    project["member_ids"] = project["member_ids"].split(",") if project["member_ids"] else []
+                    projects.append(project)
+                return projects
+        except Exception as e:
+            logger.error(f"[X] list_successful_projects hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def iter_successful_project_pages(self, page_size: int = 20) -> Iterator[List[Dict[str, Any]]]:
+        """Başarılı projeleri sayfa sayfa (tembel) dolaşır."""
+        before_rowid = None
+        while True:
+            page = self.list_successful_projects(limit=page_size, before_rowid=before_rowid)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            before_rowid = page[-1]["cursor"]
@@ -2,6 +2,7 @@ from typing import Optional, List, Dict, Any
 from src.repositories.base_repository import BaseRepository
 from src.clients.database_client import DatabaseClient
 from src.core.logger import logger
+from src.core.exceptions import DatabaseError
 
 
 class ChallengeParticipantRepository(BaseRepository):
@@ -34,6 +35,30 @@ class ChallengeParticipantRepository(BaseRepository):
         """Takım üyelerini getirir."""
         return self.list(filters={"challenge_hub_id": challenge_hub_id})
 
+    def get_team_members_by_challenges(self, challenge_hub_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Birden fazla challenge'ın takım üyelerini tek sorguda getirir.
+        Dönüş: challenge_hub_id -> üye listesi (katılım sırasıyla, üyesi olmayanlar için boş liste)
+        """
+        members: Dict[str, List[Dict[str, Any]]] = {hub_id: [] for hub_id in challenge_hub_ids}
+        if not members:
+            return members
+        placeholders = ", ".join("?" for _ in members)
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT * FROM challenge_participants
+                    WHERE challenge_hub_id IN ({placeholders})
+                    ORDER BY rowid
+                """, list(members))
+                for row in cursor.fetchall():
+                    members[row["challenge_hub_id"]].append(dict(row))
+                return members
+        except Exception as e:
+            logger.error(f"[X] get_team_members_by_challenges hatası: {e}")
+            raise DatabaseError(str(e))
+
     def get_user_active_challenges(self, user_id: str) -> List[Dict[str, Any]]:
         """Kullanıcının aktif challenge'larını getirir."""
         try:
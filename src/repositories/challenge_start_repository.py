@@ -0,0 +1,84 @@
+import json
+from typing import Any, Dict, List, Optional
+from src.core.logger import logger
+from src.core.exceptions import DatabaseError
+from src.repositories.base_repository import BaseRepository
+from src.clients.database_client import DatabaseClient
+
+
+class ChallengeStartRepository(BaseRepository):
+    """
+    Challenge başlatma iş akışının kalıcı durumu (challenge_start_runs).
+    Kayıtlar challenge_hub_id ile anahtarlanır; `state` JSON olarak saklanır.
+    """
+
+    def __init__(self, db_client: DatabaseClient):
+        super().__init__(db_client, "challenge_start_runs")
+
+    def _to_run(self, row) -> Dict[str, Any]:
+        run = dict(row)
+        run["state"] = json.loads(run["state"]) if run.get("state") else {}
+        return run
+
+    def get_run(self, challenge_hub_id: str) -> Optional[Dict[str, Any]]:
+        """Challenge'ın yarıda kalmış başlatma kaydını getirir."""
+        try:
+            with self.db_client.get_connection() as conn:
+                row = conn.execute(
+                    f"SELECT * FROM {self.table_name} WHERE challenge_hub_id = ?",
+                    (challenge_hub_id,)
+                ).fetchone()
+                return self._to_run(row) if row else None
+        except Exception as e:
+            logger.error(f"[X] ChallengeStartRepository.get_run hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def save_run(
+        self,
+        challenge_hub_id: str,
+        step: str,
+        state: Dict[str, Any],
+        attempts: int = 0,
+        last_error: Optional[str] = None
+    ) -> None:
+        """Sıradaki adımı ve biriken durumu kaydeder (yoksa oluşturur)."""
+        sql = f"""
+            INSERT INTO {self.table_name} (challenge_hub_id, step, state, attempts, last_error)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(challenge_hub_id) DO UPDATE SET
+                step = excluded.step,
+                state = excluded.state,
+                attempts = excluded.attempts,
+                last_error = excluded.last_error,
+                updated_at = CURRENT_TIMESTAMP
+        """
+        try:
+            with self.db_client.get_connection() as conn:
+                conn.execute(sql, (
+                    challenge_hub_id, step, json.dumps(state, ensure_ascii=False, default=str),
+                    attempts, last_error
+                ))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[X] ChallengeStartRepository.save_run hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def delete_run(self, challenge_hub_id: str) -> None:
+        """Tamamlanan (veya vazgeçilen) başlatma kaydını siler."""
+        try:
+            with self.db_client.get_connection() as conn:
+                conn.execute(f"DELETE FROM {self.table_name} WHERE challenge_hub_id = ?", (challenge_hub_id,))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[X] ChallengeStartRepository.delete_run hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def list_unfinished(self) -> List[Dict[str, Any]]:
+        """Yarıda kalmış tüm başlatmaları (en eski önce) getirir."""
+        try:
+            with self.db_client.get_connection() as conn:
+                rows = conn.execute(f"SELECT * FROM {self.table_name} ORDER BY created_at ASC").fetchall()
+                return [self._to_run(row) for row in rows]
+        except Exception as e:
+            logger.error(f"[X] ChallengeStartRepository.list_unfinished hatası: {e}")
+            raise DatabaseError(str(e))
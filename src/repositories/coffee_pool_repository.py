@@ -0,0 +1,56 @@
+from typing import Any, Dict, Iterable, List
+from src.core.logger import logger
+from src.core.exceptions import DatabaseError
+from src.repositories.base_repository import BaseRepository
+from src.clients.database_client import DatabaseClient
+
+class CoffeePoolRepository(BaseRepository):
+    """
+    Kahve bekleme havuzu (coffee_pool) için veritabanı erişim sınıfı.
+    Kayıtlar user_id ile anahtarlanır.
+    """
+
+    def __init__(self, db_client: DatabaseClient):
+        super().__init__(db_client, "coffee_pool")
+
+    def add(self, user_id: str, channel_id: str, user_name: str, expires_at: float) -> None:
+        """Kullanıcıyı havuza ekler (varsa süresini günceller)."""
+        sql = (
+            f"INSERT OR REPLACE INTO {self.table_name} (user_id, channel_id, user_name, expires_at) "
+            f"VALUES (?, ?, ?, ?)"
+        )
+        try:
+            with self.db_client.get_connection() as conn:
+                conn.execute(sql, (user_id, channel_id, user_name, expires_at))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[X] CoffeePoolRepository.add hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def remove_many(self, user_ids: Iterable[str]) -> int:
+        """Verilen kullanıcıları havuzdan tek sorguda siler."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return 0
+        placeholders = ", ".join("?" for _ in user_ids)
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.execute(f"DELETE FROM {self.table_name} WHERE user_id IN ({placeholders})", user_ids)
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"[X] CoffeePoolRepository.remove_many hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def list_waiting(self) -> List[Dict[str, Any]]:
+        """Havuzdaki kullanıcıları bekleme sırasına göre döndürür."""
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.execute(
+                    f"SELECT user_id, channel_id, user_name, expires_at FROM {self.table_name} "
+                    f"ORDER BY expires_at ASC"
+                )
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"[X] CoffeePoolRepository.list_waiting hatası: {e}")
+            raise DatabaseError(str(e))
@@ -0,0 +1,125 @@
+import json
+from typing import Any, Dict, List, Optional
+from src.core.logger import logger
+from src.core.exceptions import DatabaseError
+from src.repositories.base_repository import BaseRepository
+from src.clients.database_client import DatabaseClient
+
+
+class EmailOutboxRepository(BaseRepository):
+    """
+    Gönderilmeyi bekleyen e-postalar (email_outbox).
+    `recipients` JSON liste olarak saklanır; zamanlar SQLite saatiyle (UTC) karşılaştırılır.
+    """
+
+    def __init__(self, db_client: DatabaseClient):
+        super().__init__(db_client, "email_outbox")
+
+    def _to_email(self, row) -> Dict[str, Any]:
+        email = dict(row)
+        email["recipients"] = json.loads(email["recipients"])
+        email["is_html"] = bool(email.get("is_html"))
+        return email
+
+    def enqueue(self, recipients: List[str], subject: str, body: str, is_html: bool = False) -> str:
+        """E-postayı kuyruğa ekler ve kayıt ID'sini döndürür."""
+        return self.create({
+            "recipients": json.dumps(recipients, ensure_ascii=False),
+            "subject": subject,
+            "body": body,
+            "is_html": 1 if is_html else 0,
+        })
+
+    def get_due(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Gönderim zamanı gelmiş bekleyen e-postaları (en eski önce) getirir."""
+        sql = f"""
+            SELECT * FROM {self.table_name}
+            WHERE status = 'pending' AND next_attempt_at <= datetime('now')
+            ORDER BY created_at ASC, rowid ASC
+            LIMIT ?
+        """
+        try:
+            with self.db_client.get_connection() as conn:
+                rows = conn.execute(sql, (limit,)).fetchall()
+                return [self._to_email(row) for row in rows]
+        except Exception as e:
+            logger.error(f"[X] EmailOutboxRepository.get_due hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def mark_sent(self, email_ids: List[str]) -> None:
+        """Gönderilen e-postaları işaretler."""
+        if not email_ids:
+            return
+        placeholders = ", ".join("?" * len(email_ids))
+        sql = f"""
+            UPDATE {self.table_name}
+            SET status = 'sent', sent_at = CURRENT_TIMESTAMP, last_error = NULL
+            WHERE id IN ({placeholders})
+        """
+        try:
+            with self.db_client.get_connection() as conn:
+                conn.execute(sql, email_ids)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[X] EmailOutboxRepository.mark_sent hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def schedule_retry(
+        self,
+        email_id: str,
+        attempts: int,
+        delay_seconds: float,
+        error: str,
+        recipients: Optional[List[str]] = None
+    ) -> None:
+        """
+        Başarısız gönderimi `delay_seconds` sonra tekrar denenmek üzere erteler.
+        `recipients` verilirse sadece bu alıcılar yeniden denenir (diğerlerine ulaştırılmıştır).
+        """
+        sql = f"""
+            UPDATE {self.table_name}
+            SET attempts = ?, last_error = ?, next_attempt_at = datetime('now', ?),
+                recipients = COALESCE(?, recipients)
+            WHERE id = ?
+        """
+        try:
+            with self.db_client.get_connection() as conn:
+                conn.execute(sql, (attempts, error, f"+{int(delay_seconds)} seconds", self._recipients_json(recipients), email_id))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[X] EmailOutboxRepository.schedule_retry hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def mark_failed(self, email_id: str, attempts: int, error: str, recipients: Optional[List[str]] = None) -> None:
+        """
+        Deneme hakkı biten veya kalıcı hata alan e-postayı başarısız işaretler.
+        `recipients` verilirse kayıt sadece ulaştırılamayan alıcıları gösterir.
+        """
+        sql = f"""
+            UPDATE {self.table_name}
+            SET status = 'failed', attempts = ?, last_error = ?, recipients = COALESCE(?, recipients)
+            WHERE id = ?
+        """
+        try:
+            with self.db_client.get_connection() as conn:
+                conn.execute(sql, (attempts, error, self._recipients_json(recipients), email_id))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[X] EmailOutboxRepository.mark_failed hatası: {e}")
+            raise DatabaseError(str(e))
+
+    @staticmethod
+    def _recipients_json(recipients: Optional[List[str]]) -> Optional[str]:
+        return None if recipients is None else json.dumps(recipients, ensure_ascii=False)
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Durum başına e-posta sayısı (pending, sent, failed)."""
+        try:
+            with self.db_client.get_connection() as conn:
+                rows = conn.execute(
+                    f"SELECT status, COUNT(*) AS total FROM {self.table_name} GROUP BY status"
+                ).fetchall()
+                return {row["status"]: row["total"] for row in rows}
+        except Exception as e:
+            logger.error(f"[X] EmailOutboxRepository.count_by_status hatası: {e}")
+            raise DatabaseError(str(e))
@@ -1,3 +1,6 @@
+from typing import Dict, Iterable, Set
+from src.core.logger import logger
+from src.core.exceptions import DatabaseError
 from src.repositories.base_repository import BaseRepository
 from src.clients.database_client import DatabaseClient
 
@@ -8,3 +11,34 @@ class MatchRepository(BaseRepository):
 
     def __init__(self, db_client: DatabaseClient):
         super().__init__(db_client, "matches")
+
+    def get_recent_partners(self, user_ids: Iterable[str], days: int = 30) -> Dict[str, Set[str]]:
+        """
+        Verilen kullanıcıların son `days` gün içindeki eşleşme partnerlerini tek sorguda getirir.
+        Returns: user_id -> partner user_id kümesi
+        """
+        user_ids = list(user_ids)
+        partners: Dict[str, Set[str]] = {user_id: set() for user_id in user_ids}
+        if not user_ids:
+            return partners
+
+        placeholders = ", ".join("?" for _ in user_ids)
+        query = (
+            f"SELECT user1_id, user2_id FROM {self.table_name} "
+            f"WHERE (user1_id IN ({placeholders}) OR user2_id IN ({placeholders})) "
+            f"AND created_at >= datetime('now', ?)"
+        )
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, user_ids + user_ids + [f"-{days} days"])
+                for row in cursor.fetchall():
+                    user1, user2 = row["user1_id"], row["user2_id"]
+                    if user1 in partners:
+                        partners[user1].add(user2)
+                    if user2 in partners:
+                        partners[user2].add(user1)
+            return partners
+        except Exception as e:
+            logger.error(f"[X] MatchRepository.get_recent_partners hatası: {e}")
+            raise DatabaseError(str(e))
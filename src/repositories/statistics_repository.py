@@ -0,0 +1,105 @@
+from typing import Dict, Optional
+from src.core.logger import logger
+from src.core.exceptions import DatabaseError
+from src.clients.database_client import DatabaseClient, STATS_COUNTER_SPECS
+
+# Admin raporunda kullanılan kapsamlar (poll_votes oylama başına sayaçtır, rapora girmez)
+REPORT_SCOPES = ("users", "matches", "help_requests", "feedbacks", "polls", "votes")
+
+
+def _bucket_expr(column: Optional[str]) -> str:
+    # stats_counters ile aynı kodlama: değer metne çevrilir, NULL -> ''
+    return f"COALESCE(CAST({column} AS TEXT), '')" if column else "''"
+
+
+class StatisticsRepository:
+    """
+    Admin istatistikleri için sayım sorguları.
+
+    Sayımlar iki kaynaktan okunabilir:
+        - `fetch_counter_snapshot`: trigger'larla güncel tutulan stats_counters tablosu (tarama yok)
+        - `fetch_grouped_counts`: tabloların anlık GROUP BY sayımı (tek sorgu, doğrulama için)
+    İkisi de aynı biçimde döner: kapsam -> {grup değeri (metin, NULL için '') -> kayıt sayısı}
+    """
+
+    def __init__(self, db_client: DatabaseClient):
+        self.db_client = db_client
+        self._grouped_query = " UNION ALL ".join(
+            f"SELECT '{scope}' AS scope, {_bucket_expr(column)} AS bucket, COUNT(*) AS count "
+            f"FROM {table} GROUP BY 2"
+            for scope, table, column in STATS_COUNTER_SPECS
+        )
+
+    def _collect(self, rows, scopes) -> Dict[str, Dict[str, int]]:
+        counts: Dict[str, Dict[str, int]] = {scope: {} for scope in scopes}
+        for row in rows:
+            if row["scope"] in counts and row["count"]:
+                counts[row["scope"]][row["bucket"]] = row["count"]
+        return counts
+
+    def fetch_grouped_counts(self, include_poll_votes: bool = False) -> Dict[str, Dict[str, int]]:
+        """Tüm tabloların GROUP BY sayımlarını tek sorguda hesaplar."""
+        scopes = [spec[0] for spec in STATS_COUNTER_SPECS] if include_poll_votes else REPORT_SCOPES
+        try:
+            with self.db_client.get_connection() as conn:
+                rows = conn.execute(self._grouped_query).fetchall()
+            return self._collect(rows, scopes)
+        except Exception as e:
+            logger.error(f"[X] StatisticsRepository.fetch_grouped_counts hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def fetch_counter_snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Rapor sayaçlarını stats_counters tablosundan okur (tablo taraması yapılmaz)."""
+        placeholders = ", ".join("?" for _ in REPORT_SCOPES)
+        try:
+            with self.db_client.get_connection() as conn:
+                rows = conn.execute(
+                    f"SELECT scope, bucket, count FROM stats_counters WHERE scope IN ({placeholders})",
+                    REPORT_SCOPES
+                ).fetchall()
+            return self._collect(rows, REPORT_SCOPES)
+        except Exception as e:
+            logger.error(f"[X] StatisticsRepository.fetch_counter_snapshot hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def get_poll_vote_count(self, poll_id: str) -> int:
+        """Bir oylamanın toplam oy sayısını sayaçtan okur."""
+        try:
+            with self.db_client.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT count FROM stats_counters WHERE scope = 'poll_votes' AND bucket = ?",
+                    (poll_id,)
+                ).fetchone()
+            return row["count"] if row else 0
+        except Exception as e:
+            logger.error(f"[X] StatisticsRepository.get_poll_vote_count hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def reconcile_counters(self) -> int:
+        """
+        stats_counters tablosunu tabloların gerçek sayımlarından yeniden kurar.
+        Düzeltilen (sapmış) sayaç sayısını döndürür.
+        """
+        conn = self.db_client.get_connection()
+        try:
+            with conn:
+                before = {
+                    (row["scope"], row["bucket"]): row["count"]
+                    for row in conn.execute("SELECT scope, bucket, count FROM stats_counters WHERE count != 0")
+                }
+                actual = {
+                    (row["scope"], row["bucket"]): row["count"]
+                    for row in conn.execute(self._grouped_query)
+                }
+                conn.execute("DELETE FROM stats_counters")
+                conn.executemany(
+                    "INSERT INTO stats_counters (scope, bucket, count) VALUES (?, ?, ?)",
+                    [(scope, bucket, count) for (scope, bucket), count in actual.items()]
+                )
+            drift = sum(1 for key in before.keys() | actual.keys() if before.get(key, 0) != actual.get(key, 0))
+            return drift
+        except Exception as e:
+            logger.error(f"[X] StatisticsRepository.reconcile_counters hatası: {e}")
+            raise DatabaseError(str(e))
+        finally:
+            conn.close()
@@ -1,4 +1,5 @@
-from typing import Dict, Any
+import sqlite3
+from typing import Dict, Any, Iterable
 from src.repositories.base_repository import BaseRepository
 from src.clients.database_client import DatabaseClient
 from src.core.logger import logger
@@ -94,3 +95,36 @@ class UserChallengeStatsRepository(BaseRepository):
         stats = self.get_or_create(user_id)
         new_count = stats.get("completed_challenges", 0) + 1
         self._update_fields(user_id, {"completed_challenges": new_count})
+
+    def award_success(self, user_ids: Iterable[str], points: int) -> int:
+        """
+        Başarılı challenge için kullanıcılara puan ekler ve tamamlanan sayısını artırır.
+        Tüm kullanıcılar tek bağlantı/transaction içinde güncellenir (kaydı olmayan oluşturulur).
+
+        Returns:
+            Güncellenen kullanıcı sayısı
+        """
+        sql = f"""
+            INSERT INTO {self.table_name}
+                (user_id, total_challenges, completed_challenges, total_points)
+            VALUES (?, 0, 1, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                completed_challenges = completed_challenges + 1,
+                total_points = total_points + excluded.total_points,
+                updated_at = CURRENT_TIMESTAMP
+        """
+        updated = 0
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor()
+                for user_id in dict.fromkeys(user_ids):
+                    try:
+                        cursor.execute(sql, (user_id, points))
+                        updated += 1
+                    except sqlite3.IntegrityError as e:
+                        # users tablosunda olmayan kullanıcı (foreign key) diğerlerini engellemesin
+                        logger.warning(f"[!] user_challenge_stats güncellenemedi ({user_id}): {e}")
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[X] user_challenge_stats.award_success hatası: {e}")
+        return updated
@@ -1,3 +1,6 @@
+import json
+import uuid
+from typing import Any, Dict, List, Tuple
 from src.core.logger import logger
 from src.core.exceptions import DatabaseError
 from src.repositories.base_repository import BaseRepository
@@ -57,3 +60,107 @@ class VoteRepository(BaseRepository):
         except Exception as e:
             logger.error(f"[X] VoteRepository.delete_all_user_votes hatası: {e}")
             raise DatabaseError(str(e))
+
+    def toggle_vote(self, poll_id: str, user_id: str, option_index: int) -> str:
+        """
+        Oyu tek bir yazma transaction'ında (BEGIN IMMEDIATE) işler: oylamanın açık olduğunu
+        kontrol eder, toggle/switch uygular. Çoklu süreç modunda süreçler aynı kullanıcının
+        tıklamalarını sırayla görür; kapanışla da sıralanır.
+
+        Returns:
+            "added", "removed", "closed" veya "not_found" (oylama yok ya da seçenek geçersiz)
+        """
+        conn = self.db_client.get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            poll = conn.execute(
+                "SELECT options, allow_multiple, is_closed FROM polls WHERE id = ?", (poll_id,)
+            ).fetchone()
+            if not poll or not 0 <= option_index < len(json.loads(poll["options"])):
+                conn.rollback()
+                return "not_found"
+            if poll["is_closed"]:
+                conn.rollback()
+                return "closed"
+
+            has_voted = conn.execute(
+                f"SELECT 1 FROM {self.table_name} WHERE poll_id = ? AND user_id = ? AND option_index = ?",
+                (poll_id, user_id, option_index)
+            ).fetchone()
+            if has_voted:
+                conn.execute(
+                    f"DELETE FROM {self.table_name} WHERE poll_id = ? AND user_id = ? AND option_index = ?",
+                    (poll_id, user_id, option_index)
+                )
+                result = "removed"
+            else:
+                if not poll["allow_multiple"]:
+                    conn.execute(f"DELETE FROM {self.table_name} WHERE poll_id = ? AND user_id = ?", (poll_id, user_id))
+                conn.execute(
+                    f"INSERT INTO {self.table_name} (id, poll_id, user_id, option_index) VALUES (?, ?, ?, ?)",
+                    (str(uuid.uuid4()), poll_id, user_id, option_index)
+                )
+                result = "added"
+            conn.commit()
+            return result
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"[X] VoteRepository.toggle_vote hatası: {e}")
+            raise DatabaseError(str(e))
+        finally:
+            conn.close()
+
+    def voter_exists(self, user_id: str) -> bool:
+        """Oy verecek kullanıcı `users` tablosunda var mı? (votes.user_id -> users.slack_id)"""
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM users WHERE slack_id = ? LIMIT 1", (user_id,))
+                return cursor.fetchone() is not None
+        except Exception as e:
+            logger.error(f"[X] VoteRepository.voter_exists hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def list_by_polls(self, poll_ids: List[str]) -> List[Dict[str, Any]]:
+        """Verilen oylamalara ait tüm oyları tek sorguda getirir (sayaç yeniden yükleme için)."""
+        if not poll_ids:
+            return []
+        placeholders = ", ".join("?" for _ in poll_ids)
+        query = (
+            f"SELECT poll_id, user_id, option_index FROM {self.table_name} "
+            f"WHERE poll_id IN ({placeholders})"
+        )
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, list(poll_ids))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"[X] VoteRepository.list_by_polls hatası: {e}")
+            raise DatabaseError(str(e))
+
+    def apply_ops(self, ops: List[Tuple]) -> None:
+        """
+        Sıralı oy işlemlerini tek transaction içinde uygular.
+
+        İşlemler:
+            ("insert", vote_id, poll_id, user_id, option_index)
+            ("delete", poll_id, user_id, option_index)
+            ("delete_all", poll_id, user_id)
+        Bir işlem başarısız olursa transaction tamamen geri alınır.
+        """
+        sql = {
+            "insert": f"INSERT OR IGNORE INTO {self.table_name} (id, poll_id, user_id, option_index) VALUES (?, ?, ?, ?)",
+            "delete": f"DELETE FROM {self.table_name} WHERE poll_id = ? AND user_id = ? AND option_index = ?",
+            "delete_all": f"DELETE FROM {self.table_name} WHERE poll_id = ? AND user_id = ?",
+        }
+        conn = self.db_client.get_connection()
+        try:
+            with conn:
+                for op in ops:
+                    conn.execute(sql[op[0]], op[1:])
+        except Exception as e:
+            logger.error(f"[X] VoteRepository.apply_ops hatası: {e}")
+            raise DatabaseError(str(e))
+        finally:
+            conn.close()
@@ -1,21 +1,18 @@
-from .match_service import CoffeeMatchService
-from .voting_service import VotingService
-from .feedback_service import FeedbackService
-from .knowledge_service import KnowledgeService
-from .help_service import HelpService
-from .statistics_service import StatisticsService
-from .challenge_enhancement_service import ChallengeEnhancementService
-from .challenge_hub_service import ChallengeHubService
-from .challenge_evaluation_service import ChallengeEvaluationService
+# Servisler ilk erişimde import edilir (bkz. src.core.lazy.lazy_exports)
+from src.core.lazy import lazy_exports
 
-__all__ = [
-    "CoffeeMatchService",
-    "VotingService",
-    "FeedbackService",
-    "KnowledgeService",
-    "HelpService",
-    "StatisticsService",
-    "ChallengeEnhancementService",
-    "ChallengeHubService",
-    "ChallengeEvaluationService",
-]
+_EXPORTS = {
+    "CoffeeMatchService": ".match_service",
+    "VotingService": ".voting_service",
+    "EmailOutboxService": ".email_outbox_service",
+    "FeedbackService": ".feedback_service",
+    "KnowledgeService": ".knowledge_service",
+    "HelpService": ".help_service",
+    "StatisticsService": ".statistics_service",
+    "ChallengeEnhancementService": ".challenge_enhancement_service",
+    "ChallengeHubService": ".challenge_hub_service",
+    "ChallengeEvaluationService": ".challenge_evaluation_service",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
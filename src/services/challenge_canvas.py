@@ -0,0 +1,165 @@
+"""
+Challenge özet canvas'ı için veri yükleme ve içerik üretimi.
+
+Canvas her oy, değerlendirme başlangıcı ve sonuçlandırmada yeniden çizilir. Challenge başına
+ayrı sorgular yerine `ChallengeCanvasLoader` tüm aktif challenge'ların değerlendirme (jüri
+oylarıyla) ve katılımcı verisini iki `IN (...)` sorgusunda toplar. Üretilen içerik
+`content_hash` ile özetlenir; içerik değişmediyse Slack'e tekrar gönderilmez.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from src.repositories import ChallengeEvaluationRepository, ChallengeParticipantRepository
+
+CANVAS_TITLE = "📊 Aktif Challenge'lar"
+# Tüm aktif challenge'lar tek canvas'ta gösterildiğinden yayıncıda tek anahtar kullanılır
+CANVAS_PUBLISH_KEY = "challenge_hub_canvas"
+
+
+class ChallengeCanvasLoader:
+    """
+    DataLoader tarzı toplu yükleyici (tek bir canvas çizimi boyunca yaşar).
+
+    `prime` ile verilen challenge'ların verisi iki sorguda çekilir ve önbelleğe alınır;
+    önbellekte olmayan bir challenge istenirse yine toplu yol kullanılır.
+    """
+
+    def __init__(
+        self,
+        evaluation_repo: ChallengeEvaluationRepository,
+        participant_repo: ChallengeParticipantRepository
+    ):
+        self.evaluation_repo = evaluation_repo
+        self.participant_repo = participant_repo
+        self._evaluations: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._members: Dict[str, List[Dict[str, Any]]] = {}
+
+    def prime(self, challenge_ids: Iterable[str]) -> None:
+        """Önbellekte olmayan challenge'ları iki sorguda yükler."""
+        missing = [ch_id for ch_id in dict.fromkeys(challenge_ids) if ch_id not in self._members]
+        if not missing:
+            return
+        evaluations = self.evaluation_repo.get_by_challenges(missing)
+        members = self.participant_repo.get_team_members_by_challenges(missing)
+        for ch_id in missing:
+            self._evaluations[ch_id] = evaluations.get(ch_id)
+            self._members[ch_id] = members.get(ch_id, [])
+
+    def evaluation(self, challenge_id: str) -> Optional[Dict[str, Any]]:
+        self.prime([challenge_id])
+        return self._evaluations[challenge_id]
+
+    def team_members(self, challenge_id: str) -> List[Dict[str, Any]]:
+        self.prime([challenge_id])
+        return self._members[challenge_id]
+
+
+def content_hash(content: str) -> str:
+    """Gönderilen içeriğin özeti (değişiklik tespiti için)."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _status_label(status: str, evaluation: Optional[Dict[str, Any]]) -> str:
+    if status == "recruiting":
+        return "📋 Toplanıyor"
+    if status == "active":
+        return "🚀 Geliştirme"
+    if status == "evaluating":
+        return "⚖️ Değerlendirme"
+    if status == "completed":
+        final_result = evaluation.get("final_result") if evaluation else None
+        return "✅ Başarılı" if final_result == "success" else "❌ Başarısız"
+    return "❓ Bilinmiyor"
+
+
+def _team_info(challenge: Dict[str, Any], members: List[Dict[str, Any]]) -> str:
+    participant_ids = [m["user_id"] for m in members]
+    creator_id = challenge.get("creator_id")
+    if creator_id and creator_id not in participant_ids:
+        participant_ids.insert(0, creator_id)
+
+    participant_count = len(participant_ids)
+    # team_size creator hariç sayı, toplam = team_size + 1 (creator dahil)
+    total_team_size = challenge.get("team_size", 0) + 1
+
+    if not participant_ids:
+        return f"0/{total_team_size}"
+
+    # Slack Canvas'ta mention formatı: ![](@USER_ID)
+    # Kural: 7 kişiye kadar tüm üyeler, 7'den fazlasında ilk 3 kişi + "+N"
+    if participant_count <= 7:
+        user_mentions = ", ".join(f"![](@{uid})" for uid in participant_ids)
+        return f"{user_mentions} ({participant_count}/{total_team_size})"
+    shown_users = participant_ids[:3]
+    user_mentions = ", ".join(f"![](@{uid})" for uid in shown_users)
+    remaining = participant_count - len(shown_users)
+    return f"{user_mentions} +{remaining} ({participant_count}/{total_team_size})"
+
+
+def build_canvas_rows(challenges: List[Dict[str, Any]], loader: ChallengeCanvasLoader) -> List[Dict[str, str]]:
+    """Aktif challenge'lar için tablo satırlarını üretir (veri tek seferde yüklenir)."""
+    loader.prime(ch.get("id") for ch in challenges)
+
+    rows = []
+    for ch in challenges:
+        ch_id = ch.get("id")
+        evaluation = loader.evaluation(ch_id)
+
+        deadline = ch.get("deadline")
+        deadline_text = (
+            datetime.fromisoformat(deadline).strftime("%d.%m %H:%M")
+            if deadline else "Belirlenmedi"
+        )
+
+        github_info = "❌ Yok"
+        votes_info = "-"
+        if evaluation:
+            if evaluation.get("github_repo_url"):
+                github_public = evaluation.get("github_repo_public", 0) == 1
+                github_info = "✅ Public" if github_public else "⚠️ Private"
+            true_votes = evaluation.get("vote_true", 0)
+            false_votes = evaluation.get("vote_false", 0)
+            if true_votes > 0 or false_votes > 0:
+                votes_info = f"✅{true_votes} ❌{false_votes}"
+
+        rows.append({
+            "theme": ch.get("theme", "N/A")[:20],
+            "project": (ch.get("project_name") or "Belirlenmedi")[:25],
+            "status": _status_label(ch.get("status", "unknown"), evaluation),
+            "deadline": deadline_text,
+            "team": _team_info(ch, loader.team_members(ch_id)),
+            "github": github_info,
+            "votes": votes_info,
+        })
+    return rows
+
+
+def render_canvas_markdown(rows: List[Dict[str, str]]) -> str:
+    """Slack Canvas için markdown tablo içeriği."""
+    lines = [
+        f"# {CANVAS_TITLE}\n",
+        "| Tema | Proje | Durum | Bitiş | Takım | GitHub | Oylar |",
+        "|------|-------|-------|-------|-------|--------|-------|"
+    ]
+    for row in rows:
+        # Takım kolonu kırpılmaz, mention'lar tam kalsın
+        lines.append(
+            f"| {row['theme'][:18]} | {row['project'][:23]} | {row['status'][:13]} | "
+            f"{row['deadline']} | {row['team']} | {row['github'][:10]} | {row['votes']} |"
+        )
+    return "\n".join(lines)
+
+
+def render_fallback_table(rows: List[Dict[str, str]]) -> str:
+    """Canvas API kullanılamadığında normal mesaj olarak gönderilen düz tablo."""
+    lines = [
+        f"*{'Tema':<18} | {'Proje':<23} | {'Durum':<13} | {'Bitiş':<10} | {'Takım'} | {'GitHub':<10} | {'Oylar':<8}*",
+        "─" * 100
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['theme'][:18]:<18} | {row['project'][:23]:<23} | {row['status'][:13]:<13} | "
+            f"{row['deadline']:<10} | {row['team']} | {row['github'][:10]:<10} | {row['votes']:<8}"
+        )
+    return "\n".join(lines)
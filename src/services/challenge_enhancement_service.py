@@ -3,10 +3,10 @@ Challenge projelerini LLM ile özelleştiren servis.
 """
 
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from src.core.logger import logger
 from src.clients import GroqClient
-from src.services import KnowledgeService
+from src.services import KnowledgeService, document_loader
 
 
 class ChallengeEnhancementService:
@@ -14,9 +14,16 @@ class ChallengeEnhancementService:
     Challenge projelerini LLM ile özelleştiren servis.
     """
 
-    def __init__(self, groq_client: GroqClient, knowledge_service: KnowledgeService):
+    def __init__(
+        self,
+        groq_client: GroqClient,
+        knowledge_service: KnowledgeService,
+        knowledge_collection: Optional[str] = "challenge"
+    ):
         self.groq = groq_client
         self.knowledge = knowledge_service
+        # Challenge dökümanlarının koleksiyonu; indekste yoksa tüm koleksiyonlarda aranır
+        self.knowledge_collection = knowledge_collection
 
     async def enhance_project(
         self,
@@ -124,13 +131,14 @@ class ChallengeEnhancementService:
         """
         try:
             query = f"{theme} {project_name} best practices guidelines"
-            results = self.knowledge.model_search_context(query, top_k=3)
+            collections = [self.knowledge_collection] if self.knowledge_collection else None
+            results = self.knowledge.model_search_context(query, top_k=3, collections=collections)
 
             if not results:
                 return "İlgili bilgi bulunamadı."
 
             knowledge_text = "\n".join([
-                f"- {r.get('source', 'Unknown')}: {r.get('text', '')[:200]}..."
+                f"- {document_loader.format_citation(r.get('metadata', {}))}: {r.get('text', '')[:200]}..."
                 for r in results
             ])
 
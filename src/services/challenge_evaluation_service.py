@@ -8,7 +8,7 @@ import requests
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from src.core.logger import logger
-from src.commands import ChatManager, ConversationManager, CanvasManager, UserManager
+from src.commands import ChatManager, ConversationManager, CanvasManager, UserManager, DirectMessageManager
 from src.repositories import (
     ChallengeEvaluationRepository,
     ChallengeEvaluatorRepository,
@@ -17,6 +17,16 @@ from src.repositories import (
     UserChallengeStatsRepository
 )
 from src.clients import CronClient
+from src.core.coalescer import UpdateCoalescer
+from src.services.challenge_canvas import (
+    CANVAS_PUBLISH_KEY,
+    CANVAS_TITLE,
+    ChallengeCanvasLoader,
+    build_canvas_rows,
+    content_hash,
+    render_canvas_markdown,
+    render_fallback_table,
+)
 from src.core.settings import get_settings
 
 
@@ -34,10 +44,13 @@ class ChallengeEvaluationService:
         stats_repo: UserChallengeStatsRepository,
         cron_client: CronClient,
         canvas_manager: CanvasManager = None,
-        user_manager: UserManager = None
+        user_manager: UserManager = None,
+        canvas_update_interval: float = 3.0,
+        dm_manager: DirectMessageManager = None
     ):
         self.chat = chat_manager
         self.conv = conv_manager
+        self.dm = dm_manager or DirectMessageManager(chat_manager, conv_manager)
         self.canvas = canvas_manager
         self.user_manager = user_manager
         self.evaluation_repo = evaluation_repo
@@ -46,15 +59,44 @@ class ChallengeEvaluationService:
         self.participant_repo = participant_repo
         self.stats_repo = stats_repo
         self.cron = cron_client
+        # Gönderilen canvas/fallback içeriklerinin özeti (canvas_id veya mesaj ts -> hash)
+        self._published_canvas_hashes: Dict[str, str] = {}
+        # Canvas güncellemeleri arka planda birleştirilerek yayınlanır
+        self.canvas_publisher = UpdateCoalescer(interval=canvas_update_interval, name="challenge-canvas")
+        self._canvas_stats = {"published": 0, "skipped": 0}
 
-    async def update_challenge_canvas(self, challenge_id: str = None) -> None:
+    def request_canvas_update(self, challenge_id: str = None) -> None:
+        """
+        Challenge canvas'ını kirli işaretler ve hemen döner.
+        Kısa pencere içindeki tüm istekler tek bir yayınla karşılanır; çağıran
+        Slack I/O'sunu beklemez.
+
+        Args:
+            challenge_id: Güncellemeyi tetikleyen challenge (sadece log için; canvas tüm aktif challenge'ları gösterir)
+        """
+        logger.debug(f"[i] Canvas güncellemesi istendi | Challenge: {challenge_id or '-'}")
+        self.canvas_publisher.mark_dirty(CANVAS_PUBLISH_KEY, self.publish_challenge_canvas)
+
+    def get_canvas_publisher_stats(self) -> Dict[str, int]:
+        """Canvas yayıncısının istatistikleri (istenen, birleştirilen, yayınlanan, atlanan...)."""
+        stats = self.canvas_publisher.get_stats()
+        stats.update(self._canvas_stats)
+        return stats
+
+    def shutdown(self) -> None:
+        """Bekleyen canvas güncellemesini hemen yayınlar (kapanışta)."""
+        self.canvas_publisher.flush(CANVAS_PUBLISH_KEY)
+        logger.info(f"[i] Canvas yayıncısı durduruldu | {self.get_canvas_publisher_stats()}")
+
+    def publish_challenge_canvas(self) -> None:
         """
         Duyuru kanalındaki challenge özet/canvas mesajını günceller veya yoksa oluşturur.
         Tüm aktif challenge'ları yatay tablo formatında gösterir.
         Her challenge bir satır olarak eklenir.
-        
-        Args:
-            challenge_id: Belirli bir challenge için güncelleme (opsiyonel, None ise tüm aktif challenge'lar)
+
+        Veri iki toplu sorguyla yüklenir; üretilen içerik en son gönderilenle aynıysa
+        Slack'e tekrar gönderilmez. Doğrudan çağrılmak yerine `request_canvas_update`
+        üzerinden arka planda çalıştırılır.
         """
         try:
             # Tüm aktif challenge'ları al
@@ -74,132 +116,26 @@ class ChallengeEvaluationService:
                     f"Toplam aktif challenge: {len(all_active_challenges)}"
                 )
                 return
+
+            # Tüm aktif challenge'lar için veri topla (değerlendirmeler + katılımcılar: 2 sorgu)
+            loader = ChallengeCanvasLoader(self.evaluation_repo, self.participant_repo)
+            table_rows = build_canvas_rows(all_active_challenges, loader)
+            canvas_content = render_canvas_markdown(table_rows)
             
+            # İlk challenge'dan canvas_id al
+            # NOT: Artık summary_message_ts yerine canvas_id kullanıyoruz
+            canvas_id = first_challenge.get("summary_message_ts")  # Geçici olarak aynı alanda saklıyoruz
+
+            if canvas_id and self._published_canvas_hashes.get(canvas_id) == content_hash(canvas_content):
+                logger.debug(f"[i] Canvas içeriği değişmedi, gönderilmiyor | Kanal: {hub_channel_id}")
+                self._canvas_stats["skipped"] += 1
+                return
+
             logger.info(
                 f"[>] Canvas güncelleme başlıyor | "
                 f"Toplam aktif challenge: {len(all_active_challenges)} | "
                 f"Kanal: {hub_channel_id}"
             )
-
-            # Tüm aktif challenge'lar için veri topla
-            table_rows = []
-            
-            for ch in all_active_challenges:
-                ch_id = ch.get("id")
-                evaluation = self.evaluation_repo.get_by_challenge(ch_id)
-                
-                # Challenge bilgileri
-                theme = ch.get("theme", "N/A")
-                project_name = ch.get("project_name") or "Belirlenmedi"
-                status = ch.get("status", "unknown")
-                
-                # Durum etiketi
-                if status == "recruiting":
-                    status_label = "📋 Toplanıyor"
-                elif status == "active":
-                    status_label = "🚀 Geliştirme"
-                elif status == "evaluating":
-                    status_label = "⚖️ Değerlendirme"
-                elif status == "completed":
-                    final_result = evaluation.get("final_result") if evaluation else None
-                    status_label = "✅ Başarılı" if final_result == "success" else "❌ Başarısız"
-                else:
-                    status_label = "❓ Bilinmiyor"
-                
-                # Bitiş tarihi
-                deadline = ch.get("deadline")
-                deadline_text = (
-                    datetime.fromisoformat(deadline).strftime("%d.%m %H:%M")
-                    if deadline else "Belirlenmedi"
-                )
-                
-                # Katılımcı bilgisi (Slack profilleri ile)
-                participants = self.participant_repo.get_team_members(ch_id)
-                participant_ids = [p["user_id"] for p in participants]
-                creator_id = ch.get("creator_id")
-                if creator_id and creator_id not in participant_ids:
-                    participant_ids.insert(0, creator_id)
-                
-                participant_count = len(participant_ids)
-                team_size = ch.get("team_size", 0)
-                # team_size creator hariç sayı, toplam = team_size + 1 (creator dahil)
-                total_team_size = team_size + 1
-                
-                # Slack profillerini linkle
-                # Kural:
-                # - 7 kişiye kadar: TÜM üyeleri tek tek göster
-                # - 7'den fazla: İlk 3 kişi + "+N" formatı
-                if participant_ids:
-                    # Slack Canvas'ta mention formatı: ![](@USER_ID)
-                    # Canvas markdown'ta mention'lar için özel format kullanılır
-                    if participant_count <= 7:
-                        # Tüm ekibi göster
-                        user_mentions = ", ".join(f"![](@{uid})" for uid in participant_ids)
-                        team_info = f"{user_mentions} ({participant_count}/{total_team_size})"
-                    else:
-                        # İlk 3 kişiyi göster + kalan sayısı
-                        shown_users = participant_ids[:3]
-                        user_mentions = ", ".join(f"![](@{uid})" for uid in shown_users)
-                        remaining = participant_count - len(shown_users)
-                        if remaining > 0:
-                            team_info = f"{user_mentions} +{remaining} ({participant_count}/{total_team_size})"
-                        else:
-                            team_info = f"{user_mentions} ({participant_count}/{total_team_size})"
-                else:
-                    team_info = f"0/{total_team_size}"
-                
-                # GitHub durumu
-                github_info = "❌ Yok"
-                if evaluation:
-                    github_url = evaluation.get("github_repo_url")
-                    if github_url:
-                        github_public = evaluation.get("github_repo_public", 0) == 1
-                        github_info = "✅ Public" if github_public else "⚠️ Private"
-                
-                # Oylar
-                votes_info = "-"
-                if evaluation:
-                    try:
-                        votes = self.evaluator_repo.get_votes(evaluation["id"])
-                        true_votes = votes.get("true", 0)
-                        false_votes = votes.get("false", 0)
-                        if true_votes > 0 or false_votes > 0:
-                            votes_info = f"✅{true_votes} ❌{false_votes}"
-                    except:
-                        pass
-                
-                # Tablo satırı ekle
-                table_rows.append({
-                    "theme": theme[:20],
-                    "project": project_name[:25],
-                    "status": status_label,
-                    "deadline": deadline_text,
-                    "team": team_info,
-                    "github": github_info,
-                    "votes": votes_info
-                })
-            
-            # Slack Canvas için markdown tablo içeriği oluştur
-            # Canvas içinde markdown table kullan
-            canvas_content_lines = [
-                "# 📊 Aktif Challenge'lar\n",
-                "| Tema | Proje | Durum | Bitiş | Takım | GitHub | Oylar |",
-                "|------|-------|-------|-------|-------|--------|-------|"
-            ]
-            
-            for row in table_rows:
-                # Markdown table satırı - Slack mention'lar çalışır
-                # Takım kolonunu daha geniş yaparak mention'ların kırpılmasını önle
-                canvas_content_lines.append(
-                    f"| {row['theme'][:18]} | {row['project'][:23]} | {row['status'][:13]} | "
-                    f"{row['deadline']} | {row['team']} | {row['github'][:10]} | {row['votes']} |"
-                )
-            
-            canvas_content = "\n".join(canvas_content_lines)
-            
-            # İlk challenge'dan canvas_id al
-            # NOT: Artık summary_message_ts yerine canvas_id kullanıyoruz
-            canvas_id = first_challenge.get("summary_message_ts")  # Geçici olarak aynı alanda saklıyoruz
             
             # Slack Canvas kullanarak kanal içinde gömülü belge oluştur/güncelle
             if self.canvas:
@@ -215,6 +151,8 @@ class ChallengeEvaluationService:
                                 }
                             }]
                             self.canvas.edit_canvas(canvas_id, changes)
+                            self._canvas_stats["published"] += 1
+                            self._published_canvas_hashes[canvas_id] = content_hash(canvas_content)
                             logger.info(
                                 f"[+] Canvas GÜNCELLENDI | "
                                 f"Kanal: {hub_channel_id} | "
@@ -224,6 +162,7 @@ class ChallengeEvaluationService:
                             return
                         except Exception as e:
                             logger.warning(f"[!] Canvas güncellenemedi, yeniden oluşturulacak: {e}")
+                            self._published_canvas_hashes.pop(canvas_id, None)
                             canvas_id = None
                     
                     # Yeni canvas oluştur
@@ -239,6 +178,8 @@ class ChallengeEvaluationService:
                             
                             if canvas_id:
                                 logger.info(f"[DEBUG] Canvas oluşturuldu | Canvas ID: {canvas_id}")
+                                self._canvas_stats["published"] += 1
+                                self._published_canvas_hashes[canvas_id] = content_hash(canvas_content)
                                 
                                 # Tüm aktif challenge'lara canvas_id'yi kaydet
                                 for ch in all_active_challenges:
@@ -266,19 +207,7 @@ class ChallengeEvaluationService:
             
             # Fallback: Canvas API yoksa veya çalışmazsa normal mesaj gönder
             # Slack mention'ları koruyarak temiz tablo oluştur
-            table_lines_plain = [
-                f"*{'Tema':<18} | {'Proje':<23} | {'Durum':<13} | {'Bitiş':<10} | {'Takım'} | {'GitHub':<10} | {'Oylar':<8}*",
-                "─" * 100
-            ]
-            
-            for row in table_rows:
-                # Takım kolonunu truncate etme - mention'lar tam olsun
-                table_lines_plain.append(
-                    f"{row['theme'][:18]:<18} | {row['project'][:23]:<23} | {row['status'][:13]:<13} | "
-                    f"{row['deadline']:<10} | {row['team']} | {row['github'][:10]:<10} | {row['votes']:<8}"
-                )
-            
-            table_text_plain = "\n".join(table_lines_plain)
+            table_text_plain = render_fallback_table(table_rows)
             
             # Fallback blocks
             blocks = [
@@ -286,7 +215,7 @@ class ChallengeEvaluationService:
                     "type": "header",
                     "text": {
                         "type": "plain_text",
-                        "text": "📊 Aktif Challenge'lar",
+                        "text": CANVAS_TITLE,
                         "emoji": True
                     }
                 },
@@ -303,10 +232,14 @@ class ChallengeEvaluationService:
             ]
             
             summary_ts = first_challenge.get("summary_message_ts")
-            canvas_text = f"📊 Aktif Challenge'lar ({len(all_active_challenges)} adet)\n\n{table_text_plain}"
+            canvas_text = f"{CANVAS_TITLE} ({len(all_active_challenges)} adet)\n\n{table_text_plain}"
             
             # Mevcut fallback mesajı güncelle veya yeni mesaj oluştur
             if summary_ts and not summary_ts.startswith("F"):  # Canvas ID "F" ile başlar
+                if self._published_canvas_hashes.get(summary_ts) == content_hash(canvas_text):
+                    logger.debug(f"[i] Canvas tablo (fallback) değişmedi, gönderilmiyor | TS: {summary_ts}")
+                    self._canvas_stats["skipped"] += 1
+                    return
                 try:
                     self.chat.update_message(
                         channel=hub_channel_id,
@@ -314,6 +247,8 @@ class ChallengeEvaluationService:
                         text=canvas_text,
                         blocks=blocks,
                     )
+                    self._canvas_stats["published"] += 1
+                    self._published_canvas_hashes[summary_ts] = content_hash(canvas_text)
                     logger.info(
                         f"[+] Canvas tablo (fallback) GÜNCELLENDİ | "
                         f"Kanal: {hub_channel_id} | "
@@ -323,6 +258,7 @@ class ChallengeEvaluationService:
                     return
                 except Exception as e:
                     logger.warning(f"[!] Canvas fallback mesajı güncellenemedi: {e}")
+                    self._published_canvas_hashes.pop(summary_ts, None)
 
             # Yeni fallback mesajı oluştur
             try:
@@ -345,6 +281,8 @@ class ChallengeEvaluationService:
                 message_data = resp.get("message", {})
                 
                 if ts:
+                    self._canvas_stats["published"] += 1
+                    self._published_canvas_hashes[ts] = content_hash(canvas_text)
                     # Tüm aktif challenge'lara aynı summary_ts'yi kaydet
                     for ch in all_active_challenges:
                         self.hub_repo.update(
@@ -361,21 +299,7 @@ class ChallengeEvaluationService:
                         f"Toplam challenge: {len(all_active_challenges)} | "
                         f"Message Type: {message_data.get('type', 'N/A')}"
                     )
-                    
-                    # Mesajın Slack'te gerçekten var olup olmadığını kontrol et
-                    try:
-                        messages = self.conv.get_history(channel_id=hub_channel_id, limit=5)
-                        found = any(msg.get("ts") == ts for msg in messages)
-                        if found:
-                            logger.info(f"[✓] Canvas mesajı Slack kanalında DOĞRULANDI | TS: {ts}")
-                        else:
-                            logger.warning(
-                                f"[!] Canvas mesajı gönderildi ama kanal geçmişinde BULUNAMADI! | "
-                                f"TS: {ts} | Kanal: {hub_channel_id} | "
-                                f"Son 5 mesaj kontrol edildi"
-                            )
-                    except Exception as e:
-                        logger.warning(f"[!] Canvas mesajı doğrulama hatası: {e}")
+
                 else:
                     logger.error(
                         f"[X] Canvas mesajı gönderildi ama TS alınamadı! | "
@@ -603,11 +527,8 @@ class ChallengeEvaluationService:
                 blocks=info_blocks
             )
 
-            # Duyuru kanalındaki challenge canvas/özet mesajını güncelle
-            try:
-                await self.update_challenge_canvas(challenge_id)
-            except Exception as e:
-                logger.warning(f"[!] Değerlendirme başlangıcında canvas güncellenemedi: {e}")
+            # Duyuru kanalındaki challenge canvas/özet mesajını güncelle (arka planda)
+            self.request_canvas_update(challenge_id)
 
             logger.info(f"[+] Değerlendirme başlatıldı | Challenge: {challenge_id} | Evaluation: {evaluation_id}")
 
@@ -684,15 +605,8 @@ class ChallengeEvaluationService:
                 # Güncel sayıyı al
                 count = self.evaluator_repo.count_evaluators(evaluation_id)
                 
-                # DM Gönder
-                try:
-                    dm_channel = self.conv.open_conversation([user_id])
-                    if dm_channel:
-                         self.chat.post_message(
-                            channel=dm_channel["channel"]["id"],
-                            text=f"ℹ️ `{challenge.get('theme')}` projesi jüri adaylığından çekildiniz."
-                        )
-                except: pass
+                # DM Gönder (arka planda; handler beklemez)
+                self.dm.queue_dm(user_id, f"ℹ️ `{challenge.get('theme')}` projesi jüri adaylığından çekildiniz.")
                 
                 return {
                     "success": True,
@@ -745,19 +659,13 @@ class ChallengeEvaluationService:
                 current_count += 1
                 logger.info(f"[+] Jüri havuzuna eklendi: {user_id} | Evaluation: {evaluation_id}")
                 
-                # DM Gönder
-                try:
-                    dm_channel = self.conv.open_conversation([user_id])
-                    if dm_channel:
-                         self.chat.post_message(
-                            channel=dm_channel["channel"]["id"],
-                            text=(
-                                f"🎉 `{challenge.get('theme')}` projesi için jüri adaylığınız alındı!\n"
-                                f"Şu an *{current_count}/3* kişiyiz. 3 kişi tamamlandığında otomatik olarak kanala ekleneceksiniz.\n\n"
-                                "O zamana kadar bekleyiniz..."
-                            )
-                        )
-                except: pass
+                # DM Gönder (arka planda; handler beklemez)
+                self.dm.queue_dm(
+                    user_id,
+                    f"🎉 `{challenge.get('theme')}` projesi için jüri adaylığınız alındı!\n"
+                    f"Şu an *{current_count}/3* kişiyiz. 3 kişi tamamlandığında otomatik olarak kanala ekleneceksiniz.\n\n"
+                    "O zamana kadar bekleyiniz..."
+                )
 
                 # 4. EĞER 3. KİŞİ İSE -> STATUS KİLİTLE VE TOPLU DAVET BAŞLAT
                 if current_count >= 3:
@@ -787,16 +695,12 @@ class ChallengeEvaluationService:
                                 )
                             )
                             
-                            # DM ile haber ver
-                            for j_id in juror_ids:
-                                try:
-                                    dm = self.conv.open_conversation([j_id])
-                                    if dm:
-                                        self.chat.post_message(
-                                            channel=dm["channel"]["id"],
-                                            text="🚀 Jüri ekibi tamamlandı ve kanala eklendiniz! Görev başına!"
-                                        )
-                                except: pass
+                            # DM ile haber ver (eşzamanlı, arka planda)
+                            self.dm.queue_dms(
+                                juror_ids,
+                                "🚀 Jüri ekibi tamamlandı ve kanala eklendiniz! Görev başına!",
+                                name="jury-complete-dm"
+                            )
                             
                             # ✅ Davet tamamlandı, status'ü "locked" yap
                             self.evaluation_repo.update(evaluation_id, {"jury_status": "locked"})
@@ -912,12 +816,8 @@ class ChallengeEvaluationService:
 
             logger.info(f"[+] Oy kaydedildi: {user_id} | Vote: {vote} | Evaluation: {evaluation_id}")
 
-            # Canvas'ı güncelle (oy sayısı değişti)
-            try:
-                await self.update_challenge_canvas(evaluation.get("challenge_hub_id"))
-                logger.debug(f"[i] Canvas güncellendi (oy verildikten sonra): {user_id}")
-            except Exception as e:
-                logger.warning(f"[!] Oy sonrası canvas güncellenemedi: {e}")
+            # Canvas'ı güncelle (oy sayısı değişti; art arda oylar tek güncellemede birleşir)
+            self.request_canvas_update(evaluation.get("challenge_hub_id"))
 
             # 3 kişi oy verdiyse kontrol et
             total_votes = true_votes + false_votes
@@ -1374,11 +1274,9 @@ class ChallengeEvaluationService:
                         if creator_id and creator_id not in participant_ids:
                             participant_ids.append(creator_id)
                         
-                        # Herkese puan ver ve başarı sayısını artır
-                        for user_id in participant_ids:
-                            self.stats_repo.add_points(user_id, POINTS_PER_SUCCESS)
-                            self.stats_repo.increment_completed(user_id)
-                            logger.info(f"[+] Puan ve başarı güncellendi: {user_id} | Challenge: {challenge_id}")
+                        # Herkese puan ver ve başarı sayısını artır (tek transaction)
+                        self.stats_repo.award_success(participant_ids, POINTS_PER_SUCCESS)
+                        logger.info(f"[+] Puan ve başarı güncellendi: {len(participant_ids)} kullanıcı | Challenge: {challenge_id}")
                             
                     except Exception as e:
                         logger.error(f"[X] Başarı istatistikleri güncellenirken hata: {e}", exc_info=True)
@@ -1497,11 +1395,7 @@ class ChallengeEvaluationService:
                     logger.warning(f"[!] Değerlendirme kanalı mesaj gönderimi veya arşivleme planı hatası: {e}")
 
             # Canvas'ı güncelle (admin onayı/reddi sonrası oylar ve GitHub bilgileri görünsün)
-            try:
-                await self.update_challenge_canvas(challenge_id)
-                logger.info(f"[+] Canvas güncellendi (admin finalize sonrası): {evaluation_id}")
-            except Exception as e:
-                logger.warning(f"[!] Admin finalize sonrası canvas güncellenemedi: {e}")
+            self.request_canvas_update(challenge_id)
 
             logger.info(f"[+] Değerlendirme finalize edildi: {evaluation_id} | Sonuç: {final_result}")
 
@@ -1572,10 +1466,8 @@ class ChallengeEvaluationService:
                     if creator_id and creator_id not in participant_ids:
                         participant_ids.append(creator_id)
 
-                    for user_id in participant_ids:
-                        self.stats_repo.add_points(user_id, POINTS_PER_SUCCESS)
-                        self.stats_repo.increment_completed(user_id)
-                        logger.info(f"[+] Force success: Puan ve başarı güncellendi: {user_id}")
+                    self.stats_repo.award_success(participant_ids, POINTS_PER_SUCCESS)
+                    logger.info(f"[+] Force success: Puan ve başarı güncellendi: {len(participant_ids)} kullanıcı")
                 except Exception as e:
                     logger.error(f"[X] Force success istatistikleri güncellenirken hata: {e}")
 
@@ -5,14 +5,18 @@ Challenge Hub yönetim servisi.
 import json
 import uuid
 import random
+import asyncio
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 from src.core.logger import logger
 from src.core.exceptions import CemilBotError
+from src.core.coalescer import UpdateCoalescer
 from src.commands import ChatManager, ConversationManager, UserManager
 from src.repositories import (
     ChallengeHubRepository,
     ChallengeParticipantRepository,
+    ChallengeStartRepository,
     ChallengeProjectRepository,
     ChallengeSubmissionRepository,
     ChallengeThemeRepository,
@@ -21,7 +25,12 @@ from src.repositories import (
 from src.clients import GroqClient, CronClient
 from src.core.settings import get_settings
 from src.services import ChallengeEnhancementService
+from src.services.channel_guard import ChallengeChannelIndex
 
+# Challenge başlatma adımları (sırasıyla); her adım sonrası ilerleme kaydedilir
+START_STEPS = ("select", "provision", "configure", "activate", "announce", "schedule")
+MAX_START_ATTEMPTS = 3
+START_RETRY_DELAY_SECONDS = 30
 
 class ChallengeHubService:
     """
@@ -43,7 +52,8 @@ class ChallengeHubService:
         groq_client: GroqClient,
         cron_client: CronClient,
         db_client=None,
-        evaluation_service=None
+        evaluation_service=None,
+        start_repo: ChallengeStartRepository = None
     ):
         self.chat = chat_manager
         self.conv = conv_manager
@@ -59,6 +69,15 @@ class ChallengeHubService:
         self.cron = cron_client
         self.db_client = db_client
         self.evaluation_service = evaluation_service
+        self.start_repo = start_repo
+        self._start_lock = threading.Lock()
+        self._starts_in_progress = set()
+        # Challenge kanalı yetkili üye indeksi ve yetkisiz kullanıcı çıkarma kuyruğu
+        self.channel_index = ChallengeChannelIndex()
+        self.kick_queue = UpdateCoalescer(interval=0, name="challenge-kick")
+        self._privileged_ids: Optional[Set[str]] = None
+        self._kicks_in_flight: Set[str] = set()
+        self._kick_lock = threading.Lock()
 
     async def start_challenge(
         self,
@@ -404,6 +423,7 @@ class ChallengeHubService:
                 "user_id": user_id,
                 "role": "member"
             })
+            self.channel_index.add_member(challenge_id, user_id)
 
             # 7.5. Katılımcının total_challenges istatistiğini artır
             try:
@@ -446,7 +466,7 @@ class ChallengeHubService:
                             }
                         ]
                     elif challenge_start_error:
-                        message_text = "⚠️ Takım doldu ama başlatma hatası"
+                        message_text = "⚠️ Takım doldu ama başlatma gecikti, otomatik olarak yeniden denenecek"
                         blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": message_text}}]
                     elif remaining > 0:
                         message_text = f"📊 *{participant_count}/{challenge['team_size']}* katılımcı | ⏳ *{remaining} kişi* daha gerekli"
@@ -469,7 +489,7 @@ class ChallengeHubService:
             if challenge_started:
                 message = f"✅ *Takım Doldu!* Challenge başlatıldı"
             elif challenge_start_error:
-                message = f"⚠️ Takım doldu ama başlatma hatası"
+                message = f"⚠️ Takım doldu ama başlatma gecikti, otomatik olarak yeniden denenecek"
             elif remaining > 0:
                 message = f"✅ Katıldınız! 📊 *{participant_count}/{challenge['team_size']}* | ⏳ *{remaining} kişi* daha gerekli"
             else:
@@ -696,12 +716,12 @@ class ChallengeHubService:
                         f"User: {uid} | Challenge: {challenge_id} | Hata: {e}"
                     )
 
-            # 6. Canvas'ı güncelle (varsa)
-            try:
-                if self.evaluation_service and hub_channel_id:
-                    await self.evaluation_service.update_challenge_canvas(challenge_id)
-            except Exception as e:
-                logger.warning(f"[!] register_existing_channel: Canvas güncellenemedi: {e}")
+            # 5.5. Kanalı yetkili üye indeksine ekle
+            self._register_challenge_channel(challenge_id, channel_id, creator_id)
+
+            # 6. Canvas'ı güncelle (varsa, arka planda)
+            if self.evaluation_service and hub_channel_id:
+                self.evaluation_service.request_canvas_update(challenge_id)
 
             # 7. Kullanıcıya özet mesaj
             summary_lines = [
@@ -731,195 +751,293 @@ class ChallengeHubService:
         """
         Challenge'ı başlatır (takım dolduğunda).
         Random tema ve proje seçer, süreyi DB'den alır.
+
+        Başlatma adım adım ilerleyen bir iş akışıdır (bkz. START_STEPS); her adımdan sonra
+        sıradaki adım ve biriken durum challenge_start_runs tablosuna yazılır. Hata veya
+        yeniden başlatma durumunda akış kaldığı adımdan devam eder; sadece deneme hakkı
+        bittiğinde challenge "failed" olarak işaretlenir.
         """
+        with self._start_lock:
+            if challenge_id in self._starts_in_progress:
+                logger.warning(f"[!] Challenge başlatma zaten sürüyor: {challenge_id}")
+                return
+            self._starts_in_progress.add(challenge_id)
         try:
-            import random
-            from src.repositories import ChallengeThemeRepository
-            
-            challenge = self.hub_repo.get(challenge_id)
-            if not challenge:
-                logger.error(f"[X] Challenge bulunamadı: {challenge_id}")
-                raise ValueError(f"Challenge bulunamadı: {challenge_id}")
+            await self._run_start_workflow(challenge_id)
+        finally:
+            with self._start_lock:
+                self._starts_in_progress.discard(challenge_id)
+
+    async def resume_challenge_start(self, challenge_id: str):
+        """Yarıda kalan başlatmayı sürdürür (zamanlanmış görevden çağrılır)."""
+        try:
+            await self._start_challenge(challenge_id)
+        except Exception as e:
+            logger.error(f"[X] Challenge başlatma devam ettirilemedi: {challenge_id} | {e}")
+
+    def resume_pending_starts(self) -> int:
+        """
+        Açılışta yarıda kalmış başlatmaları birkaç saniye sonrasına planlar.
+        Planlanan başlatma sayısını döndürür.
+        """
+        if not self.start_repo:
+            return 0
+        runs = self.start_repo.list_unfinished()
+        for i, run in enumerate(runs):
+            challenge_id = run["challenge_hub_id"]
+            self.cron.add_once_job(
+                func=self.resume_challenge_start,
+                run_date=datetime.now() + timedelta(seconds=5 + i),
+                job_id=f"resume_challenge_start_{challenge_id}",
+                args=[challenge_id]
+            )
+            logger.info(f"[i] Yarıda kalan challenge başlatması planlandı: {challenge_id} | Adım: {run['step']}")
+        return len(runs)
+
+    def _save_start_run(self, challenge_id: str, step: str, state: Dict[str, Any], attempts: int = 0, last_error: str = None):
+        if self.start_repo:
+            self.start_repo.save_run(challenge_id, step, state, attempts, last_error)
 
+    async def _run_start_workflow(self, challenge_id: str):
+        challenge = self.hub_repo.get(challenge_id)
+        if not challenge:
+            logger.error(f"[X] Challenge bulunamadı: {challenge_id}")
+            raise ValueError(f"Challenge bulunamadı: {challenge_id}")
+
+        run = self.start_repo.get_run(challenge_id) if self.start_repo else None
+        if run is None:
             # Challenge zaten başlamış mı kontrol et
             if challenge.get("status") == "active":
                 logger.warning(f"[!] Challenge zaten aktif: {challenge_id}")
                 return
+            run = {"step": START_STEPS[0], "state": {}, "attempts": 0}
+            self._save_start_run(challenge_id, run["step"], run["state"])
+        else:
+            logger.info(f"[>] Challenge başlatma kaldığı yerden devam ediyor | ID: {challenge_id} | Adım: {run['step']}")
 
-            # 1. Tema belirleme: Önceden seçilmişse onu kullan, değilse random seç
-            existing_theme = challenge.get("theme")
-            
-            if existing_theme and existing_theme != "TBD":
-                # Tema zaten seçilmiş, onu kullan
-                theme_name = existing_theme
-                logger.info(f"[i] Önceden seçilmiş tema kullanılıyor: {theme_name}")
+        step, state = run["step"], run["state"]
+        try:
+            while step != "done":
+                await getattr(self, f"_start_step_{step}")(challenge_id, challenge, state)
+                step = START_STEPS[START_STEPS.index(step) + 1] if step != START_STEPS[-1] else "done"
+                self._save_start_run(challenge_id, step, state)
+        except Exception as e:
+            attempts = run["attempts"] + 1
+            logger.error(
+                f"[X] ChallengeHubService._start_challenge hatası | Adım: {step} | "
+                f"Deneme: {attempts}/{MAX_START_ATTEMPTS} | {e}",
+                exc_info=True
+            )
+            self._save_start_run(challenge_id, step, state, attempts, str(e))
+            if attempts < MAX_START_ATTEMPTS:
+                # Kaldığı adımdan tekrar dene (bekleme uyutulmaz, zamanlanır)
+                self.cron.add_once_job(
+                    func=self.resume_challenge_start,
+                    run_date=datetime.now() + timedelta(seconds=START_RETRY_DELAY_SECONDS * attempts),
+                    job_id=f"resume_challenge_start_{challenge_id}",
+                    args=[challenge_id]
+                )
             else:
-                # Random tema seç
-                if not self.db_client:
-                    active_themes = self.theme_repo.get_active_themes()
-                else:
-                    theme_repo = ChallengeThemeRepository(self.db_client)
-                    active_themes = theme_repo.get_active_themes()
-                
-                if not active_themes:
-                    logger.error("[X] Aktif tema bulunamadı")
-                    raise ValueError("Aktif tema bulunamadı")
-                
-                selected_theme = random.choice(active_themes)
-                theme_name = selected_theme["name"]
-                logger.info(f"[i] Random tema seçildi: {theme_name}")
+                # Deneme hakkı bitti: challenge durumunu "failed" olarak işaretle
+                try:
+                    self.hub_repo.update(challenge_id, {"status": "failed"})
+                    if self.start_repo:
+                        self.start_repo.delete_run(challenge_id)
+                except Exception as mark_error:
+                    logger.error(
+                        f"[X] Challenge 'failed' olarak işaretlenemedi | ID: {challenge_id} | {mark_error}",
+                        exc_info=True
+                    )
+            raise
+
+        if self.start_repo:
+            self.start_repo.delete_run(challenge_id)
+        logger.info(
+            f"[+] Challenge başarıyla başlatıldı | ID: {challenge_id} | "
+            f"Tema: {state['theme_name']} | Kanal: {state['channel_id']}"
+        )
+
+    async def _start_step_select(self, challenge_id: str, challenge: Dict, state: Dict[str, Any]):
+        """Adım 1: Tema, proje ve süre seçimi."""
+        # Tema belirleme: Önceden seçilmişse onu kullan, değilse random seç
+        existing_theme = challenge.get("theme")
+        
+        if existing_theme and existing_theme != "TBD":
+            theme_name = existing_theme
+            logger.info(f"[i] Önceden seçilmiş tema kullanılıyor: {theme_name}")
+        else:
+            theme_repo = ChallengeThemeRepository(self.db_client) if self.db_client else self.theme_repo
+            active_themes = theme_repo.get_active_themes()
             
-            # 2. Random proje seç (tema bazlı)
-            project = self.project_repo.get_random_project(theme_name)
-            if not project:
-                logger.error(f"[X] Tema için proje bulunamadı: {theme_name}")
-                raise ValueError(f"Tema için proje bulunamadı: {theme_name}")
-
-            logger.info(f"[i] Proje seçildi: {project.get('name', 'N/A')}")
-
-            # 3. Süreyi DB'den al (proje bazlı) - Minimum 72 saat
-            deadline_hours = project.get("estimated_hours", 48)
-            # Minimum süre: 72 saat
-            if deadline_hours < 72:
-                deadline_hours = 72
-                logger.info(f"[i] Süre minimum 72 saate ayarlandı (proje: {deadline_hours} saat < 72)")
-            difficulty = project.get("difficulty_level", "intermediate")
-            logger.info(f"[i] Süre belirlendi: {deadline_hours} saat | Zorluk: {difficulty}")
-
-            # LLM ile özelleştir
+            if not active_themes:
+                logger.error("[X] Aktif tema bulunamadı")
+                raise ValueError("Aktif tema bulunamadı")
+            
+            theme_name = random.choice(active_themes)["name"]
+            logger.info(f"[i] Random tema seçildi: {theme_name}")
+        
+        # Random proje seç (tema bazlı)
+        project = self.project_repo.get_random_project(theme_name)
+        if not project:
+            logger.error(f"[X] Tema için proje bulunamadı: {theme_name}")
+            raise ValueError(f"Tema için proje bulunamadı: {theme_name}")
+
+        logger.info(f"[i] Proje seçildi: {project.get('name', 'N/A')}")
+
+        # Süreyi DB'den al (proje bazlı) - Minimum 72 saat
+        deadline_hours = project.get("estimated_hours", 48)
+        if deadline_hours < 72:
+            deadline_hours = 72
+            logger.info(f"[i] Süre minimum 72 saate ayarlandı (proje: {deadline_hours} saat < 72)")
+        difficulty = project.get("difficulty_level", "intermediate")
+        logger.info(f"[i] Süre belirlendi: {deadline_hours} saat | Zorluk: {difficulty}")
+
+        state.update({
+            "theme_name": theme_name,
+            "project": project,
+            "deadline_hours": deadline_hours,
+            "difficulty": difficulty,
+        })
+
+    async def _start_step_provision(self, challenge_id: str, challenge: Dict, state: Dict[str, Any]):
+        """
+        Adım 2: LLM ile proje özelleştirme ve challenge kanalı açma (birbirinden bağımsız,
+        eşzamanlı çalışır). Her biri bitince durum kaydedilir; kanal tekrar açılmaz.
+        """
+        theme_name = state["theme_name"]
+
+        async def enhance():
+            if "enhanced_project" in state:
+                return
             try:
-                enhanced_project = await self.enhancement.enhance_project(
-                    base_project=project,
+                enhanced = await self.enhancement.enhance_project(
+                    base_project=state["project"],
                     team_size=challenge["team_size"],
-                    deadline_hours=deadline_hours,
+                    deadline_hours=state["deadline_hours"],
                     theme=theme_name
                 )
                 logger.info("[+] Proje LLM ile özelleştirildi")
             except Exception as e:
                 logger.warning(f"[!] LLM özelleştirme hatası, orijinal proje kullanılıyor: {e}")
-                enhanced_project = project
+                enhanced = state["project"]
+            state["enhanced_project"] = enhanced
+            self._save_start_run(challenge_id, "provision", state)
 
-            # 4. Challenge kanalı aç
+        async def create_channel():
+            if "channel_id" in state:
+                return
             channel_suffix = str(uuid.uuid4())[:8]
             channel_name = f"challenge-{theme_name.lower().replace(' ', '-').replace('_', '-')}-{channel_suffix}"
-            
             try:
-                challenge_channel = self.conv.create_channel(
-                    name=channel_name,
-                    is_private=True
-                )
-                challenge_channel_id = challenge_channel["id"]
-                logger.info(f"[+] Challenge kanalı oluşturuldu: #{channel_name} (ID: {challenge_channel_id})")
+                channel = await asyncio.to_thread(self.conv.create_channel, name=channel_name, is_private=True)
             except Exception as e:
                 logger.error(f"[X] Challenge kanalı oluşturulamadı: {e}", exc_info=True)
                 raise
+            state["channel_id"] = channel["id"]
+            self._save_start_run(challenge_id, "provision", state)
+            logger.info(f"[+] Challenge kanalı oluşturuldu: #{channel_name} (ID: {channel['id']})")
+
+        results = await asyncio.gather(create_channel(), enhance(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+    async def _start_step_configure(self, challenge_id: str, challenge: Dict, state: Dict[str, Any]):
+        """Adım 3: Katılımcıları davet et, ardından topic ve purpose'u ayarla."""
+        channel_id = state["channel_id"]
+        project = state["project"]
+
+        participants = self.participant_repo.get_team_members(challenge_id)
+        user_ids = [p["user_id"] for p in participants]
+        creator_id = challenge.get("creator_id")
+        if creator_id and creator_id not in user_ids:
+            user_ids.append(creator_id)
+        
+        logger.info(f"[i] Kanal davet listesi: {len(user_ids)} kullanıcı")
+        
+        # Zaten kanalda olanlar davet edilmez; adım tekrarlanırsa güvenlidir
+        try:
+            await asyncio.to_thread(self.conv.invite_users, channel_id, user_ids)
+            logger.info(f"[+] {len(user_ids)} kullanıcı challenge kanalına davet edildi")
+        except Exception as e:
+            logger.warning(f"[!] Kullanıcılar kanala davet edilirken hata (devam ediliyor): {e}")
 
-            # 5. Katılımcıları ve owner'ı kanala ekle (önce kullanıcıları ekle, sonra topic ayarla)
-            participants = self.participant_repo.get_team_members(challenge_id)
-            user_ids = [p["user_id"] for p in participants]
-            
-            # Owner'ı ekle (creator_id)
-            creator_id = challenge.get("creator_id")
-            if creator_id and creator_id not in user_ids:
-                user_ids.append(creator_id)
-            
-            logger.info(f"[i] Kanal davet listesi: {len(user_ids)} kullanıcı")
-            
-            # User token ile oluşturulan kanal olduğu için user token kullanılacak (otomatik)
-            try:
-                self.conv.invite_users(challenge_channel_id, user_ids)
-                logger.info(f"[+] {len(user_ids)} kullanıcı challenge kanalına davet edildi")
-            except Exception as e:
-                logger.warning(f"[!] Kullanıcılar kanala davet edilirken hata (devam ediliyor): {e}")
-
-            # 6. Kanal topic ve purpose'unu ayarla (kullanıcılar davet edildikten sonra - kanal hazır olacak)
-            try:
-                import time
-                # Kısa bir gecikme ekle (kanalın tam olarak hazır olması için)
-                time.sleep(1)
-                
-                topic_text = f"Challenge: {project.get('name', 'Proje')} | Süre: {deadline_hours} saat | ⚠️ Lütfen kanala başka kişileri davet etmeyin"
-                purpose_text = f"Challenge kanalı - {theme_name} teması | Takım: {challenge['team_size'] + 1} kişi | Bu kanal sadece challenge takımı için oluşturulmuştur. Lütfen kanala başka kişileri davet etmeyin."
-                
-                topic_success = self.conv.set_topic(challenge_channel_id, topic_text)
-                purpose_success = self.conv.set_purpose(challenge_channel_id, purpose_text)
-                
-                if topic_success and purpose_success:
-                    logger.info(f"[+] Kanal topic ve purpose ayarlandı: {challenge_channel_id}")
-                else:
-                    logger.warning(f"[!] Kanal topic/purpose ayarlanamadı (non-critical): {challenge_channel_id}")
-            except Exception as e:
-                # Topic/purpose ayarlanmasa bile challenge devam edebilir
-                logger.warning(f"[!] Kanal topic/purpose ayarlanırken hata (devam ediliyor): {e}")
-
-            # 7. Challenge'ı güncelle
-            deadline = datetime.now() + timedelta(hours=deadline_hours)
-            update_data = {
-                "status": "active",
-                "theme": theme_name,
-                "challenge_channel_id": challenge_channel_id,
-                "selected_project_id": project["id"],
-                # Canvas/özet için gerekli temel proje bilgileri
-                "project_name": project.get("name"),
-                "project_description": project.get("description"),
-                "deadline_hours": deadline_hours,
-                "difficulty": difficulty,
-                "llm_customizations": json.dumps(enhanced_project.get("llm_enhanced_features", [])),
-                "started_at": datetime.now().isoformat(),
-                "deadline": deadline.isoformat()
-            }
-            
-            self.hub_repo.update(challenge_id, update_data)
-            logger.info(f"[+] Challenge güncellendi: {challenge_id}")
-
-            # 7.1. Duyuru kanalında challenge özeti/canvas mesajını oluştur veya güncelle
-            try:
-                if self.evaluation_service:
-                    # Evaluation servisi, hub + evaluation + github bilgilerini birleştirerek
-                    # duyuru kanalındaki özet mesajı güncelleyecek.
-                    await self.evaluation_service.update_challenge_canvas(challenge_id)
-            except Exception as e:
-                logger.warning(f"[!] Challenge canvas/özet mesajı güncellenemedi: {e}")
-
-            # 8. Challenge içeriğini kanala gönder
-            try:
-                await self._post_challenge_content(challenge_channel_id, enhanced_project, challenge, theme_name, deadline_hours)
-                logger.info(f"[+] Challenge içeriği kanala gönderildi: {challenge_channel_id}")
-            except Exception as e:
-                logger.error(f"[X] Challenge içeriği gönderilemedi: {e}", exc_info=True)
-                # İçerik gönderilemese bile devam et
-
-            # 9. Deadline sonrası kapatma görevi planla
-            try:
-                self.cron.add_once_job(
-                    func=self._close_challenge,
-                    delay_minutes=deadline_hours * 60,
-                    job_id=f"close_challenge_{challenge_id}",
-                    args=[challenge_id, challenge_channel_id]
-                )
-                logger.info(f"[+] Challenge kapatma görevi planlandı: {deadline_hours} saat sonra")
-            except Exception as e:
-                logger.warning(f"[!] Challenge kapatma görevi planlanamadı: {e}")
-
-            # 10. Challenge başlatıldıktan sonra hemen yetkisiz kullanıcı kontrolü yap
-            try:
-                import time
-                time.sleep(5)  # Kullanıcıların kanala eklenmesi ve Slack'in senkronize olması için bekleme
-                self.monitor_challenge_channels()
-                logger.info(f"[+] Challenge kanalı kontrol edildi: {challenge_channel_id}")
-            except Exception as e:
-                logger.warning(f"[!] Challenge kanalı kontrol edilemedi: {e}")
-
-            logger.info(f"[+] Challenge başarıyla başlatıldı | ID: {challenge_id} | Tema: {theme_name} | Kanal: {challenge_channel_id}")
+        topic_text = f"Challenge: {project.get('name', 'Proje')} | Süre: {state['deadline_hours']} saat | ⚠️ Lütfen kanala başka kişileri davet etmeyin"
+        purpose_text = f"Challenge kanalı - {state['theme_name']} teması | Takım: {challenge['team_size'] + 1} kişi | Bu kanal sadece challenge takımı için oluşturulmuştur. Lütfen kanala başka kişileri davet etmeyin."
+        try:
+            topic_success, purpose_success = await asyncio.gather(
+                asyncio.to_thread(self.conv.set_topic, channel_id, topic_text),
+                asyncio.to_thread(self.conv.set_purpose, channel_id, purpose_text),
+            )
+            if topic_success and purpose_success:
+                logger.info(f"[+] Kanal topic ve purpose ayarlandı: {channel_id}")
+            else:
+                logger.warning(f"[!] Kanal topic/purpose ayarlanamadı (non-critical): {channel_id}")
+        except Exception as e:
+            # Topic/purpose ayarlanmasa bile challenge devam edebilir
+            logger.warning(f"[!] Kanal topic/purpose ayarlanırken hata (devam ediliyor): {e}")
+
+    async def _start_step_activate(self, challenge_id: str, challenge: Dict, state: Dict[str, Any]):
+        """Adım 4: Challenge'ı aktif olarak kaydet ve duyuru canvas'ını güncelle."""
+        project = state["project"]
+        enhanced_project = state["enhanced_project"]
+        now = datetime.now()
+        deadline = now + timedelta(hours=state["deadline_hours"])
+        state["deadline"] = deadline.isoformat()
+
+        self.hub_repo.update(challenge_id, {
+            "status": "active",
+            "theme": state["theme_name"],
+            "challenge_channel_id": state["channel_id"],
+            "selected_project_id": project["id"],
+            # Canvas/özet için gerekli temel proje bilgileri
+            "project_name": project.get("name"),
+            "project_description": project.get("description"),
+            "deadline_hours": state["deadline_hours"],
+            "difficulty": state["difficulty"],
+            "llm_customizations": json.dumps(enhanced_project.get("llm_enhanced_features", [])),
+            "started_at": now.isoformat(),
+            "deadline": state["deadline"]
+        })
+        logger.info(f"[+] Challenge güncellendi: {challenge_id}")
+        self._register_challenge_channel(challenge_id, state["channel_id"], challenge.get("creator_id"))
+
+        # Duyuru kanalındaki challenge özeti/canvas mesajı arka planda güncellenir
+        if self.evaluation_service:
+            self.evaluation_service.request_canvas_update(challenge_id)
+
+    async def _start_step_announce(self, challenge_id: str, challenge: Dict, state: Dict[str, Any]):
+        """Adım 5: Challenge içeriğini kanala gönder."""
+        await self._post_challenge_content(
+            state["channel_id"], state["enhanced_project"], challenge, state["theme_name"], state["deadline_hours"]
+        )
+        logger.info(f"[+] Challenge içeriği kanala gönderildi: {state['channel_id']}")
+
+    async def _start_step_schedule(self, challenge_id: str, challenge: Dict, state: Dict[str, Any]):
+        """Adım 6: Kapatma görevini ve yeni kanalın yetkisiz kullanıcı kontrolünü planla."""
+        channel_id = state["channel_id"]
+        try:
+            self.cron.add_once_job(
+                func=self._close_challenge,
+                run_date=datetime.fromisoformat(state["deadline"]),
+                job_id=f"close_challenge_{challenge_id}",
+                args=[challenge_id, channel_id]
+            )
+            logger.info(f"[+] Challenge kapatma görevi planlandı: {state['deadline_hours']} saat sonra")
+        except Exception as e:
+            logger.warning(f"[!] Challenge kapatma görevi planlanamadı: {e}")
 
+        # Slack'in üyelikleri senkronize etmesi için birkaç saniye sonra, sadece bu kanal kontrol edilir
+        try:
+            self.cron.add_once_job(
+                func=self.monitor_challenge_channel,
+                run_date=datetime.now() + timedelta(seconds=5),
+                job_id=f"monitor_new_challenge_{challenge_id}",
+                args=[challenge_id]
+            )
+            logger.info(f"[+] Challenge kanalı kontrolü planlandı: {channel_id}")
         except Exception as e:
-            logger.error(f"[X] ChallengeHubService._start_challenge hatası: {e}", exc_info=True)
-            # Hata durumunda challenge durumunu "failed" olarak işaretle
-            try:
-                self.hub_repo.update(challenge_id, {"status": "failed"})
-            except:
-                pass
-            raise
+            logger.warning(f"[!] Challenge kanalı kontrolü planlanamadı: {e}")
 
     async def _post_challenge_content(
         self,
@@ -1221,11 +1339,13 @@ class ChallengeHubService:
             if is_owner:
                 # Sahibi ayrılırsa challenge iptal edilir
                 self.hub_repo.update(challenge_id, {"status": "cancelled", "ended_at": datetime.now().isoformat()})
+                self.channel_index.forget_challenge(challenge_id)
                 logger.info(f"[-] Challenge iptal edildi (sahibi ayrıldı) | ID: {challenge_id}")
                 message = "📉 Challenge sahibi ayrıldığı için challenge iptal edildi."
             else:
                 # Normal katılımcı ayrılırsa sadece katılımcı silinir
                 self.participant_repo.delete(participant["id"])
+                self.channel_index.remove_member(challenge_id, user_id)
                 logger.info(f"[-] Kullanıcı challenge'dan ayrıldı: {user_id} | ID: {challenge_id}")
                 message = "✅ Challenge'dan başarıyla ayrıldınız."
 
@@ -1431,280 +1551,327 @@ class ChallengeHubService:
         # Settings'den startup_channel'ı kullan (eğer ayarlanmışsa)
         return settings.startup_channel
 
+    def _privileged_user_ids(self) -> Set[str]:
+        """
+        Her challenge kanalında bulunabilecek kullanıcılar: bot ve user token sahibi
+        (kanalı oluşturan workspace admin; kendisini çıkaramaz - cant_kick_self).
+        auth_test sonuçları önbelleğe alınır.
+        """
+        if self._privileged_ids is not None:
+            return self._privileged_ids
+        ids = set()
+        complete = True
+        clients = [self.chat.client] + ([self.conv.user_client] if self.conv.user_client else [])
+        for client in clients:
+            try:
+                info = client.auth_test()
+                if info["ok"]:
+                    ids.add(info["user_id"])
+            except Exception as e:
+                complete = False
+                logger.warning(f"[!] Yetkili sistem kullanıcısı bilgisi alınamadı: {e}")
+        if complete:
+            self._privileged_ids = ids
+        return ids
+
+    def load_channel_index(self) -> int:
+        """
+        Aktif challenge'ların yetkili üye indeksini veritabanından kurar
+        (challenge'lar + tüm takım üyeleri için iki sorgu). İndekslenen kanal sayısını döndürür.
+        """
+        challenges = self.hub_repo.get_all_active()
+        members = self.participant_repo.get_team_members_by_challenges([ch["id"] for ch in challenges])
+        self.channel_index.rebuild(
+            (
+                ch["id"],
+                ch.get("challenge_channel_id"),
+                [m["user_id"] for m in members.get(ch["id"], [])] + ([ch["creator_id"]] if ch.get("creator_id") else []),
+            )
+            for ch in challenges
+        )
+        logger.info(f"[i] Challenge kanal indeksi kuruldu | Kanal: {len(self.channel_index)} | Challenge: {len(challenges)}")
+        return len(self.channel_index)
+
+    def _register_challenge_channel(self, challenge_id: str, channel_id: str, creator_id: Optional[str] = None):
+        """Yeni challenge kanalını indekse ekler (creator + kayıtlı takım üyeleri yetkili)."""
+        user_ids = [m["user_id"] for m in self.participant_repo.get_team_members(challenge_id)]
+        if creator_id:
+            user_ids.append(creator_id)
+        self.channel_index.register_channel(challenge_id, channel_id, user_ids)
+
+    def _challenge_for_channel_from_db(self, channel_id: str) -> Optional[str]:
+        """
+        İndekste olmayan kanalı veritabanında arar; aktif bir challenge kanalıysa indekse ekler.
+        (Kanal başka bir replikada açılmış ve bu sürecin indeksi henüz yenilenmemiş olabilir.)
+        """
+        challenge = self.hub_repo.get_by_channel_id(channel_id)
+        if not challenge or challenge.get("status") not in ("recruiting", "active", "evaluating"):
+            return None
+        self._register_challenge_channel(challenge["id"], channel_id, challenge.get("creator_id"))
+        return challenge["id"]
+
+    def _is_team_member_in_db(self, challenge_id: str, user_id: str) -> bool:
+        """İndekste yetkisiz görünen kullanıcıyı veritabanından doğrular; üyeyse indekse ekler."""
+        if not self.participant_repo.get_by_challenge_and_user(challenge_id, user_id):
+            return False
+        self.channel_index.add_member(challenge_id, user_id)
+        return True
+
     def check_and_remove_unauthorized_user(self, channel_id: str, user_id: str) -> Dict[str, Any]:
         """
-        Challenge kanalına yetkisiz kullanıcı katıldığında çağrılır.
-        Kullanıcı yetkisiz ise kanaldan çıkarır ve uyarı gönderir.
+        Challenge kanalına yetkisiz kullanıcı katıldığında çağrılır (member_joined_channel).
+        Karar önce bellekteki indeksten verilir; indekste kaydı olmayan kanal/kullanıcı
+        işlem yapılmadan veritabanından doğrulanır (indeks başka replikadaki değişiklikleri
+        bir sonraki yenilemeye kadar görmez). Yetkisiz kullanıcı çıkarma kuyruğuna eklenir,
+        çıkarma ve uyarılar arka planda yapılır.
         """
         try:
             # 1. Bu kanal bir challenge kanalı mı?
-            challenge = self.hub_repo.get_by_channel_id(channel_id)
-            if not challenge:
+            challenge_id = (
+                self.channel_index.challenge_for_channel(channel_id)
+                or self._challenge_for_channel_from_db(channel_id)
+            )
+            if not challenge_id:
                 # Bu bir challenge kanalı değil, işlem yapma
                 return {"is_challenge_channel": False, "action": "none"}
             
-            # 2. Challenge'ın yetkili kullanıcılarını al
-            authorized_users = set()
-            
-            # Creator'ı ekle
-            creator_id = challenge.get("creator_id")
-            if creator_id:
-                authorized_users.add(creator_id)
-            
-            # Participants'ları ekle
-            participants = self.participant_repo.get_team_members(challenge["id"])
-            for participant in participants:
-                authorized_users.add(participant["user_id"])
+            # 2. Kullanıcı yetkili mi?
+            if (
+                self.channel_index.is_authorized(channel_id, user_id)
+                or user_id in self._privileged_user_ids()
+                or self._is_team_member_in_db(challenge_id, user_id)
+            ):
+                logger.debug(f"[i] Yetkili kullanıcı kanala katıldı: {user_id} | Challenge: {challenge_id}")
+                return {"is_challenge_channel": True, "is_authorized": True, "action": "none"}
             
-            # 3. Bot'u da ekle (bot her zaman kanalda olmalı)
+            # 3. Yetkisiz kullanıcı - çıkarma kuyruğuna ekle
+            logger.warning(f"[!] Yetkisiz kullanıcı challenge kanalına katılmaya çalıştı: {user_id} | Challenge: {challenge_id} | Kanal: {channel_id}")
+            self._enqueue_kick(channel_id, user_id, challenge_id)
+            return {
+                "is_challenge_channel": True,
+                "is_authorized": False,
+                "action": "queued",
+                "user_id": user_id,
+                "challenge_id": challenge_id
+            }
+                
+        except Exception as e:
+            logger.error(f"[X] Yetkisiz kullanıcı kontrolü hatası: {e}", exc_info=True)
+            return {"is_challenge_channel": False, "action": "error", "error": str(e)}
+
+    def _enqueue_kick(self, channel_id: str, user_id: str, challenge_id: str):
+        """
+        Çıkarma işini kuyruğa ekler. Aynı kullanıcı/kanal için bekleyen iş tekrar eklenmez;
+        işler tek arka plan thread'inde sırayla ve SlackRateLimiter tier limitlerine uyarak çalışır.
+        """
+        key = f"{channel_id}:{user_id}"
+        with self._kick_lock:
+            # Çıkarma sürerken gelen tekrar eden olaylar ikinci bir çıkarma başlatmasın
+            if key in self._kicks_in_flight:
+                return
+            self._kicks_in_flight.add(key)
+
+        def kick():
             try:
-                bot_info = self.chat.client.auth_test()
-                if bot_info["ok"]:
-                    bot_user_id = bot_info["user_id"]
-                    authorized_users.add(bot_user_id)
-            except Exception as e:
-                logger.warning(f"[!] Bot user ID alınamadı: {e}")
-            
-            # 4. User token sahibini ekle (workspace admin - kanalı oluşturan)
-            # User token sahibi kendisini çıkaramaz (cant_kick_self hatası)
+                self._remove_unauthorized_user(channel_id, user_id, challenge_id)
+            finally:
+                with self._kick_lock:
+                    self._kicks_in_flight.discard(key)
+
+        self.kick_queue.mark_dirty(key, kick)
+
+    def get_kick_queue_stats(self) -> Dict[str, int]:
+        return self.kick_queue.get_stats()
+
+    def _remove_unauthorized_user(self, channel_id: str, user_id: str, challenge_id: str) -> Dict[str, Any]:
+        """Yetkisiz kullanıcıyı kanaldan çıkarır, kullanıcıya ve kanala bilgi verir."""
+        # Kuyrukta beklerken takıma katılmış olabilir (bu veya başka bir replikada)
+        if self.channel_index.is_authorized(channel_id, user_id) or self._is_team_member_in_db(challenge_id, user_id):
+            return {"is_challenge_channel": True, "is_authorized": True, "action": "none"}
+
+        try:
+            # Kullanıcıyı kanaldan çıkar
+            logger.info(f"[>] Kullanıcı kanaldan çıkarılıyor: {user_id} | Kanal: {channel_id}")
             try:
-                if self.conv.user_client:
-                    user_token_info = self.conv.user_client.auth_test()
-                    if user_token_info["ok"]:
-                        user_token_owner_id = user_token_info["user_id"]
-                        authorized_users.add(user_token_owner_id)
-                        logger.debug(f"[i] User token sahibi yetkili kullanıcılara eklendi: {user_token_owner_id}")
-            except Exception as e:
-                logger.warning(f"[!] User token sahibi bilgisi alınamadı: {e}")
-            
-            # 5. Kullanıcı yetkili mi?
-            if user_id in authorized_users:
-                # Yetkili kullanıcı, işlem yapma
-                logger.debug(f"[i] Yetkili kullanıcı kanala katıldı: {user_id} | Challenge: {challenge['id']}")
-                return {"is_challenge_channel": True, "is_authorized": True, "action": "none"}
-            
-            # 6. Yetkisiz kullanıcı - kanaldan çıkar
-            logger.warning(f"[!] Yetkisiz kullanıcı challenge kanalına katılmaya çalıştı: {user_id} | Challenge: {challenge['id']} | Kanal: {channel_id}")
-            logger.info(f"[i] Yetkili kullanıcılar: {authorized_users}")
+                success = self.conv.kick_user(channel_id, user_id)
+                logger.info(f"[i] kick_user sonucu: {success}")
+            except Exception as kick_error:
+                logger.error(f"[X] kick_user exception: {kick_error} | Kullanıcı: {user_id} | Kanal: {channel_id}", exc_info=True)
+                success = False
             
-            try:
-                # Kullanıcıyı kanaldan çıkar
-                logger.info(f"[>] Kullanıcı kanaldan çıkarılıyor: {user_id} | Kanal: {channel_id}")
+            if success:
+                logger.info(f"[+] Yetkisiz kullanıcı kanaldan çıkarıldı: {user_id} | Challenge: {challenge_id}")
+                
+                # Kullanıcıya DM ile uyarı gönder
+                try:
+                    dm_channel = self.conv.open_conversation([user_id])
+                    if dm_channel and dm_channel.get("channel"):
+                        dm_id = dm_channel["channel"]["id"]
+                        self.chat.post_message(
+                            channel=dm_id,
+                            text=(
+                                "⚠️ *Yetkisiz Kanal Erişimi*\n\n"
+                                "Challenge kanalları sadece challenge takımı için oluşturulmuştur. "
+                                "Bu kanala katılamazsınız çünkü bu challenge'ın takım üyesi değilsiniz.\n\n"
+                                "💡 *Not:* Challenge kanallarına sadece challenge sahibi ve takım üyeleri katılabilir. "
+                                "Lütfen başka challenge kanallarına katılmaya çalışmayın."
+                            ),
+                            blocks=[{
+                                "type": "section",
+                                "text": {
+                                    "type": "mrkdwn",
+                                    "text": (
+                                        "⚠️ *Yetkisiz Kanal Erişimi*\n\n"
+                                        "Challenge kanalları sadece challenge takımı için oluşturulmuştur. "
+                                        "Bu kanala katılamazsınız çünkü bu challenge'ın takım üyesi değilsiniz.\n\n"
+                                        "💡 *Not:* Challenge kanallarına sadece challenge sahibi ve takım üyeleri katılabilir. "
+                                        "Lütfen başka challenge kanallarına katılmaya çalışmayın."
+                                    )
+                                }
+                            }]
+                        )
+                except Exception as e:
+                    logger.warning(f"[!] DM gönderilemedi: {e}")
+                
+                # Challenge kanalına bilgilendirme mesajı gönder
                 try:
-                    success = self.conv.kick_user(channel_id, user_id)
-                    logger.info(f"[i] kick_user sonucu: {success}")
-                except Exception as kick_error:
-                    logger.error(f"[X] kick_user exception: {kick_error} | Kullanıcı: {user_id} | Kanal: {channel_id}", exc_info=True)
-                    success = False
+                    self.chat.post_message(
+                        channel=channel_id,
+                        text=(
+                            f"⚠️ *Yetkisiz Kullanıcı Tespit Edildi*\n\n"
+                            f"<@{user_id}> bu kanala yetkisiz olarak katılmaya çalıştı ve otomatik olarak çıkarıldı.\n\n"
+                            f"💡 *Hatırlatma:* Bu kanal sadece challenge takımı için oluşturulmuştur. "
+                            f"Lütfen kanala başka kişileri davet etmeyin."
+                        ),
+                        blocks=[{
+                            "type": "section",
+                            "text": {
+                                "type": "mrkdwn",
+                                "text": (
+                                    f"⚠️ *Yetkisiz Kullanıcı Tespit Edildi*\n\n"
+                                    f"<@{user_id}> bu kanala yetkisiz olarak katılmaya çalıştı ve otomatik olarak çıkarıldı.\n\n"
+                                    f"💡 *Hatırlatma:* Bu kanal sadece challenge takımı için oluşturulmuştur. "
+                                    f"Lütfen kanala başka kişileri davet etmeyin."
+                                )
+                            }
+                        }]
+                    )
+                except Exception as e:
+                    logger.warning(f"[!] Challenge kanalına bilgilendirme mesajı gönderilemedi: {e}")
                 
-                if success:
-                    logger.info(f"[+] Yetkisiz kullanıcı kanaldan çıkarıldı: {user_id} | Challenge: {challenge['id']}")
-                    
-                    # Kullanıcıya DM ile uyarı gönder
-                    try:
-                        dm_channel = self.conv.open_conversation([user_id])
-                        if dm_channel and dm_channel.get("channel"):
-                            dm_id = dm_channel["channel"]["id"]
-                            self.chat.post_message(
-                                channel=dm_id,
-                                text=(
-                                    "⚠️ *Yetkisiz Kanal Erişimi*\n\n"
-                                    "Challenge kanalları sadece challenge takımı için oluşturulmuştur. "
-                                    "Bu kanala katılamazsınız çünkü bu challenge'ın takım üyesi değilsiniz.\n\n"
-                                    "💡 *Not:* Challenge kanallarına sadece challenge sahibi ve takım üyeleri katılabilir. "
-                                    "Lütfen başka challenge kanallarına katılmaya çalışmayın."
-                                ),
-                                blocks=[{
-                                    "type": "section",
-                                    "text": {
-                                        "type": "mrkdwn",
-                                        "text": (
-                                            "⚠️ *Yetkisiz Kanal Erişimi*\n\n"
-                                            "Challenge kanalları sadece challenge takımı için oluşturulmuştur. "
-                                            "Bu kanala katılamazsınız çünkü bu challenge'ın takım üyesi değilsiniz.\n\n"
-                                            "💡 *Not:* Challenge kanallarına sadece challenge sahibi ve takım üyeleri katılabilir. "
-                                            "Lütfen başka challenge kanallarına katılmaya çalışmayın."
-                                        )
-                                    }
-                                }]
-                            )
-                    except Exception as e:
-                        logger.warning(f"[!] DM gönderilemedi: {e}")
+                return {
+                    "is_challenge_channel": True,
+                    "is_authorized": False,
+                    "action": "removed",
+                    "user_id": user_id,
+                    "challenge_id": challenge_id
+                }
+            else:
+                logger.error(f"[X] Kullanıcı kanaldan çıkarılamadı: {user_id} | Kanal: {channel_id} | Challenge: {challenge_id}")
+                
+                # Admin'e bildirim gönder
+                try:
+                    from src.core.settings import get_settings
+                    settings = get_settings()
+                    admin_channel = settings.admin_channel_id
                     
-                    # Challenge kanalına bilgilendirme mesajı gönder
-                    try:
+                    if admin_channel:
                         self.chat.post_message(
-                            channel=channel_id,
+                            channel=admin_channel,
                             text=(
-                                f"⚠️ *Yetkisiz Kullanıcı Tespit Edildi*\n\n"
-                                f"<@{user_id}> bu kanala yetkisiz olarak katılmaya çalıştı ve otomatik olarak çıkarıldı.\n\n"
-                                f"💡 *Hatırlatma:* Bu kanal sadece challenge takımı için oluşturulmuştur. "
-                                f"Lütfen kanala başka kişileri davet etmeyin."
+                                f"⚠️ *Yetkisiz Kullanıcı Çıkarılamadı*\n\n"
+                                f"Kullanıcı: <@{user_id}>\n"
+                                f"Challenge: `{challenge_id[:8]}...`\n"
+                                f"Kanal: <#{channel_id}>\n\n"
+                                f"❌ Kullanıcı otomatik olarak çıkarılamadı. Lütfen manuel olarak çıkarın.\n\n"
+                                f"💡 *Not:* Bot'un `groups:write` ve `channels:write` scope'larına sahip olduğundan emin olun."
                             ),
                             blocks=[{
                                 "type": "section",
                                 "text": {
                                     "type": "mrkdwn",
                                     "text": (
-                                        f"⚠️ *Yetkisiz Kullanıcı Tespit Edildi*\n\n"
-                                        f"<@{user_id}> bu kanala yetkisiz olarak katılmaya çalıştı ve otomatik olarak çıkarıldı.\n\n"
-                                        f"💡 *Hatırlatma:* Bu kanal sadece challenge takımı için oluşturulmuştur. "
-                                        f"Lütfen kanala başka kişileri davet etmeyin."
+                                        f"⚠️ *Yetkisiz Kullanıcı Çıkarılamadı*\n\n"
+                                        f"Kullanıcı: <@{user_id}>\n"
+                                        f"Challenge: `{challenge_id[:8]}...`\n"
+                                        f"Kanal: <#{channel_id}>\n\n"
+                                        f"❌ Kullanıcı otomatik olarak çıkarılamadı. Lütfen manuel olarak çıkarın.\n\n"
+                                        f"💡 *Not:* Bot'un `groups:write` ve `channels:write` scope'larına sahip olduğundan emin olun."
                                     )
                                 }
                             }]
                         )
-                    except Exception as e:
-                        logger.warning(f"[!] Challenge kanalına bilgilendirme mesajı gönderilemedi: {e}")
-                    
-                    return {
-                        "is_challenge_channel": True,
-                        "is_authorized": False,
-                        "action": "removed",
-                        "user_id": user_id,
-                        "challenge_id": challenge["id"]
-                    }
-                else:
-                    logger.error(f"[X] Kullanıcı kanaldan çıkarılamadı: {user_id} | Kanal: {channel_id} | Challenge: {challenge['id']}")
-                    
-                    # Admin'e bildirim gönder
-                    try:
-                        from src.core.settings import get_settings
-                        settings = get_settings()
-                        admin_channel = settings.admin_channel_id
-                        
-                        if admin_channel:
-                            self.chat.post_message(
-                                channel=admin_channel,
-                                text=(
-                                    f"⚠️ *Yetkisiz Kullanıcı Çıkarılamadı*\n\n"
-                                    f"Kullanıcı: <@{user_id}>\n"
-                                    f"Challenge: `{challenge['id'][:8]}...`\n"
-                                    f"Kanal: <#{channel_id}>\n\n"
-                                    f"❌ Kullanıcı otomatik olarak çıkarılamadı. Lütfen manuel olarak çıkarın.\n\n"
-                                    f"💡 *Not:* Bot'un `groups:write` ve `channels:write` scope'larına sahip olduğundan emin olun."
-                                ),
-                                blocks=[{
-                                    "type": "section",
-                                    "text": {
-                                        "type": "mrkdwn",
-                                        "text": (
-                                            f"⚠️ *Yetkisiz Kullanıcı Çıkarılamadı*\n\n"
-                                            f"Kullanıcı: <@{user_id}>\n"
-                                            f"Challenge: `{challenge['id'][:8]}...`\n"
-                                            f"Kanal: <#{channel_id}>\n\n"
-                                            f"❌ Kullanıcı otomatik olarak çıkarılamadı. Lütfen manuel olarak çıkarın.\n\n"
-                                            f"💡 *Not:* Bot'un `groups:write` ve `channels:write` scope'larına sahip olduğundan emin olun."
-                                        )
-                                    }
-                                }]
-                            )
-                    except Exception as admin_error:
-                        logger.warning(f"[!] Admin'e bildirim gönderilemedi: {admin_error}")
-                    
-                    return {
-                        "is_challenge_channel": True,
-                        "is_authorized": False,
-                        "action": "failed_to_remove",
-                        "user_id": user_id,
-                        "challenge_id": challenge["id"]
-                    }
-            except Exception as e:
-                logger.error(f"[X] Kullanıcı kanaldan çıkarılırken hata: {e}", exc_info=True)
+                except Exception as admin_error:
+                    logger.warning(f"[!] Admin'e bildirim gönderilemedi: {admin_error}")
+                
                 return {
                     "is_challenge_channel": True,
                     "is_authorized": False,
-                    "action": "error",
-                    "error": str(e)
+                    "action": "failed_to_remove",
+                    "user_id": user_id,
+                    "challenge_id": challenge_id
                 }
-                
         except Exception as e:
-            logger.error(f"[X] Yetkisiz kullanıcı kontrolü hatası: {e}", exc_info=True)
-            return {"is_challenge_channel": False, "action": "error", "error": str(e)}
+            logger.error(f"[X] Kullanıcı kanaldan çıkarılırken hata: {e}", exc_info=True)
+            return {
+                "is_challenge_channel": True,
+                "is_authorized": False,
+                "action": "error",
+                "error": str(e)
+            }
+
+    def refresh_channel_index(self):
+        """İndeksi veritabanından yeniler (her süreçte çalışır; indeks süreç içidir)."""
+        try:
+            self.load_channel_index()
+        except Exception as e:
+            logger.error(f"[X] Challenge kanal indeksi yenilenemedi: {e}", exc_info=True)
 
-    def monitor_challenge_channels(self):
+    def reconcile_challenge_channels(self):
         """
-        Tüm aktif challenge kanallarını periyodik olarak kontrol eder.
-        Yetkisiz kullanıcıları tespit edip çıkarır.
+        Seyrek çalışan uzlaştırma: indeksi veritabanından yeniden kurar, her challenge
+        kanalının üyelerini (sayfalı) listeler ve olaylarla yakalanamamış yetkisiz
+        kullanıcıları çıkarma kuyruğuna ekler.
         """
         try:
-            # Aktif challenge'ları al
-            active_challenges = self.hub_repo.get_all_active()
-            
-            if not active_challenges:
-                logger.debug("[i] Aktif challenge yok, kontrol atlandı")
+            self.load_channel_index()
+            channels = self.channel_index.channels()
+            if not channels:
+                logger.debug("[i] Aktif challenge kanalı yok, uzlaştırma atlandı")
                 return
             
-            logger.info(f"[>] Challenge kanalları kontrol ediliyor: {len(active_challenges)} aktif challenge")
+            logger.info(f"[>] Challenge kanalları uzlaştırılıyor: {len(channels)} kanal")
+            for channel_id, challenge_id in channels:
+                self._check_challenge_channel(challenge_id, channel_id)
+                    
+        except Exception as e:
+            logger.error(f"[X] Challenge kanalları uzlaştırma hatası: {e}", exc_info=True)
+
+    def monitor_challenge_channel(self, challenge_id: str):
+        """Tek bir challenge kanalını kontrol eder (örn: yeni açılan kanal)."""
+        for channel_id, ch_id in self.channel_index.channels():
+            if ch_id == challenge_id:
+                self._check_challenge_channel(challenge_id, channel_id)
+
+    def _check_challenge_channel(self, challenge_id: str, channel_id: str):
+        """Kanal üyelerini indeksle karşılaştırır, yetkisizleri çıkarma kuyruğuna ekler."""
+        try:
+            # Kanal üyelerini al (tüm sayfalar - büyük kanallar kesilmez)
+            privileged = self._privileged_user_ids()
+            unauthorized_users = [
+                uid for uid in self.conv.iter_members(channel_id)
+                if uid not in privileged and not self.channel_index.is_authorized(channel_id, uid)
+            ]
             
-            for challenge in active_challenges:
-                channel_id = challenge.get("challenge_channel_id")
-                if not channel_id:
-                    continue
+            if unauthorized_users:
+                logger.warning(f"[!] Yetkisiz kullanıcılar tespit edildi: {len(unauthorized_users)} kişi | Challenge: {challenge_id} | Kanal: {channel_id}")
+                for user_id in unauthorized_users:
+                    self._enqueue_kick(channel_id, user_id, challenge_id)
+            else:
+                logger.debug(f"[i] Challenge kanalı temiz: {challenge_id} | Kanal: {channel_id}")
                 
-                try:
-                    # Kanal üyelerini al
-                    channel_members = set(self.conv.get_members(channel_id))
-                    
-                    # Yetkili kullanıcıları belirle
-                    authorized_users = set()
-                    
-                    # Creator'ı ekle
-                    creator_id = challenge.get("creator_id")
-                    if creator_id:
-                        authorized_users.add(creator_id)
-                    
-                    # Participants'ları ekle
-                    participants = self.participant_repo.get_team_members(challenge["id"])
-                    for participant in participants:
-                        authorized_users.add(participant["user_id"])
-                    
-                    # Bot'u ekle
-                    try:
-                        bot_info = self.chat.client.auth_test()
-                        if bot_info["ok"]:
-                            bot_user_id = bot_info["user_id"]
-                            authorized_users.add(bot_user_id)
-                    except Exception:
-                        pass
-                    
-                    # User token sahibini ekle
-                    try:
-                        if self.conv.user_client:
-                            user_token_info = self.conv.user_client.auth_test()
-                            if user_token_info["ok"]:
-                                user_token_owner_id = user_token_info["user_id"]
-                                authorized_users.add(user_token_owner_id)
-                    except Exception:
-                        pass
-                    
-                    # Yetkisiz kullanıcıları bul
-                    unauthorized_users = channel_members - authorized_users
-                    
-                    if unauthorized_users:
-                        logger.warning(f"[!] Yetkisiz kullanıcılar tespit edildi: {len(unauthorized_users)} kişi | Challenge: {challenge['id']} | Kanal: {channel_id}")
-                        
-                        # Her yetkisiz kullanıcıyı çıkar (rate limit için aralarına gecikme ekle)
-                        import time
-                        for i, user_id in enumerate(unauthorized_users):
-                            try:
-                                result = self.check_and_remove_unauthorized_user(channel_id, user_id)
-                                if result.get("action") == "removed":
-                                    logger.info(f"[+] Yetkisiz kullanıcı çıkarıldı: {user_id} | Challenge: {challenge['id']}")
-                                
-                                # Rate limit'e takılmamak için her işlem arasında kısa gecikme (son kullanıcıdan sonra bekleme yok)
-                                if i < len(unauthorized_users) - 1:
-                                    time.sleep(2)  # 2 saniye bekle (dakikada ~20 request için güvenli)
-                            except Exception as e:
-                                logger.error(f"[X] Kullanıcı çıkarılırken hata: {user_id} | {e}")
-                    else:
-                        logger.debug(f"[i] Challenge kanalı temiz: {challenge['id']} | Kanal: {channel_id}")
-                        
-                except Exception as e:
-                    logger.warning(f"[!] Challenge kanalı kontrol edilemedi: {challenge['id']} | {e}")
-                    
         except Exception as e:
-            logger.error(f"[X] Challenge kanalları kontrol hatası: {e}", exc_info=True)
+            logger.warning(f"[!] Challenge kanalı kontrol edilemedi: {challenge_id} | {e}")
 
     def _get_theme_icon(self, theme: str) -> str:
         """Tema için icon döndürür."""
@@ -0,0 +1,77 @@
+"""
+Challenge kanalı yetkili üye indeksi.
+Kanala katılma olayları veritabanına veya Slack'e gitmeden bellekteki indeksten yanıtlanır.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class ChallengeChannelIndex:
+    """
+    Challenge başına yetkili kullanıcılar (creator + takım üyeleri) ve kanal -> challenge eşlemesi.
+
+    İndeks açılışta ve periyodik uzlaştırmada veritabanından (`rebuild`) kurulur; arada
+    katılım/ayrılma ve kanal açılışı gibi değişikliklerle yerinde güncellenir. Challenge'ın
+    henüz kanalı yoksa üyeleri yine tutulur, kanal bağlandığında hemen kullanılır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._members: Dict[str, Set[str]] = {}
+        self._channels: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def rebuild(self, entries: Iterable[Tuple[str, Optional[str], Iterable[str]]]):
+        """
+        İndeksi baştan kurar ve tek seferde değiştirir.
+
+        Args:
+            entries: (challenge_id, channel_id veya None, yetkili kullanıcılar) üçlüleri
+        """
+        members: Dict[str, Set[str]] = {}
+        channels: Dict[str, str] = {}
+        for challenge_id, channel_id, user_ids in entries:
+            members[challenge_id] = set(user_ids)
+            if channel_id:
+                channels[channel_id] = challenge_id
+        with self._lock:
+            self._members = members
+            self._channels = channels
+
+    def register_channel(self, challenge_id: str, channel_id: str, user_ids: Iterable[str] = ()):
+        """Challenge'a kanal bağlar (verilen kullanıcılar yetkililere eklenir)."""
+        with self._lock:
+            self._members.setdefault(challenge_id, set()).update(user_ids)
+            self._channels[channel_id] = challenge_id
+
+    def forget_challenge(self, challenge_id: str):
+        """Sona eren/iptal edilen challenge'ı indeksten çıkarır."""
+        with self._lock:
+            self._members.pop(challenge_id, None)
+            for channel_id in [c for c, ch_id in self._channels.items() if ch_id == challenge_id]:
+                del self._channels[channel_id]
+
+    def add_member(self, challenge_id: str, user_id: str):
+        with self._lock:
+            self._members.setdefault(challenge_id, set()).add(user_id)
+
+    def remove_member(self, challenge_id: str, user_id: str):
+        with self._lock:
+            self._members.get(challenge_id, set()).discard(user_id)
+
+    def challenge_for_channel(self, channel_id: str) -> Optional[str]:
+        """Kanal bir challenge kanalıysa challenge ID'sini, değilse None döndürür."""
+        return self._channels.get(channel_id)
+
+    def is_authorized(self, channel_id: str, user_id: str) -> bool:
+        with self._lock:
+            challenge_id = self._channels.get(channel_id)
+            return challenge_id is not None and user_id in self._members.get(challenge_id, ())
+
+    def channels(self) -> List[Tuple[str, str]]:
+        """(channel_id, challenge_id) çiftleri."""
+        with self._lock:
+            return list(self._channels.items())
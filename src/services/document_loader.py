@@ -0,0 +1,449 @@
+"""
+Bilgi küpü döküman okuyucu ve parçalayıcı.
+
+Hem bot içindeki `KnowledgeService` hem de ayrı süreçte çalışan indeksleyici
+(`python -m src.indexer`) dökümanları buradan okur; modül Slack/Groq bağımlılığı taşımaz.
+
+PDF, DOCX, Markdown ve TXT dosyaları yapıya göre parçalanır: döküman önce başlık, paragraf
+ve tablo bloklarına ayrılır (DOCX başlık stilleri, PDF sayfa düzeni ve sayfa numaraları),
+bloklar parça boyutuna kadar birleştirilir; tablolar satır, paragraflar cümle sınırında bölünür.
+Parçalar doğal sınırlarda bittiği için örtüşme gerekmez; her parçanın metadata'sında
+sayfa (`page`, `page_end`) ve bölüm (`section`) bulunur (atıf: "kurallar.pdf s.4").
+"""
+
+import fnmatch
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from src.clients.vector_store import DEFAULT_COLLECTION, normalize_collection
+from src.core.lazy import lazy_import
+from src.core.logger import logger
+
+# Döküman okuyucular sadece bilgi küpü indekslenirken yüklenir
+pd = lazy_import("pandas")
+docx = lazy_import("docx")
+pypdf = lazy_import("pypdf")
+text_splitters = lazy_import("langchain_text_splitters")
+
+CHUNK_SIZE = 1200
+CHUNK_OVERLAP = 200
+
+
+def create_splitter():
+    """Metin bölücü."""
+    return text_splitters.RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,  # Daha büyük chunk'lar için artırıldı
+        chunk_overlap=CHUNK_OVERLAP  # Overlap de artırıldı
+    )
+
+
+def read_document(file_path: str) -> str:
+    """Desteklenen bir dökümanı düz metne çevirir (desteklenmeyen uzantıda boş metin)."""
+    filename = os.path.basename(file_path)
+    text = ""
+
+    # PDF İşleme
+    if filename.endswith(".pdf"):
+        reader = pypdf.PdfReader(file_path)
+        for page in reader.pages:
+            text += page.extract_text() + "\n"
+
+    # TXT ve Markdown İşleme
+    elif filename.endswith((".txt", ".md")):
+        with open(file_path, "r", encoding="utf-8") as f:
+            text = f.read()
+
+    # DOCX (Word) İşleme
+    elif filename.endswith(".docx"):
+        doc = docx.Document(file_path)
+        text = "\n".join([para.text for para in doc.paragraphs])
+
+    # Excel ve CSV İşleme (Tablosal)
+    elif filename.endswith((".csv", ".xlsx", ".xls")):
+        if filename.endswith(".csv"):
+            df = pd.read_csv(file_path)
+        else:
+            df = pd.read_excel(file_path)
+
+        # Her satırı bir metin parçasına dönüştür
+        rows_text = []
+        for idx, row in df.iterrows():
+            row_str = ", ".join([f"{col}: {row[col]}" for col in df.columns])
+            rows_text.append(row_str)
+        text = "\n".join(rows_text)
+
+    return text
+
+
+# ----------------------------------------------------------------------
+# Yapısal bloklar: {"kind": "heading" | "text" | "table", "text" / "rows", "page", "level"}
+# ----------------------------------------------------------------------
+
+_MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*$")
+_NUMBERED_HEADING = re.compile(r"^(\d+(?:\.\d+)*)\.?\s+\S")
+_TABLE_GAP = re.compile(r"\s{3,}")
+_MARKDOWN_TABLE_RULE = re.compile(r"^\|?[\s:|-]+\|?$")
+_PAGE_NUMBER = re.compile(r"^(sayfa\s*)?\d+(\s*/\s*\d+)?$", re.IGNORECASE)
+_DOCX_HEADING_STYLE = re.compile(r"^(heading|başlık)\s*(\d)", re.IGNORECASE)
+
+
+def _heading_level(line: str) -> Optional[int]:
+    """Satır başlıksa seviyesi (Markdown `#`, numaralı `2.1 Başlık` veya kısa BÜYÜK HARF satır: 0)."""
+    match = _MARKDOWN_HEADING.match(line)
+    if match:
+        return len(match.group(1))
+    if len(line) > 80 or line[-1] in ".,;:!?":
+        return None
+    letters = [c for c in line if c.isalpha()]
+    if len(letters) < 3:
+        return None
+    match = _NUMBERED_HEADING.match(line)
+    if match and len(line) <= 60 and letters[0].isupper():
+        return match.group(1).count(".") + 1
+    if all(c.isupper() for c in letters) and len(line.split()) <= 10:
+        # BÜYÜK HARF satırlar genelde numaralı başlıkların üstündeki ana bölümdür
+        return 0
+    return None
+
+
+def _table_cells(raw_line: str) -> List[str]:
+    """Tablo satırının hücreleri (Markdown `| a | b |` veya sayfa düzeninde 3+ boşlukla ayrılmış)."""
+    line = raw_line.strip()
+    if line.startswith("|") and line.endswith("|") and len(line) > 1:
+        return [cell.strip() for cell in line.strip("|").split("|")]
+    return [cell for cell in _TABLE_GAP.split(line) if cell]
+
+
+def text_blocks(text: str, page: Optional[int] = None) -> List[Dict]:
+    """
+    Düz metni (PDF sayfası, Markdown, TXT) başlık, paragraf ve tablo bloklarına ayırır.
+    Boş satırlar paragrafı bitirir; en az iki ardışık çok hücreli satır tablo sayılır.
+    """
+    blocks: List[Dict] = []
+    paragraph: List[str] = []
+    table: List[List[str]] = []
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append({"kind": "text", "text": " ".join(paragraph), "page": page})
+            paragraph.clear()
+
+    def flush_table():
+        if len(table) >= 2:
+            flush_paragraph()
+            blocks.append({"kind": "table", "rows": [" | ".join(cells) for cells in table], "page": page})
+        else:
+            paragraph.extend(" ".join(cells) for cells in table)
+        table.clear()
+
+    for raw_line in text.splitlines():
+        line = " ".join(raw_line.split())
+        if _MARKDOWN_TABLE_RULE.match(line) and "-" in line:
+            continue
+        cells = _table_cells(raw_line) if line else []
+        if len(cells) >= 2:
+            table.append(cells)
+            continue
+        flush_table()
+        if not line:
+            flush_paragraph()
+            continue
+        level = _heading_level(line)
+        if level is not None:
+            flush_paragraph()
+            blocks.append({"kind": "heading", "text": line.lstrip("#").strip(), "level": level, "page": page})
+        elif paragraph and paragraph[-1].endswith("-"):
+            # Satır sonunda bölünmüş kelime
+            paragraph[-1] = paragraph[-1][:-1] + line
+        else:
+            paragraph.append(line)
+    flush_table()
+    flush_paragraph()
+    return blocks
+
+
+def _repeated_lines(pages: List[str]) -> set:
+    """Sayfaların yarısından fazlasında tekrar eden kısa satırlar (üst/alt bilgi)."""
+    if len(pages) < 3:
+        return set()
+    counts = Counter()
+    for text in pages:
+        counts.update({" ".join(line.split()) for line in text.splitlines() if line.strip()})
+    return {line for line, count in counts.items() if count > len(pages) / 2 and len(line) <= 80}
+
+
+def read_pdf_blocks(file_path: str) -> List[Dict]:
+    """PDF'i sayfa numaralı bloklara ayırır; üst/alt bilgi ve sayfa numarası satırları atılır."""
+    reader = pypdf.PdfReader(file_path)
+    pages = []
+    for page in reader.pages:
+        try:
+            # Sayfa düzeni modu sütun boşluklarını korur (tablo satırları ayrılabilir)
+            pages.append(page.extract_text(extraction_mode="layout") or "")
+        except Exception:
+            pages.append(page.extract_text() or "")
+
+    repeated = _repeated_lines(pages)
+    blocks = []
+    for number, text in enumerate(pages, 1):
+        lines = [
+            line for line in text.splitlines()
+            if " ".join(line.split()) not in repeated and not _PAGE_NUMBER.match(line.strip())
+        ]
+        blocks.extend(text_blocks("\n".join(lines), page=number))
+    return blocks
+
+
+def read_docx_blocks(file_path: str) -> List[Dict]:
+    """
+    DOCX'i gövde sırasıyla bloklara ayırır: başlık stilleri (Heading/Başlık N, Title) bölümü,
+    tablolar ayrı bloğu belirler. Sayfa numarası Word'ün kaydettiği sayfa sonlarından
+    (`lastRenderedPageBreak`, yoksa elle eklenen sayfa sonları) çıkarılır; hiçbiri yoksa bilinmez.
+    """
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = docx.Document(file_path)
+    body = document.element.body
+    break_xpath = ".//w:lastRenderedPageBreak"
+    if not body.xpath(break_xpath):
+        break_xpath = ".//w:br[@w:type='page']"
+    page = 1 if body.xpath(break_xpath) else None
+
+    blocks = []
+    for child in body.iterchildren():
+        tag = child.tag.rsplit("}", 1)[-1]
+        if tag == "p":
+            paragraph = Paragraph(child, document)
+            breaks = len(child.xpath(break_xpath))
+            if page is not None and breaks:
+                page += breaks
+            text = " ".join(paragraph.text.split())
+            if not text:
+                continue
+            style = paragraph.style.name if paragraph.style is not None else ""
+            match = _DOCX_HEADING_STYLE.match(style)
+            if match or style.lower() == "title":
+                level = int(match.group(2)) if match else 1
+                blocks.append({"kind": "heading", "text": text, "level": level, "page": page})
+            else:
+                blocks.append({"kind": "text", "text": text, "page": page})
+        elif tag == "tbl":
+            rows = []
+            for row in Table(child, document).rows:
+                cells = []
+                for cell in row.cells:
+                    cell_text = " ".join(cell.text.split())
+                    # Birleştirilmiş hücreler her sütunda tekrar eder
+                    if not cells or cell_text != cells[-1]:
+                        cells.append(cell_text)
+                if any(cells):
+                    rows.append(" | ".join(cells))
+            if rows:
+                blocks.append({"kind": "table", "rows": rows, "page": page})
+    return blocks
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _fit_sentences(text: str, size: int) -> Tuple[str, str]:
+    """Metnin `size`'dan kısa kalan baştaki cümleleri ve kalanı."""
+    sentences = _SENTENCE_END.split(text)
+    used = 0
+    for count, sentence in enumerate(sentences):
+        used += len(sentence) + 1
+        if used >= size:
+            return " ".join(sentences[:count]), " ".join(sentences[count:])
+    return text, ""
+
+
+def chunk_blocks(blocks: List[Dict], chunk_size: int = CHUNK_SIZE, splitter=None) -> List[Tuple[str, Dict]]:
+    """
+    Blokları parçalara çevirir. Paragraflar ve tablolar `chunk_size`'a kadar birleştirilir;
+    parça çeyrekten fazla boşken gelen başlık yeni parça açmaz, satır olarak eklenir (küçük
+    bölümler ayrı vektör olmaz). Sığmayan tablolar satır sınırından (başlık satırı tekrarlanarak),
+    paragraflar cümle sınırından bölünür; parça metninin başına başladığı bölümün yolu eklenir.
+    Sadece tek cümlesi bile `chunk_size`'ı aşan metinler `splitter` ile bölünür.
+
+    Returns:
+        [(metin, {"section", "page", "page_end"}), ...] (bilinmeyen alanlar eklenmez)
+    """
+    chunks: List[Tuple[str, Dict]] = []
+    headings: List[Tuple[int, str]] = []
+    buffer: List[str] = []
+    pages: List[Optional[int]] = []
+    buffer_section: List[Optional[str]] = [None]
+
+    def section() -> Optional[str]:
+        return " > ".join(text for _, text in headings) or None
+
+    def limit() -> int:
+        title = buffer_section[0] if buffer else section()
+        return max(chunk_size - len(title or ""), 1)
+
+    def room() -> int:
+        return limit() - sum(len(t) + 1 for t in buffer)
+
+    def emit(text: str, chunk_pages: List[Optional[int]], title: Optional[str]):
+        metadata = {}
+        if title:
+            metadata["section"] = title
+        chunk_pages = [p for p in chunk_pages if p is not None]
+        if chunk_pages:
+            metadata["page"] = min(chunk_pages)
+            if max(chunk_pages) != metadata["page"]:
+                metadata["page_end"] = max(chunk_pages)
+        chunks.append((f"{title}\n{text}" if title else text, metadata))
+
+    def add(text: str, page: Optional[int]):
+        if not buffer:
+            buffer_section[0] = section()
+        buffer.append(text)
+        pages.append(page)
+
+    def flush():
+        if buffer:
+            emit("\n".join(buffer), pages[:], buffer_section[0])
+            buffer.clear()
+            pages.clear()
+
+    for block in blocks:
+        page = block["page"]
+        if block["kind"] == "heading":
+            if buffer and room() > limit() // 4 and len(block["text"]) < room():
+                buffer.append(block["text"])
+                pages.append(page)
+            else:
+                flush()
+            headings[:] = [h for h in headings if h[0] < block["level"]] + [(block["level"], block["text"])]
+        elif block["kind"] == "table":
+            # Tablo satır sınırından bölünür, her parçada başlık satırı tekrarlanır
+            header = block["rows"][0]
+            group = [header]
+            for row in block["rows"][1:]:
+                if sum(len(r) + 1 for r in group) + len(row) >= room():
+                    if len(group) > 1:
+                        add("\n".join(group), page)
+                        group = [header]
+                    flush()
+                group.append(row)
+            add("\n".join(group), page)
+        else:
+            text = block["text"]
+            # Sığmayan paragraf cümle sınırından bölünür, parçalar dolu kalır
+            while text and len(text) >= room():
+                head, text = _fit_sentences(text, room())
+                if head:
+                    add(head, page)
+                    flush()
+                elif buffer:
+                    flush()
+                else:
+                    # Tek cümlesi bile parça boyutunu aşan metin
+                    splitter = splitter or create_splitter()
+                    for piece in splitter.split_text(text):
+                        emit(piece, [page], section())
+                    text = ""
+            if text:
+                add(text, page)
+    flush()
+    return chunks
+
+
+def read_blocks(file_path: str) -> Optional[List[Dict]]:
+    """Yapısal okunabilen dökümanın blokları (PDF, DOCX, MD, TXT); diğerlerinde None."""
+    filename = os.path.basename(file_path)
+    if filename.endswith(".pdf"):
+        return read_pdf_blocks(file_path)
+    if filename.endswith(".docx"):
+        return read_docx_blocks(file_path)
+    if filename.endswith((".txt", ".md")):
+        with open(file_path, "r", encoding="utf-8") as f:
+            return text_blocks(f.read())
+    return None
+
+
+def format_citation(metadata: Dict) -> str:
+    """Parçanın atfı: "kurallar.pdf s.4", "kurallar.pdf s.4-5" veya sadece dosya adı."""
+    source = metadata.get("source", "Bilinmiyor")
+    page = metadata.get("page")
+    if page is None:
+        return source
+    page_end = metadata.get("page_end")
+    return f"{source} s.{page}-{page_end}" if page_end else f"{source} s.{page}"
+
+
+def format_sources(metadata_list: List[Dict]) -> List[str]:
+    """Kaynak başına tek atıf, sayfalar birleştirilir: ["kurallar.pdf s.2, 4", "sss.md"]."""
+    pages: Dict[str, List[int]] = {}
+    for metadata in metadata_list:
+        source_pages = pages.setdefault(metadata.get("source", "Bilinmiyor"), [])
+        page = metadata.get("page")
+        if page is not None:
+            for number in range(page, metadata.get("page_end", page) + 1):
+                if number not in source_pages:
+                    source_pages.append(number)
+    return [
+        f"{source} s.{', '.join(str(p) for p in sorted(numbers))}" if numbers else source
+        for source, numbers in pages.items()
+    ]
+
+
+def collection_for(relative_path: str, patterns: Optional[Dict[str, List[str]]] = None) -> str:
+    """
+    Dökümanın koleksiyonu: alt klasördeyse klasör adı (`knowledge_base/challenge/x.pdf` ->
+    `challenge`), kök klasördeyse ilk eşleşen dosya adı kalıbı, hiçbiri değilse varsayılan.
+    """
+    parts = relative_path.replace(os.sep, "/").split("/")
+    if len(parts) > 1:
+        return normalize_collection(parts[0])
+    filename = parts[0].lower()
+    for name, globs in (patterns or {}).items():
+        if any(fnmatch.fnmatch(filename, glob.lower()) for glob in globs):
+            return normalize_collection(name)
+    return DEFAULT_COLLECTION
+
+
+def load_knowledge_base(
+    folder_path: str,
+    splitter=None,
+    collection_patterns: Optional[Dict[str, List[str]]] = None
+) -> Tuple[List[str], List[Dict]]:
+    """
+    Klasördeki (ve alt klasörlerdeki) dökümanları okur ve parçalar.
+
+    Returns:
+        (parçalar, her parça için metadata: source, collection; varsa section, page, page_end)
+    """
+    all_texts = []
+    all_metadata = []
+
+    for dirpath, dirnames, filenames in os.walk(folder_path):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            relative_path = os.path.relpath(file_path, folder_path)
+            try:
+                blocks = read_blocks(file_path)
+                if blocks is not None:
+                    chunks = chunk_blocks(blocks, splitter=splitter)
+                else:
+                    text = read_document(file_path)
+                    if text.strip():
+                        # Tablosal dosyalar (CSV/Excel) satır metni olarak düz bölünür
+                        splitter = splitter or create_splitter()
+                        chunks = [(chunk, {}) for chunk in splitter.split_text(text)]
+                    else:
+                        chunks = []
+                if chunks:
+                    collection = collection_for(relative_path, collection_patterns)
+                    for text, metadata in chunks:
+                        all_texts.append(text)
+                        all_metadata.append({"source": filename, "collection": collection, **metadata})
+                    logger.info(f"[+] İşlendi: {relative_path} ({len(chunks)} parça, koleksiyon: {collection})")
+            except Exception as e:
+                logger.error(f"[X] {relative_path} işlenirken hata: {e}")
+
+    return all_texts, all_metadata
@@ -0,0 +1,237 @@
+"""
+E-posta giden kutusu (outbox).
+
+Slack handler'ları e-postayı SMTP'yi beklemeden SQLite'taki kuyruğa yazar; tek bir arka plan
+worker'ı kuyruğu boşaltır. Worker SMTPClient'ın açık tuttuğu oturumu kullanır, aynı içerikteki
+mesajların alıcılarını tek gönderimde (alıcılar birbirini görmeden) birleştirir ve geçici hataları
+artan bekleme süreleriyle (exponential backoff) yeniden dener; 5xx yanıtlar kalıcı sayılır.
+Kuyruk kalıcı olduğundan yeniden başlatmada bekleyen e-postalar kaybolmaz.
+"""
+
+import smtplib
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+from src.core.logger import logger
+from src.clients import SMTPClient
+from src.clients.smpt_client import request_notification_message
+from src.repositories import EmailOutboxRepository
+
+
+class EmailOutboxService:
+    """Kalıcı e-posta kuyruğu ve onu boşaltan arka plan worker'ı."""
+
+    def __init__(
+        self,
+        smtp_client: SMTPClient,
+        outbox_repo: EmailOutboxRepository,
+        poll_interval: float = 5.0,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        retry_base_delay: float = 30.0,
+        idle_timeout: float = 60.0
+    ):
+        self.smtp = smtp_client
+        self.repo = outbox_repo
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        # Bu süre boyunca gönderim olmazsa SMTP oturumu kapatılır (sunucu zaten düşürebilir)
+        self.idle_timeout = idle_timeout
+
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._thread = None
+        self._stats = {"queued": 0, "sent": 0, "batches": 0, "retried": 0, "failed": 0}
+
+    # ------------------------------------------------------------------
+    # Kuyruğa ekleme (Slack handler'larından çağrılır, hemen döner)
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        to_emails: Union[str, List[str]],
+        subject: str,
+        body: str,
+        is_html: bool = False
+    ) -> str:
+        """
+        E-postayı kuyruğa yazar ve worker'ı uyandırır.
+
+        Returns:
+            Kuyruk kaydının ID'si
+        """
+        if isinstance(to_emails, str):
+            to_emails = [email.strip() for email in to_emails.split(",") if email.strip()]
+
+        email_id = self.repo.enqueue(to_emails, subject, body, is_html)
+        self._stats["queued"] += 1
+        logger.debug(f"[+] E-posta kuyruğa eklendi: {subject} -> {', '.join(to_emails)}")
+        self._wakeup.set()
+        return email_id
+
+    def send_request_notification(self, requester_slack_id: str, request_content: str) -> str:
+        """Kullanıcı talebini yöneticilere e-posta ile bildirmek üzere kuyruğa ekler."""
+        subject, body = request_notification_message(requester_slack_id, request_content)
+        return self.enqueue(self.smtp.admin_recipients(), subject, body, is_html=True)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Arka plan worker'ını başlatır (açılışta kalan e-postalar da gönderilir)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox-worker", daemon=True)
+        self._thread.start()
+        self._wakeup.set()
+        logger.info("[+] E-posta kuyruğu worker'ı başlatıldı.")
+
+    def _run(self):
+        idle_for = 0.0
+        while not self._stopping.is_set():
+            woken = self._wakeup.wait(timeout=self.poll_interval)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            try:
+                sent = self.drain()
+            except Exception as e:
+                logger.error(f"[X] E-posta kuyruğu işlenirken hata: {e}")
+                sent = 0
+
+            # Uzun süre gönderim yoksa oturumu bırak
+            idle_for = 0.0 if sent else idle_for + (0.0 if woken else self.poll_interval)
+            if idle_for >= self.idle_timeout:
+                self.smtp.close()
+                idle_for = 0.0
+
+    def drain(self) -> int:
+        """
+        Zamanı gelmiş e-postaları gönderir (kuyrukta gönderilecek kalmayana kadar).
+
+        Returns:
+            Gönderilen kuyruk kaydı sayısı
+        """
+        total = 0
+        with self._drain_lock:
+            while True:
+                due = self.repo.get_due(self.batch_size)
+                if not due:
+                    break
+                progressed = 0
+                for key, emails in self._group(due):
+                    progressed += self._send_group(key, emails)
+                total += progressed
+                # Hepsi ertelendiyse bir sonraki turu bekle
+                if not progressed or len(due) < self.batch_size:
+                    break
+        return total
+
+    def _group(self, emails: List[Dict[str, Any]]) -> List[Tuple[Tuple[str, str, bool], List[Dict[str, Any]]]]:
+        """Aynı konu/gövdeli e-postaları tek gönderimde birleştirmek için gruplar."""
+        groups: Dict[Tuple[str, str, bool], List[Dict[str, Any]]] = {}
+        for email in emails:
+            groups.setdefault((email["subject"], email["body"], email["is_html"]), []).append(email)
+        return list(groups.items())
+
+    def _send_group(self, key: Tuple[str, str, bool], emails: List[Dict[str, Any]]) -> int:
+        subject, body, is_html = key
+        recipients = list(dict.fromkeys(r for email in emails for r in email["recipients"]))
+        # Birden fazla kayıt birleştirildiyse alıcılar sadece zarfta olur, birbirini görmez
+        hide_recipients = len(emails) > 1
+        try:
+            refused = self.smtp.send_message(recipients, subject, body, is_html, hide_recipients=hide_recipients)
+        except smtplib.SMTPRecipientsRefused as e:
+            # Hiçbir alıcı kabul edilmedi; kayıt kayıt reddedilen alıcılar olarak işlenir
+            refused = e.recipients
+        except Exception as e:
+            self._handle_failure(emails, str(e), permanent=self._is_permanent(e))
+            return 0
+
+        delivered = []
+        for email in emails:
+            rejected = {r: refused[r] for r in email["recipients"] if r in refused}
+            if rejected:
+                self._handle_refused(email, rejected)
+            else:
+                delivered.append(email)
+
+        if delivered:
+            self.repo.mark_sent([email["id"] for email in delivered])
+            self._stats["sent"] += len(delivered)
+            self._stats["batches"] += 1
+            logger.info(
+                f"[+] E-posta gönderildi: {subject} -> {len(recipients) - len(refused)} alıcı ({len(delivered)} kayıt)"
+            )
+        return len(delivered)
+
+    def _handle_refused(self, email: Dict[str, Any], rejected: Dict[str, tuple]):
+        """
+        Sunucunun reddettiği alıcılar: 5xx kalıcıdır (kayıt bu alıcılarla failed olur), 4xx alıcılar
+        tek başına yeniden denenir. Kaydın kabul edilen alıcılarına tekrar gönderilmez.
+        """
+        error = "Reddedilen alıcılar: " + "; ".join(
+            f"{address} ({code} {message.decode(errors='replace') if isinstance(message, bytes) else message})"
+            for address, (code, message) in rejected.items()
+        )
+        temporary = [address for address, (code, _) in rejected.items() if code < 500]
+        permanent = [address for address in rejected if address not in temporary]
+        if permanent:
+            logger.error(f"[X] E-posta alıcıları kalıcı olarak reddedildi: {email['subject']} | {', '.join(permanent)}")
+        if temporary:
+            self._handle_failure([email], error, recipients=temporary)
+        else:
+            self._handle_failure([email], error, permanent=True, recipients=permanent)
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        """5xx yanıtları (kimlik doğrulama hariç) tekrar denemeyle düzelmez."""
+        if isinstance(error, smtplib.SMTPAuthenticationError):
+            return False
+        return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+    def _handle_failure(
+        self,
+        emails: List[Dict[str, Any]],
+        error: str,
+        permanent: bool = False,
+        recipients: Optional[List[str]] = None
+    ):
+        for email in emails:
+            attempts = email["attempts"] + 1
+            if permanent or attempts >= self.max_attempts:
+                self.repo.mark_failed(email["id"], attempts, error, recipients=recipients)
+                self._stats["failed"] += 1
+                reason = "kalıcı hata" if permanent else "deneme hakkı bitti"
+                logger.error(f"[X] E-posta gönderilemedi, {reason}: {email['subject']} | {error}")
+                continue
+            delay = self.retry_base_delay * (2 ** (attempts - 1))
+            self.repo.schedule_retry(email["id"], attempts, delay, error, recipients=recipients)
+            self._stats["retried"] += 1
+            logger.warning(
+                f"[!] E-posta gönderilemedi, {delay:.0f} sn sonra tekrar denenecek "
+                f"({attempts}/{self.max_attempts}): {email['subject']} | {error}"
+            )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Kuyruğa eklenen, gönderilen, ertelenen ve başarısız e-posta sayıları."""
+        stats = dict(self._stats)
+        stats["pending"] = self.repo.count_by_status().get("pending", 0)
+        return stats
+
+    def shutdown(self, timeout: float = 10.0):
+        """Worker'ı durdurur, zamanı gelmiş e-postaları gönderir ve SMTP oturumunu kapatır."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        try:
+            sent = self.drain()
+            if sent:
+                logger.info(f"[+] Kapanışta {sent} bekleyen e-posta gönderildi.")
+        finally:
+            self.smtp.close()
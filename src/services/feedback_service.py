@@ -1,9 +1,10 @@
 import os
+from datetime import datetime
 from typing import Optional
 from src.core.logger import logger
 from src.commands import ChatManager
-from src.clients import SMTPClient
 from src.repositories import FeedbackRepository
+from src.services.email_outbox_service import EmailOutboxService
 
 class FeedbackService:
     """
@@ -13,11 +14,11 @@ class FeedbackService:
     def __init__(
         self, 
         chat_manager: ChatManager, 
-        smtp_client: SMTPClient, 
+        email_outbox: EmailOutboxService, 
         feedback_repo: FeedbackRepository
     ):
         self.chat = chat_manager
-        self.smtp = smtp_client
+        self.outbox = email_outbox
         self.repo = feedback_repo
         self.admin_channel = os.environ.get("ADMIN_CHANNEL_ID")
         self.admin_email = os.environ.get("ADMIN_EMAIL")
@@ -58,7 +59,7 @@ class FeedbackService:
                 )
                 logger.debug("[+] Slack üzerinden admin kanalına bildirildi.")
 
-            # 3. E-posta üzerinden yöneticilere bildir
+            # 3. E-posta üzerinden yöneticilere bildir (kuyruğa eklenir, arka planda gönderilir)
             if self.admin_email:
                 subject = f"Anonim Geri Bildirim: {category}"
                 email_body = (
@@ -66,15 +67,15 @@ class FeedbackService:
                     f"Cemil Bot üzerinden yeni bir anonim geri bildirim alındı.\n\n"
                     f"Kategori: {category}\n"
                     f"İçerik: {content}\n\n"
-                    f"Tarih: {os.popen('date').read().strip()}\n\n"
+                    f"Tarih: {datetime.now().strftime('%d.%m.%Y %H:%M')}\n\n"
                     f"İyi çalışmalar,\nCemil Bot"
                 )
-                self.smtp.send_email(
+                self.outbox.enqueue(
                     to_emails=self.admin_email,
                     subject=subject,
                     body=email_body
                 )
-                logger.debug(f"[+] E-posta üzerinden {self.admin_email} adresine bildirildi.")
+                logger.debug(f"[+] {self.admin_email} adresine e-posta bildirimi kuyruğa eklendi.")
 
             return True
 
@@ -6,9 +6,19 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from src.core.logger import logger
 from src.core.exceptions import CemilBotError
-from src.commands import ChatManager, ConversationManager, UserManager
+from src.commands import ChatManager, ConversationManager, UserManager, DirectMessageManager
 from src.repositories import HelpRepository, UserRepository
 from src.clients import CronClient, GroqClient
+from src.services.help_transcript import (
+    ANALYSIS_SYSTEM_PROMPT,
+    collect_user_messages,
+    compact_transcript,
+    parse_analysis,
+)
+
+# Kapanış analizi için okunacak en fazla mesaj ve LLM'e gönderilecek döküm bütçesi (token)
+HELP_HISTORY_MAX_MESSAGES = 1000
+HELP_TRANSCRIPT_TOKEN_BUDGET = 3000
 
 
 class HelpService:
@@ -24,10 +34,12 @@ class HelpService:
         help_repo: HelpRepository,
         user_repo: UserRepository,
         groq_client: Optional[GroqClient] = None,
-        cron_client: Optional[CronClient] = None
+        cron_client: Optional[CronClient] = None,
+        dm_manager: Optional[DirectMessageManager] = None
     ):
         self.chat = chat_manager
         self.conv = conv_manager
+        self.dm = dm_manager or DirectMessageManager(chat_manager, conv_manager)
         self.user_manager = user_manager
         self.repo = help_repo
         self.user_repo = user_repo
@@ -37,22 +49,19 @@ class HelpService:
     def _get_workspace_owner(self) -> Optional[str]:
         """Workspace owner veya admin kullanıcıyı bulur."""
         try:
-            # Tüm kullanıcıları listele
-            response = self.user_manager.list_users(limit=1000)
-            if response.get("ok"):
-                members = response.get("members", [])
-                # Önce owner'ı bul
-                for member in members:
-                    if member.get("is_owner", False):
-                        owner_id = member.get("id")
-                        logger.info(f"[i] Workspace owner bulundu: {owner_id}")
-                        return owner_id
-                # Owner yoksa admin'i bul
-                for member in members:
-                    if member.get("is_admin", False):
-                        admin_id = member.get("id")
-                        logger.info(f"[i] Workspace admin bulundu: {admin_id}")
-                        return admin_id
+            # Kullanıcıları sayfa sayfa tara; owner bulunduğunda kalan sayfalar istenmez
+            first_admin_id = None
+            for member in self.user_manager.iter_users():
+                if member.get("is_owner", False):
+                    owner_id = member.get("id")
+                    logger.info(f"[i] Workspace owner bulundu: {owner_id}")
+                    return owner_id
+                if first_admin_id is None and member.get("is_admin", False):
+                    first_admin_id = member.get("id")
+            # Owner yoksa admin'i kullan
+            if first_admin_id:
+                logger.info(f"[i] Workspace admin bulundu: {first_admin_id}")
+                return first_admin_id
             logger.warning("[!] Workspace owner/admin bulunamadı")
             return None
         except Exception as e:
@@ -298,18 +307,14 @@ class HelpService:
             logger.info(f"[>] Kanala katılma isteği | Kullanıcı: {user_name} ({user_id}) | Yardım ID: {help_id}")
             
             # 5. Kullanıcının zaten kanalda olup olmadığını kontrol et
-            try:
-                channel_members = self.conv.get_members(help_channel_id)
-                if user_id in channel_members:
-                    logger.info(f"[i] Kullanıcı zaten kanalda: {user_id} | Kanal: {help_channel_id}")
-                    return {
-                        "success": True,
-                        "message": f"✅ Zaten kanaldasınız! <#{help_channel_id}> kanalına gidebilirsiniz.",
-                        "channel_id": help_channel_id,
-                        "already_joined": True
-                    }
-            except Exception as e:
-                logger.debug(f"[i] Kanal üyeleri kontrol edilemedi, devam ediliyor: {e}")
+            if self.conv.is_member(help_channel_id, user_id):
+                logger.info(f"[i] Kullanıcı zaten kanalda: {user_id} | Kanal: {help_channel_id}")
+                return {
+                    "success": True,
+                    "message": f"✅ Zaten kanaldasınız! <#{help_channel_id}> kanalına gidebilirsiniz.",
+                    "channel_id": help_channel_id,
+                    "already_joined": True
+                }
             
             # 6. Kullanıcıyı kanala davet et
             try:
@@ -365,49 +370,34 @@ class HelpService:
                 logger.error(f"[X] Yardım isteği bulunamadı: {help_id}")
                 return
             
-            # 2. Sohbet geçmişini al
-            messages = self.conv.get_history(channel_id=help_channel_id, limit=100)
+            # 2. Sohbet geçmişini al (sayfalı; Slack en yeniden eskiye döndürür)
+            messages = list(self.conv.iter_history(help_channel_id, max_items=HELP_HISTORY_MAX_MESSAGES))
+            messages.reverse()
             
             # 3. Mesajları temizle (bot mesajları hariç)
-            user_messages = []
             participants = set()
             for msg in messages:
-                if not msg.get("bot_id") and msg.get("type") == "message":
-                    user_id = msg.get("user", "")
-                    user_text = msg.get("text", "")
-                    if user_id:
-                        participants.add(user_id)
-                        user_messages.append(f"<@{user_id}>: {user_text}")
+                if not msg.get("bot_id") and msg.get("type") == "message" and msg.get("user"):
+                    participants.add(msg["user"])
+            user_messages = collect_user_messages(messages)
             
-            conversation_text = "\n".join(user_messages) if user_messages else "Konuşma yapılmadı."
-            
-            # 4. LLM ile Analiz ve Yorumlama
+            # 4. LLM ile Analiz ve Yorumlama (tek çağrı: özet + detaylı analiz)
             summary = "Yardım kanalında herhangi bir konuşma gerçekleşmedi."
             detailed_analysis = summary
             
             if user_messages and self.groq:
+                conversation_text = compact_transcript(user_messages, token_budget=HELP_TRANSCRIPT_TOKEN_BUDGET)
                 try:
-                    # Kısa özet
-                    summary_prompt = "Sana sunulan yardım kanalı sohbet geçmişini analiz et ve bir cümleyle özetle. Sadece Türkçe kullan."
-                    summary = await self.groq.quick_ask(summary_prompt, f"Yardım Kanalı Sohbet Geçmişi:\n{conversation_text}")
-                    
-                    # Detaylı analiz
-                    analysis_prompt = (
-                        "Sen bir topluluk analiz asistanısın. Sana sunulan yardım kanalı sohbet geçmişini analiz et ve "
-                        "şu konularda değerlendirme yap:\n"
-                        "1. Yardım isteğinin çözülüp çözülmediği\n"
-                        "2. Konuşmanın genel tonu ve atmosferi\n"
-                        "3. Yardım eden kişilerin katkıları\n"
-                        "4. Çözüm önerileri veya paylaşılan bilgiler\n"
-                        "5. Öne çıkan noktalar veya önemli paylaşımlar\n\n"
-                        "Kısa, net ve yapıcı bir analiz yap. Sadece Türkçe kullan."
-                    )
-                    detailed_analysis = await self.groq.quick_ask(
-                        analysis_prompt,
-                        f"Yardım Kanalı Sohbet Geçmişi:\n{conversation_text}"
+                    raw = await self.groq.ask_json(
+                        ANALYSIS_SYSTEM_PROMPT,
+                        f"Yardım Konusu: {help_request['topic']}\n\nYardım Kanalı Sohbet Geçmişi:\n{conversation_text}"
                     )
+                    analysis = parse_analysis(raw)
+                    summary = analysis.summary
+                    detailed_analysis = analysis.analysis
                 except Exception as e:
                     logger.error(f"[X] LLM analizi hatası: {e}")
+                    summary = f"{len(user_messages)} mesajlık sohbet analiz edilemedi."
                     detailed_analysis = summary
             
             # 5. Tüm katılımcılara DM gönder
@@ -417,32 +407,26 @@ class HelpService:
             if help_request.get("helper_id") and help_request["helper_id"] not in all_participants:
                 all_participants.append(help_request["helper_id"])
             
-            for participant_id in all_participants:
-                try:
-                    dm_channel = self.conv.open_conversation(users=[participant_id])
-                    dm_blocks = [
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": (
-                                    f"🆘 *Yardım Kanalı Sonlandı*\n\n"
-                                    f"*Konu:* {help_request['topic']}\n"
-                                    f"*Kanal:* <#{help_channel_id}>\n\n"
-                                    f"*📊 Sohbet Analizi:*\n{detailed_analysis}\n\n"
-                                    f"Yeni bir yardım isteği için `/yardim-iste` komutunu kullanabilirsiniz!"
-                                )
-                            }
-                        }
-                    ]
-                    self.chat.post_message(
-                        channel=dm_channel["id"],
-                        text="🆘 Yardım Kanalı Sonlandı",
-                        blocks=dm_blocks
-                    )
-                    logger.info(f"[+] Analiz DM'i gönderildi | Kullanıcı: {participant_id}")
-                except Exception as e:
-                    logger.warning(f"[!] Kullanıcıya DM gönderilemedi ({participant_id}): {e}")
+            # Tüm DM'ler eşzamanlı gönderilir (DM kanalları önbellekten)
+            dm_blocks = [
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": (
+                            f"🆘 *Yardım Kanalı Sonlandı*\n\n"
+                            f"*Konu:* {help_request['topic']}\n"
+                            f"*Kanal:* <#{help_channel_id}>\n\n"
+                            f"*📊 Sohbet Analizi:*\n{detailed_analysis}\n\n"
+                            f"Yeni bir yardım isteği için `/yardim-iste` komutunu kullanabilirsiniz!"
+                        )
+                    }
+                }
+            ]
+            dm_result = self.dm.send_dms(
+                all_participants, "🆘 Yardım Kanalı Sonlandı", dm_blocks, name="help-close-dm"
+            )
+            logger.info(f"[+] Analiz DM'leri gönderildi | {dm_result.summary()}")
             
             # 6. Admin kanalına özet gönder (settings'den al)
             from src.core.settings import get_settings
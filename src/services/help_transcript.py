@@ -0,0 +1,156 @@
+"""
+Yardım kanalı kapanış analizi için sohbet dökümü (transcript) hazırlığı ve LLM çıktısı doğrulama.
+
+Kanal geçmişi sayfalı olarak okunur, `compact_transcript` ile token bütçesine sığacak şekilde
+temizlenir/kırpılır ve tek bir LLM çağrısında hem kısa özet hem detaylı analiz JSON olarak
+istenir. Yanıt `HelpChannelAnalysis` modeliyle doğrulanır.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Kaba token tahmini: Türkçe metinde ~4 karakter ≈ 1 token
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 3000
+# Tek mesaj en fazla bu kadar karakterle dökümde yer alır (kod blokları/log yapıştırmaları)
+MAX_MESSAGE_CHARS = 600
+# Bütçe aşıldığında baştan korunacak mesaj sayısı (soru ve ilk yanıtlar)
+HEAD_MESSAGES = 6
+# Dökümden atılan bot/sistem mesaj türleri; kullanıcı içerikli türler (file_share,
+# thread_broadcast, me_message...) dökümde kalır
+SKIPPED_SUBTYPES = frozenset({
+    "bot_message", "bot_add", "bot_remove", "message_changed", "message_deleted", "message_replied",
+    "channel_join", "channel_leave", "channel_topic", "channel_purpose", "channel_name",
+    "channel_archive", "channel_unarchive", "channel_convert_to_private", "channel_convert_to_public",
+    "channel_posting_permissions", "group_join", "group_leave", "group_topic", "group_purpose",
+    "group_name", "group_archive", "group_unarchive", "pinned_item", "unpinned_item",
+    "reminder_add", "tombstone", "huddle_thread", "sh_room_created", "ekm_access_denied",
+})
+
+ANALYSIS_SYSTEM_PROMPT = (
+    "Sen bir topluluk analiz asistanısın. Sana sunulan yardım kanalı sohbet geçmişini analiz et.\n"
+    "Yanıtını SADECE şu alanlara sahip bir JSON nesnesi olarak ver:\n"
+    '{"summary": "sohbetin tek cümlelik özeti", '
+    '"analysis": "detaylı analiz", '
+    '"resolved": true/false/null}\n\n'
+    "`analysis` alanında şu konuları kısa, net ve yapıcı şekilde değerlendir:\n"
+    "1. Yardım isteğinin çözülüp çözülmediği\n"
+    "2. Konuşmanın genel tonu ve atmosferi\n"
+    "3. Yardım eden kişilerin katkıları\n"
+    "4. Çözüm önerileri veya paylaşılan bilgiler\n"
+    "5. Öne çıkan noktalar veya önemli paylaşımlar\n\n"
+    "`resolved`: yardım isteği çözüldüyse true, çözülmediyse false, anlaşılamıyorsa null.\n"
+    "Sadece Türkçe kullan."
+)
+
+
+class HelpChannelAnalysis(BaseModel):
+    """LLM'in yardım kanalı analizi (tek çağrıda özet + detay)."""
+
+    summary: str = Field(..., min_length=1, max_length=500)
+    analysis: str = Field(..., min_length=1)
+    resolved: Optional[bool] = None
+
+    @field_validator("summary", "analysis", mode="before")
+    @classmethod
+    def strip_text(cls, v: Any) -> Any:
+        return v.strip() if isinstance(v, str) else v
+
+
+def extract_json_object(text: str) -> Dict[str, Any]:
+    """LLM yanıtındaki JSON nesnesini çıkarır (```json blokları ve çevre metin tolere edilir)."""
+    fenced = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    else:
+        start, end = text.find("{"), text.rfind("}")
+        if start != -1 and end > start:
+            text = text[start:end + 1]
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("JSON nesnesi bekleniyordu")
+    return data
+
+
+def parse_analysis(raw: str) -> HelpChannelAnalysis:
+    """
+    LLM yanıtını doğrular.
+
+    Raises:
+        ValueError: Yanıt JSON değilse veya alanlar eksik/geçersizse
+    """
+    try:
+        return HelpChannelAnalysis(**extract_json_object(raw))
+    except (json.JSONDecodeError, ValidationError, TypeError) as e:
+        raise ValueError(f"Geçersiz analiz yanıtı: {e}")
+
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"\s+", " ", text or "").strip()
+    if len(text) > MAX_MESSAGE_CHARS:
+        text = text[:MAX_MESSAGE_CHARS].rstrip() + " …"
+    return text
+
+
+def collect_user_messages(messages: Iterable[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Slack mesajlarından (kronolojik sırada) bot olmayan kullanıcı mesajlarını çıkarır.
+    Dosya paylaşımı ve kanala da gönderilen thread yanıtları dahildir; sistem mesajları atılır.
+
+    Returns:
+        (user_id, metin) çiftleri
+    """
+    result = []
+    for msg in messages:
+        if msg.get("bot_id") or msg.get("type") != "message" or msg.get("subtype") in SKIPPED_SUBTYPES:
+            continue
+        user_id = msg.get("user", "")
+        if user_id:
+            result.append((user_id, msg.get("text", "")))
+    return result
+
+
+def compact_transcript(
+    messages: List[Tuple[str, str]],
+    token_budget: int = DEFAULT_TOKEN_BUDGET
+) -> str:
+    """
+    Sohbet dökümünü token bütçesine sığdırır.
+
+    - Boşluklar sadeleştirilir, çok uzun mesajlar kırpılır, boş mesajlar atılır.
+    - Aynı kullanıcının art arda tekrarladığı ve daha önce birebir yazılmış mesajlar atılır.
+    - Bütçe hâlâ aşılıyorsa ilk `HEAD_MESSAGES` mesaj (soru ve ilk yanıtlar) ile sığabildiği
+      kadar son mesaj tutulur, aradaki kısım tek satırlık bir notla özetlenir.
+    """
+    lines: List[str] = []
+    seen = set()
+    for user_id, text in messages:
+        text = _normalize(text)
+        if not text:
+            continue
+        fingerprint = (user_id, text.lower())
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        lines.append(f"<@{user_id}>: {text}")
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    if sum(len(line) + 1 for line in lines) <= budget_chars:
+        return "\n".join(lines)
+
+    head = lines[:HEAD_MESSAGES]
+    used = sum(len(line) + 1 for line in head)
+    tail: List[str] = []
+    for line in reversed(lines[HEAD_MESSAGES:]):
+        if used + len(line) + 1 > budget_chars:
+            break
+        tail.append(line)
+        used += len(line) + 1
+    tail.reverse()
+
+    skipped = len(lines) - len(head) - len(tail)
+    if skipped <= 0:
+        return "\n".join(head + tail)
+    return "\n".join(head + [f"[... {skipped} mesaj kısaltıldı ...]"] + tail)
@@ -1,11 +1,9 @@
 import os
-import pandas as pd
-from docx import Document
-from typing import List, Dict, Any
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from pypdf import PdfReader
+import threading
+from typing import List, Dict, Any, Optional
 from src.core.logger import logger
-from src.clients import VectorClient, GroqClient
+from src.clients import VectorClient, GroqClient, RerankerClient
+from src.services import document_loader
 
 class KnowledgeService:
     """
@@ -13,71 +11,87 @@ class KnowledgeService:
     Tamamen ücretsiz ve limit-free yapıdadır.
     """
 
-    def __init__(self, vector_client: VectorClient, groq_client: GroqClient):
+    def __init__(
+        self,
+        vector_client: VectorClient,
+        groq_client: GroqClient,
+        knowledge_base_path: str = "knowledge_base",
+        collection_patterns: Optional[Dict[str, List[str]]] = None,
+        qa_collections: Optional[List[str]] = None,
+        reranker: Optional[RerankerClient] = None,
+        rerank_candidates: int = 20,
+        rerank_top_n: int = 4
+    ):
         self.vector = vector_client
         self.groq = groq_client
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1200,  # Daha büyük chunk'lar için artırıldı
-            chunk_overlap=200  # Overlap de artırıldı
-        )
+        self.knowledge_base_path = knowledge_base_path
+        # Kök klasördeki dosyaların koleksiyon kuralları ve /sor'un aradığı koleksiyonlar (None: hepsi)
+        self.collection_patterns = collection_patterns or {}
+        self.qa_collections = qa_collections
+        # Verilirse vektör adayları cross-encoder ile yeniden sıralanır, prompt'a en iyi top_n girer
+        self.reranker = reranker
+        self.rerank_candidates = rerank_candidates
+        self.rerank_top_n = rerank_top_n
+        self._splitter = None
+        # Aynı süreçte aynı anda tek yeniden indeksleme
+        self._reindex_lock = threading.Lock()
+
+    @property
+    def splitter(self):
+        """Metin bölücü (ilk indekslemede oluşturulur)."""
+        if self._splitter is None:
+            self._splitter = document_loader.create_splitter()
+        return self._splitter
 
-    async def process_knowledge_base(self, folder_path: str = "knowledge_base"):
-        """Belirtilen klasördeki dökümanları okur ve indekse ekler."""
+    async def process_knowledge_base(self, folder_path: Optional[str] = None):
+        """Belirtilen klasördeki dökümanları okur ve indeksi bu süreçte sıfırdan oluşturur."""
+        folder_path = folder_path or self.knowledge_base_path
         if not os.path.exists(folder_path):
             os.makedirs(folder_path)
             logger.warning(f"[!] {folder_path} bulunamadı, boş bir tane oluşturuldu.")
             return
 
-        all_texts = []
-        all_metadata = []
+        all_texts, all_metadata = document_loader.load_knowledge_base(
+            folder_path, self.splitter, collection_patterns=self.collection_patterns
+        )
+        if all_texts:
+            self.vector.rebuild(all_texts, all_metadata)
+            logger.info(f"[!] {len(all_texts)} parça ile Bilgi Küpü güncellendi.")
 
-        for filename in os.listdir(folder_path):
-            file_path = os.path.join(folder_path, filename)
-            text = ""
-            
-            try:
-                # PDF İşleme
-                if filename.endswith(".pdf"):
-                    reader = PdfReader(file_path)
-                    for page in reader.pages:
-                        text += page.extract_text() + "\n"
-                
-                # TXT ve Markdown İşleme
-                elif filename.endswith((".txt", ".md")):
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        text = f.read()
-
-                # DOCX (Word) İşleme
-                elif filename.endswith(".docx"):
-                    doc = Document(file_path)
-                    text = "\n".join([para.text for para in doc.paragraphs])
-
-                # Excel ve CSV İşleme (Tablosal)
-                elif filename.endswith((".csv", ".xlsx", ".xls")):
-                    if filename.endswith(".csv"):
-                        df = pd.read_csv(file_path)
-                    else:
-                        df = pd.read_excel(file_path)
-                    
-                    # Her satırı bir metin parçasına dönüştür
-                    rows_text = []
-                    for idx, row in df.iterrows():
-                        row_str = ", ".join([f"{col}: {row[col]}" for col in df.columns])
-                        rows_text.append(row_str)
-                    text = "\n".join(rows_text)
-                
-                if text.strip():
-                    chunks = self.splitter.split_text(text)
-                    all_texts.extend(chunks)
-                    all_metadata.extend([{"source": filename}] * len(chunks))
-                    logger.info(f"[+] İşlendi: {filename} ({len(chunks)} parça)")
+    def reindex_in_worker(self, folder_path: Optional[str] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Bilgi küpünü ayrı bir süreçte (`python -m src.indexer`) yeniden indeksler ve biten sürüme
+        geçer. Embedding hesabı botun sürecinde yapılmaz; sorgular bu sırada eski sürümle yanıtlanır.
 
-            except Exception as e:
-                logger.error(f"[X] {filename} işlenirken hata: {e}")
+        Returns:
+            {"success": bool, "message": str, "version": Optional[str]}
+        """
+        from src.indexer import parse_version, run_indexer_process
 
-        if all_texts:
-            self.vector.add_texts(all_texts, all_metadata)
-            logger.info(f"[!] {len(all_texts)} parça ile Bilgi Küpü güncellendi.")
+        if not self._reindex_lock.acquire(blocking=False):
+            return {"success": False, "message": "Yeniden indeksleme zaten devam ediyor.", "version": None}
+        try:
+            logger.info("[>] İndeksleyici süreci başlatılıyor...")
+            result = run_indexer_process(
+                source=folder_path or self.knowledge_base_path,
+                store=self.vector.index_path,
+                timeout=timeout
+            )
+            if result.returncode == 1:
+                return {"success": False, "message": "İndekslenecek döküman bulunamadı.", "version": None}
+            if result.returncode != 0:
+                logger.error(f"[X] İndeksleyici hata ile çıktı (kod: {result.returncode})")
+                return {"success": False, "message": "İndeksleme başarısız oldu.", "version": None}
+
+            version = parse_version(result.stdout)
+            self.vector.reload_if_changed()
+            logger.info(f"[+] İndeksleyici tamamlandı, yeni sürüm: {version}")
+            return {"success": True, "message": "Bilgi küpü güncellendi.", "version": version}
+        except Exception as e:
+            logger.error(f"[X] İndeksleyici çalıştırılamadı: {e}", exc_info=True)
+            return {"success": False, "message": "İndeksleme başlatılamadı.", "version": None}
+        finally:
+            self._reindex_lock.release()
 
     async def ask_question(self, question: str, user_id: str = "unknown") -> str:
         """Kullanıcının sorusunu dökümanlara göre yanıtlar."""
@@ -85,7 +99,7 @@ class KnowledgeService:
             logger.info(f"[>] Soru işleniyor | Kullanıcı: {user_id} | Soru: {question}")
             
             # 1. Benzer metin parçalarını bul (threshold ile filtrele)
-            context_docs = self.model_search_context(question)
+            context_docs = self.retrieve_context(question, collections=self.qa_collections)
             
             if not context_docs:
                 logger.warning(f"[!] Soru için dökümanlarda eşleşme bulunamadı | Soru: {question} | Kullanıcı: {user_id}")
@@ -97,7 +111,7 @@ class KnowledgeService:
             # 2. Bağlamı (Context) hazırla - Daha temiz format
             context_parts = []
             for i, doc in enumerate(context_docs, 1):
-                source = doc['metadata'].get('source', 'Bilinmiyor')
+                source = document_loader.format_citation(doc['metadata'])
                 score = doc.get('score')
                 # Score formatını düzelt
                 if isinstance(score, float):
@@ -155,9 +169,9 @@ class KnowledgeService:
             answer = await self.groq.quick_ask(system_prompt, user_prompt)
             
             # 4. Kaynakları Ekle
-            unique_sources = list(set([doc['metadata'].get('source', 'Bilinmiyor') for doc in context_docs]))
+            unique_sources = document_loader.format_sources([doc['metadata'] for doc in context_docs])
             if unique_sources:
-                answer += f"\n\n[Kaynaklar: {', '.join(unique_sources)}]"
+                answer += f"\n\n[Kaynaklar: {'; '.join(unique_sources)}]"
             
             return answer
 
@@ -165,18 +179,62 @@ class KnowledgeService:
             logger.error(f"[X] KnowledgeService.ask_question hatası: {e}")
             return "Şu an hafızamı toparlamakta zorlanıyorum, birazdan tekrar sorar mısın? 🧠✨"
 
-    def model_search_context(self, question: str, top_k: int = 10) -> List[Dict]:
-        """Vektör veritabanından bağlamı çeker."""
+    def retrieve_context(self, question: str, collections: Optional[List[str]] = None) -> List[Dict]:
+        """
+        /sor bağlamı: vektör araması, yeniden sıralama açıksa geniş aday kümesi + cross-encoder.
+        Yeniden sıralama hata verirse vektör sırasıyla devam edilir.
+        """
+        if self.reranker is None:
+            return self.model_search_context(question, collections=collections)
+
+        candidates = self.model_search_context(
+            question, top_k=self.rerank_candidates, collections=collections, max_results=self.rerank_candidates
+        )
+        if len(candidates) <= 1:
+            return candidates
+        try:
+            return self.reranker.rerank(question, candidates, top_n=self.rerank_top_n)
+        except Exception as e:
+            logger.warning(f"[!] Yeniden sıralama başarısız, vektör sırası kullanılıyor: {e}")
+            return candidates[:self.rerank_top_n]
+
+    def _existing_collections(self, collections: Optional[List[str]]) -> Optional[List[str]]:
+        """İstenen koleksiyonlardan indekste olanlar; hiçbiri yoksa None (tüm koleksiyonlar)."""
+        if collections is None:
+            return None
+        available = self.vector.collection_sizes()
+        existing = [name for name in collections if name in available]
+        if not existing:
+            logger.debug(f"[i] Koleksiyon(lar) indekste yok, tüm koleksiyonlarda aranacak: {collections}")
+            return None
+        return existing
+
+    def model_search_context(
+        self,
+        question: str,
+        top_k: int = 10,
+        collections: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        max_results: int = 8
+    ) -> List[Dict]:
+        """
+        Vektör veritabanından bağlamı çeker.
+
+        Args:
+            collections: Sadece bu koleksiyonlarda ara (indekste yoksa tüm koleksiyonlara düşer)
+            sources: Sadece bu kaynak dosyalardan parçalar
+            max_results: Döndürülecek en fazla parça (yeniden sıralamada aday sayısı kadar)
+        """
+        search_scope = {"collections": self._existing_collections(collections), "sources": sources}
         # L2 mesafesi için: küçük mesafe = benzer, büyük mesafe = farklı
         # Daha esnek arama stratejisi: Önce geniş arama, sonra filtreleme
         
         # 1. İlk deneme: Geniş arama (threshold yok, sadece en iyi sonuçlar)
-        results = self.vector.search(question, top_k=top_k, threshold=2.0)  # Çok gevşek threshold
+        results = self.vector.search(question, top_k=top_k, threshold=2.0, **search_scope)  # Çok gevşek threshold
         
         if results and len(results) >= 3:
             # En iyi sonuçları al (top_k'ya göre)
-            max_results = min(top_k, 8)
-            results = results[:max_results]
+            results = results[:min(top_k, max_results)]
             logger.info(f"[i] Vector search: {len(results)} eşleşme bulundu | Soru: {question[:50]}...")
             # İlk 3 sonucun skorlarını logla
             for i, res in enumerate(results[:3], 1):
@@ -191,11 +249,10 @@ class KnowledgeService:
         else:
             # Hiç sonuç yoksa, threshold'u tamamen kaldır ve tüm sonuçları al
             logger.warning(f"[!] İlk aramada sonuç bulunamadı | Soru: {question[:50]}... | Threshold kaldırılıyor")
-            results = self.vector.search(question, top_k=top_k, threshold=999.0)  # Pratik olarak threshold yok
+            results = self.vector.search(question, top_k=top_k, threshold=999.0, **search_scope)  # Pratik olarak threshold yok
             if results:
                 # En iyi sonuçları al (top_k'ya göre)
-                max_results = min(top_k, 5)
-                results = results[:max_results]
+                results = results[:min(top_k, max_results, 5)]
                 logger.info(f"[i] Threshold kaldırılarak {len(results)} sonuç bulundu")
                 for i, res in enumerate(results[:2], 1):
                     if res.get('score') is not None:
@@ -0,0 +1,229 @@
+"""
+Kahve eşleşmesi bekleme havuzu.
+FIFO sıralı, O(1) üyelik kontrollü, kalıcı (SQLite) ve tek bir zaman aşımı taramasıyla yönetilir.
+
+Birden fazla bot süreci çalışırken (paylaşılan durum deposu verilmişse) havuzu değiştiren her
+işlem dağıtık bir kilit altında yapılır ve önce veritabanındaki güncel havuz okunur; böylece
+iki süreç aynı bekleyen kullanıcıyı eşleştiremez.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+from src.core.logger import logger
+from src.repositories import CoffeePoolRepository
+
+if TYPE_CHECKING:
+    from src.clients.state_backend import StateBackend
+
+# Havuz kilidinin adı ve süresi (saniye)
+POOL_LOCK_NAME = "coffee-pool"
+POOL_LOCK_TTL = 15.0
+
+
+class CoffeeMatchPool:
+    """
+    Kahve bekleme havuzu.
+
+    Bekleyenler `OrderedDict` içinde tutulur: üyelik ve çıkarma O(1), sıra geliş sırasıdır.
+    Herkesin zaman aşımı süresi aynı olduğundan geliş sırası aynı zamanda son kullanma
+    sırasıdır; bu yüzden kullanıcı başına ayrı zamanlanmış görev yerine havuzun başından
+    süresi dolanları toplayan tek bir tarama (`expire`) yeterlidir.
+    """
+
+    def __init__(
+        self,
+        pool_repo: Optional[CoffeePoolRepository] = None,
+        timeout_seconds: int = 300,
+        cooldown_seconds: int = 300,
+        state_backend: Optional["StateBackend"] = None
+    ):
+        self.pool_repo = pool_repo
+        # Paylaşılan depo + kalıcı havuz varsa havuzun asıl kaynağı veritabanıdır
+        self.state_backend = state_backend if state_backend is not None and state_backend.is_shared else None
+        self.timeout_seconds = timeout_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._waiting: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._last_request: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_shared(self) -> bool:
+        return self.state_backend is not None and self.pool_repo is not None
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Havuzu değiştiren işlemler için kilit. Çoklu süreç modunda dağıtık kilit alınır ve
+        yerel havuz veritabanındaki güncel hâliyle değiştirilir.
+        """
+        with self._lock:
+            if not self.is_shared:
+                yield
+                return
+            with self.state_backend.lock(POOL_LOCK_NAME, ttl=POOL_LOCK_TTL):
+                self._waiting = OrderedDict(
+                    (entry["user_id"], entry) for entry in self.pool_repo.list_waiting()
+                )
+                yield
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._waiting
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def restore(self) -> int:
+        """Havuzu veritabanından yükler (açılışta). Yüklenen kullanıcı sayısını döndürür."""
+        if self.pool_repo is None:
+            return 0
+        entries = self.pool_repo.list_waiting()
+        with self._lock:
+            for entry in entries:
+                self._waiting[entry["user_id"]] = entry
+                # Havuzdakiler yeniden istek yapamaz; rate limit penceresi de geri kurulur
+                self._last_request[entry["user_id"]] = entry["expires_at"] - self.timeout_seconds
+        return len(entries)
+
+    # ------------------------------------------------------------------
+    # Rate limit (istekler arası bekleme)
+    # ------------------------------------------------------------------
+
+    def cooldown_remaining(self, user_id: str, now: Optional[float] = None) -> float:
+        """Kullanıcının yeni istek yapabilmesi için kalan süre (saniye, 0 = yapabilir)."""
+        last = self._last_request.get(user_id)
+        if last is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return max(0.0, self.cooldown_seconds - (now - last))
+
+    def clear_cooldown(self, user_id: str):
+        self._last_request.pop(user_id, None)
+
+    # ------------------------------------------------------------------
+    # Havuz işlemleri
+    # ------------------------------------------------------------------
+
+    def take_partner_or_enqueue(
+        self,
+        user_id: str,
+        channel_id: str,
+        user_name: str,
+        avoid: Set[str] = frozenset(),
+        now: Optional[float] = None
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Bekleyen bir partner varsa onu havuzdan alır, yoksa kullanıcıyı havuza ekler.
+        `avoid` içindeki (yakın zamanda eşleşilmiş) kullanıcılar tercih edilmez; başka
+        kimse yoksa en eski bekleyenle eşleşilir.
+
+        Returns:
+            ("matched", partner_kaydı) | ("queued", None) | ("already_waiting", None)
+        """
+        now = time.time() if now is None else now
+        with self._locked():
+            if user_id in self._waiting:
+                return "already_waiting", None
+            self._last_request[user_id] = now
+
+            partner_id = None
+            for candidate in self._waiting:
+                if candidate not in avoid:
+                    partner_id = candidate
+                    break
+            if partner_id is None and self._waiting:
+                partner_id = next(iter(self._waiting))
+
+            if partner_id is not None:
+                partner = self._waiting.pop(partner_id)
+                self._persist_remove([partner_id])
+                return "matched", partner
+
+            entry = {
+                "user_id": user_id,
+                "channel_id": channel_id,
+                "user_name": user_name,
+                "expires_at": now + self.timeout_seconds,
+            }
+            self._waiting[user_id] = entry
+            if self.pool_repo is not None:
+                try:
+                    self.pool_repo.add(user_id, channel_id, user_name, entry["expires_at"])
+                except Exception as e:
+                    logger.warning(f"[!] Kahve havuzu kaydı yazılamadı | Kullanıcı: {user_id} | {e}")
+            return "queued", None
+
+    def remove(self, user_id: str) -> bool:
+        """Kullanıcıyı havuzdan çıkarır."""
+        with self._locked():
+            if self._waiting.pop(user_id, None) is None:
+                return False
+            self._persist_remove([user_id])
+            return True
+
+    def waiting_user_ids(self) -> List[str]:
+        with self._locked():
+            return list(self._waiting)
+
+    def expire(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Süresi dolan bekleyenleri havuzdan çıkarır ve döndürür.
+        Havuz son kullanma sırasına göre dizili olduğundan yalnızca baştaki kayıtlara bakılır.
+        """
+        now = time.time() if now is None else now
+        expired = []
+        with self._locked():
+            while self._waiting:
+                user_id, entry = next(iter(self._waiting.items()))
+                if entry["expires_at"] > now:
+                    break
+                self._waiting.popitem(last=False)
+                # Zaman aşımında kullanıcı hemen tekrar deneyebilsin
+                self._last_request.pop(user_id, None)
+                expired.append(entry)
+            if expired:
+                self._persist_remove([entry["user_id"] for entry in expired])
+
+            # Rate limit kayıtları süresiz büyümesin
+            cutoff = now - self.cooldown_seconds
+            for user_id in [u for u, t in self._last_request.items() if t < cutoff and u not in self._waiting]:
+                del self._last_request[user_id]
+        return expired
+
+    def match_round(self, recent_partners: Dict[str, Set[str]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Havuzdaki herkesi tek seferde çiftler.
+        Önce yakın zamanda eşleşmemiş çiftler (geliş sırasına göre) kurulur, kalanlar
+        birbiriyle eşleştirilir. Tek sayıda kişi varsa en yeni gelen havuzda kalır.
+        """
+        with self._locked():
+            order = list(self._waiting)
+            paired: Set[str] = set()
+            pairs: List[Tuple[str, str]] = []
+
+            for strict in (True, False):
+                for i, user_id in enumerate(order):
+                    if user_id in paired:
+                        continue
+                    avoid = recent_partners.get(user_id, set())
+                    for candidate in order[i + 1:]:
+                        if candidate in paired or (strict and candidate in avoid):
+                            continue
+                        pairs.append((user_id, candidate))
+                        paired.update((user_id, candidate))
+                        break
+
+            result = [(self._waiting.pop(a), self._waiting.pop(b)) for a, b in pairs]
+            if paired:
+                self._persist_remove(paired)
+            return result
+
+    def _persist_remove(self, user_ids):
+        if self.pool_repo is None:
+            return
+        try:
+            self.pool_repo.remove_many(user_ids)
+        except Exception as e:
+            logger.warning(f"[!] Kahve havuzu kaydı silinemedi | {e}")
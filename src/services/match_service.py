@@ -5,8 +5,9 @@ from datetime import datetime, timedelta
 from src.core.logger import logger
 from src.core.exceptions import CemilBotError
 from src.commands import ChatManager, ConversationManager
-from src.clients import GroqClient, CronClient
-from src.repositories import MatchRepository
+from src.clients import GroqClient, CronClient, StateBackend
+from src.repositories import MatchRepository, CoffeePoolRepository
+from src.services.match_pool import CoffeeMatchPool
 
 class CoffeeMatchService:
     """
@@ -20,7 +21,9 @@ class CoffeeMatchService:
         conv_manager: ConversationManager, 
         groq_client: GroqClient, 
         cron_client: CronClient,
-        match_repo: MatchRepository
+        match_repo: MatchRepository,
+        pool_repo: Optional[CoffeePoolRepository] = None,
+        state_backend: Optional[StateBackend] = None
     ):
         self.chat = chat_manager
         self.conv = conv_manager
@@ -29,27 +32,27 @@ class CoffeeMatchService:
         self.match_repo = match_repo
         self.admin_channel = os.environ.get("ADMIN_CHANNEL_ID")
         
-        # Bekleme Havuzu ve Rate Limiting
-        self.waiting_pool: List[str] = []  # Bekleyen kullanıcı ID'leri
-        self.last_request_time: Dict[str, datetime] = {}  # user_id -> son istek zamanı
-        self.pool_timeout_jobs: Dict[str, str] = {}  # user_id -> cron job_id
+        # Bekleme Havuzu ve Rate Limiting (5 dakika zaman aşımı, 5 dakikada bir istek)
+        # Çoklu süreç modunda havuz işlemleri paylaşılan depodaki kilitle yapılır
+        self.pool = CoffeeMatchPool(
+            pool_repo, timeout_seconds=300, cooldown_seconds=300, state_backend=state_backend
+        )
 
     def can_request_coffee(self, user_id: str) -> tuple[bool, Optional[str]]:
         """
         Kullanıcının kahve isteği yapıp yapamayacağını kontrol eder.
         Returns: (izin_var_mı, hata_mesajı)
         """
-        # Rate limiting: 5 dakikada bir istek
-        if user_id in self.last_request_time:
-            elapsed = datetime.now() - self.last_request_time[user_id]
-            if elapsed < timedelta(minutes=5):
-                remaining = 5 - int(elapsed.total_seconds() / 60)
-                return False, f"⏳ Bir sonraki kahve isteğinizi {remaining} dakika sonra yapabilirsiniz."
-        
         # Zaten havuzda mı?
-        if user_id in self.waiting_pool:
+        if user_id in self.pool:
             return False, "⏳ Zaten kahve havuzunda bekliyorsunuz. Eşleşme için sabırlı olun!"
         
+        # Rate limiting: 5 dakikada bir istek
+        remaining_seconds = self.pool.cooldown_remaining(user_id)
+        if remaining_seconds > 0:
+            remaining = max(1, int(remaining_seconds // 60) + (1 if remaining_seconds % 60 else 0))
+            return False, f"⏳ Bir sonraki kahve isteğinizi {remaining} dakika sonra yapabilirsiniz."
+        
         return True, None
 
     async def request_coffee(self, user_id: str, channel_id: str, user_name: str = None) -> str:
@@ -66,33 +69,24 @@ class CoffeeMatchService:
             logger.info(f"[!] Kahve isteği reddedildi | Kullanıcı: {user_name} ({user_id}) | Sebep: {error_msg}")
             return error_msg
         
-        # Son istek zamanını kaydet
-        self.last_request_time[user_id] = datetime.now()
+        # Yakın zamanda eşleşilen kişiler tercih edilmez (havuz boşsa sorguya gerek yok)
+        recent = set()
+        if len(self.pool) > 0:
+            try:
+                recent = self.match_repo.get_recent_partners([user_id]).get(user_id, set())
+            except Exception as e:
+                logger.warning(f"[!] Eşleşme geçmişi alınamadı: {e}")
+        
+        # Havuzdan partner alma veya havuza ekleme tek adımda (race condition önleme)
+        status, partner = self.pool.take_partner_or_enqueue(user_id, channel_id, user_name, avoid=recent)
         
-        # CRITICAL: Önce havuzda olup olmadığını tekrar kontrol et (race condition önleme)
-        if user_id in self.waiting_pool:
+        if status == "already_waiting":
             logger.warning(f"[!] Kullanıcı zaten havuzda | Kullanıcı: {user_name} ({user_id})")
             return "⏳ Zaten kahve havuzunda bekliyorsunuz. Eşleşme için sabırlı olun!"
         
-        # Havuzda başka biri var mı?
-        if self.waiting_pool:
-            # Eşleşme yap!
-            partner_id = self.waiting_pool.pop(0)
-            
-            # Partner'ın timeout job'ını iptal et
-            if partner_id in self.pool_timeout_jobs:
-                removed = self.cron.remove_job(self.pool_timeout_jobs[partner_id])
-                if removed:
-                    logger.info(f"[i] Partner timeout job iptal edildi | Partner: {partner_id}")
-                del self.pool_timeout_jobs[partner_id]
-            
-            # Partner ismini al
-            try:
-                partner_info = self.chat.client.users_info(user=partner_id)
-                partner_name = partner_info.get("user", {}).get("real_name", partner_id) if partner_info.get("ok") else partner_id
-            except Exception as e:
-                logger.warning(f"[!] Partner ismi alınamadı: {e}")
-                partner_name = partner_id
+        if status == "matched":
+            partner_id = partner["user_id"]
+            partner_name = partner.get("user_name") or partner_id
             
             # Eşleşmeyi başlat
             await self.start_match(user_id, partner_id, user_name, partner_name)
@@ -100,61 +94,73 @@ class CoffeeMatchService:
             logger.info(f"[<>] KAHVE EŞLEŞMESİ | {user_name} ({user_id}) <-> {partner_name} ({partner_id})")
             return f"✅ Harika! Bir kahve arkadaşı bulduk. Özel sohbet kanalınız açılıyor... ☕"
         
-        else:
-            # Havuza ekle (tekrar kontrol ile - race condition önleme)
-            if user_id not in self.waiting_pool:
-                self.waiting_pool.append(user_id)
-                
-                # 5 dakika sonra havuzdan çıkar
-                job_id = f"coffee_timeout_{user_id}"
-                self.cron.add_once_job(
-                    func=self._timeout_user,
-                    delay_minutes=5,
-                    job_id=job_id,
-                    args=[user_id]
-                )
-                self.pool_timeout_jobs[user_id] = job_id
-                
-                logger.info(f"[i] Kullanıcı kahve havuzuna eklendi | Kullanıcı: {user_name} ({user_id}) | Bekleyen: {len(self.waiting_pool)} kişi")
-                return (
-                    "☕ *Kahve İsteğiniz Alındı!*\n\n"
-                    "⏳ 5 dakika içinde başka biri de kahve isterse eşleşeceksiniz.\n"
-                    "Eğer kimse çıkmazsa istek otomatik olarak iptal edilecek."
-                )
-            else:
-                logger.warning(f"[!] Kullanıcı zaten havuzda (race condition) | Kullanıcı: {user_name} ({user_id})")
-                return "⏳ Zaten kahve havuzunda bekliyorsunuz. Eşleşme için sabırlı olun!"
+        logger.info(f"[i] Kullanıcı kahve havuzuna eklendi | Kullanıcı: {user_name} ({user_id}) | Bekleyen: {len(self.pool)} kişi")
+        return (
+            "☕ *Kahve İsteğiniz Alındı!*\n\n"
+            "⏳ 5 dakika içinde başka biri de kahve isterse eşleşeceksiniz.\n"
+            "Eğer kimse çıkmazsa istek otomatik olarak iptal edilecek."
+        )
+
+    def restore_pool(self):
+        """
+        Açılışta bekleme havuzunu veritabanından yükler.
+        Kapalıyken süresi dolanlar bilgilendirilir, kalanlar toplu eşleştirmeye girer.
+        """
+        try:
+            count = self.pool.restore()
+            if count:
+                logger.info(f"[+] Kahve havuzu geri yüklendi | Bekleyen: {count} kişi")
+            self.sweep_pool()
+        except Exception as e:
+            logger.error(f"[X] CoffeeMatchService.restore_pool hatası: {e}")
 
-    def _timeout_user(self, user_id: str):
-        """5 dakika içinde eşleşme olmayan kullanıcıyı havuzdan çıkarır."""
-        # Önce havuzda olup olmadığını kontrol et
-        if user_id not in self.waiting_pool:
-            logger.debug(f"[i] Kullanıcı zaten havuzda değil (muhtemelen eşleşti) | Kullanıcı: {user_id}")
-            # Cleanup yap
-            if user_id in self.pool_timeout_jobs:
-                del self.pool_timeout_jobs[user_id]
-            if user_id in self.last_request_time:
-                del self.last_request_time[user_id]
-            return
+    def sweep_pool(self):
+        """
+        Tek zaman aşımı taraması (periyodik cron görevi).
+        Süresi dolanları havuzdan çıkarıp bilgilendirir; havuzda birden fazla kişi
+        kalmışsa (örn: yeniden başlatma sonrası) toplu eşleştirme turu çalıştırır.
+        """
+        for entry in self.pool.expire():
+            self._notify_timeout(entry)
         
-        # Havuzdan çıkar
-        self.waiting_pool.remove(user_id)
+        if len(self.pool) >= 2:
+            asyncio.run(self.run_match_round())
+
+    async def run_match_round(self) -> int:
+        """
+        Havuzdaki herkesi tek turda eşleştirir; son 30 günde eşleşmiş çiftler
+        mümkün olduğunca tekrar eşleştirilmez. Kurulan eşleşme sayısını döndürür.
+        """
+        waiting = self.pool.waiting_user_ids()
+        if len(waiting) < 2:
+            return 0
         
-        # Kullanıcı ismini al
         try:
-            user_info = self.chat.client.users_info(user=user_id)
-            user_name = user_info.get("user", {}).get("real_name", user_id) if user_info.get("ok") else user_id
+            recent_partners = self.match_repo.get_recent_partners(waiting)
         except Exception as e:
-            logger.warning(f"[!] Kullanıcı ismi alınamadı: {e}")
-            user_name = user_id
+            logger.warning(f"[!] Eşleşme geçmişi alınamadı, geçmiş dikkate alınmadan eşleştiriliyor: {e}")
+            recent_partners = {}
         
-        logger.info(f"[!] Kahve isteği zaman aşımı | Kullanıcı: {user_name} ({user_id}) | 5 dakika içinde eşleşme bulunamadı")
+        pairs = self.pool.match_round(recent_partners)
+        for first, second in pairs:
+            try:
+                await self.start_match(
+                    first["user_id"], second["user_id"],
+                    first.get("user_name"), second.get("user_name")
+                )
+                logger.info(f"[<>] KAHVE EŞLEŞMESİ (toplu tur) | {first['user_id']} <-> {second['user_id']}")
+            except Exception as e:
+                logger.error(f"[X] Toplu eşleşme başlatılamadı | {first['user_id']} <-> {second['user_id']} | {e}")
         
-        # ÖNEMLİ: Timeout olduğunda last_request_time'ı temizle
-        # Böylece kullanıcı hemen tekrar deneyebilir (rate limiting engellemesin)
-        if user_id in self.last_request_time:
-            del self.last_request_time[user_id]
-            logger.info(f"[i] Rate limiting temizlendi | Kullanıcı: {user_name} ({user_id}) | Tekrar deneyebilir")
+        logger.info(f"[i] Kahve eşleştirme turu tamamlandı | Eşleşme: {len(pairs)} | Bekleyen: {len(self.pool)} kişi")
+        return len(pairs)
+
+    def _notify_timeout(self, entry: Dict):
+        """5 dakika içinde eşleşme olmayan kullanıcıyı bilgilendirir."""
+        user_id = entry["user_id"]
+        user_name = entry.get("user_name") or user_id
+        
+        logger.info(f"[!] Kahve isteği zaman aşımı | Kullanıcı: {user_name} ({user_id}) | 5 dakika içinde eşleşme bulunamadı")
         
         # Kullanıcıya bilgi mesajı gönder
         try:
@@ -166,10 +172,6 @@ class CoffeeMatchService:
             logger.debug(f"[i] Timeout mesajı gönderildi | Kullanıcı: {user_name} ({user_id})")
         except Exception as e:
             logger.error(f"[X] Timeout mesajı gönderilemedi: {e}")
-        
-        # Cleanup
-        if user_id in self.pool_timeout_jobs:
-            del self.pool_timeout_jobs[user_id]
 
     async def start_match(self, user_id1: str, user_id2: str, user_name1: str = None, user_name2: str = None):
         """
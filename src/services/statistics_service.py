@@ -2,7 +2,8 @@
 Admin istatistik servisi.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from pydantic import BaseModel, Field
 from src.core.logger import logger
 from src.repositories import (
     UserRepository,
@@ -10,13 +11,106 @@ from src.repositories import (
     HelpRepository,
     FeedbackRepository,
     PollRepository,
-    VoteRepository
+    VoteRepository,
+    StatisticsRepository
 )
 
 
+class UserStats(BaseModel):
+    """Kullanıcı istatistikleri."""
+    total: int = 0
+    cohort_distribution: Dict[str, int] = Field(default_factory=dict)
+
+
+class MatchStats(BaseModel):
+    """Kahve eşleşme istatistikleri."""
+    total: int = 0
+    active: int = 0
+    closed: int = 0
+
+
+class HelpStats(BaseModel):
+    """Yardım isteği istatistikleri."""
+    total: int = 0
+    open: int = 0
+    in_progress: int = 0
+    resolved: int = 0
+    closed: int = 0
+
+
+class FeedbackStats(BaseModel):
+    """Geri bildirim istatistikleri."""
+    total: int = 0
+    category_distribution: Dict[str, int] = Field(default_factory=dict)
+
+
+class PollStats(BaseModel):
+    """Oylama istatistikleri."""
+    total: int = 0
+    open: int = 0
+    closed: int = 0
+    total_votes: int = 0
+
+
+class BotStatistics(BaseModel):
+    """Admin raporundaki tüm istatistikler."""
+    users: UserStats = Field(default_factory=UserStats)
+    matches: MatchStats = Field(default_factory=MatchStats)
+    help_requests: HelpStats = Field(default_factory=HelpStats)
+    feedbacks: FeedbackStats = Field(default_factory=FeedbackStats)
+    polls: PollStats = Field(default_factory=PollStats)
+
+    @classmethod
+    def from_grouped_counts(cls, counts: Dict[str, Dict[str, int]]) -> "BotStatistics":
+        """
+        StatisticsRepository sayımlarından istatistik nesnesi oluşturur.
+        Grup değerleri metin olarak gelir (NULL -> '', polls.is_closed -> '0'/'1').
+        """
+        users = counts.get("users", {})
+        cohort_distribution: Dict[str, int] = {}
+        for cohort, count in users.items():
+            key = cohort or "Belirtilmemiş"
+            cohort_distribution[key] = cohort_distribution.get(key, 0) + count
+
+        feedbacks = counts.get("feedbacks", {})
+        category_distribution: Dict[str, int] = {}
+        for category, count in feedbacks.items():
+            key = category or "general"
+            category_distribution[key] = category_distribution.get(key, 0) + count
+
+        matches = counts.get("matches", {})
+        help_requests = counts.get("help_requests", {})
+        polls = counts.get("polls", {})
+
+        return cls(
+            users=UserStats(total=sum(users.values()), cohort_distribution=cohort_distribution),
+            matches=MatchStats(
+                total=sum(matches.values()),
+                active=matches.get("active", 0),
+                closed=matches.get("closed", 0)
+            ),
+            help_requests=HelpStats(
+                total=sum(help_requests.values()),
+                open=help_requests.get("open", 0),
+                in_progress=help_requests.get("in_progress", 0),
+                resolved=help_requests.get("resolved", 0),
+                closed=help_requests.get("closed", 0)
+            ),
+            feedbacks=FeedbackStats(total=sum(feedbacks.values()), category_distribution=category_distribution),
+            polls=PollStats(
+                total=sum(polls.values()),
+                open=polls.get("0", 0),
+                closed=polls.get("1", 0),
+                total_votes=sum(counts.get("votes", {}).values())
+            )
+        )
+
+
 class StatisticsService:
     """
     Bot istatistiklerini toplayan ve raporlayan servis.
+    Rapor, yazma anında trigger'larla güncellenen stats_counters tablosundan okunur;
+    periyodik uzlaştırma (reconcile) olası sapmaları gerçek sayımlarla düzeltir.
     """
     
     def __init__(
@@ -26,7 +120,8 @@ class StatisticsService:
         help_repo: HelpRepository,
         feedback_repo: FeedbackRepository,
         poll_repo: PollRepository,
-        vote_repo: VoteRepository
+        vote_repo: VoteRepository,
+        stats_repo: Optional[StatisticsRepository] = None
     ):
         self.user_repo = user_repo
         self.match_repo = match_repo
@@ -34,7 +129,34 @@ class StatisticsService:
         self.feedback_repo = feedback_repo
         self.poll_repo = poll_repo
         self.vote_repo = vote_repo
+        self.stats_repo = stats_repo or StatisticsRepository(user_repo.db_client)
     
+    def collect_statistics(self, fresh: bool = False) -> BotStatistics:
+        """
+        Tüm istatistikleri döndürür.
+
+        Args:
+            fresh: True ise sayaçlar yerine tablolar anlık GROUP BY ile sayılır
+        """
+        if fresh:
+            counts = self.stats_repo.fetch_grouped_counts()
+        else:
+            counts = self.stats_repo.fetch_counter_snapshot()
+        return BotStatistics.from_grouped_counts(counts)
+
+    def reconcile_counters(self) -> int:
+        """İstatistik sayaçlarını gerçek sayımlarla eşitler (periyodik cron görevi)."""
+        try:
+            drift = self.stats_repo.reconcile_counters()
+            if drift:
+                logger.warning(f"[!] İstatistik sayaçlarında sapma düzeltildi | Sayaç: {drift}")
+            else:
+                logger.info("[i] İstatistik sayaçları tutarlı.")
+            return drift
+        except Exception as e:
+            logger.error(f"[X] StatisticsService.reconcile_counters hatası: {e}")
+            return 0
+
     def get_all_statistics(self) -> Dict[str, Any]:
         """
         Tüm istatistikleri toplar ve döndürür.
@@ -43,122 +165,13 @@ class StatisticsService:
             Dict with all statistics
         """
         try:
-            stats = {
-                "users": self._get_user_statistics(),
-                "matches": self._get_match_statistics(),
-                "help_requests": self._get_help_statistics(),
-                "feedbacks": self._get_feedback_statistics(),
-                "polls": self._get_poll_statistics()
-            }
+            stats = self.collect_statistics().model_dump()
             logger.info("[+] İstatistikler toplandı")
             return stats
         except Exception as e:
             logger.error(f"[X] StatisticsService.get_all_statistics hatası: {e}", exc_info=True)
             return {}
     
-    def _get_user_statistics(self) -> Dict[str, Any]:
-        """Kullanıcı istatistiklerini getirir."""
-        try:
-            all_users = self.user_repo.list()
-            total_users = len(all_users)
-            
-            # Cohort bazlı dağılım
-            cohort_distribution = {}
-            for user in all_users:
-                cohort = user.get("cohort", "Belirtilmemiş")
-                cohort_distribution[cohort] = cohort_distribution.get(cohort, 0) + 1
-            
-            return {
-                "total": total_users,
-                "cohort_distribution": cohort_distribution
-            }
-        except Exception as e:
-            logger.error(f"[X] User statistics hatası: {e}")
-            return {"total": 0, "cohort_distribution": {}}
-    
-    def _get_match_statistics(self) -> Dict[str, Any]:
-        """Kahve eşleşme istatistiklerini getirir."""
-        try:
-            all_matches = self.match_repo.list()
-            total_matches = len(all_matches)
-            
-            active_matches = len([m for m in all_matches if m.get("status") == "active"])
-            closed_matches = len([m for m in all_matches if m.get("status") == "closed"])
-            
-            return {
-                "total": total_matches,
-                "active": active_matches,
-                "closed": closed_matches
-            }
-        except Exception as e:
-            logger.error(f"[X] Match statistics hatası: {e}")
-            return {"total": 0, "active": 0, "closed": 0}
-    
-    def _get_help_statistics(self) -> Dict[str, Any]:
-        """Yardım isteği istatistiklerini getirir."""
-        try:
-            all_help = self.help_repo.list()
-            total_help = len(all_help)
-            
-            open_help = len([h for h in all_help if h.get("status") == "open"])
-            in_progress_help = len([h for h in all_help if h.get("status") == "in_progress"])
-            resolved_help = len([h for h in all_help if h.get("status") == "resolved"])
-            closed_help = len([h for h in all_help if h.get("status") == "closed"])
-            
-            return {
-                "total": total_help,
-                "open": open_help,
-                "in_progress": in_progress_help,
-                "resolved": resolved_help,
-                "closed": closed_help
-            }
-        except Exception as e:
-            logger.error(f"[X] Help statistics hatası: {e}")
-            return {"total": 0, "open": 0, "in_progress": 0, "resolved": 0, "closed": 0}
-    
-    def _get_feedback_statistics(self) -> Dict[str, Any]:
-        """Geri bildirim istatistiklerini getirir."""
-        try:
-            all_feedbacks = self.feedback_repo.list()
-            total_feedbacks = len(all_feedbacks)
-            
-            # Kategori bazlı dağılım
-            category_distribution = {}
-            for feedback in all_feedbacks:
-                category = feedback.get("category", "general")
-                category_distribution[category] = category_distribution.get(category, 0) + 1
-            
-            return {
-                "total": total_feedbacks,
-                "category_distribution": category_distribution
-            }
-        except Exception as e:
-            logger.error(f"[X] Feedback statistics hatası: {e}")
-            return {"total": 0, "category_distribution": {}}
-    
-    def _get_poll_statistics(self) -> Dict[str, Any]:
-        """Oylama istatistiklerini getirir."""
-        try:
-            all_polls = self.poll_repo.list()
-            total_polls = len(all_polls)
-            
-            open_polls = len([p for p in all_polls if p.get("is_closed", 0) == 0])
-            closed_polls = len([p for p in all_polls if p.get("is_closed", 0) == 1])
-            
-            # Toplam oy sayısı
-            all_votes = self.vote_repo.list()
-            total_votes = len(all_votes)
-            
-            return {
-                "total": total_polls,
-                "open": open_polls,
-                "closed": closed_polls,
-                "total_votes": total_votes
-            }
-        except Exception as e:
-            logger.error(f"[X] Poll statistics hatası: {e}")
-            return {"total": 0, "open": 0, "closed": 0, "total_votes": 0}
-    
     def format_statistics_report(self, stats: Dict[str, Any]) -> str:
         """
         İstatistikleri formatlanmış bir rapor olarak döndürür.
@@ -0,0 +1,282 @@
+"""
+Açık oylamalar için bellek içi oy sayacı.
+Oylar O(1) işlenir, veritabanına arka planda toplu (write-behind) yazılır.
+"""
+
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+from src.core.logger import logger
+from src.repositories import VoteRepository
+
+
+class PollTally:
+    """
+    Tek bir oylamanın sayaçları.
+    `counts` seçenek başına oy sayısı, `selections` kullanıcı başına seçim bitmap'idir
+    (bit i = kullanıcı i. seçeneğe oy vermiş).
+    """
+
+    __slots__ = ("poll_id", "counts", "selections", "allow_multiple", "closed", "lock")
+
+    def __init__(self, poll_id: str, option_count: int, allow_multiple: bool):
+        self.poll_id = poll_id
+        self.counts = [0] * option_count
+        self.selections: Dict[str, int] = {}
+        self.allow_multiple = allow_multiple
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def load(self, user_id: str, option_index: int):
+        """Kalıcı kayıttan bir oyu sayaca ekler (yeniden yükleme)."""
+        if not 0 <= option_index < len(self.counts):
+            return
+        bit = 1 << option_index
+        mask = self.selections.get(user_id, 0)
+        if not mask & bit:
+            self.selections[user_id] = mask | bit
+            self.counts[option_index] += 1
+
+
+class VoteTallyEngine:
+    """
+    Açık oylamaların sayaçlarını tutan ve değişiklikleri toplu olarak SQLite'a yazan motor.
+
+    Toggle (aynı seçeneğe tekrar basınca geri alma) ve switch (tekli oylamada seçimi
+    değiştirme) mantığı oylama kilidi altında bellek üzerinde çalışır. Her değişiklik
+    sıralı bir işlem kuyruğuna eklenir; arka plan thread'i kuyruğu `flush_interval`
+    saniyede bir tek transaction ile yazar. Açılışta açık oylamaların sayaçları
+    `votes` tablosundan yeniden kurulur.
+    """
+
+    def __init__(self, vote_repo: VoteRepository, flush_interval: float = 0.5):
+        self.vote_repo = vote_repo
+        self.flush_interval = flush_interval
+        self._tallies: Dict[str, PollTally] = {}
+        self._tallies_lock = threading.Lock()
+        # Kapanan oylamalar (sayaç çıkarıldıktan sonra da oy kabul edilmez, yeniden yüklenmez)
+        self._closed: set = set()
+        self._ops: List[Tuple] = []
+        self._ops_lock = threading.Lock()
+        # Aynı anda tek flush; kuyruğun sırası korunur
+        self._flush_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Sayaç yönetimi
+    # ------------------------------------------------------------------
+
+    def get(self, poll_id: str) -> Optional[PollTally]:
+        """Bellekteki sayacı döndürür (yüklenmemişse None)."""
+        return self._tallies.get(poll_id)
+
+    def open_poll(self, poll_id: str, option_count: int, allow_multiple: bool) -> PollTally:
+        """Yeni (boş) bir oylama sayacı oluşturur."""
+        tally = PollTally(poll_id, option_count, allow_multiple)
+        with self._tallies_lock:
+            self._tallies[poll_id] = tally
+        return tally
+
+    def load_polls(self, polls: List[Dict]) -> int:
+        """
+        Verilen açık oylamaların sayaçlarını `votes` tablosundan tek sorguyla yeniden kurar.
+        Yüklenen oy sayısını döndürür.
+        """
+        tallies = {
+            poll["id"]: PollTally(poll["id"], poll["option_count"], bool(poll["allow_multiple"]))
+            for poll in polls
+            if poll["id"] not in self._closed
+        }
+        rows = self.vote_repo.list_by_polls(list(tallies))
+        for row in rows:
+            tallies[row["poll_id"]].load(row["user_id"], row["option_index"])
+
+        with self._tallies_lock:
+            # Yükleme sırasında oluşturulmuş sayaçları ezme
+            for poll_id, tally in tallies.items():
+                if poll_id not in self._closed:
+                    self._tallies.setdefault(poll_id, tally)
+        return len(rows)
+
+    def toggle(self, poll_id: str, user_id: str, option_index: int) -> Optional[str]:
+        """
+        Kullanıcının oyunu işler.
+
+        Returns:
+            "added" (oy verildi), "removed" (oy geri alındı) veya
+            None (sayaç yok, oylama kapalı ya da seçenek geçersiz)
+        """
+        tally = self._tallies.get(poll_id)
+        if tally is None:
+            return None
+
+        with tally.lock:
+            if tally.closed or not 0 <= option_index < len(tally.counts):
+                return None
+
+            bit = 1 << option_index
+            mask = tally.selections.get(user_id, 0)
+
+            if mask & bit:
+                tally.counts[option_index] -= 1
+                mask &= ~bit
+                self._enqueue(("delete", poll_id, user_id, option_index))
+                result = "removed"
+            else:
+                if mask and not tally.allow_multiple:
+                    for i in range(len(tally.counts)):
+                        if mask & (1 << i):
+                            tally.counts[i] -= 1
+                    mask = 0
+                    self._enqueue(("delete_all", poll_id, user_id))
+                tally.counts[option_index] += 1
+                mask |= bit
+                self._enqueue(("insert", str(uuid.uuid4()), poll_id, user_id, option_index))
+                result = "added"
+
+            if mask:
+                tally.selections[user_id] = mask
+            else:
+                tally.selections.pop(user_id, None)
+            return result
+
+    def get_counts(self, poll_id: str) -> Optional[List[int]]:
+        """Seçenek başına güncel oy sayıları (anlık, veritabanına gitmeden)."""
+        tally = self._tallies.get(poll_id)
+        if tally is None:
+            return None
+        with tally.lock:
+            return list(tally.counts)
+
+    def is_closed(self, poll_id: str) -> bool:
+        return poll_id in self._closed
+
+    def close_poll(self, poll_id: str) -> Optional[List[int]]:
+        """
+        Oylamayı dondurur, bekleyen oyları yazar ve sayacı bellekten çıkarır. Oylama kapalı
+        olarak işaretli kalır; sonradan gelen oy sayacı yeniden yükleyip kabul edilemez.
+        Son sayıları döndürür (sayaç yoksa None).
+        """
+        with self._tallies_lock:
+            self._closed.add(poll_id)
+            tally = self._tallies.get(poll_id)
+        if tally is None:
+            return None
+        with tally.lock:
+            tally.closed = True
+            counts = list(tally.counts)
+        self.flush()
+        with self._tallies_lock:
+            self._tallies.pop(poll_id, None)
+        return counts
+
+    # ------------------------------------------------------------------
+    # Write-behind
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, op: Tuple):
+        with self._ops_lock:
+            self._ops.append(op)
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._worker_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="vote-write-behind", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def pending_count(self) -> int:
+        """Henüz yazılmamış işlem sayısı."""
+        with self._ops_lock:
+            return len(self._ops)
+
+    def flush(self) -> int:
+        """Bekleyen oy işlemlerini tek transaction ile yazar; yazılan işlem sayısını döndürür."""
+        with self._flush_lock:
+            with self._ops_lock:
+                ops, self._ops = self._ops, []
+            if not ops:
+                return 0
+
+            try:
+                self.vote_repo.apply_ops(ops)
+                logger.debug(f"[i] {len(ops)} oy işlemi veritabanına yazıldı.")
+                return len(ops)
+            except Exception as e:
+                logger.warning(f"[!] Toplu oy yazımı başarısız, işlemler tek tek deneniyor: {e}")
+
+            # Yazılamayan işlemler (örn: users tablosunda olmayan kullanıcı) atlanır ve
+            # etkilenen oylamaların sayaçları veritabanıyla yeniden eşitlenir.
+            written = 0
+            failed_polls = set()
+            for op in ops:
+                try:
+                    self.vote_repo.apply_ops([op])
+                    written += 1
+                except Exception as e:
+                    poll_id = op[2] if op[0] == "insert" else op[1]
+                    failed_polls.add(poll_id)
+                    logger.error(f"[X] Oy işlemi yazılamadı | {op[0]} | Oylama: {poll_id} | {e}")
+
+            for poll_id in failed_polls:
+                self._resync(poll_id)
+            return written
+
+    def _resync(self, poll_id: str):
+        """Oylamanın sayacını veritabanındaki kayıtlardan yeniden kurar."""
+        tally = self._tallies.get(poll_id)
+        if tally is None:
+            return
+        try:
+            rows = self.vote_repo.list_by_polls([poll_id])
+        except Exception as e:
+            logger.error(f"[X] Oy sayacı eşitlenemedi | Oylama: {poll_id} | {e}")
+            return
+        with tally.lock:
+            tally.counts = [0] * len(tally.counts)
+            tally.selections = {}
+            for row in rows:
+                tally.load(row["user_id"], row["option_index"])
+            # Kuyrukta bekleyen (henüz yazılmamış) işlemler sayaca tekrar uygulanmaz;
+            # bunlar bir sonraki flush'ta yazılır ve tutarlılık korunur.
+            with self._ops_lock:
+                pending = [op for op in self._ops if (op[2] if op[0] == "insert" else op[1]) == poll_id]
+            for op in pending:
+                self._replay_op(tally, op)
+        logger.info(f"[i] Oy sayacı veritabanıyla eşitlendi | Oylama: {poll_id}")
+
+    @staticmethod
+    def _replay_op(tally: PollTally, op: Tuple):
+        if op[0] == "insert":
+            tally.load(op[3], op[4])
+            return
+        user_id = op[2]
+        mask = tally.selections.get(user_id, 0)
+        if op[0] == "delete":
+            bits = [op[3]]
+        else:
+            bits = [i for i in range(len(tally.counts)) if mask & (1 << i)]
+        for i in bits:
+            if mask & (1 << i):
+                tally.counts[i] -= 1
+                mask &= ~(1 << i)
+        if mask:
+            tally.selections[user_id] = mask
+        else:
+            tally.selections.pop(user_id, None)
+
+    def shutdown(self):
+        """Arka plan yazıcısını durdurur ve kalan işlemleri yazar."""
+        self._stopped = True
+        self._wakeup.set()
+        self.flush()
@@ -1,27 +1,45 @@
 import json
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from src.core.logger import logger
 from src.core.exceptions import CemilBotError
+from src.core.coalescer import UpdateCoalescer
+from src.services.vote_tally import VoteTallyEngine
 from src.commands import ChatManager
 from src.repositories import PollRepository, VoteRepository
 from src.clients import CronClient
 
+if TYPE_CHECKING:
+    from src.clients.state_backend import StateBackend
+
 class VotingService:
     """
     Oylama süreçlerini (Açma, Oy Verme, Sonuçlandırma) yöneten servis.
     """
 
+    CLOSED_MESSAGE = "⏰ Bu oylama sona ermiştir. Artık oy veremezsiniz. Sonuçları görmek için oylama mesajını kontrol edin."
+    ERROR_MESSAGE = "Oy pusulanda bir sorun çıktı, tekrar dener misin? 🗳️"
+
     def __init__(
         self, 
         chat_manager: ChatManager, 
         poll_repo: PollRepository, 
         vote_repo: VoteRepository,
-        cron_client: CronClient
+        cron_client: CronClient,
+        live_update_interval: float = 2.0,
+        state_backend: Optional["StateBackend"] = None
     ):
         self.chat = chat_manager
         self.poll_repo = poll_repo
         self.vote_repo = vote_repo
         self.cron = cron_client
+        # Oy yağmurunda mesajı her oyda değil, aralık başına en fazla bir kez güncelle
+        self.live_updater = UpdateCoalescer(interval=live_update_interval, name="poll-live")
+        self.tally = VoteTallyEngine(vote_repo)
+        # Çoklu süreç modunda oylar süreçler arasında paylaşılmayan bellek içi sayaca girmez;
+        # her oy SQLite'ta transaction ile işlenir, sayılar veritabanından okunur
+        self.shared = state_backend is not None and state_backend.is_shared
+        # users tablosunda olduğu doğrulanan oy verenler (votes.user_id FK'sı; silinen kullanıcının oyları da silinir)
+        self._known_voters = set()
 
     async def create_poll(
         self, 
@@ -43,6 +61,8 @@ class VotingService:
                 "allow_multiple": 1 if allow_multiple else 0,
                 "is_closed": 0
             })
+            if not self.shared:
+                self.tally.open_poll(poll_id, len(options), allow_multiple)
 
             # Slack Mesajı Oluştur (ASCII ONLY)
             blocks = self._build_poll_blocks(poll_id, topic, options, allow_multiple)
@@ -77,74 +97,105 @@ class VotingService:
     def cast_vote(self, poll_id: str, user_id: str, option_index: int) -> Dict[str, Any]:
         """
         Kullanıcının oyunu işler. Toggle (Aç/Kapa) ve Switch (Değiştir) mantığı içerir.
-        Transaction kullanarak race condition'ları önler.
+        Oy bellek içi sayaç kilidi altında işlenir; veritabanına toplu olarak arka planda yazılır.
         """
         try:
-            poll = self.poll_repo.get(poll_id)
-            if not poll:
-                logger.warning(f"[!] Oylama bulunamadı | Oylama: {poll_id} | Kullanıcı: {user_id}")
-                return {"success": False, "message": "❌ Bu oylama bulunamadı. Lütfen geçerli bir oylama seçin."}
-            
-            if poll["is_closed"]:
+            if self.shared:
+                return self._cast_vote_shared(poll_id, user_id, option_index)
+
+            tally = self.tally.get(poll_id)
+            if tally is None and not self.tally.is_closed(poll_id):
+                # Sayaç bellekte yoksa oylamayı veritabanından kontrol edip yükle
+                poll = self.poll_repo.get(poll_id)
+                if not poll:
+                    logger.warning(f"[!] Oylama bulunamadı | Oylama: {poll_id} | Kullanıcı: {user_id}")
+                    return {"success": False, "message": "❌ Bu oylama bulunamadı. Lütfen geçerli bir oylama seçin."}
+                if poll["is_closed"]:
+                    logger.warning(f"[!] Kapalı oylamaya oy verme denemesi | Oylama: {poll_id} | Kullanıcı: {user_id}")
+                    return {"success": False, "message": self.CLOSED_MESSAGE}
+                self._load_tallies([poll])
+
+            # Yazılamayacak oy (users'ta olmayan kullanıcı) sayaca hiç girmesin; aksi halde
+            # kullanıcı "kaydedildi" görür, oy arka plandaki yazımda sessizce düşer
+            if not self._is_known_voter(user_id):
+                logger.warning(f"[!] Kayıtlı olmayan kullanıcının oyu reddedildi | Kullanıcı: {user_id} | Oylama: {poll_id}")
+                return {"success": False, "message": self.ERROR_MESSAGE}
+
+            action = self.tally.toggle(poll_id, user_id, option_index)
+            if action is None:
                 logger.warning(f"[!] Kapalı oylamaya oy verme denemesi | Oylama: {poll_id} | Kullanıcı: {user_id}")
-                return {"success": False, "message": "⏰ Bu oylama sona ermiştir. Artık oy veremezsiniz. Sonuçları görmek için oylama mesajını kontrol edin."}
+                return {"success": False, "message": self.CLOSED_MESSAGE}
 
-            # Transaction içinde tüm işlemleri yap (race condition önleme)
-            with self.vote_repo.db_client.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 1. Kullanıcı bu seçeneğe daha önce oy vermiş mi? (Toggle Mantığı)
-                cursor.execute(
-                    "SELECT COUNT(*) as count FROM votes WHERE poll_id = ? AND user_id = ? AND option_index = ?",
-                    (poll_id, user_id, option_index)
-                )
-                row = cursor.fetchone()
-                has_voted = row["count"] > 0 if row else False
-                
-                logger.info(f"[>] OY VERİLDİ | Kullanıcı: {user_id} | Oylama: {poll_id} | Seçenek: {option_index} | Daha önce oy vermiş: {has_voted}")
-                
-                if has_voted:
-                    # Oyu geri al (Sil)
-                    cursor.execute(
-                        "DELETE FROM votes WHERE poll_id = ? AND user_id = ? AND option_index = ?",
-                        (poll_id, user_id, option_index)
-                    )
-                    deleted_count = cursor.rowcount
-                    conn.commit()
-                    
-                    if deleted_count > 0:
-                        logger.info(f"[+] OY GERİ ALINDI | Kullanıcı: {user_id} | Oylama: {poll_id} | Seçenek: {option_index}")
-                        return {"success": True, "message": "Oyunuz geri alındı."}
-                    else:
-                        logger.warning(f"[!] Oy geri alınamadı | Kullanıcı: {user_id} | Oylama: {poll_id} | Seçenek: {option_index}")
-                        return {"success": False, "message": "Oy geri alınamadı."}
-
-                # 2. Çoklu oy kapalıysa, diğer oyları temizle (Switch Mantığı)
-                if not poll["allow_multiple"]:
-                    # Kullanıcının önceki tüm oylarını sil
-                    cursor.execute(
-                        "DELETE FROM votes WHERE poll_id = ? AND user_id = ?",
-                        (poll_id, user_id)
-                    )
-                    deleted_count = cursor.rowcount
-                    if deleted_count > 0:
-                        logger.info(f"[i] ÖNCEKİ OYLAR TEMİZLENDİ | Kullanıcı: {user_id} | Oylama: {poll_id} | Silinen: {deleted_count} oy")
-
-                # 3. Yeni oyu kaydet
-                import uuid
-                vote_id = str(uuid.uuid4())
-                cursor.execute(
-                    "INSERT INTO votes (id, poll_id, user_id, option_index) VALUES (?, ?, ?, ?)",
-                    (vote_id, poll_id, user_id, option_index)
-                )
-                conn.commit()
-                
-                logger.info(f"[+] OY KAYDEDİLDİ | Kullanıcı: {user_id} | Oylama: {poll_id} | Seçenek: {option_index}")
-                return {"success": True, "message": "Oyunuz kaydedildi!"}
+            self._schedule_live_update(poll_id)
+            if action == "removed":
+                logger.info(f"[+] OY GERİ ALINDI | Kullanıcı: {user_id} | Oylama: {poll_id} | Seçenek: {option_index}")
+                return {"success": True, "message": "Oyunuz geri alındı."}
+
+            logger.info(f"[+] OY KAYDEDİLDİ | Kullanıcı: {user_id} | Oylama: {poll_id} | Seçenek: {option_index}")
+            return {"success": True, "message": "Oyunuz kaydedildi!"}
 
         except Exception as e:
             logger.error(f"[X] VotingService.cast_vote hatası: {e}", exc_info=True)
-            return {"success": False, "message": "Oy pusulanda bir sorun çıktı, tekrar dener misin? 🗳️"}
+            return {"success": False, "message": self.ERROR_MESSAGE}
+
+    def _cast_vote_shared(self, poll_id: str, user_id: str, option_index: int) -> Dict[str, Any]:
+        """Çoklu süreç modu: toggle/switch tek bir SQLite yazma transaction'ında yapılır."""
+        if not self._is_known_voter(user_id):
+            logger.warning(f"[!] Kayıtlı olmayan kullanıcının oyu reddedildi | Kullanıcı: {user_id} | Oylama: {poll_id}")
+            return {"success": False, "message": self.ERROR_MESSAGE}
+
+        action = self.vote_repo.toggle_vote(poll_id, user_id, option_index)
+        if action == "not_found":
+            logger.warning(f"[!] Oylama bulunamadı | Oylama: {poll_id} | Kullanıcı: {user_id}")
+            return {"success": False, "message": "❌ Bu oylama bulunamadı. Lütfen geçerli bir oylama seçin."}
+        if action == "closed":
+            logger.warning(f"[!] Kapalı oylamaya oy verme denemesi | Oylama: {poll_id} | Kullanıcı: {user_id}")
+            return {"success": False, "message": self.CLOSED_MESSAGE}
+
+        self._schedule_live_update(poll_id)
+        if action == "removed":
+            logger.info(f"[+] OY GERİ ALINDI | Kullanıcı: {user_id} | Oylama: {poll_id} | Seçenek: {option_index}")
+            return {"success": True, "message": "Oyunuz geri alındı."}
+        logger.info(f"[+] OY KAYDEDİLDİ | Kullanıcı: {user_id} | Oylama: {poll_id} | Seçenek: {option_index}")
+        return {"success": True, "message": "Oyunuz kaydedildi!"}
+
+    def _is_known_voter(self, user_id: str) -> bool:
+        if user_id in self._known_voters:
+            return True
+        if self.vote_repo.voter_exists(user_id):
+            self._known_voters.add(user_id)
+            return True
+        return False
+
+    def restore_open_polls(self) -> int:
+        """
+        Açılışta açık oylamaların sayaçlarını `votes` tablosundan yeniden kurar.
+        Yüklenen oylama sayısını döndürür (çoklu süreç modunda sayaç kullanılmaz: 0).
+        """
+        if self.shared:
+            return 0
+        try:
+            polls = self.poll_repo.list(filters={"is_closed": 0})
+            votes = self._load_tallies(polls)
+            logger.info(f"[+] Açık oylama sayaçları yüklendi | Oylama: {len(polls)} | Oy: {votes}")
+            return len(polls)
+        except Exception as e:
+            logger.error(f"[X] VotingService.restore_open_polls hatası: {e}")
+            return 0
+
+    def shutdown(self):
+        """Bekleyen oyları veritabanına yazar (kapanışta çağrılır)."""
+        self.tally.shutdown()
+
+    def _load_tallies(self, polls: List[Dict[str, Any]]) -> int:
+        return self.tally.load_polls([
+            {
+                "id": poll["id"],
+                "option_count": len(json.loads(poll["options"])),
+                "allow_multiple": poll["allow_multiple"],
+            }
+            for poll in polls
+        ])
 
     async def close_poll(self, channel_id: str, poll_id: str):
         """Oylamayı kapatır ve sonuçları açıklar."""
@@ -153,11 +204,21 @@ class VotingService:
             if not poll or poll["is_closed"]:
                 return
 
-            # Oylamayı veritabanında kapat
+            # Önce veritabanında kapat: sayaç yokken gelen oy oylamayı açık okuyup yeniden yüklemesin
             self.poll_repo.update(poll_id, {"is_closed": 1})
 
+            # Yeni oyları durdur, bekleyenleri yaz ve son sayıları al
+            final_counts = self.tally.close_poll(poll_id)
+
+            # Bekleyen canlı güncelleme kapanış mesajının üzerine yazmasın
+            self.live_updater.cancel(poll_id)
+
             # Sonuçları hesapla
-            results = self._calculate_results(poll_id, json.loads(poll["options"]))
+            options = json.loads(poll["options"])
+            if final_counts is not None:
+                results = self._build_results(options, dict(enumerate(final_counts)))
+            else:
+                results = self._calculate_results(poll_id, options)
             
             # Sonuç Mesajı (ASCII Grafik)
             result_text = self._build_result_text(poll["topic"], results)
@@ -205,7 +266,39 @@ class VotingService:
         except Exception as e:
             logger.error(f"[X] VotingService.close_poll hatası: {e}")
 
-    def _build_poll_blocks(self, poll_id: str, topic: str, options: List[str], allow_multiple: bool) -> List[Dict]:
+    def _schedule_live_update(self, poll_id: str):
+        """Oylama mesajını kirli işaretler; güncelleme arka planda birleştirilerek yapılır."""
+        self.live_updater.mark_dirty(poll_id, lambda: self._render_live_poll(poll_id))
+
+    def _render_live_poll(self, poll_id: str):
+        """Açık oylama mesajını güncel oy sayılarıyla yeniden çizer."""
+        poll = self.poll_repo.get(poll_id)
+        if not poll or poll["is_closed"] or not poll.get("message_ts"):
+            return
+
+        options = json.loads(poll["options"])
+        counts = self.tally.get_counts(poll_id)
+        if counts is not None:
+            results = self._build_results(options, dict(enumerate(counts)))
+        else:
+            results = self._calculate_results(poll_id, options)
+        blocks = self._build_poll_blocks(poll_id, poll["topic"], options, bool(poll["allow_multiple"]), results)
+        self.chat.update_message(
+            channel=poll["message_channel"],
+            ts=poll["message_ts"],
+            text=f"Oylama: {poll['topic']}",
+            blocks=blocks
+        )
+        logger.debug(f"[i] Canlı oylama mesajı güncellendi | Poll: {poll_id}")
+
+    def _build_poll_blocks(
+        self,
+        poll_id: str,
+        topic: str,
+        options: List[str],
+        allow_multiple: bool,
+        results: Optional[List[Dict]] = None
+    ) -> List[Dict]:
         blocks = [
             {
                 "type": "section",
@@ -215,9 +308,12 @@ class VotingService:
         ]
         
         for i, opt in enumerate(options):
+            text = f"[{i+1}] {opt}"
+            if results is not None and i < len(results):
+                text += f"\n_{results[i]['count']} Oy_"
             blocks.append({
                 "type": "section",
-                "text": {"type": "mrkdwn", "text": f"[{i+1}] {opt}"},
+                "text": {"type": "mrkdwn", "text": text},
                 "accessory": {
                     "type": "button",
                     "text": {"type": "plain_text", "text": "Oy Ver"},
@@ -277,6 +373,9 @@ class VotingService:
         except Exception as e:
             logger.error(f"[X] VotingService._calculate_results hatası: {e}")
 
+        return self._build_results(options, counts_map)
+
+    def _build_results(self, options: List[str], counts_map: Dict[int, int]) -> List[Dict]:
         total_votes = sum(counts_map.values())
         
         results = []
@@ -0,0 +1,186 @@
+"""
+Challenge canvas toplu yükleyici ve içerik üretimi testleri.
+"""
+
+import sqlite3
+import time
+import pytest
+from src.repositories import ChallengeEvaluationRepository, ChallengeParticipantRepository
+from src.services import ChallengeEvaluationService
+from src.services.challenge_canvas import (
+    ChallengeCanvasLoader,
+    build_canvas_rows,
+    content_hash,
+    render_canvas_markdown,
+)
+
+
+class CountingDatabase:
+    """Açılan bağlantıları sayan dosya tabanlı veritabanı."""
+
+    def __init__(self, path):
+        self.path = path
+        self.connections = 0
+
+    def get_connection(self):
+        self.connections += 1
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "canvas.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE challenge_evaluations (
+            id TEXT, challenge_hub_id TEXT, final_result TEXT,
+            github_repo_url TEXT, github_repo_public INTEGER
+        );
+        CREATE TABLE challenge_evaluators (id TEXT, evaluation_id TEXT, user_id TEXT, vote TEXT);
+        CREATE TABLE challenge_participants (id TEXT, challenge_hub_id TEXT, user_id TEXT);
+
+        INSERT INTO challenge_evaluations VALUES ('e1', 'c1', NULL, 'https://github.com/x/y', 1);
+        INSERT INTO challenge_evaluators VALUES
+            ('j1', 'e1', 'U7', 'true'), ('j2', 'e1', 'U8', 'true'),
+            ('j3', 'e1', 'U9', 'false'), ('j4', 'e1', 'U10', NULL);
+        INSERT INTO challenge_participants VALUES
+            ('p1', 'c1', 'U2'), ('p2', 'c1', 'U3'), ('p3', 'c2', 'U5');
+    """)
+    conn.commit()
+    conn.close()
+    return CountingDatabase(path)
+
+
+class FakeHubRepo:
+    def __init__(self, challenges):
+        self.challenges = challenges
+
+    def get_all_active(self):
+        return [dict(ch) for ch in self.challenges]
+
+
+class FakeEvaluationRepo:
+    def get_by_challenges(self, challenge_ids):
+        return {}
+
+
+class FakeParticipantRepo:
+    def __init__(self):
+        self.members = []
+
+    def get_team_members_by_challenges(self, challenge_ids):
+        return {ch_id: list(self.members) for ch_id in challenge_ids}
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.edits = []
+
+    def edit_canvas(self, canvas_id, changes):
+        time.sleep(0.05)  # Slack çağrısı gecikmesi
+        self.edits.append(changes[0]["document_content"]["markdown"])
+
+
+def make_service(participant_repo, canvas, interval=0.2):
+    hub_repo = FakeHubRepo([{
+        "id": "c1", "theme": "Yapay Zeka", "status": "active", "creator_id": "U1",
+        "team_size": 3, "hub_channel_id": "C1", "summary_message_ts": "F123",
+    }])
+    return ChallengeEvaluationService(
+        None, None, FakeEvaluationRepo(), None, hub_repo, participant_repo,
+        None, None, canvas_manager=canvas, canvas_update_interval=interval
+    )
+
+
+def wait_idle(service, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while service.get_canvas_publisher_stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.02)
+    time.sleep(0.1)
+
+
+CHALLENGES = [
+    {"id": "c1", "theme": "Yapay Zeka", "status": "evaluating", "creator_id": "U1", "team_size": 3},
+    {"id": "c2", "theme": "Web", "status": "recruiting", "creator_id": "U4", "team_size": 2},
+    {"id": "c3", "theme": "Oyun", "status": "active", "creator_id": None, "team_size": 1},
+]
+
+
+class TestChallengeCanvas:
+    """ChallengeCanvasLoader + render testleri."""
+
+    def test_rows_are_built_with_two_queries(self, db):
+        """Challenge sayısından bağımsız olarak iki sorgu yapılmalı."""
+        loader = ChallengeCanvasLoader(ChallengeEvaluationRepository(db), ChallengeParticipantRepository(db))
+        rows = build_canvas_rows(CHALLENGES, loader)
+
+        assert db.connections == 2
+        assert rows[0]["team"] == "![](@U1), ![](@U2), ![](@U3) (3/4)"
+        assert rows[0]["votes"] == "✅2 ❌1"
+        assert rows[0]["github"] == "✅ Public"
+        assert rows[1]["team"] == "![](@U4), ![](@U5) (2/3)"
+        assert rows[2]["team"] == "0/2"
+        assert (rows[2]["votes"], rows[2]["github"]) == ("-", "❌ Yok")
+
+        # Önbellekteki challenge için yeni sorgu yapılmamalı
+        loader.team_members("c2")
+        assert db.connections == 2
+
+    def test_content_hash_is_stable(self, db):
+        """Aynı veri aynı içeriği (ve özeti) üretmeli, değişiklik özeti değiştirmeli."""
+        def render():
+            loader = ChallengeCanvasLoader(ChallengeEvaluationRepository(db), ChallengeParticipantRepository(db))
+            return render_canvas_markdown(build_canvas_rows(CHALLENGES, loader))
+
+        first = render()
+        assert content_hash(first) == content_hash(render())
+
+        conn = db.get_connection()
+        with conn:
+            conn.execute("INSERT INTO challenge_evaluators VALUES ('j5', 'e1', 'U11', 'false')")
+        conn.close()
+        assert content_hash(first) != content_hash(render())
+
+
+class TestCanvasPublisher:
+    """Arka plan canvas yayıncısı testleri."""
+
+    def test_burst_is_coalesced_and_unchanged_is_skipped(self):
+        """Art arda istekler birleşmeli, içerik değişmediyse Slack çağrısı yapılmamalı."""
+        participants, canvas = FakeParticipantRepo(), FakeCanvas()
+        service = make_service(participants, canvas)
+
+        started = time.perf_counter()
+        for i in range(20):
+            participants.members = [{"user_id": f"U{n}"} for n in range(2, 3 + i % 3)]
+            service.request_canvas_update("c1")
+        # Çağıran Slack I/O'sunu beklememeli
+        assert time.perf_counter() - started < 0.05
+        wait_idle(service)
+
+        stats = service.get_canvas_publisher_stats()
+        assert stats["marked"] == 20
+        assert stats["coalesced"] >= 17
+        assert 1 <= len(canvas.edits) <= 2
+        # Son yayın en son durumu (i=19 -> U2, U3) göstermeli
+        assert canvas.edits[-1].endswith("![](@U1), ![](@U2), ![](@U3) (3/4) | ❌ Yok | - |")
+
+        service.request_canvas_update("c1")
+        wait_idle(service)
+        assert len(canvas.edits) == stats["published"]
+        assert service.get_canvas_publisher_stats()["skipped"] == stats["skipped"] + 1
+
+    def test_shutdown_flushes_pending_update(self):
+        """Kapanışta bekleyen güncelleme hemen yayınlanmalı."""
+        participants, canvas = FakeParticipantRepo(), FakeCanvas()
+        service = make_service(participants, canvas, interval=60)
+        service.request_canvas_update("c1")
+        wait_idle(service)
+
+        participants.members = [{"user_id": "U9"}]
+        service.request_canvas_update("c1")
+        assert service.get_canvas_publisher_stats()["pending"] == 1
+        service.shutdown()
+        assert "![](@U9)" in canvas.edits[-1]
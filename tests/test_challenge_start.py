@@ -0,0 +1,193 @@
+"""
+Challenge başlatma iş akışı (adım adım, kaldığı yerden devam eden) testleri.
+"""
+
+import asyncio
+import sqlite3
+import time
+import pytest
+from src.repositories import ChallengeStartRepository
+from src.services import ChallengeHubService
+from src.services import challenge_hub_service
+from src.services.challenge_hub_service import MAX_START_ATTEMPTS
+
+
+class FileDatabase:
+    def __init__(self, path):
+        self.path = path
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+class FakeHubRepo:
+    def __init__(self):
+        self.challenge = {"id": "c1", "creator_id": "U1", "theme": "TBD", "team_size": 2, "status": "recruiting"}
+        self.fail_updates = 0
+
+    def get(self, challenge_id):
+        return dict(self.challenge)
+
+    def update(self, challenge_id, data):
+        if self.fail_updates:
+            self.fail_updates -= 1
+            raise RuntimeError("veritabanı kilitli")
+        self.challenge.update(data)
+
+
+class FakeThemeRepo:
+    def get_active_themes(self):
+        return [{"name": "AI Chatbot"}]
+
+
+class FakeProjectRepo:
+    def get_random_project(self, theme):
+        return {"id": "p1", "name": "Bot", "description": "Açıklama", "estimated_hours": 24}
+
+
+class FakeParticipantRepo:
+    def get_team_members(self, challenge_id):
+        return [{"user_id": "U2"}, {"user_id": "U3"}]
+
+
+class FakeEnhancement:
+    async def enhance_project(self, base_project, team_size, deadline_hours, theme):
+        await asyncio.sleep(0.2)  # LLM gecikmesi
+        return dict(base_project, llm_enhanced_features=["ekstra"])
+
+
+class FakeConv:
+    def __init__(self):
+        self.created = []
+        self.invited = []
+
+    def create_channel(self, name, is_private=False):
+        time.sleep(0.2)  # Slack gecikmesi
+        self.created.append(name)
+        return {"id": f"CH{len(self.created)}"}
+
+    def invite_users(self, channel_id, user_ids):
+        self.invited.append((channel_id, tuple(user_ids)))
+
+    def set_topic(self, channel_id, topic):
+        return True
+
+    def set_purpose(self, channel_id, purpose):
+        return True
+
+
+class FakeChat:
+    def __init__(self):
+        self.posts = []
+
+    def post_message(self, channel, text, blocks=None):
+        self.posts.append(channel)
+
+
+class FakeCron:
+    def __init__(self):
+        self.jobs = {}
+
+    def add_once_job(self, func, run_date=None, delay_minutes=None, job_id=None, args=None):
+        self.jobs[job_id] = (func, args)
+        return job_id
+
+
+@pytest.fixture
+def start_repo(tmp_path):
+    path = str(tmp_path / "start.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE challenge_start_runs (
+            challenge_hub_id TEXT PRIMARY KEY, step TEXT NOT NULL, state TEXT,
+            attempts INTEGER DEFAULT 0, last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.close()
+    return ChallengeStartRepository(FileDatabase(path))
+
+
+def make_service(start_repo):
+    hub_repo, conv, chat, cron = FakeHubRepo(), FakeConv(), FakeChat(), FakeCron()
+    service = ChallengeHubService(
+        chat, conv, None, hub_repo, FakeParticipantRepo(), FakeProjectRepo(), None,
+        FakeThemeRepo(), None, FakeEnhancement(), None, cron, start_repo=start_repo
+    )
+    return service, hub_repo, conv, chat, cron
+
+
+class TestChallengeStartWorkflow:
+    """ChallengeHubService._start_challenge testleri."""
+
+    def test_full_start_runs_provisioning_concurrently(self, start_repo):
+        """LLM ve kanal açma paralel çalışmalı, akış bitince kayıt silinmeli."""
+        service, hub_repo, conv, chat, cron = make_service(start_repo)
+
+        started = time.perf_counter()
+        asyncio.run(service._start_challenge("c1"))
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.35  # 0.2 + 0.2 sıralı olsaydı >= 0.4
+        assert hub_repo.challenge["status"] == "active"
+        assert hub_repo.challenge["challenge_channel_id"] == "CH1"
+        assert conv.invited == [("CH1", ("U2", "U3", "U1"))]
+        assert len(chat.posts) == 3
+        assert cron.jobs["monitor_new_challenge_c1"][1] == ["c1"]
+        assert "close_challenge_c1" in cron.jobs
+        assert start_repo.get_run("c1") is None
+
+    def test_failure_resumes_from_saved_step(self, start_repo):
+        """Hata sonrası kaydedilen adımdan devam edilmeli, kanal tekrar açılmamalı."""
+        service, hub_repo, conv, chat, cron = make_service(start_repo)
+        hub_repo.fail_updates = 1
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(service._start_challenge("c1"))
+
+        run = start_repo.get_run("c1")
+        assert run["step"] == "activate"
+        assert run["attempts"] == 1
+        assert run["state"]["channel_id"] == "CH1"
+        assert hub_repo.challenge["status"] == "recruiting"
+        func, args = cron.jobs["resume_challenge_start_c1"]
+        assert args == ["c1"]
+
+        # Zamanlanmış yeniden deneme (veya yeniden başlatma sonrası) kaldığı yerden sürer
+        asyncio.run(func(*args))
+        assert conv.created and len(conv.created) == 1
+        assert len(conv.invited) == 1
+        assert hub_repo.challenge["status"] == "active"
+        assert start_repo.get_run("c1") is None
+
+    def test_marks_failed_after_max_attempts(self, start_repo):
+        """Deneme hakkı bitince challenge failed olarak işaretlenmeli."""
+        service, hub_repo, conv, chat, cron = make_service(start_repo)
+        hub_repo.fail_updates = MAX_START_ATTEMPTS
+
+        for _ in range(MAX_START_ATTEMPTS):
+            cron.jobs.pop("resume_challenge_start_c1", None)
+            with pytest.raises(RuntimeError):
+                asyncio.run(service._start_challenge("c1"))
+
+        assert hub_repo.challenge["status"] == "failed"
+        assert start_repo.get_run("c1") is None
+        assert "resume_challenge_start_c1" not in cron.jobs
+        assert len(conv.created) == 1
+
+    def test_failed_mark_error_is_logged(self, start_repo, monkeypatch):
+        """'failed' işaretlenemezse hata yutulmamalı, loglanmalı."""
+        errors = []
+        monkeypatch.setattr(challenge_hub_service.logger, "error", lambda msg, **kw: errors.append(msg))
+        service, hub_repo, conv, chat, cron = make_service(start_repo)
+        hub_repo.fail_updates = MAX_START_ATTEMPTS + 1
+
+        for _ in range(MAX_START_ATTEMPTS):
+            cron.jobs.pop("resume_challenge_start_c1", None)
+            with pytest.raises(RuntimeError):
+                asyncio.run(service._start_challenge("c1"))
+
+        assert hub_repo.challenge["status"] != "failed"
+        assert any("failed' olarak işaretlenemedi" in msg for msg in errors)
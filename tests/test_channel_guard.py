@@ -0,0 +1,182 @@
+"""
+Challenge kanalı yetkili üye indeksi ve olay tabanlı yetkisiz kullanıcı çıkarma testleri.
+"""
+
+import time
+from src.services import ChallengeHubService
+from src.services.channel_guard import ChallengeChannelIndex
+
+
+class FakeAuthClient:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.calls = 0
+
+    def auth_test(self):
+        self.calls += 1
+        return {"ok": True, "user_id": self.user_id}
+
+
+class FakeChat:
+    def __init__(self):
+        self.client = FakeAuthClient("UBOT")
+        self.posts = []
+
+    def post_message(self, channel, text, blocks=None):
+        self.posts.append(channel)
+
+
+class FakeConv:
+    def __init__(self, members):
+        self.user_client = FakeAuthClient("UADMIN")
+        self.members = members
+        self.kicked = []
+
+    def iter_members(self, channel_id):
+        # Sayfalı listeleme gibi parça parça döner
+        yield from self.members
+
+    def kick_user(self, channel_id, user_id):
+        time.sleep(0.05)
+        self.kicked.append((channel_id, user_id))
+        return True
+
+    def open_conversation(self, users):
+        return {"channel": {"id": f"D{users[0]}"}}
+
+
+class FakeHubRepo:
+    """İndeks kurulduktan sonra başka replikada açılan kanallar `later` ile eklenir."""
+
+    def __init__(self):
+        self.challenges = [
+            {"id": "c1", "creator_id": "U1", "challenge_channel_id": "CH1", "status": "active"},
+            {"id": "c2", "creator_id": "U5", "challenge_channel_id": None, "status": "recruiting"},
+        ]
+        self.channel_lookups = []
+
+    def get_all_active(self):
+        return [dict(ch) for ch in self.challenges]
+
+    def get_by_channel_id(self, channel_id):
+        self.channel_lookups.append(channel_id)
+        return next((dict(ch) for ch in self.challenges if ch["challenge_channel_id"] == channel_id), None)
+
+
+class FakeParticipantRepo:
+    def __init__(self):
+        self.members = {"c1": ["U2"], "c2": ["U6"]}
+
+    def get_team_members_by_challenges(self, challenge_ids):
+        return {ch_id: [{"user_id": u} for u in self.members.get(ch_id, [])] for ch_id in challenge_ids}
+
+    def get_team_members(self, challenge_id):
+        return [{"user_id": u} for u in self.members.get(challenge_id, [])]
+
+    def get_by_challenge_and_user(self, challenge_id, user_id):
+        return {"user_id": user_id} if user_id in self.members.get(challenge_id, []) else None
+
+
+def make_service(members=()):
+    chat, conv = FakeChat(), FakeConv(list(members))
+    service = ChallengeHubService(
+        chat, conv, None, FakeHubRepo(), FakeParticipantRepo(), None, None,
+        None, None, None, None, None
+    )
+    service.load_channel_index()
+    return service, chat, conv
+
+
+def wait_idle(service, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while service.get_kick_queue_stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.02)
+    time.sleep(0.1)
+
+
+class TestChallengeChannelIndex:
+    """ChallengeChannelIndex testleri."""
+
+    def test_membership_updates(self):
+        """Üye ve kanal değişiklikleri indekse hemen yansımalı."""
+        index = ChallengeChannelIndex()
+        index.rebuild([("c1", None, ["U1"])])
+        assert index.challenge_for_channel("CH1") is None
+
+        index.add_member("c1", "U2")
+        index.register_channel("c1", "CH1")
+        assert index.is_authorized("CH1", "U1") and index.is_authorized("CH1", "U2")
+
+        index.remove_member("c1", "U2")
+        assert not index.is_authorized("CH1", "U2")
+
+        index.forget_challenge("c1")
+        assert index.challenge_for_channel("CH1") is None
+        assert not index.is_authorized("CH1", "U1")
+
+
+class TestChannelGuard:
+    """ChallengeHubService olay/uzlaştırma testleri."""
+
+    def test_join_event_uses_index_and_queues_kick(self):
+        """Katılma olayı bellekten yanıtlanmalı, yetkisiz kullanıcı kuyruktan çıkarılmalı."""
+        service, chat, conv = make_service()
+
+        started = time.perf_counter()
+        assert service.check_and_remove_unauthorized_user("CH1", "U2")["is_authorized"]
+        assert service.check_and_remove_unauthorized_user("CH1", "UBOT")["is_authorized"]
+        assert service.check_and_remove_unauthorized_user("CX", "U9") == {"is_challenge_channel": False, "action": "none"}
+        result = service.check_and_remove_unauthorized_user("CH1", "U9")
+        service.check_and_remove_unauthorized_user("CH1", "U9")  # tekrar eden olay
+        assert time.perf_counter() - started < 0.05
+        assert result["action"] == "queued"
+
+        wait_idle(service)
+        assert conv.kicked == [("CH1", "U9")]
+        assert "DU9" in chat.posts and "CH1" in chat.posts
+        # auth_test sonuçları önbellekte
+        assert chat.client.calls == 1 and conv.user_client.calls == 1
+
+    def test_member_added_before_kick_is_spared(self):
+        """Kuyrukta beklerken takıma eklenen kullanıcı çıkarılmamalı."""
+        service, chat, conv = make_service()
+        service.kick_queue.interval = 60
+        service.kick_queue._last_run["CH1:U7"] = time.monotonic()  # işi pencere sonuna ertele
+
+        service.check_and_remove_unauthorized_user("CH1", "U7")
+        service.channel_index.add_member("c1", "U7")
+        service.kick_queue.flush("CH1:U7")
+        assert conv.kicked == []
+
+    def test_reconcile_kicks_only_unauthorized(self):
+        """Uzlaştırma sadece yetkisiz üyeleri kuyruğa eklemeli."""
+        service, chat, conv = make_service(["U1", "U2", "UBOT", "UADMIN", "U8", "U9"])
+        service.reconcile_challenge_channels()
+        wait_idle(service)
+        assert sorted(conv.kicked) == [("CH1", "U8"), ("CH1", "U9")]
+
+    def test_index_miss_is_checked_against_database(self):
+        """Başka replikada açılan kanal ve sonradan katılan üye indekste yoksa veritabanından doğrulanmalı."""
+        service, chat, conv = make_service()
+        service.hub_repo.challenges[1]["challenge_channel_id"] = "CH2"
+        service.participant_repo.members["c2"].append("U7")
+        service.participant_repo.members["c1"].append("U3")
+
+        assert service.check_and_remove_unauthorized_user("CH2", "U7")["is_authorized"]
+        assert service.check_and_remove_unauthorized_user("CH2", "U5")["is_authorized"]
+        assert service.check_and_remove_unauthorized_user("CH1", "U3")["is_authorized"]
+        assert service.check_and_remove_unauthorized_user("CH2", "U9")["action"] == "queued"
+
+        # Doğrulanan kanal ve üye indekse eklendi
+        assert service.channel_index.challenge_for_channel("CH2") == "c2"
+        assert service.channel_index.is_authorized("CH1", "U3")
+        assert service.hub_repo.channel_lookups == ["CH2"]
+        wait_idle(service)
+        assert conv.kicked == [("CH2", "U9")]
+
+    def test_refresh_picks_up_new_channels(self):
+        """Periyodik yenileme diğer replikalardaki değişiklikleri indekse almalı."""
+        service, chat, conv = make_service()
+        service.hub_repo.challenges[1]["challenge_channel_id"] = "CH2"
+        service.refresh_channel_index()
+        assert service.channel_index.is_authorized("CH2", "U6")
@@ -0,0 +1,65 @@
+"""
+UpdateCoalescer (debounce/coalesce) testleri.
+"""
+
+import threading
+import time
+from src.core.coalescer import UpdateCoalescer
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestUpdateCoalescer:
+    """UpdateCoalescer testleri."""
+
+    def test_burst_is_coalesced(self):
+        """Pencere içindeki işaretler tek bir çalıştırmaya indirgenmeli."""
+        coalescer = UpdateCoalescer(interval=0.2, name="test")
+        calls = []
+
+        for i in range(50):
+            coalescer.mark_dirty("poll-1", lambda i=i: calls.append(i))
+
+        # En fazla iki çalıştırma (ilk işaret + pencere sonu), son durum kazanır
+        assert wait_until(lambda: calls and calls[-1] == 49)
+        time.sleep(0.3)
+        assert len(calls) <= 2
+        stats = coalescer.get_stats()
+        assert stats["marked"] == 50
+        assert stats["coalesced"] >= 48
+
+    def test_keys_are_independent(self):
+        """Farklı anahtarlar birbirini bekletmemeli."""
+        coalescer = UpdateCoalescer(interval=5, name="test")
+        done = threading.Event()
+        seen = set()
+
+        def record(key):
+            seen.add(key)
+            if len(seen) == 2:
+                done.set()
+
+        coalescer.mark_dirty("a", lambda: record("a"))
+        coalescer.mark_dirty("b", lambda: record("b"))
+        assert done.wait(1)
+
+    def test_cancel_drops_pending_update(self):
+        """İptal edilen güncelleme çalışmamalı."""
+        coalescer = UpdateCoalescer(interval=0.2, name="test")
+        calls = []
+
+        coalescer.mark_dirty("poll-1", lambda: calls.append("first"))
+        assert wait_until(lambda: calls == ["first"])
+        coalescer.mark_dirty("poll-1", lambda: calls.append("stale"))
+        coalescer.cancel("poll-1")
+
+        time.sleep(0.35)
+        assert calls == ["first"]
+        assert coalescer.get_stats()["cancelled"] == 1
@@ -0,0 +1,127 @@
+"""
+Bağımlılık konteyneri (tembel oluşturma, kapsam, override) ve uygulama grafiği testleri.
+"""
+
+import subprocess
+import sys
+import textwrap
+import pytest
+from src.core.container import SCOPED, TRANSIENT, Container
+from src.core.exceptions import ContainerError
+
+
+class Service:
+    def __init__(self, *deps):
+        self.deps = deps
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestContainer:
+    """Container testleri."""
+
+    def test_services_are_built_lazily_once(self):
+        built = []
+        container = Container()
+        container.register("db", lambda c: built.append("db") or Service())
+        container.register("repo", lambda c: built.append("repo") or Service(c.db))
+
+        assert built == [] and not container.is_built("repo")
+        repo = container.repo
+        assert sorted(built) == ["db", "repo"]
+        assert container.get("repo") is repo and repo.deps[0] is container.db
+        assert set(container.build_times()) == {"db", "repo"}
+
+    def test_lifetimes(self):
+        container = Container()
+        container.register("shared", lambda c: Service())
+        container.register("per_scope", lambda c: Service(c.shared), lifetime=SCOPED)
+        container.register("fresh", lambda c: Service(), lifetime=TRANSIENT)
+
+        first, second = container.scope(), container.scope()
+        assert first.shared is second.shared is container.shared
+        assert first.per_scope is first.per_scope
+        assert first.per_scope is not second.per_scope
+        assert container.fresh is not container.fresh
+
+    def test_override_and_scope_override(self):
+        container = Container()
+        container.register("groq", lambda c: Service())
+        container.register("service", lambda c: Service(c.groq), lifetime=TRANSIENT)
+        fake = object()
+
+        with container.override("groq", fake):
+            assert container.service.deps[0] is fake
+        assert container.service.deps[0] is not fake
+
+        scope = container.scope()
+        scope.override("groq", fake)
+        assert scope.service.deps[0] is fake
+        assert container.groq is not fake
+
+        with pytest.raises(ContainerError):
+            container.override("missing", fake)
+
+    def test_cycle_and_unknown_service(self):
+        container = Container()
+        container.register("a", lambda c: c.b)
+        container.register("b", lambda c: c.a)
+
+        with pytest.raises(ContainerError, match="a -> b -> a"):
+            container.get("a")
+        with pytest.raises(ContainerError):
+            container.get("missing")
+        with pytest.raises(AttributeError):
+            container.missing
+
+    def test_close_in_reverse_build_order(self):
+        closed = []
+        container = Container()
+        container.register("db", lambda c: Service(), close=lambda s: closed.append("db"))
+        container.register("repo", lambda c: Service(c.db), close=lambda s: closed.append("repo"))
+        container.register("unused", lambda c: Service(), close=lambda s: closed.append("unused"))
+
+        with container.scope() as scope:
+            scope.repo
+        assert closed == []  # singleton'lar kök konteynere ait
+
+        container.close()
+        assert closed == ["repo", "db"]
+        assert not container.is_built("db")
+
+
+class TestApplicationContainer:
+    """src.container.build_container testleri."""
+
+    def test_repository_does_not_load_heavy_clients(self, tmp_path):
+        """Sadece repository kullanan bir CLI Groq, Slack, faiss veya servisleri yüklememeli."""
+        script = textwrap.dedent(f"""
+            import sys
+            from types import SimpleNamespace
+            from src.container import build_container
+
+            container = build_container(SimpleNamespace(database_path={str(tmp_path / "bot.db")!r}))
+            container.user_repo
+            heavy = ["groq", "slack_bolt", "slack_sdk", "faiss", "apscheduler", "src.services.help_service"]
+            print("yüklenen:", ",".join(name for name in heavy if name in sys.modules))
+        """)
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "yüklenen:"
+
+    def test_services_resolve_with_overrides(self):
+        from types import SimpleNamespace
+        from src.container import build_container
+
+        container = build_container(SimpleNamespace(
+            database_path=":memory:", poll_live_update_interval=5, slack_user_token=None
+        ))
+        for name in ("chat_manager", "cron_client", "poll_repo", "vote_repo"):
+            container.override(name, Service())
+        container.override("state_backend", SimpleNamespace(is_shared=False))
+
+        service = container.voting_service
+        assert service.chat is container.chat_manager
+        assert not container.is_built("groq_client")
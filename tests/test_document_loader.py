@@ -0,0 +1,132 @@
+"""
+Yapıya göre parçalama (başlık, tablo, sayfa) ve atıf testleri.
+"""
+
+import pytest
+
+from src.services import document_loader
+from src.services.document_loader import chunk_blocks, format_citation, format_sources, text_blocks
+
+PAGE = """GENEL KURALLAR
+
+1. Katılım
+Derslere devam zorunludur ve her hafta yoklama alınır. Bu kural tüm
+öğrenciler için geçerlidir.
+
+Ödevler zamanında teslim edilmeli-
+dir.
+
+Eğitim    Süre      Gün
+Python    4 hafta   Pazartesi
+ML        6 hafta   Çarşamba
+
+1.1 Sertifika
+Sertifika için %80 devam gerekir.
+"""
+
+
+class TestTextBlocks:
+    def test_headings_paragraphs_and_tables(self):
+        blocks = text_blocks(PAGE, page=4)
+
+        assert [(b["kind"], b.get("level")) for b in blocks] == [
+            ("heading", 0), ("heading", 1), ("text", None), ("text", None), ("table", None), ("heading", 2), ("text", None)
+        ]
+        assert blocks[2]["text"].endswith("tüm öğrenciler için geçerlidir.")
+        assert blocks[3]["text"] == "Ödevler zamanında teslim edilmelidir."
+        assert blocks[4]["rows"][1] == "Python | 4 hafta | Pazartesi"
+        assert {b["page"] for b in blocks} == {4}
+
+    def test_markdown_headings_and_tables(self):
+        blocks = text_blocks("# Kahve\n\nEşleşme her gün.\n\n| Gün | Saat |\n|---|---|\n| Pzt | 10 |\n")
+        assert blocks[0] == {"kind": "heading", "text": "Kahve", "level": 1, "page": None}
+        assert blocks[2]["rows"] == ["Gün | Saat", "Pzt | 10"]
+
+    def test_repeated_header_lines_are_detected(self):
+        pages = ["Akademi Rehberi\nsayfa bir\n", "Akademi Rehberi\nsayfa iki\n", "Akademi Rehberi\nsayfa üç\n"]
+        assert document_loader._repeated_lines(pages) == {"Akademi Rehberi"}
+
+
+class TestChunkBlocks:
+    def test_small_sections_share_a_chunk(self):
+        chunks = chunk_blocks(text_blocks(PAGE, page=4))
+
+        assert len(chunks) == 1
+        text, metadata = chunks[0]
+        assert text.startswith("GENEL KURALLAR > 1. Katılım\nDerslere devam")
+        assert "Eğitim | Süre | Gün\nPython | 4 hafta | Pazartesi" in text
+        assert "1.1 Sertifika\nSertifika için" in text
+        assert metadata == {"section": "GENEL KURALLAR > 1. Katılım", "page": 4}
+
+    def test_heading_starts_new_chunk_when_current_is_full(self):
+        blocks = [
+            {"kind": "heading", "text": "Kurallar", "level": 1, "page": 1},
+            {"kind": "text", "text": "a" * 80, "page": 1},
+            {"kind": "heading", "text": "Sertifika", "level": 1, "page": 2},
+            {"kind": "text", "text": "b" * 20, "page": 2},
+        ]
+        chunks = chunk_blocks(blocks, chunk_size=100)
+        assert chunks == [("Kurallar\n" + "a" * 80, {"section": "Kurallar", "page": 1}),
+                          ("Sertifika\n" + "b" * 20, {"section": "Sertifika", "page": 2})]
+
+    def test_paragraphs_split_at_sentences_across_pages(self):
+        sentence = "Bu bir cümle."
+        blocks = [{"kind": "text", "text": " ".join([sentence] * 4), "page": page} for page in (1, 2, 3)]
+        chunks = chunk_blocks(blocks, chunk_size=100)
+
+        # Örtüşme yok: her cümle tam bir kez, parçalar cümle sınırında biter
+        assert sum(text.count(sentence) for text, _ in chunks) == 12
+        assert all(text.endswith(".") and len(text) <= 100 for text, _ in chunks)
+        assert chunks[0][1] == {"page": 1, "page_end": 2}
+
+    def test_long_table_repeats_header(self):
+        rows = ["Ad | Puan"] + [f"takım{i} | {i}" for i in range(20)]
+        chunks = chunk_blocks([{"kind": "table", "rows": rows, "page": 2}], chunk_size=60)
+
+        assert len(chunks) > 1
+        assert all(text.startswith("Ad | Puan\n") for text, _ in chunks)
+        assert sum(text.count("takım") for text, _ in chunks) == 20
+
+
+class TestDocx:
+    def test_heading_styles_tables_and_page_breaks(self, tmp_path):
+        docx = pytest.importorskip("docx")
+        from docx.enum.text import WD_BREAK
+
+        document = docx.Document()
+        document.add_heading("Challenge Rehberi", level=1)
+        document.add_paragraph("Takımlar dört kişiden oluşur.")
+        document.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+        document.add_heading("Puanlama", level=2)
+        table = document.add_table(rows=2, cols=2)
+        for row, values in zip(table.rows, [("Kriter", "Puan"), ("Kod", "40")]):
+            for cell, value in zip(row.cells, values):
+                cell.text = value
+        path = tmp_path / "rehber.docx"
+        document.save(path)
+
+        blocks = document_loader.read_docx_blocks(str(path))
+        assert [(b["kind"], b.get("level"), b["page"]) for b in blocks] == [
+            ("heading", 1, 1), ("text", None, 1), ("heading", 2, 2), ("table", None, 2)
+        ]
+        assert blocks[3]["rows"] == ["Kriter | Puan", "Kod | 40"]
+        assert chunk_blocks(blocks) == [(
+            "Challenge Rehberi\nTakımlar dört kişiden oluşur.\nPuanlama\nKriter | Puan\nKod | 40",
+            {"section": "Challenge Rehberi", "page": 1, "page_end": 2}
+        )]
+
+
+class TestCitations:
+    def test_format_citation(self):
+        assert format_citation({"source": "kurallar.pdf", "page": 4}) == "kurallar.pdf s.4"
+        assert format_citation({"source": "kurallar.pdf", "page": 4, "page_end": 5}) == "kurallar.pdf s.4-5"
+        assert format_citation({"source": "sss.md"}) == "sss.md"
+
+    def test_format_sources_merges_pages(self):
+        metadata = [
+            {"source": "kurallar.pdf", "page": 4},
+            {"source": "sss.md"},
+            {"source": "kurallar.pdf", "page": 2, "page_end": 3},
+            {"source": "kurallar.pdf", "page": 4},
+        ]
+        assert format_sources(metadata) == ["kurallar.pdf s.2, 3, 4", "sss.md"]
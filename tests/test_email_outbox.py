@@ -0,0 +1,299 @@
+"""
+E-posta giden kutusu (kalıcı kuyruk + arka plan worker'ı) ve kalıcı SMTP oturumu testleri.
+"""
+
+import smtplib
+import socket
+import sqlite3
+import time
+import pytest
+from src.clients import SMTPClient
+from src.core.singleton import SingletonMeta
+from src.repositories import EmailOutboxRepository
+from src.services import EmailOutboxService
+
+
+class FileDatabase:
+    def __init__(self, path):
+        self.path = path
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+@pytest.fixture
+def outbox_repo(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE email_outbox (
+            id TEXT PRIMARY KEY, recipients TEXT NOT NULL, subject TEXT NOT NULL, body TEXT NOT NULL,
+            is_html INTEGER DEFAULT 0, status TEXT DEFAULT 'pending', attempts INTEGER DEFAULT 0,
+            next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, sent_at TIMESTAMP
+        )
+    """)
+    conn.close()
+    return EmailOutboxRepository(FileDatabase(path))
+
+
+@pytest.fixture
+def smtp_env(monkeypatch):
+    monkeypatch.setenv("SMTP_EMAIL", "bot@example.com")
+    monkeypatch.setenv("SMTP_PASSWORD", "secret")
+    monkeypatch.setenv("ADMIN_EMAIL", "a@example.com, b@example.com")
+    monkeypatch.delitem(SingletonMeta._instances, SMTPClient, raising=False)
+    yield monkeypatch
+    SingletonMeta._instances.pop(SMTPClient, None)
+
+
+class FakeSMTPClient:
+    def __init__(self, failures=0, error=None, refused=None):
+        self.failures = failures
+        self.error = error or smtplib.SMTPServerDisconnected("bağlantı koptu")
+        self.refused = refused or {}
+        self.sent = []
+        self.hidden = []
+        self.closed = 0
+
+    def send_message(self, to_emails, subject, body, is_html=False, hide_recipients=False):
+        time.sleep(0.05)  # SMTP gecikmesi
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.sent.append((tuple(to_emails), subject))
+        self.hidden.append(hide_recipients)
+        return {r: self.refused[r] for r in to_emails if r in self.refused}
+
+    def admin_recipients(self):
+        return ["a@example.com", "b@example.com"]
+
+    def close(self):
+        self.closed += 1
+
+
+class TestEmailOutbox:
+    """EmailOutboxService testleri."""
+
+    def test_enqueue_returns_without_sending(self, outbox_repo):
+        """Kuyruğa ekleme SMTP'yi beklememeli, worker sonra göndermeli."""
+        smtp = FakeSMTPClient()
+        service = EmailOutboxService(smtp, outbox_repo, poll_interval=0.05)
+
+        started = time.perf_counter()
+        service.enqueue("a@example.com", "Konu", "Gövde")
+        assert time.perf_counter() - started < 0.05
+        assert smtp.sent == []
+
+        service.start()
+        deadline = time.monotonic() + 3
+        while not smtp.sent and time.monotonic() < deadline:
+            time.sleep(0.02)
+        service.shutdown()
+
+        assert smtp.sent == [(("a@example.com",), "Konu")]
+        assert outbox_repo.count_by_status() == {"sent": 1}
+        assert smtp.closed == 1
+
+    def test_identical_messages_are_batched(self, outbox_repo):
+        """Aynı içerikli e-postalar tek gönderimde, alıcıları birleştirilerek gönderilmeli."""
+        smtp = FakeSMTPClient()
+        service = EmailOutboxService(smtp, outbox_repo)
+        service.enqueue(["a@example.com"], "Bildirim", "Gövde")
+        service.enqueue(["b@example.com", "a@example.com"], "Bildirim", "Gövde")
+        service.enqueue(["c@example.com"], "Başka", "Gövde")
+
+        assert service.drain() == 3
+        assert smtp.sent == [
+            (("a@example.com", "b@example.com"), "Bildirim"),
+            (("c@example.com",), "Başka"),
+        ]
+        assert service.get_stats()["batches"] == 2
+        # Birleştirilen gönderimde alıcılar birbirini görmemeli
+        assert smtp.hidden == [True, False]
+
+    def test_failure_is_retried_with_backoff(self, outbox_repo):
+        """Başarısız gönderim ertelenmeli, deneme hakkı bitince failed olmalı."""
+        smtp = FakeSMTPClient(failures=10)
+        service = EmailOutboxService(smtp, outbox_repo, max_attempts=3, retry_base_delay=30)
+        email_id = service.enqueue("a@example.com", "Konu", "Gövde")
+
+        assert service.drain() == 0
+        row = outbox_repo.get(email_id)
+        assert (row["status"], row["attempts"]) == ("pending", 1)
+        assert "bağlantı koptu" in row["last_error"]
+        # Bekleme süresi dolmadan tekrar denenmemeli
+        assert outbox_repo.get_due() == []
+
+        # Sonraki denemeler: süre dolmuş gibi kaydı öne çek
+        for _ in range(2):
+            with outbox_repo.db_client.get_connection() as conn:
+                conn.execute("UPDATE email_outbox SET next_attempt_at = datetime('now', '-1 seconds')")
+                conn.commit()
+            service.drain()
+
+        row = outbox_repo.get(email_id)
+        assert (row["status"], row["attempts"]) == ("failed", 3)
+        assert service.get_stats()["failed"] == 1
+
+    def test_refused_recipients_are_not_marked_sent(self, outbox_repo):
+        """5xx ile reddedilen alıcı failed olmalı, 4xx alıcı tek başına yeniden denenmeli."""
+        smtp = FakeSMTPClient(refused={
+            "b@example.com": (550, b"No such user"),
+            "c@example.com": (452, b"Mailbox full"),
+        })
+        service = EmailOutboxService(smtp, outbox_repo)
+        ok_id = service.enqueue(["a@example.com"], "Bildirim", "Gövde")
+        bad_id = service.enqueue(["b@example.com", "d@example.com"], "Bildirim", "Gövde")
+        later_id = service.enqueue(["c@example.com", "e@example.com"], "Bildirim", "Gövde")
+
+        assert service.drain() == 1
+        assert outbox_repo.get(ok_id)["status"] == "sent"
+
+        bad = outbox_repo._to_email(outbox_repo.get(bad_id))
+        assert (bad["status"], bad["recipients"]) == ("failed", ["b@example.com"])
+        assert "550" in bad["last_error"]
+
+        later = outbox_repo._to_email(outbox_repo.get(later_id))
+        assert (later["status"], later["attempts"], later["recipients"]) == ("pending", 1, ["c@example.com"])
+
+    def test_permanent_error_is_not_retried(self, outbox_repo):
+        """5xx SMTP yanıtı (örn. 554) tekrar denenmeden failed olmalı."""
+        smtp = FakeSMTPClient(failures=1, error=smtplib.SMTPDataError(554, b"Message rejected"))
+        service = EmailOutboxService(smtp, outbox_repo, max_attempts=5)
+        email_id = service.enqueue("a@example.com", "Konu", "Gövde")
+
+        assert service.drain() == 0
+        row = outbox_repo.get(email_id)
+        assert (row["status"], row["attempts"]) == ("failed", 1)
+
+    def test_all_recipients_refused(self, outbox_repo):
+        """SMTPRecipientsRefused: kayıt reddedilen alıcılar olarak işlenmeli."""
+        error = smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No such user")})
+        service = EmailOutboxService(FakeSMTPClient(failures=1, error=error), outbox_repo)
+        email_id = service.enqueue("a@example.com", "Konu", "Gövde")
+
+        assert service.drain() == 0
+        assert outbox_repo.get(email_id)["status"] == "failed"
+
+    def test_request_notification_is_queued(self, outbox_repo):
+        """Talep bildirimi tüm yöneticiler için tek kayıt olarak kuyruğa eklenmeli."""
+        service = EmailOutboxService(FakeSMTPClient(), outbox_repo)
+        email_id = service.send_request_notification("U1", "Yeni kanal istiyorum")
+
+        row = outbox_repo._to_email(outbox_repo.get(email_id))
+        assert row["recipients"] == ["a@example.com", "b@example.com"]
+        assert row["is_html"] and "Yeni kanal istiyorum" in row["body"]
+
+
+class FakeSMTPServer:
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.messages = []
+        self.alive = True
+        FakeSMTPServer.instances.append(self)
+
+    def ehlo(self):
+        return (250, b"ok")
+
+    def starttls(self):
+        return (220, b"ok")
+
+    def has_extn(self, name):
+        return name == "auth"
+
+    def login(self, user, password):
+        return (235, b"ok")
+
+    def noop(self):
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected("kapalı")
+        return (250, b"ok")
+
+    def send_message(self, msg, to_addrs=None):
+        self.messages.append(to_addrs)
+        self.headers = dict(msg.items())
+        return {}
+
+    def quit(self):
+        self.alive = False
+
+    def close(self):
+        self.alive = False
+
+
+class TestSMTPSession:
+    """SMTPClient kalıcı oturum testleri."""
+
+    def test_session_is_reused_and_reopened(self, smtp_env):
+        """Gönderimler tek oturumu paylaşmalı, düşen oturum yeniden açılmalı."""
+        FakeSMTPServer.instances = []
+        smtp_env.setattr(smtplib, "SMTP", FakeSMTPServer)
+        client = SMTPClient()
+
+        for i in range(3):
+            client.send_message([f"u{i}@example.com"], "Konu", "Gövde")
+        assert len(FakeSMTPServer.instances) == 1
+        assert len(FakeSMTPServer.instances[0].messages) == 3
+
+        FakeSMTPServer.instances[0].alive = False
+        client.send_email("a@example.com", "Konu", "Gövde")
+        assert len(FakeSMTPServer.instances) == 2
+        assert client.connections_opened == 2
+
+        client.close()
+        assert not FakeSMTPServer.instances[1].alive
+
+    def test_hidden_recipients_stay_in_envelope(self, smtp_env):
+        """Gizli gönderimde adresler To başlığında değil sadece zarfta olmalı."""
+        FakeSMTPServer.instances = []
+        smtp_env.setattr(smtplib, "SMTP", FakeSMTPServer)
+        client = SMTPClient()
+
+        client.send_message(["a@example.com", "b@example.com"], "Konu", "Gövde", hide_recipients=True)
+        server = FakeSMTPServer.instances[0]
+        assert server.messages == [["a@example.com", "b@example.com"]]
+        assert server.headers["To"] == "undisclosed-recipients:;"
+        client.close()
+
+    def test_delivery_against_local_server(self, smtp_env, outbox_repo):
+        """Yerel aiosmtpd sunucusuna kuyruktan tek oturumla gerçek gönderim."""
+        pytest.importorskip("aiosmtpd")
+        from aiosmtpd.controller import Controller
+
+        class Handler:
+            def __init__(self):
+                self.envelopes = []
+
+            async def handle_DATA(self, server, session, envelope):
+                self.envelopes.append((session.peer, tuple(envelope.rcpt_tos)))
+                return "250 OK"
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        handler = Handler()
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        try:
+            client = SMTPClient(smtp_host="127.0.0.1", smtp_port=port, use_tls=False)
+            service = EmailOutboxService(client, outbox_repo)
+
+            service.enqueue("a@example.com", "Bir", "Gövde")
+            service.enqueue("b@example.com", "Bir", "Gövde")
+            service.enqueue("c@example.com", "İki", "Gövde")
+            assert service.drain() == 3
+            service.shutdown()
+        finally:
+            controller.stop()
+
+        assert [rcpts for _, rcpts in handler.envelopes] == [
+            ("a@example.com", "b@example.com"), ("c@example.com",)
+        ]
+        # Tüm gönderimler aynı bağlantıdan geldi
+        assert len({peer for peer, _ in handler.envelopes}) == 1
+        assert client.connections_opened == 1
@@ -0,0 +1,118 @@
+"""
+Sınırlı eşzamanlı fan-out ve DM kanal önbelleği testleri.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from src.commands import DirectMessageManager, fan_out
+from src.commands.rate_limit import SlackRateLimiter
+from src.core.exceptions import SlackClientError
+
+
+class FakeConv:
+    def __init__(self):
+        self.opened = []
+
+    def open_conversation(self, users):
+        time.sleep(0.05)
+        self.opened.append(users[0])
+        return {"id": f"D{users[0]}-{self.opened.count(users[0])}"}
+
+
+class FakeChat:
+    def __init__(self, failing=(), stale=()):
+        self.failing = set(failing)
+        self.stale = set(stale)
+        self.posts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def post_message(self, channel, text, blocks=None):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.1)  # Slack round-trip
+            if channel in self.stale:
+                self.stale.discard(channel)
+                raise SlackClientError("Mesaj gönderilemedi: channel_not_found")
+            if any(channel.startswith(f"D{u}-") for u in self.failing):
+                raise SlackClientError("Mesaj gönderilemedi: user_disabled")
+            self.posts.append((channel, text))
+            return {"ok": True, "channel": channel}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestFanOut:
+    """fan_out ve DirectMessageManager testleri."""
+
+    def test_team_is_notified_in_parallel(self):
+        """20 kişilik ekip tek tek değil, eşzamanlı bildirilmeli."""
+        chat, conv = FakeChat(), FakeConv()
+        dm = DirectMessageManager(chat, conv, max_concurrency=20)
+        users = [f"U{i}" for i in range(20)]
+
+        started = time.perf_counter()
+        result = dm.send_dms(users + ["U0"], "Merhaba")
+        elapsed = time.perf_counter() - started
+
+        assert result.ok and result.total == 20
+        assert elapsed < 0.5  # sıralı olsaydı 20 * 0.15 = 3s
+        assert len(chat.posts) == 20
+
+        # İkinci gönderimde DM kanalları önbellekten gelir
+        dm.send_dms(users, lambda u: (f"Selam {u}", None))
+        assert len(conv.opened) == 20
+        assert dm.channels.hits == 20
+        assert ("DU3-1", "Selam U3") in chat.posts
+
+    def test_concurrency_is_bounded(self):
+        """Aynı anda uçuşta olan çağrı sayısı sınırı aşmamalı."""
+        chat, conv = FakeChat(), FakeConv()
+        DirectMessageManager(chat, conv, max_concurrency=3).send_dms([f"U{i}" for i in range(9)], "x")
+        assert chat.max_in_flight <= 3
+
+    def test_partial_failures_are_reported(self):
+        """Bir kullanıcının hatası diğerlerini durdurmamalı, sonuçta raporlanmalı."""
+        chat, conv = FakeChat(failing={"U2"}), FakeConv()
+        result = DirectMessageManager(chat, conv).send_dms(["U1", "U2", "U3"], "x")
+
+        assert not result.ok
+        assert set(result.succeeded) == {"U1", "U3"}
+        assert "user_disabled" in str(result.failed["U2"])
+        assert result.summary().startswith("2/3")
+
+    def test_stale_dm_channel_is_reopened(self):
+        """Önbellekteki DM kanalı geçersizse bir kez yeniden açılmalı."""
+        chat, conv = FakeChat(stale={"DU1-1"}), FakeConv()
+        dm = DirectMessageManager(chat, conv)
+        dm.send_dm("U1", "x")
+        assert chat.posts == [("DU1-2", "x")]
+        assert conv.opened == ["U1", "U1"]
+
+    def test_queued_dms_do_not_block_caller(self):
+        """queue_dms handler'ı bekletmemeli; DM'ler Slack rate limit kuyruğunda gönderilmeli."""
+        chat, conv = FakeChat(), FakeConv()
+        chat.client = SimpleNamespace(limiter=SlackRateLimiter.__new__(SlackRateLimiter))
+        SlackRateLimiter.__init__(chat.client.limiter)
+        dm = DirectMessageManager(chat, conv)
+
+        started = time.perf_counter()
+        future = dm.queue_dms(["U1", "U2"], "x")
+        single = dm.queue_dm("U3", "y")
+        assert time.perf_counter() - started < 0.05
+
+        assert future.result(timeout=3).ok
+        single.result(timeout=3)
+        assert sorted(chat.posts) == [("DU1-1", "x"), ("DU2-1", "x"), ("DU3-1", "y")]
+
+    def test_fan_out_deduplicates_keys(self):
+        """Aynı anahtarlı öğeler bir kez işlenmeli."""
+        seen = []
+        result = fan_out(seen.append, ["a", "b", "a"])
+        assert sorted(seen) == ["a", "b"]
+        assert set(result.succeeded) == {"a", "b"}
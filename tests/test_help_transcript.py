@@ -0,0 +1,152 @@
+"""
+Yardım kanalı kapanış analizi (döküm sıkıştırma, JSON doğrulama, tek LLM çağrısı) testleri.
+"""
+
+import asyncio
+import pytest
+from src.services import HelpService
+from src.services.help_transcript import (
+    CHARS_PER_TOKEN,
+    collect_user_messages,
+    compact_transcript,
+    parse_analysis,
+)
+
+
+class TestCompactTranscript:
+    """compact_transcript testleri."""
+
+    def test_dedupes_and_normalizes(self):
+        """Tekrarlanan ve boş mesajlar atılmalı, boşluklar sadeleşmeli."""
+        text = compact_transcript([
+            ("U1", "Merhaba,   pip install   hata veriyor"),
+            ("U1", "merhaba, pip install hata veriyor"),
+            ("U2", "  "),
+            ("U2", "Sürümün ne?"),
+        ])
+        assert text.splitlines() == ["<@U1>: Merhaba, pip install hata veriyor", "<@U2>: Sürümün ne?"]
+
+    def test_fits_budget_keeping_head_and_tail(self):
+        """Uzun dökümde baş ve son mesajlar korunmalı, aradakiler tek notla özetlenmeli."""
+        messages = [(f"U{i % 3}", f"mesaj {i} " + "x" * 80) for i in range(400)]
+        text = compact_transcript(messages, token_budget=500)
+        lines = text.splitlines()
+
+        assert len(text) <= 500 * CHARS_PER_TOKEN + 100
+        assert lines[0].startswith("<@U0>: mesaj 0 ")
+        assert lines[-1].startswith("<@U0>: mesaj 399 ")
+        assert any("mesaj kısaltıldı" in line for line in lines)
+
+    def test_collect_skips_bots_and_system_messages(self):
+        """Bot ve sistem (subtype) mesajları dökümde yer almamalı."""
+        messages = [
+            {"type": "message", "user": "U1", "text": "soru"},
+            {"type": "message", "bot_id": "B1", "text": "bot"},
+            {"type": "message", "subtype": "channel_join", "user": "U2", "text": "katıldı"},
+            {"type": "message", "subtype": "message_changed", "message": {"user": "U1", "text": "soru!"}},
+        ]
+        assert collect_user_messages(messages) == [("U1", "soru")]
+
+    def test_collect_keeps_user_content_subtypes(self):
+        """Dosya paylaşımı ve kanala gönderilen thread yanıtları dökümde kalmalı."""
+        messages = [
+            {"type": "message", "subtype": "file_share", "user": "U1", "text": "hata logu ekte"},
+            {"type": "message", "subtype": "thread_broadcast", "user": "U2", "text": "çözüldü"},
+        ]
+        assert collect_user_messages(messages) == [("U1", "hata logu ekte"), ("U2", "çözüldü")]
+
+
+class TestParseAnalysis:
+    """parse_analysis testleri."""
+
+    def test_accepts_fenced_json(self):
+        result = parse_analysis('Tabii:\n```json\n{"summary": " Çözüldü. ", "analysis": "Detay", "resolved": true}\n```')
+        assert (result.summary, result.analysis, result.resolved) == ("Çözüldü.", "Detay", True)
+
+    def test_rejects_missing_fields(self):
+        with pytest.raises(ValueError):
+            parse_analysis('{"summary": "sadece özet"}')
+        with pytest.raises(ValueError):
+            parse_analysis("JSON değil")
+
+
+class FakeGroq:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    async def ask_json(self, system_prompt, user_prompt):
+        self.calls.append(user_prompt)
+        return self.response
+
+
+class FakeConv:
+    def __init__(self, messages):
+        self.messages = messages
+        self.history_calls = []
+
+    def iter_history(self, channel_id, max_items=None):
+        self.history_calls.append(max_items)
+        return iter(self.messages)
+
+    def archive_channel(self, channel_id):
+        return True
+
+
+class FakeSettings:
+    admin_channel_id = "CADMIN"
+
+
+class FakeChat:
+    def __init__(self):
+        self.posts = []
+
+    def post_message(self, channel, text, blocks=None):
+        self.posts.append((channel, text, blocks))
+
+
+class FakeDM:
+    def __init__(self):
+        self.sent = []
+
+    def send_dms(self, user_ids, text, blocks=None, name=None):
+        self.sent.append((list(user_ids), blocks))
+
+        class Result:
+            def summary(self):
+                return "ok"
+        return Result()
+
+
+class FakeHelpRepo:
+    def get(self, help_id):
+        return {"id": help_id, "topic": "Pip hatası", "requester_id": "U1", "helper_id": "U2"}
+
+    def update(self, help_id, data):
+        pass
+
+
+class TestHelpChannelClosure:
+    """HelpService._close_help_channel testleri."""
+
+    def test_single_structured_call(self, monkeypatch):
+        """Özet ve analiz tek LLM çağrısından gelmeli, döküm kronolojik olmalı."""
+        monkeypatch.setattr("src.core.settings.get_settings", lambda: FakeSettings())
+
+        # Slack en yeniden eskiye döndürür
+        conv = FakeConv([
+            {"type": "message", "user": "U2", "text": "Sürümü güncelle"},
+            {"type": "message", "user": "U1", "text": "pip hata veriyor"},
+        ])
+        groq = FakeGroq('{"summary": "Pip sorunu çözüldü.", "analysis": "U2 güncelleme önerdi.", "resolved": true}')
+        chat, dm = FakeChat(), FakeDM()
+        service = HelpService(chat, conv, None, FakeHelpRepo(), None, groq, None, dm_manager=dm)
+
+        asyncio.run(service._close_help_channel("h1", "CHELP"))
+
+        assert len(groq.calls) == 1
+        assert groq.calls[0].index("pip hata veriyor") < groq.calls[0].index("Sürümü güncelle")
+        assert conv.history_calls and conv.history_calls[0] > 100
+        assert "U2 güncelleme önerdi." in dm.sent[0][1][0]["text"]["text"]
+        admin_text = next(text for channel, text, _ in chat.posts if channel == "CADMIN")
+        assert "Pip sorunu çözüldü." in admin_text
@@ -0,0 +1,79 @@
+"""
+Kuyruk tabanlı log hattı, JSON formatlayıcı ve örnekleme testleri.
+"""
+
+import json
+import logging
+import time
+from src.core.logger import JsonLinesFormatter, LogSampler, setup_logger, stop_logging
+
+
+def make_record(msg, level=logging.INFO, module="chat_commands", **extra):
+    record = logging.LogRecord("CemilBot", level, f"/src/{module}.py", 1, msg, None, None)
+    record.module = module
+    record.__dict__.update(extra)
+    return record
+
+
+class SlowHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        time.sleep(0.02)  # yavaş disk
+        self.messages.append(record.getMessage())
+
+
+class TestLogPipeline:
+    """setup_logger / LogSampler / JsonLinesFormatter testleri."""
+
+    def test_json_formatter_fields(self):
+        """Ek alanlar (user/cmd/latency_ms) ayrı JSON anahtarları olmalı."""
+        line = JsonLinesFormatter().format(make_record("Oy verildi", user="U1", cmd="/oylama", latency_ms=12.5))
+        entry = json.loads(line)
+        assert entry["message"] == "Oy verildi"
+        assert (entry["user"], entry["cmd"], entry["latency_ms"]) == ("U1", "/oylama", 12.5)
+        assert entry["level"] == "INFO" and entry["module"] == "chat_commands"
+
+    def test_sampler_limits_chatty_modules(self):
+        """Modül başına pencere limiti aşılınca INFO atılmalı, WARNING her zaman geçmeli."""
+        sampler = LogSampler(limit=3, window=0.2, module_limits={"voting_service": 1})
+        passed = [sampler.filter(make_record(f"m{i}")) for i in range(10)]
+        assert passed.count(True) == 3
+        assert sampler.filter(make_record("uyarı", level=logging.WARNING))
+        assert sampler.filter(make_record("oy", module="voting_service"))
+        assert not sampler.filter(make_record("oy", module="voting_service"))
+
+        time.sleep(0.25)
+        record = make_record("yeni pencere")
+        assert sampler.filter(record)
+        assert "7 benzer kayıt atlandı" in record.getMessage()
+
+    def test_queue_handler_does_not_block(self, tmp_path):
+        """Yavaş handler log çağıran thread'i bekletmemeli; kapanışta kayıtlar yazılmalı."""
+        logger = setup_logger("test-queue", str(tmp_path / "q.log"), use_queue=True, sample_limit=0)
+        slow = SlowHandler()
+        # Dinleyicinin handler'larını yavaş handler ile değiştir
+        from src.core import logger as logger_module
+        listener = logger_module._listeners["test-queue"]
+        listener.handlers = (slow,)
+
+        started = time.perf_counter()
+        for i in range(10):
+            logger.info("kayıt %d", i)
+        assert time.perf_counter() - started < 0.05
+
+        stop_logging("test-queue")
+        assert slow.messages == [f"kayıt {i}" for i in range(10)]
+
+    def test_json_file_output(self, tmp_path):
+        """JSON modunda dosyaya her satır bir JSON kaydı yazılmalı."""
+        path = tmp_path / "j.log"
+        logger = setup_logger("test-json", str(path), json_format=True, use_queue=True, sample_limit=0)
+        logger.info("[+] Mesaj gönderildi", extra={"user": "U1", "channel": "C1"})
+        stop_logging("test-json")
+
+        entry = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+        assert entry["message"] == "[+] Mesaj gönderildi"
+        assert entry["channel"] == "C1"
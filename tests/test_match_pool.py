@@ -0,0 +1,87 @@
+"""
+Kahve bekleme havuzu (CoffeeMatchPool) testleri.
+"""
+
+from src.services.match_pool import CoffeeMatchPool
+
+
+class FakePoolRepo:
+    """coffee_pool tablosunu taklit eden basit depo."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def add(self, user_id, channel_id, user_name, expires_at):
+        self.rows[user_id] = {
+            "user_id": user_id, "channel_id": channel_id,
+            "user_name": user_name, "expires_at": expires_at,
+        }
+
+    def remove_many(self, user_ids):
+        for user_id in list(user_ids):
+            self.rows.pop(user_id, None)
+
+    def list_waiting(self):
+        return sorted(self.rows.values(), key=lambda r: r["expires_at"])
+
+
+class TestCoffeeMatchPool:
+    """CoffeeMatchPool testleri."""
+
+    def test_enqueue_then_match_fifo(self):
+        """İkinci gelen en eski bekleyenle eşleşmeli."""
+        pool = CoffeeMatchPool(timeout_seconds=300)
+        assert pool.take_partner_or_enqueue("U1", "C", "A", now=0)[0] == "queued"
+        assert pool.take_partner_or_enqueue("U1", "C", "A", now=1)[0] == "already_waiting"
+        status, partner = pool.take_partner_or_enqueue("U2", "C", "B", now=2)
+        assert status == "matched"
+        assert partner["user_id"] == "U1"
+        assert len(pool) == 0
+
+    def test_avoids_recent_partner_when_possible(self):
+        """Yakın zamanda eşleşilen kişi yerine sıradaki tercih edilmeli."""
+        pool = CoffeeMatchPool()
+        pool._waiting["U1"] = {"user_id": "U1", "expires_at": 300}
+        pool._waiting["U2"] = {"user_id": "U2", "expires_at": 301}
+
+        _, partner = pool.take_partner_or_enqueue("U3", "C", "X", avoid={"U1"}, now=10)
+        assert partner["user_id"] == "U2"
+        _, partner = pool.take_partner_or_enqueue("U4", "C", "Y", avoid={"U1"}, now=11)
+        assert partner["user_id"] == "U1"
+
+    def test_single_sweep_expires_only_due_users(self):
+        """Tarama sadece süresi dolanları çıkarmalı ve bekleme süresini sıfırlamalı."""
+        repo = FakePoolRepo()
+        pool = CoffeeMatchPool(repo, timeout_seconds=300, cooldown_seconds=300)
+        pool.take_partner_or_enqueue("U1", "C", "A", now=0)
+        pool._waiting["U2"] = {"user_id": "U2", "expires_at": 500}
+
+        expired = pool.expire(now=301)
+        assert [e["user_id"] for e in expired] == ["U1"]
+        assert "U2" in pool
+        assert "U1" not in repo.rows
+        assert pool.cooldown_remaining("U1", now=301) == 0
+
+    def test_pool_survives_restart(self):
+        """Havuz veritabanından aynı sırayla geri yüklenmeli."""
+        repo = FakePoolRepo()
+        pool = CoffeeMatchPool(repo)
+        pool.take_partner_or_enqueue("U1", "C", "A", now=0)
+
+        restored = CoffeeMatchPool(repo)
+        assert restored.restore() == 1
+        assert "U1" in restored
+        assert restored.cooldown_remaining("U1", now=60) == 240
+
+    def test_match_round_avoids_repeats(self):
+        """Toplu tur tekrar eden çiftleri mümkün olduğunca önlemeli."""
+        pool = CoffeeMatchPool()
+        for i, user_id in enumerate(["U1", "U2", "U3", "U4", "U5"]):
+            pool._waiting[user_id] = {"user_id": user_id, "expires_at": i}
+
+        pairs = pool.match_round({"U1": {"U2"}, "U2": {"U1"}})
+        pairs = {frozenset((a["user_id"], b["user_id"])) for a, b in pairs}
+
+        assert len(pairs) == 2
+        assert frozenset(("U1", "U2")) not in pairs
+        assert len(pool) == 1
@@ -0,0 +1,75 @@
+"""
+Slack cursor sayfalama testleri.
+"""
+
+import pytest
+from src.commands.pagination import iter_cursor_pages
+from src.core.exceptions import SlackClientError
+
+
+class FakeListMethod:
+    """Sayfalı bir Slack liste metodunu taklit eder."""
+
+    def __init__(self, items, error_on_call=None):
+        self.items = items
+        self.calls = []
+        self.error_on_call = error_on_call
+
+    def __call__(self, limit, cursor=None, **kwargs):
+        self.calls.append({"limit": limit, "cursor": cursor, **kwargs})
+        if self.error_on_call is not None and len(self.calls) == self.error_on_call:
+            return {"ok": False, "error": "channel_not_found"}
+        start = int(cursor) if cursor else 0
+        end = start + limit
+        next_cursor = str(end) if end < len(self.items) else ""
+        return {
+            "ok": True,
+            "members": self.items[start:end],
+            "response_metadata": {"next_cursor": next_cursor},
+        }
+
+
+class TestIterCursorPages:
+    """iter_cursor_pages testleri."""
+
+    def test_follows_all_pages(self):
+        """Tüm sayfalar cursor ile takip edilmeli."""
+        method = FakeListMethod([f"U{i}" for i in range(25)])
+        result = list(iter_cursor_pages(method, "members", page_size=10, channel="C1"))
+        assert result == [f"U{i}" for i in range(25)]
+        assert len(method.calls) == 3
+        assert method.calls[1]["cursor"] == "10"
+        assert method.calls[0]["channel"] == "C1"
+
+    def test_is_lazy(self):
+        """Erken durdurulan döngü kalan sayfaları istememeli."""
+        method = FakeListMethod([f"U{i}" for i in range(50)])
+        for member in iter_cursor_pages(method, "members", page_size=10):
+            if member == "U3":
+                break
+        assert len(method.calls) == 1
+
+    def test_max_items(self):
+        """max_items sınırı hem sonucu hem sayfa limitini kısıtlamalı."""
+        method = FakeListMethod([f"U{i}" for i in range(50)])
+        result = list(iter_cursor_pages(method, "members", page_size=10, max_items=15))
+        assert len(result) == 15
+        assert method.calls[-1]["limit"] == 5
+
+    def test_error_response(self):
+        """ok=False yanıtı SlackClientError fırlatmalı."""
+        method = FakeListMethod([f"U{i}" for i in range(30)], error_on_call=2)
+        with pytest.raises(SlackClientError):
+            list(iter_cursor_pages(method, "members", page_size=10))
+
+    def test_rate_limit_error_is_not_retried_again(self):
+        """429 tekrar denemeleri SlackRateLimiter'da yapılır; sayfalayıcı aynı sayfayı yeniden istememeli."""
+        calls = []
+
+        def method(limit, cursor=None):
+            calls.append(cursor)
+            raise RuntimeError("ratelimited")
+
+        with pytest.raises(SlackClientError):
+            list(iter_cursor_pages(method, "members"))
+        assert calls == [None]
@@ -57,3 +57,93 @@ class TestRateLimiter:
         # Reset
         limiter.reset("user1")
         assert limiter.is_allowed("user1")[0] is True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("src.core.rate_limiter.time", fake)
+    return fake
+
+
+class TestSlidingWindow:
+    """Kayan pencere sayacı, boşta anahtar silme ve isimli limiter testleri."""
+
+    def test_previous_window_is_weighted(self, clock):
+        """Önceki pencere geçen süre oranında sayılmalı; pencere bitince istek hakkı geri gelmeli."""
+        limiter = RateLimiter(max_requests=4, window_seconds=60)
+        for _ in range(4):
+            assert limiter.is_allowed("user1")[0] is True
+        allowed, msg = limiter.is_allowed("user1")
+        assert allowed is False
+        assert "saniye" in msg
+
+        # Sonraki pencerenin yarısında önceki 4 istek ~2 sayılır -> 2 yeni istek
+        clock.now += 90
+        assert limiter.is_allowed("user1")[0] is True
+        assert limiter.is_allowed("user1")[0] is True
+        assert limiter.is_allowed("user1")[0] is False
+
+    def test_wait_message_is_accurate(self, clock):
+        """Mesajdaki bekleme süresi dolduğunda istek kabul edilmeli, öncesinde edilmemeli."""
+        limiter = RateLimiter(max_requests=3, window_seconds=60)
+        for _ in range(3):
+            limiter.is_allowed("user1")
+        clock.now += 20
+        _, msg = limiter.is_allowed("user1")
+        # Sonraki pencerede önceki 3 isteğin ağırlığı 2/3'e düşünce (t=80) yer açılır
+        assert "60 saniye" in msg
+
+        clock.now += 59
+        assert limiter.is_allowed("user1")[0] is False
+        clock.now += 1
+        assert limiter.is_allowed("user1")[0] is True
+
+    def test_idle_users_are_evicted(self, clock):
+        """Boşta kalan kullanıcılar ayrı bir temizlik işi olmadan bellekten silinmeli."""
+        limiter = RateLimiter(max_requests=5, window_seconds=10)
+        for i in range(100):
+            limiter.is_allowed(f"user{i}")
+        assert len(limiter) == 100
+
+        clock.now += 15
+        limiter.is_allowed("user0")
+        clock.now += 10
+        limiter.is_allowed("active")
+        assert set(limiter.requests) == {"user0", "active"}
+
+    def test_named_limiters(self):
+        """Her komut grubunun ayrı sayacı olmalı; farklı limitler yok sayılmamalı."""
+        from src.core.rate_limiter import get_rate_limiter
+
+        ask = get_rate_limiter("test-knowledge", 1, 60)
+        poll = get_rate_limiter("test-poll", 3, 60)
+        assert ask is not poll
+        assert get_rate_limiter("test-knowledge", 1, 60) is ask
+
+        assert ask.is_allowed("user1")[0] is True
+        assert ask.is_allowed("user1")[0] is False
+        assert poll.is_allowed("user1")[0] is True
+
+        assert get_rate_limiter("test-poll", 5, 30).max_requests == 5
+
+    def test_overrides_from_settings(self):
+        """RATE_LIMIT_OVERRIDES komut grubu limitini belirlemeli."""
+        from src.core.settings import BotSettings
+
+        settings = BotSettings.model_construct(
+            rate_limit_requests=10, rate_limit_window=60,
+            rate_limit_overrides="knowledge=3/120, help=2, poll=x/1"
+        )
+        assert settings.rate_limit_for("knowledge") == (3, 120)
+        assert settings.rate_limit_for("help") == (2, 60)
+        assert settings.rate_limit_for("poll") == (10, 60)
+        assert settings.rate_limit_for("coffee") == (10, 60)
@@ -0,0 +1,102 @@
+"""
+Cross-encoder yeniden sıralama (bütçe, erken çıkış) ve /sor bağlamı testleri.
+"""
+
+from src.clients.reranker_client import RerankerClient
+from src.services.knowledge_service import KnowledgeService
+
+
+class FakeCrossEncoder:
+    """Soru ile parçanın ortak kelime sayısını skor olarak döndürür; çağrılan partileri kaydeder."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, pairs, batch_size=32):
+        self.batches.append(len(pairs))
+        return [float(len(set(query.split()) & set(text.split()))) for query, text in pairs]
+
+
+class FakeVector:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def collection_sizes(self):
+        return {"genel": len(self.docs)}
+
+    def search(self, query, top_k=5, threshold=0.8, collections=None, sources=None):
+        self.calls.append(top_k)
+        return [dict(doc) for doc in self.docs[:top_k]]
+
+
+def make_reranker(batch_size=2, budget_ms=1000.0, early_exit_score=None):
+    reranker = RerankerClient.__new__(RerankerClient)
+    reranker.__init__(batch_size=batch_size, budget_ms=budget_ms, early_exit_score=early_exit_score)
+    reranker._model = FakeCrossEncoder()
+    return reranker
+
+
+def doc(text, source="a.md", score=0.5):
+    return {"text": text, "metadata": {"source": source}, "score": score}
+
+
+CANDIDATES = [
+    doc("kahve eşleşmesi"),
+    doc("oylama sistemi"),
+    doc("challenge takım kişi sayısı"),
+    doc("challenge takım"),
+    doc("doğum günü"),
+]
+
+
+class TestReranker:
+    def test_orders_by_cross_encoder_score_and_keeps_top_n(self):
+        reranker = make_reranker()
+        results = reranker.rerank("challenge takım kişi", CANDIDATES, top_n=2)
+
+        assert [r["text"] for r in results] == ["challenge takım kişi sayısı", "challenge takım"]
+        assert results[0]["rerank_score"] == 3.0
+        assert reranker._model.batches == [2, 2, 1]
+        assert "rerank_score" not in CANDIDATES[2]
+
+    def test_budget_stops_after_first_batch(self):
+        reranker = make_reranker(budget_ms=0.0)
+        results = reranker.rerank("challenge takım kişi", CANDIDATES, top_n=4)
+
+        # Sadece ilk parti puanlandı; kalanlar vektör sırasıyla arkaya eklenir
+        assert reranker._model.batches == [2]
+        assert [r["text"] for r in results] == ["kahve eşleşmesi", "oylama sistemi", "challenge takım kişi sayısı", "challenge takım"]
+        assert "rerank_score" not in results[2]
+
+    def test_early_exit_when_enough_confident_chunks(self):
+        reranker = make_reranker(batch_size=2, early_exit_score=2.0)
+        candidates = [doc("challenge takım"), doc("takım challenge kişi"), doc("kahve")]
+        results = reranker.rerank("challenge takım", candidates, top_n=2)
+
+        assert reranker._model.batches == [2]
+        assert len(results) == 2
+
+    def test_empty_candidates(self):
+        assert make_reranker().rerank("soru", []) == []
+
+
+class TestRetrieveContext:
+    def test_reranker_receives_wide_candidate_set(self):
+        vector = FakeVector(CANDIDATES)
+        service = KnowledgeService(vector, None, reranker=make_reranker(), rerank_candidates=5, rerank_top_n=2)
+        results = service.retrieve_context("challenge takım kişi")
+
+        assert vector.calls == [5]
+        assert [r["text"] for r in results] == ["challenge takım kişi sayısı", "challenge takım"]
+
+    def test_reranker_failure_falls_back_to_vector_order(self):
+        reranker = make_reranker()
+        reranker._model.predict = lambda pairs, batch_size=32: 1 / 0
+        service = KnowledgeService(FakeVector(CANDIDATES), None, reranker=reranker, rerank_candidates=5, rerank_top_n=2)
+
+        assert [r["text"] for r in service.retrieve_context("challenge")] == ["kahve eşleşmesi", "oylama sistemi"]
+
+    def test_without_reranker_uses_vector_results(self):
+        service = KnowledgeService(FakeVector(CANDIDATES), None)
+        assert len(service.retrieve_context("challenge")) == 5
@@ -0,0 +1,135 @@
+"""
+Slack rate limit zamanlayıcısı testleri.
+"""
+
+import time
+import pytest
+from src.commands import rate_limit
+from src.core.exceptions import SlackClientError
+from src.commands.rate_limit import TokenBucket, SlackRateLimiter, RateLimitedClient, retry_after_seconds
+
+
+class FakeResponse(dict):
+    """SlackResponse benzeri yanıt (status_code + headers)."""
+
+    def __init__(self, status_code, headers=None, **data):
+        super().__init__(**data)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeRateLimitError(Exception):
+    def __init__(self, retry_after):
+        super().__init__("ratelimited")
+        self.response = FakeResponse(429, {"Retry-After": str(retry_after)}, ok=False, error="ratelimited")
+
+
+class FakeWebClient:
+    token = "xoxb-test"
+
+    def __init__(self, failures=0, retry_after=0):
+        self.failures = failures
+        self.retry_after = retry_after
+        self.kick_calls = 0
+
+    def conversations_kick(self, channel, user):
+        self.kick_calls += 1
+        if self.kick_calls <= self.failures:
+            raise FakeRateLimitError(self.retry_after)
+        return {"ok": True}
+
+
+@pytest.fixture
+def limiter():
+    # SingletonMeta'yı atlayarak her test için temiz bir örnek oluştur
+    instance = SlackRateLimiter.__new__(SlackRateLimiter)
+    SlackRateLimiter.__init__(instance, max_retries=3)
+    return instance
+
+
+class TestTokenBucket:
+    """TokenBucket testleri."""
+
+    def test_burst_then_wait(self, monkeypatch):
+        """Kapasite dolunca bekleme süresi hesaplanmalı."""
+        # Saat sabit: çağrılar arasındaki gecikme (örn. GC duraklaması) sonucu değiştirmesin
+        monkeypatch.setattr(rate_limit.time, "monotonic", lambda: 1000.0)
+        bucket = TokenBucket(per_minute=60, burst=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+        # Kuyruktaki bir sonraki çağrı daha uzun beklemeli (FIFO)
+        assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+    def test_block_honours_retry_after(self):
+        """Retry-After süresi bitene kadar yeni çağrılar beklemeli."""
+        bucket = TokenBucket(per_minute=6000, burst=10)
+        bucket.block(30)
+        assert bucket.reserve() == pytest.approx(30, abs=0.1)
+
+
+class TestSlackRateLimiter:
+    """SlackRateLimiter ve RateLimitedClient testleri."""
+
+    def test_retry_after_parsing(self):
+        assert retry_after_seconds(FakeRateLimitError(7)) == 7
+        assert retry_after_seconds(ValueError("x")) is None
+
+    def test_retries_on_429_and_records_stats(self, limiter):
+        raw = FakeWebClient(failures=1)
+        client = RateLimitedClient(raw, limiter)
+
+        response = client.conversations_kick(channel="C1", user="U1")
+
+        assert response["ok"] is True
+        assert raw.kick_calls == 2
+        stats = limiter.get_stats()["conversations_kick"]
+        assert stats["calls"] == 2
+        assert stats["rate_limited"] == 1
+
+    def test_gives_up_after_max_retries(self, limiter):
+        client = RateLimitedClient(FakeWebClient(failures=10), limiter)
+        with pytest.raises(FakeRateLimitError):
+            client.conversations_kick(channel="C1", user="U1")
+
+    def test_passes_through_attributes(self, limiter):
+        client = RateLimitedClient(FakeWebClient(), limiter)
+        assert client.token == "xoxb-test"
+
+    def test_handler_fails_fast_instead_of_sleeping(self, limiter):
+        """Handler thread'inde uzun kuyruk beklenmemeli; hemen hata verilmeli."""
+        client = RateLimitedClient(FakeWebClient(), limiter)
+        limiter._bucket_for("conversations_kick", {}).block(30)
+
+        started = time.perf_counter()
+        with limiter.handler_context(), pytest.raises(SlackClientError):
+            client.conversations_kick(channel="C1", user="U1")
+        assert time.perf_counter() - started < 0.5
+
+    def test_handler_does_not_sleep_through_long_retry_after(self, limiter):
+        """Handler'da sınırı aşan Retry-After ile 429 uyumadan iletilmeli."""
+        raw = FakeWebClient(failures=1, retry_after=30)
+        client = RateLimitedClient(raw, limiter)
+
+        with limiter.handler_context(), pytest.raises(FakeRateLimitError):
+            client.conversations_kick(channel="C1", user="U1")
+        assert raw.kick_calls == 1
+
+    def test_submit_runs_in_background_queue(self, limiter):
+        """submit çağıranı bekletmemeli; iş handler sınırı olmadan arka planda çalışmalı."""
+        client = RateLimitedClient(FakeWebClient(), limiter)
+        limiter._bucket_for("conversations_kick", {}).block(0.3)
+
+        with limiter.handler_context():
+            started = time.perf_counter()
+            future = limiter.submit(client.conversations_kick, channel="C1", user="U1")
+            assert time.perf_counter() - started < 0.1
+        assert future.result(timeout=3) == {"ok": True}
+
+    def test_handler_executor_marks_listener_threads(self, limiter):
+        executor = limiter.handler_executor(max_workers=1)
+        try:
+            assert executor.submit(lambda: limiter._max_wait()).result() == limiter.handler_max_wait
+        finally:
+            executor.shutdown()
+        assert limiter._max_wait() == limiter.max_queue_wait
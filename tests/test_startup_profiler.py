@@ -0,0 +1,97 @@
+"""
+Açılış profilleyicisi (import süreleri, bütçe kontrolü) ve gecikmeli import testleri.
+"""
+
+import os
+import sqlite3
+import sys
+from src.core.lazy import LazyModule, lazy_import, lazy_load_times
+from src.core.startup_profiler import check_budgets, format_report, parse_importtime, use_database_copies
+
+IMPORTTIME_LINES = [
+    "import time: self [us] | cumulative | imported package",
+    "import time:       120 |        120 |   slack_bolt.util",
+    "import time:      3182 |     900000 | src.bot",
+    "import time:     45000 |      60000 |   src.clients",
+    "[i] INFO  | log satırı",
+]
+
+
+class TestStartupProfiler:
+    """parse_importtime / check_budgets testleri."""
+
+    def test_parse_importtime(self):
+        imports = parse_importtime(IMPORTTIME_LINES)
+        assert set(imports) == {"slack_bolt.util", "src.bot", "src.clients"}
+        assert imports["src.bot"] == {"self": 0.003182, "cumulative": 0.9, "depth": 0}
+        assert imports["src.clients"]["depth"] == 1
+
+    def test_budget_violations(self):
+        report = {
+            "total": 2.5,
+            "phases": [("import'lar", 1.8), ("client'lar", 0.4)],
+            "imports": parse_importtime(IMPORTTIME_LINES),
+        }
+        assert check_budgets(report, total_budget=3, phase_budgets={"client'lar": 0.5}) == []
+
+        violations = check_budgets(
+            report,
+            total_budget=2,
+            phase_budgets={"import'lar": 1.0, "yok": 1.0},
+            import_budgets={"src.bot": 0.5, "torch": 0.1}
+        )
+        assert len(violations) == 4
+        assert any("src.bot" in v for v in violations)
+        assert any("bulunamadı: yok" in v for v in violations)
+
+        text = format_report(report, top=2)
+        assert "client'lar" in text and "src.bot" in text
+
+    def test_profile_child_uses_database_copies(self, tmp_path, monkeypatch):
+        """Profil alt süreci gerçek veritabanı yerine geçici kopyayı açmalı."""
+        original = tmp_path / "bot.db"
+        conn = sqlite3.connect(original)
+        conn.execute("CREATE TABLE challenge_hubs (id TEXT)")
+        conn.execute("INSERT INTO challenge_hubs VALUES ('1')")
+        conn.commit()
+        conn.close()
+        # Ortam değişkenleri test sonunda eski hallerine dönsün
+        monkeypatch.delenv("DB_PATH", raising=False)
+        monkeypatch.delenv("STATE_DB_PATH", raising=False)
+
+        workdir = use_database_copies({"DB_PATH": str(original), "STATE_DB_PATH": str(tmp_path / "yok.db")})
+        copy = os.environ["DB_PATH"]
+        assert copy.startswith(workdir) and copy != str(original)
+
+        conn = sqlite3.connect(copy)
+        conn.execute("DELETE FROM challenge_hubs")
+        conn.commit()
+        conn.close()
+        assert sqlite3.connect(original).execute("SELECT COUNT(*) FROM challenge_hubs").fetchone() == (1,)
+        assert not os.path.exists(os.environ["STATE_DB_PATH"])
+
+
+class TestLazyImport:
+    """lazy_import testleri."""
+
+    def test_import_is_deferred_until_first_use(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_import("colorsys")
+
+        assert isinstance(colorsys, LazyModule)
+        assert not colorsys.is_loaded
+        assert "colorsys" not in sys.modules
+
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert colorsys.is_loaded
+        assert "colorsys" in lazy_load_times()
+
+    def test_heavy_modules_not_imported_by_clients(self):
+        """VectorClient ve döküman okuyucu import edilince faiss/pandas/torch yüklenmemeli."""
+        import src.clients.vector_client as vector_client
+        import src.services.document_loader as document_loader
+
+        assert isinstance(vector_client.faiss, LazyModule)
+        assert isinstance(vector_client.sentence_transformers, LazyModule)
+        assert isinstance(document_loader.pd, LazyModule)
+        assert isinstance(document_loader.pypdf, LazyModule)
@@ -0,0 +1,266 @@
+"""
+Paylaşılan durum deposu (kilit, lider seçimi, sayaç) ve çoklu süreç koordinasyonu testleri.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from src.clients.state_backend import (
+    EXTEND_SCRIPT,
+    INCR_SCRIPT,
+    RELEASE_SCRIPT,
+    LeaderElector,
+    MemoryStateBackend,
+    RedisStateBackend,
+    SQLiteStateBackend,
+)
+from src.core.exceptions import StateBackendError
+
+RUN_DATE = datetime(2026, 1, 1, 12, 0)
+
+
+class FileDatabase:
+    def __init__(self, path):
+        self.path = path
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+class FakeRedis:
+    """Testlerde kullanılan komutları ve betikleri taklit eden yerel Redis."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def _alive(self, key):
+        expires_at = self.expiry.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.data
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and self._alive(key):
+            return None
+        self.data[key] = value
+        if px:
+            self.expiry[key] = time.time() + px / 1000
+        return True
+
+    def get(self, key):
+        return self.data.get(key) if self._alive(key) else None
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def eval(self, script, numkeys, key, *args):
+        if script == RELEASE_SCRIPT:
+            if self.get(key) == args[0]:
+                del self.data[key]
+                return 1
+            return 0
+        if script == EXTEND_SCRIPT:
+            if self.get(key) == args[0]:
+                self.expiry[key] = time.time() + int(args[1]) / 1000
+                return 1
+            return 0
+        if script == INCR_SCRIPT:
+            value = int(self.get(key) or 0) + int(args[0])
+            self.data[key] = str(value)
+            if int(args[1]) > 0 and key not in self.expiry:
+                self.expiry[key] = time.time() + int(args[1]) / 1000
+            return value
+        raise NotImplementedError(script)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backends(request, tmp_path):
+    """Aynı depoya bağlanan iki 'süreç'."""
+    if request.param == "sqlite":
+        path = str(tmp_path / "state.db")
+        first, second = SQLiteStateBackend(path), SQLiteStateBackend(path)
+        yield first, second
+        first.close()
+        second.close()
+    else:
+        redis = FakeRedis()
+        yield RedisStateBackend(redis), RedisStateBackend(redis)
+
+
+class TestStateBackends:
+    """SQLite ve Redis depolarının ortak davranışı."""
+
+    def test_lock_is_exclusive_and_expires(self, backends):
+        a, b = backends
+        assert a.acquire_lock("job", "A", ttl=0.2)
+        assert not b.acquire_lock("job", "B", ttl=0.2)
+        assert a.acquire_lock("job", "A", ttl=0.2)  # sahibi yenileyebilir
+        assert not b.release_lock("job", "B")
+
+        time.sleep(0.25)
+        assert not a.extend_lock("job", "A", ttl=1)
+        assert b.acquire_lock("job", "B", ttl=1)
+        assert b.release_lock("job", "B")
+        assert a.acquire_lock("job", "A", ttl=1)
+
+    def test_counters_are_shared_and_expire(self, backends):
+        a, b = backends
+        assert a.incr("votes", ttl=0.2) == 1
+        assert b.incr("votes", 2) == 3
+        assert a.get_counters(["votes", "missing"]) == [3, 0]
+
+        time.sleep(0.25)
+        assert b.get_counter("votes") == 0
+        assert b.incr("votes") == 1
+
+    def test_lock_context_manager_serializes(self, backends):
+        a, b = backends
+        active, overlaps = [], []
+
+        def worker(backend):
+            for _ in range(5):
+                with backend.lock("pool", ttl=5, timeout=5):
+                    active.append(1)
+                    if len(active) > 1:
+                        overlaps.append(1)
+                    time.sleep(0.005)
+                    active.pop()
+
+        threads = [threading.Thread(target=worker, args=(x,)) for x in (a, b, a, b)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not overlaps
+
+    def test_lock_timeout(self, backends):
+        a, b = backends
+        a.acquire_lock("busy", "A", ttl=5)
+        with pytest.raises(StateBackendError):
+            with b.lock("busy", timeout=0.1):
+                pass
+
+
+class TestLeaderElection:
+    """LeaderElector testleri."""
+
+    def test_single_leader_and_failover(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        first = LeaderElector(SQLiteStateBackend(path), instance_id="p1", ttl=0.3)
+        second = LeaderElector(SQLiteStateBackend(path), instance_id="p2", ttl=0.3)
+
+        assert first.try_acquire()
+        assert not second.try_acquire()
+        assert first.is_leader and not second.is_leader
+
+        # Lider yenilemeyi bırakırsa kira dolunca diğeri devralır
+        time.sleep(0.35)
+        assert not first.is_leader
+        assert second.try_acquire()
+        assert not first.try_acquire()
+
+        # Düzgün kapanışta liderlik hemen devredilir
+        second.stop()
+        assert first.try_acquire()
+
+
+class TestCoordination:
+    """Cron, rate limiter ve kahve havuzunun paylaşılan depoyla çalışması."""
+
+    def test_cron_jobs_run_only_on_leader(self):
+        from src.clients.cron_client import CronClient
+
+        backend = MemoryStateBackend()
+        leader = LeaderElector(backend, instance_id="p1", ttl=5)
+        cron = CronClient.__new__(CronClient)
+        cron.leader, cron.state_backend = leader, backend
+
+        calls = []
+        job = cron._leader_only(lambda: calls.append(1), "sweep")
+        job()
+        assert calls == []
+        leader.try_acquire()
+        job()
+        assert calls == [1]
+
+    def test_once_job_runs_in_one_process(self, tmp_path):
+        from src.clients.cron_client import CronClient
+
+        path = str(tmp_path / "state.db")
+        calls = []
+        jobs = []
+        for _ in range(2):
+            cron = CronClient.__new__(CronClient)
+            cron.leader, cron.state_backend = None, SQLiteStateBackend(path)
+            jobs.append(cron._run_once_cluster_wide(lambda: calls.append(1), "poll_close_1", RUN_DATE))
+        for job in jobs:
+            job()
+        assert calls == [1]
+
+    def test_rescheduled_once_job_runs_again(self, tmp_path):
+        """Aynı job_id'nin başka bir zamana yeniden planlanması (tekrar deneme) atlanmamalı."""
+        from src.clients.cron_client import CronClient
+
+        cron = CronClient.__new__(CronClient)
+        cron.leader, cron.state_backend = None, SQLiteStateBackend(str(tmp_path / "state.db"))
+        calls = []
+        job_id = "resume_challenge_start_1"
+        for delay in (30, 60):
+            run_date = RUN_DATE + timedelta(seconds=delay)
+            cron._run_once_cluster_wide(lambda: calls.append(delay), job_id, run_date)()
+        assert calls == [30, 60]
+
+    def test_rate_limit_shared_between_processes(self, tmp_path):
+        from src.core.rate_limiter import RateLimiter
+
+        path = str(tmp_path / "state.db")
+        a = RateLimiter(3, 60, name="sor", backend=SQLiteStateBackend(path))
+        b = RateLimiter(3, 60, name="sor", backend=SQLiteStateBackend(path))
+
+        assert a.is_allowed("U1")[0] and b.is_allowed("U1")[0] and a.is_allowed("U1")[0]
+        allowed, msg = b.is_allowed("U1")
+        assert not allowed and "saniye" in msg
+        assert a.is_allowed("U2")[0]
+
+        a.reset("U1")
+        assert b.is_allowed("U1")[0]
+
+    def test_coffee_pool_never_double_matches(self, tmp_path):
+        from src.repositories import CoffeePoolRepository
+        from src.services.match_pool import CoffeeMatchPool
+
+        db_path = str(tmp_path / "bot.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE coffee_pool (user_id TEXT PRIMARY KEY, channel_id TEXT, "
+                "user_name TEXT, expires_at REAL NOT NULL)"
+            )
+        repo = CoffeePoolRepository(FileDatabase(db_path))
+        path = str(tmp_path / "state.db")
+        pools = [CoffeeMatchPool(repo, state_backend=SQLiteStateBackend(path)) for _ in range(2)]
+
+        # Süreç 1'de bekleyen kullanıcı süreç 2'deki istekle eşleşmeli
+        assert pools[0].take_partner_or_enqueue("U1", "C1", "Ali")[0] == "queued"
+        status, partner = pools[1].take_partner_or_enqueue("U2", "C2", "Ayşe")
+        assert status == "matched" and partner["user_id"] == "U1"
+
+        # Aynı anda gelen istekler aynı bekleyeni iki kez alamaz
+        pools[0].take_partner_or_enqueue("U3", "C3", "Can")
+        results = []
+        threads = [
+            threading.Thread(target=lambda p=p, u=u: results.append(p.take_partner_or_enqueue(u, "C", u)))
+            for p, u in ((pools[0], "U4"), (pools[1], "U5"))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        matched = [partner["user_id"] for status, partner in results if status == "matched"]
+        assert matched == ["U3"]
+        assert len(repo.list_waiting()) == 1
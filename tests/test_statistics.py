@@ -0,0 +1,90 @@
+"""
+SQL tarafı istatistik toplama testleri.
+"""
+
+import sqlite3
+import pytest
+from src.clients.database_client import DatabaseClient
+from src.repositories.statistics_repository import StatisticsRepository
+from src.services.statistics_service import BotStatistics
+
+
+class FileDatabase:
+    def __init__(self, path):
+        self.path = path
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "stats.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (id TEXT, cohort TEXT);
+        CREATE TABLE matches (id TEXT, status TEXT);
+        CREATE TABLE help_requests (id TEXT, status TEXT);
+        CREATE TABLE feedbacks (id TEXT, category TEXT);
+        CREATE TABLE polls (id TEXT, is_closed INTEGER);
+        CREATE TABLE votes (id TEXT, poll_id TEXT);
+    """)
+    # SingletonMeta'yı atlayarak sadece trigger'ları kur
+    DatabaseClient.__new__(DatabaseClient)._create_stats_counters(conn.cursor())
+    conn.executescript("""
+        INSERT INTO users VALUES ('1', 'AI'), ('2', 'AI'), ('3', NULL);
+        INSERT INTO matches VALUES ('1', 'active'), ('2', 'closed'), ('3', 'closed');
+        INSERT INTO help_requests VALUES ('1', 'open'), ('2', 'resolved');
+        INSERT INTO feedbacks VALUES ('1', 'bug');
+        INSERT INTO polls VALUES ('1', 0), ('2', 1), ('3', 1);
+        INSERT INTO votes VALUES ('1', '1'), ('2', '1'), ('3', '2'), ('4', '1');
+    """)
+    conn.commit()
+    conn.close()
+    return FileDatabase(path)
+
+
+class TestStatistics:
+    """StatisticsRepository + BotStatistics + stats_counters testleri."""
+
+    def test_grouped_counts_to_typed_stats(self, db):
+        """Tek sorgudaki sayımlar tipli istatistik nesnesine doğru aktarılmalı."""
+        stats = BotStatistics.from_grouped_counts(StatisticsRepository(db).fetch_grouped_counts())
+
+        assert stats.users.total == 3
+        assert stats.users.cohort_distribution == {"AI": 2, "Belirtilmemiş": 1}
+        assert (stats.matches.active, stats.matches.closed, stats.matches.total) == (1, 2, 3)
+        assert (stats.help_requests.open, stats.help_requests.resolved) == (1, 1)
+        assert stats.feedbacks.category_distribution == {"bug": 1}
+        assert (stats.polls.open, stats.polls.closed, stats.polls.total_votes) == (1, 2, 4)
+
+    def test_snapshot_matches_grouped_counts(self, db):
+        """Trigger'larla tutulan sayaçlar gerçek sayımlarla aynı olmalı."""
+        repo = StatisticsRepository(db)
+        with db.get_connection() as conn:
+            conn.execute("UPDATE matches SET status = 'closed' WHERE id = '1'")
+            conn.execute("UPDATE users SET cohort = 'Backend' WHERE id = '3'")
+            conn.execute("DELETE FROM votes WHERE id = '4'")
+
+        assert repo.fetch_counter_snapshot() == repo.fetch_grouped_counts()
+        assert repo.get_poll_vote_count("1") == 2
+
+    def test_reconcile_fixes_drift(self, db):
+        """Uzlaştırma sapmış sayaçları düzeltmeli."""
+        repo = StatisticsRepository(db)
+        with db.get_connection() as conn:
+            conn.execute("UPDATE stats_counters SET count = 99 WHERE scope = 'votes'")
+            conn.execute("DELETE FROM stats_counters WHERE scope = 'users'")
+
+        assert repo.reconcile_counters() == 3
+        assert repo.fetch_counter_snapshot() == repo.fetch_grouped_counts()
+        assert repo.reconcile_counters() == 0
+
+    def test_empty_database(self):
+        """Boş sayımlar sıfır değerli istatistik üretmeli."""
+        stats = BotStatistics.from_grouped_counts({})
+        assert stats.model_dump()["help_requests"] == {
+            "total": 0, "open": 0, "in_progress": 0, "resolved": 0, "closed": 0
+        }
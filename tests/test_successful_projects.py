@@ -0,0 +1,187 @@
+"""
+Başarılı projeler raporu (keyset sayfalama + /admin-basarili-projeler) testleri.
+"""
+
+import pytest
+from src.clients.database_client import DatabaseClient
+from src.core.exceptions import DatabaseError
+from src.repositories import ChallengeEvaluationRepository
+from src.handlers import statistics_handler
+from src.handlers.statistics_handler import (
+    setup_statistics_handlers,
+    SUCCESSFUL_PROJECTS_PAGE_SIZE,
+    SUCCESSFUL_PROJECTS_MAX_PAGES,
+)
+
+
+def _seed(db, count, members=("U1", "U2")):
+    """`count` adet başarılı challenge ve araya başarısız bir kayıt ekler."""
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (id, slack_id) VALUES (?, ?)",
+            [(f"id-{u}", u) for u in ("U0",) + tuple(members)]
+        )
+        conn.execute(
+            "INSERT INTO challenge_projects (id, theme, name) VALUES ('PR1', 'AI', 'Chatbot')"
+        )
+        for i in range(count):
+            conn.execute(
+                "INSERT INTO challenge_hubs (id, creator_id, theme, team_size, selected_project_id) "
+                "VALUES (?, 'U0', 'AI', 3, 'PR1')",
+                (f"H{i}",)
+            )
+            conn.executemany(
+                "INSERT INTO challenge_participants (id, challenge_hub_id, user_id) VALUES (?, ?, ?)",
+                [(f"P{i}-{u}", f"H{i}", u) for u in members]
+            )
+            conn.execute(
+                "INSERT INTO challenge_evaluations (id, challenge_hub_id, final_result) VALUES (?, ?, 'success')",
+                (f"E{i}", f"H{i}")
+            )
+        # Filtreye takılması gereken başarısız değerlendirme
+        conn.execute(
+            "INSERT INTO challenge_hubs (id, creator_id, theme, team_size) VALUES ('HF', 'U0', 'AI', 3)"
+        )
+        conn.execute(
+            "INSERT INTO challenge_evaluations (id, challenge_hub_id, final_result) VALUES ('EF', 'HF', 'failed')"
+        )
+
+
+@pytest.fixture
+def db(tmp_path):
+    # SingletonMeta'yı atlayarak geçici veritabanında tabloları kur
+    db = DatabaseClient.__new__(DatabaseClient)
+    db.db_path = str(tmp_path / "projects.db")
+    db.init_db()
+    return db
+
+
+class BrokenDatabase:
+    def get_connection(self):
+        raise DatabaseError("disk I/O error")
+
+
+class TestSuccessfulProjectsRepository:
+    """ChallengeEvaluationRepository başarılı proje sorguları testleri."""
+
+    def test_keyset_pages_cover_every_project_once(self, db):
+        """Sayfalar en yeniden eskiye, tekrar ve boşluk olmadan ilerlemeli."""
+        _seed(db, 5)
+        repo = ChallengeEvaluationRepository(db)
+
+        pages = list(repo.iter_successful_project_pages(page_size=2))
+
+        assert [len(p) for p in pages] == [2, 2, 1]
+        ids = [p["evaluation_id"] for page in pages for p in page]
+        assert ids == ["E4", "E3", "E2", "E1", "E0"]
+        assert repo.count_successful() == 5
+
+    def test_before_rowid_is_exclusive(self, db):
+        """`before_rowid` sınırındaki kayıt bir sonraki sayfada tekrar gelmemeli."""
+        _seed(db, 3)
+        repo = ChallengeEvaluationRepository(db)
+
+        first = repo.list_successful_projects(limit=1)
+        boundary = first[-1]["cursor"]
+        rest = repo.list_successful_projects(limit=10, before_rowid=boundary)
+
+        assert [p["evaluation_id"] for p in first] == ["E2"]
+        assert [p["evaluation_id"] for p in rest] == ["E1", "E0"]
+        assert all(p["cursor"] < boundary for p in rest)
+        assert repo.list_successful_projects(limit=10, before_rowid=rest[-1]["cursor"]) == []
+
+    def test_exact_multiple_of_page_size_stops_on_empty_page(self, db):
+        """Tam dolu son sayfadan sonra boş sayfa üretilmemeli."""
+        _seed(db, 4)
+        repo = ChallengeEvaluationRepository(db)
+
+        assert [len(p) for p in repo.iter_successful_project_pages(page_size=2)] == [2, 2]
+
+    def test_members_grouped_per_challenge(self, db):
+        """GROUP_CONCAT takım üyelerini challenge başına tek kayıtta listelemeli."""
+        _seed(db, 2, members=("U1", "U2", "U3"))
+        repo = ChallengeEvaluationRepository(db)
+
+        projects = repo.list_successful_projects(limit=10)
+
+        assert len(projects) == 2
+        for project in projects:
+            assert sorted(project["member_ids"]) == ["U1", "U2", "U3"]
+            assert project["project_name"] == "Chatbot"
+            assert project["creator_id"] == "U0"
+
+    def test_project_without_members(self, db):
+        """Katılımcısı olmayan challenge'da member_ids boş liste olmalı."""
+        _seed(db, 1, members=())
+        repo = ChallengeEvaluationRepository(db)
+
+        assert repo.list_successful_projects(limit=10)[0]["member_ids"] == []
+
+    def test_database_errors_are_raised(self):
+        """Veritabanı hatası 'başarılı proje yok' gibi görünmemeli."""
+        repo = ChallengeEvaluationRepository(BrokenDatabase())
+
+        with pytest.raises(DatabaseError):
+            repo.count_successful()
+        with pytest.raises(DatabaseError):
+            repo.list_successful_projects()
+
+
+class FakeApp:
+    """Komut handler'larını yakalayan basit Bolt App taklidi."""
+
+    def __init__(self):
+        self.commands = {}
+        self.client = None
+
+    def command(self, name):
+        def register(func):
+            self.commands[name] = func
+            return func
+        return register
+
+
+class FakeChat:
+    def __init__(self):
+        self.ephemerals = []
+
+    def post_ephemeral(self, channel, user, text, blocks=None):
+        self.ephemerals.append({"text": text, "blocks": blocks})
+
+
+class FakeUserRepo:
+    def get_by_slack_id(self, slack_id):
+        return None
+
+
+def _run_report(monkeypatch, eval_repo):
+    monkeypatch.setattr(statistics_handler, "is_admin", lambda app, user_id: True)
+    app, chat = FakeApp(), FakeChat()
+    setup_statistics_handlers(app, None, chat, FakeUserRepo(), eval_repo)
+    app.commands["/admin-basarili-projeler"](lambda: None, {"user_id": "UA", "channel_id": "C1"})
+    return chat.ephemerals
+
+
+class TestSuccessfulProjectsHandler:
+    """/admin-basarili-projeler handler testleri."""
+
+    def test_report_stops_after_max_pages(self, db, monkeypatch):
+        """Sayfa sınırında durmalı ve kalan proje sayısını göstermeli."""
+        extra = 3
+        total = SUCCESSFUL_PROJECTS_PAGE_SIZE * SUCCESSFUL_PROJECTS_MAX_PAGES + extra
+        _seed(db, total)
+
+        messages = _run_report(monkeypatch, ChallengeEvaluationRepository(db))
+
+        assert len(messages) == SUCCESSFUL_PROJECTS_MAX_PAGES
+        assert all(len(m["blocks"]) <= 50 for m in messages)
+        footer = messages[-1]["blocks"][-1]
+        assert footer["type"] == "context"
+        assert f"{extra} proje daha" in footer["elements"][0]["text"]
+
+    def test_report_surfaces_database_errors(self, monkeypatch):
+        """Veritabanı hatasında 'henüz başarılı proje yok' yerine hata mesajı gönderilmeli."""
+        messages = _run_report(monkeypatch, ChallengeEvaluationRepository(BrokenDatabase()))
+
+        assert len(messages) == 1
+        assert messages[0]["text"].startswith("❌")
@@ -0,0 +1,240 @@
+"""
+Sürümlü vektör deposu, indeksleyici, sürüm takası ve çökme dayanıklılığı testleri.
+"""
+
+import json
+import os
+import pickle
+import threading
+import pytest
+
+faiss = pytest.importorskip("faiss")
+np = pytest.importorskip("numpy")
+
+from src.clients import vector_store
+from src.clients.vector_client import VectorClient
+from src.indexer import parse_version
+from src.services.document_loader import collection_for, load_knowledge_base
+
+
+class FakeModel:
+    """Metni harf frekanslarına çeviren deterministik embedding modeli."""
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), 26), dtype="float32")
+        for row, text in enumerate(texts):
+            for char in text.lower():
+                if "a" <= char <= "z":
+                    vectors[row, ord(char) - ord("a")] += 1
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1)
+
+
+def make_client(path, autoload=True, keep=3):
+    """SingletonMeta'yı atlayarak bağımsız bir VectorClient oluşturur (ayrı süreçleri temsil eder)."""
+    client = VectorClient.__new__(VectorClient)
+    client.__init__(index_path=path, keep_versions=keep, autoload=autoload)
+    client._model = FakeModel()
+    return client
+
+
+class TestVersionedStore:
+    """Sürüm yayınlama, işaretçi ve takas testleri."""
+
+    def test_indexer_publish_is_picked_up_by_bot(self, tmp_path):
+        store = str(tmp_path / "vector_store")
+        indexer = make_client(store, autoload=False)
+        first = indexer.rebuild(["kahve eşleşmesi", "mentorluk programı"], [{"source": "a.md"}] * 2)
+
+        bot = make_client(store)
+        assert bot.version == first and len(bot.documents) == 2
+        old_snapshot = bot._snapshot
+
+        second = make_client(store, autoload=False).rebuild(["challenge kuralları"], [{"source": "b.md"}])
+        assert vector_store.read_pointer(store) == second
+        assert bot.version == first  # takas işaretçi kontrol edilene kadar yapılmaz
+
+        assert bot.reload_if_changed()
+        assert bot.version == second
+        assert [doc["text"] for doc in bot.documents] == ["challenge kuralları"]
+        assert not bot.reload_if_changed()
+        # Devam eden aramanın tuttuğu eski görüntü değişmez
+        assert old_snapshot.collections["genel"].index.ntotal == 2 and len(old_snapshot.documents) == 2
+
+    def test_staging_leftovers_are_ignored_and_versions_pruned(self, tmp_path):
+        store = str(tmp_path / "vector_store")
+        client = make_client(store, keep=2)
+        versions = [client.rebuild([f"metin {i}"]) for i in range(4)]
+
+        # Yarım kalmış bir indeksleyici sürümü yayınlanmış sayılmaz
+        os.makedirs(os.path.join(vector_store.versions_path(store), vector_store.STAGING_PREFIX + "x"))
+        assert vector_store.list_versions(store) == versions[-2:]
+        assert vector_store.read_pointer(store) == versions[-1]
+
+        results = client.search("metin 3", top_k=1, threshold=10)
+        assert results[0]["text"] == "metin 3"
+
+    def test_add_texts_does_not_mutate_served_index(self, tmp_path):
+        client = make_client(str(tmp_path / "vector_store"))
+        client.rebuild(["ilk"])
+        served = client._snapshot.collections["genel"].index
+
+        client.add_texts(["ikinci"], [{"source": "c.md"}])
+        assert served.ntotal == 1
+        assert client.collection_sizes() == {"genel": 2} and len(client.documents) == 2
+
+    def test_legacy_flat_files_are_loaded(self, tmp_path):
+        prefix = str(tmp_path / "vector_store")
+        index = faiss.IndexFlatL2(26)
+        index.add(FakeModel().encode(["eski"]))
+        faiss.write_index(index, f"{prefix}.index")
+        with open(f"{prefix}.pkl", "wb") as f:
+            pickle.dump([{"text": "eski", "metadata": {}}], f)
+
+        client = make_client(prefix)
+        assert client.has_index() and client.version is None
+        assert client.documents[0]["text"] == "eski"
+
+    def test_parse_version(self):
+        assert parse_version("[i] log\nVERSION=20261019T120301-abc123\n") == "20261019T120301-abc123"
+        assert parse_version("[X] hata\n") is None
+
+
+class TestCrashSafety:
+    """Manifest doğrulaması ve son sağlam sürüme dönüş testleri."""
+
+    def test_manifest_records_counts_and_model(self, tmp_path):
+        store = str(tmp_path / "vector_store")
+        client = make_client(store)
+        version = client.rebuild(["bir", "iki", "üç"])
+
+        manifest = vector_store.read_manifest(store, version)
+        assert manifest["vector_count"] == manifest["chunk_count"] == 3
+        assert manifest["dimension"] == 26 and manifest["model_name"] == client.model_name
+        assert client.manifest["version"] == version
+        assert not [name for name in os.listdir(vector_store.version_path(store, version)) if name.endswith(".tmp")]
+
+    def test_corrupt_current_falls_back_to_last_good(self, tmp_path):
+        store = str(tmp_path / "vector_store")
+        writer = make_client(store)
+        good = writer.rebuild(["sağlam sürüm"])
+        bad = writer.rebuild(["bozulacak sürüm", "ikinci parça"])
+
+        # Çökme: dökümanlar dosyası indeksle uyuşmayan içerikle değişmiş
+        with open(os.path.join(vector_store.version_path(store, bad), vector_store.DOCUMENTS_FILE), "wb") as f:
+            pickle.dump([{"text": "tek", "metadata": {}}], f)
+
+        reader = make_client(store)
+        assert reader.version == good
+        assert reader.documents[0]["text"] == "sağlam sürüm"
+        assert bad in reader._rejected_versions
+
+    def test_incomplete_version_is_rejected_on_reload(self, tmp_path):
+        store = str(tmp_path / "vector_store")
+        client = make_client(store)
+        good = client.rebuild(["ilk"])
+
+        other = make_client(store, autoload=False)
+        partial = other.rebuild(["yarım"])
+        os.unlink(os.path.join(vector_store.version_path(store, partial), vector_store.MANIFEST_FILE))
+
+        assert not client.reload_if_changed()
+        assert client.version == good and partial in client._rejected_versions
+
+    def test_model_mismatch_is_rejected(self, tmp_path):
+        store = str(tmp_path / "vector_store")
+        make_client(store).rebuild(["model a"])
+
+        client = VectorClient.__new__(VectorClient)
+        client.__init__(model_name="baska-model", index_path=store)
+        assert not client.has_index()
+
+    def test_searches_continue_during_save(self, tmp_path, monkeypatch):
+        client = make_client(str(tmp_path / "vector_store"))
+        client.rebuild(["kahve", "çay"])
+        writing, release = threading.Event(), threading.Event()
+        original = vector_store.stage_version
+
+        def slow_stage(*args, **kwargs):
+            writing.set()
+            release.wait(5)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(vector_store, "stage_version", slow_stage)
+        saver = threading.Thread(target=client.rebuild, args=(["yeni"],))
+        saver.start()
+        assert writing.wait(5)
+        # Diske yazma sürerken arama eski sürümle yanıt verir
+        assert client.search("kahve", top_k=1, threshold=10)[0]["text"] == "kahve"
+        release.set()
+        saver.join()
+        assert client.documents[0]["text"] == "yeni"
+
+
+class TestCollections:
+    """Koleksiyon ayrımı ve kaynak ön-filtresi testleri."""
+
+    def test_collections_are_indexed_and_searched_separately(self, tmp_path):
+        store = str(tmp_path / "vector_store")
+        client = make_client(store)
+        version = client.rebuild(
+            ["kahve kuralları", "challenge puanlama", "challenge takımları"],
+            [{"source": "a.md"}, {"source": "c.md", "collection": "challenge"}, {"source": "c.md", "collection": "challenge"}]
+        )
+
+        assert client.collection_sizes() == {"genel": 1, "challenge": 2}
+        manifest = vector_store.read_manifest(store, version)
+        assert manifest["collections"]["challenge"] == {"vector_count": 2, "chunk_count": 2}
+
+        results = client.search("kahve kuralları", top_k=3, threshold=10, collections=["challenge"])
+        assert {r["metadata"]["collection"] for r in results} == {"challenge"}
+        assert client.search("kahve kuralları", top_k=1, threshold=10)[0]["text"] == "kahve kuralları"
+        assert client.search("kahve", collections=["yok"]) == []
+
+    def test_source_prefilter(self, tmp_path):
+        client = make_client(str(tmp_path / "vector_store"))
+        client.rebuild(
+            ["mentorluk programı", "mentorluk takvimi", "kahve"],
+            [{"source": "a.md"}, {"source": "b.md"}, {"source": "b.md"}]
+        )
+
+        results = client.search("mentorluk programı", top_k=2, threshold=10, sources=["b.md"])
+        assert [r["text"] for r in results] == ["mentorluk takvimi", "kahve"]
+        assert client.search("mentorluk", threshold=10, sources=["yok.md"]) == []
+
+    def test_format1_version_is_loaded_into_default_collection(self, tmp_path):
+        store = str(tmp_path / "vector_store")
+        version = make_client(store).rebuild(["eski biçim"])
+        path = vector_store.version_path(store, version)
+
+        # Format 1: tek index.faiss, liste halinde dökümanlar, koleksiyonsuz manifest
+        os.rename(os.path.join(path, vector_store.collection_file("genel")), os.path.join(path, vector_store.INDEX_FILE))
+        with open(os.path.join(path, vector_store.DOCUMENTS_FILE), "wb") as f:
+            pickle.dump([{"text": "eski biçim", "metadata": {}}], f)
+        manifest = vector_store.read_manifest(store, version)
+        manifest.pop("collections")
+        manifest.pop("files")
+        manifest["format"] = 1
+        with open(os.path.join(path, vector_store.MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f)
+
+        client = make_client(store)
+        assert client.version == version and client.collection_sizes() == {"genel": 1}
+
+    def test_collection_for_folders_and_patterns(self, tmp_path):
+        patterns = {"challenge": ["*challenge*"], "akademi": ["*kural*"]}
+        assert collection_for(os.path.join("Challenge", "x.pdf"), patterns) == "challenge"
+        assert collection_for("yaz_challenge_2026.pdf", patterns) == "challenge"
+        assert collection_for("Kurallar.md", patterns) == "akademi"
+        assert collection_for("sss.md", patterns) == "genel"
+
+        (tmp_path / "challenge").mkdir()
+        (tmp_path / "challenge" / "rehber.md").write_text("takım rehberi", encoding="utf-8")
+        (tmp_path / "sss.md").write_text("sık sorulanlar", encoding="utf-8")
+        texts, metadata = load_knowledge_base(str(tmp_path), splitter=_LineSplitter())
+        assert sorted((m["source"], m["collection"]) for m in metadata) == [("rehber.md", "challenge"), ("sss.md", "genel")]
+
+
+class _LineSplitter:
+    def split_text(self, text):
+        return text.splitlines()
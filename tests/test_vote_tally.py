@@ -0,0 +1,220 @@
+"""
+Bellek içi oy sayacı (VoteTallyEngine) testleri.
+"""
+
+import asyncio
+import json
+import pytest
+from src.services.vote_tally import VoteTallyEngine
+from src.clients.database_client import DatabaseClient
+from src.repositories import PollRepository, VoteRepository
+from src.services.voting_service import VotingService
+
+
+class FakeVoteRepo:
+    """votes tablosunu taklit eden basit depo."""
+
+    def __init__(self, rows=None, fail_users=()):
+        self.rows = set(rows or [])
+        self.fail_users = set(fail_users)
+        self.batches = []
+
+    def voter_exists(self, user_id):
+        return user_id not in self.fail_users
+
+    def list_by_polls(self, poll_ids):
+        return [
+            {"poll_id": p, "user_id": u, "option_index": i}
+            for (p, u, i) in self.rows if p in poll_ids
+        ]
+
+    def apply_ops(self, ops):
+        staged = set(self.rows)
+        for op in ops:
+            if op[0] == "insert":
+                _, _, poll_id, user_id, index = op
+                if user_id in self.fail_users:
+                    raise RuntimeError("FOREIGN KEY constraint failed")
+                staged.add((poll_id, user_id, index))
+            elif op[0] == "delete":
+                staged.discard(op[1:])
+            else:
+                staged = {r for r in staged if r[:2] != op[1:]}
+        self.rows = staged
+        self.batches.append(len(ops))
+
+
+@pytest.fixture
+def engine():
+    return VoteTallyEngine(FakeVoteRepo(), flush_interval=60)
+
+
+class TestVoteTallyEngine:
+    """VoteTallyEngine testleri."""
+
+    def test_toggle_and_switch(self, engine):
+        """Tekli oylamada yeni seçim eskisini silmeli, aynı seçim geri almalı."""
+        engine.open_poll("P1", 3, allow_multiple=False)
+
+        assert engine.toggle("P1", "U1", 0) == "added"
+        assert engine.toggle("P1", "U1", 2) == "added"
+        assert engine.get_counts("P1") == [0, 0, 1]
+        assert engine.toggle("P1", "U1", 2) == "removed"
+        assert engine.get_counts("P1") == [0, 0, 0]
+
+    def test_multiple_choice(self, engine):
+        """Çoklu oylamada seçimler birikmeli."""
+        engine.open_poll("P1", 3, allow_multiple=True)
+        engine.toggle("P1", "U1", 0)
+        engine.toggle("P1", "U1", 1)
+        engine.toggle("P1", "U2", 1)
+        assert engine.get_counts("P1") == [1, 2, 0]
+
+    def test_write_behind_batches_and_replay(self, engine):
+        """Bekleyen işlemler tek seferde yazılmalı ve yeniden yüklemede aynı sonucu vermeli."""
+        engine.open_poll("P1", 2, allow_multiple=False)
+        for i in range(10):
+            engine.toggle("P1", f"U{i}", i % 2)
+        engine.toggle("P1", "U0", 1)
+
+        assert engine.flush() == 12
+        assert engine.vote_repo.batches == [12]
+
+        restored = VoteTallyEngine(engine.vote_repo)
+        restored.load_polls([{"id": "P1", "option_count": 2, "allow_multiple": 0}])
+        assert restored.get_counts("P1") == engine.get_counts("P1") == [4, 6]
+
+    def test_failed_op_resyncs_tally(self):
+        """Yazılamayan oy sayaçtan düşülmeli, diğer oylar korunmalı."""
+        engine = VoteTallyEngine(FakeVoteRepo(fail_users={"UX"}), flush_interval=60)
+        engine.open_poll("P1", 2, allow_multiple=False)
+        engine.toggle("P1", "U1", 0)
+        engine.toggle("P1", "UX", 0)
+
+        engine.flush()
+        assert engine.get_counts("P1") == [1, 0]
+
+    def test_closed_poll_rejects_votes(self, engine):
+        """Kapanan oylama son sayıları döndürmeli ve yeni oy kabul etmemeli."""
+        engine.open_poll("P1", 2, allow_multiple=False)
+        engine.toggle("P1", "U1", 1)
+
+        assert engine.close_poll("P1") == [0, 1]
+        assert engine.pending_count() == 0
+        assert engine.toggle("P1", "U2", 0) is None
+
+
+class FakePollRepo:
+    def __init__(self):
+        self.polls = {"P1": {"id": "P1", "topic": "Konu", "options": json.dumps(["a", "b"]),
+                             "allow_multiple": 0, "is_closed": 0, "message_ts": None, "message_channel": None}}
+
+    def get(self, poll_id):
+        poll = self.polls.get(poll_id)
+        return dict(poll) if poll else None
+
+    def update(self, poll_id, data):
+        self.polls[poll_id].update(data)
+
+
+class FakeChat:
+    def post_message(self, **kwargs):
+        return {"ok": True}
+
+
+def make_voting_service(vote_repo=None):
+    service = VotingService(FakeChat(), FakePollRepo(), vote_repo or FakeVoteRepo(), None, live_update_interval=60)
+    service.tally.flush_interval = 60
+    return service
+
+
+class TestVotingService:
+    """VotingService oy kabul/kapanış testleri."""
+
+    def test_unknown_user_vote_is_rejected_before_tally(self):
+        """users tablosunda olmayan kullanıcının oyu sayaca girmemeli, hata mesajı dönmeli."""
+        service = make_voting_service(FakeVoteRepo(fail_users={"UX"}))
+
+        result = service.cast_vote("P1", "UX", 0)
+        assert result == {"success": False, "message": VotingService.ERROR_MESSAGE}
+        assert service.cast_vote("P1", "U1", 1)["success"]
+        assert service.tally.get_counts("P1") == [0, 1]
+
+    def test_vote_after_close_is_rejected_and_not_reloaded(self):
+        """Kapanıştan sonra gelen oy sayacı yeniden kurmamalı; veritabanı önce kapatılmalı."""
+        service = make_voting_service()
+        service.cast_vote("P1", "U1", 0)
+        updates = []
+        original_close = service.tally.close_poll
+
+        def close_and_record(poll_id):
+            updates.append(service.poll_repo.polls[poll_id]["is_closed"])
+            return original_close(poll_id)
+
+        service.tally.close_poll = close_and_record
+        asyncio.run(service.close_poll("C1", "P1"))
+        assert updates == [1]
+
+        # Kapalı işaretini görmeyen (eski) okuma olsa bile oy kabul edilmez
+        service.poll_repo.polls["P1"]["is_closed"] = 0
+        assert service.cast_vote("P1", "U2", 1) == {"success": False, "message": VotingService.CLOSED_MESSAGE}
+        service._load_tallies([service.poll_repo.get("P1")])
+        assert service.tally.get("P1") is None
+        assert service.vote_repo.rows == {("P1", "U1", 0)}
+
+
+class SharedBackend:
+    is_shared = True
+
+
+@pytest.fixture
+def vote_db(tmp_path):
+    # SingletonMeta'yı atlayarak geçici veritabanında tabloları kur
+    db = DatabaseClient.__new__(DatabaseClient)
+    db.db_path = str(tmp_path / "votes.db")
+    db.init_db()
+    with db.get_connection() as conn:
+        conn.executemany("INSERT INTO users (id, slack_id) VALUES (?, ?)", [("1", "U1"), ("2", "U2")])
+        conn.execute(
+            "INSERT INTO polls (id, topic, options, allow_multiple, is_closed) VALUES ('P1', 'Konu', ?, 0, 0)",
+            (json.dumps(["a", "b"]),)
+        )
+        conn.commit()
+    return db
+
+
+class TestSharedVoting:
+    """Çoklu süreç modu: oylar bellek içi sayaca girmeden SQLite transaction'ında işlenir."""
+
+    def test_toggle_vote_switches_removes_and_respects_close(self, vote_db):
+        repo = VoteRepository(vote_db)
+
+        assert repo.toggle_vote("P1", "U1", 0) == "added"
+        assert repo.toggle_vote("P1", "U1", 1) == "added"
+        assert [(v["user_id"], v["option_index"]) for v in repo.list_by_polls(["P1"])] == [("U1", 1)]
+        assert repo.toggle_vote("P1", "U1", 1) == "removed"
+        assert repo.toggle_vote("P1", "U1", 5) == "not_found"
+        assert repo.toggle_vote("P2", "U1", 0) == "not_found"
+
+        with vote_db.get_connection() as conn:
+            conn.execute("UPDATE polls SET is_closed = 1 WHERE id = 'P1'")
+            conn.commit()
+        assert repo.toggle_vote("P1", "U2", 0) == "closed"
+        assert repo.list_by_polls(["P1"]) == []
+
+    def test_service_bypasses_in_memory_tally(self, vote_db):
+        service = VotingService(
+            FakeChat(), PollRepository(vote_db), VoteRepository(vote_db), None,
+            live_update_interval=60, state_backend=SharedBackend()
+        )
+
+        assert service.cast_vote("P1", "U1", 0)["success"]
+        assert service.cast_vote("P1", "U2", 0)["success"]
+        assert service.cast_vote("P1", "UX", 0) == {"success": False, "message": VotingService.ERROR_MESSAGE}
+        assert service.tally.get("P1") is None
+        assert service.restore_open_polls() == 0
+        assert [r["count"] for r in service._calculate_results("P1", ["a", "b"])] == [2, 0]
+
+        asyncio.run(service.close_poll("C1", "P1"))
+        assert service.cast_vote("P1", "U1", 1) == {"success": False, "message": VotingService.CLOSED_MESSAGE}
+        service.shutdown()